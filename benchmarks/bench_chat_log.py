@@ -0,0 +1,66 @@
+"""Chat logging benchmark: legacy read-modify-write JSON array vs the JSONL journal.
+
+Logs a session the way CLI.run does (two append_chat calls per turn) and
+reports the time per call at a few points in the session.
+
+Usage: python benchmarks/bench_chat_log.py [--turns 2000] [--fsync interval]
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, PROJECT_ROOT)
+
+from src.rexode_cli.chat_logger import FSYNC_POLICIES, ChatJournal
+
+
+def legacy_append(path, entry):
+    # The pre-journal chat_logger.append_chat.
+    log_data = []
+    if os.path.exists(path):
+        with open(path, "r", encoding="utf-8") as f:
+            log_data = json.load(f)
+    log_data.append(entry)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(log_data, f, indent=2, ensure_ascii=False)
+
+
+def entry(turn, side):
+    text = f"message {turn} " + "lorem ipsum " * 20
+    return {"timestamp": "2024-05-01 10:00:00", "user": text if side == 0 else "", "rexode": text if side else ""}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--turns", type=int, default=2000)
+    parser.add_argument("--fsync", choices=FSYNC_POLICIES, default="interval")
+    args = parser.parse_args()
+    checkpoints = {1, 10, 100, 500, 1000, args.turns}
+
+    with tempfile.TemporaryDirectory() as folder:
+        legacy_path = os.path.join(folder, "legacy.json")
+        journal = ChatJournal(os.path.join(folder, "journal"), fsync=args.fsync)
+        legacy_total = journal_total = 0.0
+        print(f"{'turn':>5} {'legacy ms/call':>15} {'journal ms/call':>16}")
+        for turn in range(1, args.turns + 1):
+            start = time.perf_counter()
+            for side in (0, 1):
+                legacy_append(legacy_path, entry(turn, side))
+            middle = time.perf_counter()
+            for side in (0, 1):
+                journal.append(entry(turn, side))
+            end = time.perf_counter()
+            legacy_total += middle - start
+            journal_total += end - middle
+            if turn in checkpoints:
+                print(f"{turn:>5} {(middle - start) * 500:>15.3f} {(end - middle) * 500:>16.3f}")
+        journal.close()
+        print(f"\ntotal: legacy {legacy_total:.2f} s, journal {journal_total:.3f} s (fsync={args.fsync})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+"""Batch scraping benchmark against a local fixture server.
+
+Compares, on the same set of pages:
+  legacy   one requests.get at a time + BeautifulSoup(html.parser).get_text(),
+           pages collected in a list and dumped at the end;
+  crawler  the asyncio Crawler (streaming lxml/html.parser extraction,
+           boilerplate stripped) writing JSONL as pages complete.
+Each mode runs in its own process so the reported peak RSS is its own.
+
+Usage: python benchmarks/bench_crawler.py [--pages 200] [--size 100] [--latency-ms 50]
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, PROJECT_ROOT)
+
+
+def make_page(n, size_kb):
+    paragraph = f"<p>Paragraph of page {n} with <b>some</b> <a href='/page/{n + 1}'>inline links</a> and text.</p>\n"
+    nav = "<nav>" + "".join(f"<a href='/section/{i}'>Section {i}</a>" for i in range(50)) + "</nav>"
+    script = "<script>" + "var x = 1;" * 200 + "</script>"
+    repeats = max(1, size_kb * 1024 // len(paragraph))
+    return (f"<html><head><title>Page {n}</title>{script}</head><body>{nav}<article>"
+            + paragraph * repeats + "</article><footer>Copyright</footer></body></html>").encode()
+
+
+def make_handler(size_kb, latency):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_GET(self):
+            time.sleep(latency)
+            body = make_page(int(self.path.rsplit("/", 1)[-1] or 0), size_kb)
+            self.send_response(200)
+            self.send_header("Content-Type", "text/html; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    return Handler
+
+
+def run_legacy(urls, save_path):
+    import requests
+    from bs4 import BeautifulSoup
+    pages = []
+    for url in urls:
+        response = requests.get(url)
+        soup = BeautifulSoup(response.text, "html.parser")
+        pages.append({"url": url, "text": soup.get_text()})
+    with open(save_path, "w", encoding="utf-8") as f:
+        json.dump(pages, f)
+
+
+def run_crawler(urls, save_path):
+    from src.rexode_cli.core.crawler import Crawler, crawl_to_file
+    crawl_to_file(urls, "jsonl", save_path, crawler=Crawler(concurrency=16, per_domain=16, domain_delay=0))
+
+
+def child(mode, base, pages):
+    from src.rexode_cli.core.crawler import peak_memory_mb
+    urls = [f"{base}/page/{n}" for n in range(pages)]
+    with tempfile.TemporaryDirectory() as directory:
+        save_path = os.path.join(directory, "out")
+        start = time.perf_counter()
+        (run_legacy if mode == "legacy" else run_crawler)(urls, save_path)
+        elapsed = time.perf_counter() - start
+        output_mb = os.path.getsize(save_path) / 1024 / 1024
+    print(json.dumps({"elapsed": elapsed, "peak_mb": peak_memory_mb(), "output_mb": output_mb}))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--pages", type=int, default=200)
+    parser.add_argument("--size", type=int, default=100, help="page size in KB")
+    parser.add_argument("--latency-ms", type=float, default=50.0)
+    parser.add_argument("--mode", choices=["legacy", "crawler"], help=argparse.SUPPRESS)
+    parser.add_argument("--base", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.mode:
+        child(args.mode, args.base, args.pages)
+        return
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), make_handler(args.size, args.latency_ms / 1000))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base = f"http://127.0.0.1:{server.server_address[1]}"
+    print(f"{args.pages} pages of ~{args.size} KB, {args.latency_ms:.0f} ms server latency\n")
+    print(f"{'mode':<8} {'seconds':>8} {'pages/s':>8} {'peak RSS MB':>12} {'output MB':>10}")
+    for mode in ("legacy", "crawler"):
+        output = subprocess.run(
+            [sys.executable, __file__, "--mode", mode, "--base", base, "--pages", str(args.pages)],
+            capture_output=True, text=True, check=True,
+        ).stdout
+        result = json.loads(output.strip().splitlines()[-1])
+        print(f"{mode:<8} {result['elapsed']:>8.2f} {args.pages / result['elapsed']:>8.1f} "
+              f"{result['peak_mb']:>12.0f} {result['output_mb']:>10.1f}")
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
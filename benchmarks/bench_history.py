@@ -0,0 +1,64 @@
+"""Per-turn prompt size over a scripted 100-turn session: unbounded history
+vs the token-budgeted ConversationHistory.
+
+Every turn is a user request, a tool call, a tool output (every fifth one is
+a large scraped page) and a final answer, the same shape process_with_llm
+produces.
+
+Usage: python benchmarks/bench_history.py [--turns 100] [--budget 6000]
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, PROJECT_ROOT)
+
+from src.rexode_cli.core.config import Config
+from src.rexode_cli.core.history import ConversationHistory, OutputStore
+from src.rexode_cli.core.tool_manager import ToolManager
+from src.rexode_cli.llm_handler import LLMHandler
+
+
+def play_turn(history, turn):
+    history.append({"role": "user", "content": f"Scrape https://example.com/page/{turn} and tell me the headline"})
+    history.append({"role": "assistant", "content": json.dumps(
+        {"tool_calls": [{"name": "scrape_website", "parameters": {"url": f"https://example.com/page/{turn}"}}]})})
+    page_words = 6000 if turn % 5 == 0 else 300
+    history.append({"role": "tool", "content": f"Headline {turn}. " + "body text " * page_words})
+    history.append({"role": "assistant", "content": json.dumps({"response": f"The headline is 'Headline {turn}'."})})
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--turns", type=int, default=100)
+    parser.add_argument("--budget", type=int, default=Config.HISTORY_TOKEN_BUDGET)
+    args = parser.parse_args()
+
+    tool_manager = ToolManager(Config())
+    unbounded_handler, bounded_handler = LLMHandler(), LLMHandler()
+    unbounded = []
+    with tempfile.TemporaryDirectory() as directory:
+        bounded = ConversationHistory(token_budget=args.budget, max_output_tokens=Config.HISTORY_MAX_OUTPUT_TOKENS,
+                                      keep_recent=Config.HISTORY_KEEP_RECENT, store=OutputStore(directory))
+        print(f"{'turn':>4} {'unbounded KB':>13} {'bounded KB':>11} {'unbounded ms':>13} {'bounded ms':>11}")
+        for turn in range(1, args.turns + 1):
+            play_turn(unbounded, turn)
+            play_turn(bounded, turn)
+            start = time.perf_counter()
+            unbounded_prompt = unbounded_handler.get_prompt(unbounded, tool_manager.tools, tool_manager.tools_version)
+            middle = time.perf_counter()
+            bounded_prompt = bounded_handler.get_prompt(bounded, tool_manager.tools, tool_manager.tools_version)
+            end = time.perf_counter()
+            if turn == 1 or turn % 10 == 0:
+                print(f"{turn:>4} {len(unbounded_prompt.encode()) / 1024:>13.1f} {len(bounded_prompt.encode()) / 1024:>11.1f} "
+                      f"{(middle - start) * 1000:>13.2f} {(end - middle) * 1000:>11.2f}")
+        print(f"\nbounded history: {len(bounded)} entries, ~{bounded.total_tokens} tokens "
+              f"(budget {args.budget}), {len(os.listdir(directory))} outputs stored out-of-line")
+
+
+if __name__ == "__main__":
+    main()
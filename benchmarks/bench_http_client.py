@@ -0,0 +1,94 @@
+"""HTTP client benchmark against a local stand-in server.
+
+Compares, for the same sequence of GETs:
+  bare         requests.get per call (new connection every time, as before),
+  pooled       the shared HttpClient with conditional GETs off,
+  conditional  the shared HttpClient revalidating with ETag (304s).
+The server adds --handshake-ms to every new connection to stand in for the
+TCP + TLS setup a real host costs, and sends a --size KB body with an ETag at
+--mbps to stand in for a real link.
+
+Usage: python benchmarks/bench_http_client.py [--requests 200] [--size 256] [--handshake-ms 20] [--mbps 100]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, PROJECT_ROOT)
+
+from src.rexode_cli.core.http_client import HttpClient
+
+
+def make_handler(body, handshake_seconds, transfer_seconds):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def setup(self):
+            time.sleep(handshake_seconds)
+            super().setup()
+
+        def do_GET(self):
+            if self.headers.get("If-None-Match") == '"bench"':
+                self.send_response(304)
+                self.send_header("ETag", '"bench"')
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return
+            self.send_response(200)
+            self.send_header("ETag", '"bench"')
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            time.sleep(transfer_seconds)
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    return Handler
+
+
+def timed(label, fetch, url, count):
+    start = time.perf_counter()
+    received = 0
+    for _ in range(count):
+        received += len(fetch(url).content)
+    elapsed = time.perf_counter() - start
+    print(f"{label:<12} {elapsed:>8.2f} s {elapsed / count * 1000:>9.2f} ms/req {received / 1024 / 1024:>9.1f} MB body")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--size", type=int, default=256, help="response body in KB")
+    parser.add_argument("--handshake-ms", type=float, default=20.0)
+    parser.add_argument("--mbps", type=float, default=100.0)
+    args = parser.parse_args()
+
+    body = b"x" * args.size * 1024
+    handler = make_handler(body, args.handshake_ms / 1000, len(body) * 8 / (args.mbps * 1e6))
+    server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_address[1]}/page"
+
+    print(f"{args.requests} GETs of {args.size} KB at {args.mbps:.0f} Mbit/s, "
+          f"{args.handshake_ms:.0f} ms per new connection\n")
+    timed("bare", lambda u: requests.get(u, headers={"Connection": "close"}), url, args.requests)
+    pooled = HttpClient()
+    timed("pooled", lambda u: pooled.get(u, conditional=False), url, args.requests)
+    pooled.close()
+    with tempfile.TemporaryDirectory() as cache_dir:
+        conditional = HttpClient(cache_dir=cache_dir)
+        timed("conditional", conditional.get, url, args.requests)
+        conditional.close()
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
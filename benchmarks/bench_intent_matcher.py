@@ -0,0 +1,125 @@
+"""Rule-based intent detection throughput: per-pair fuzzy scoring vs IntentMatcher.
+
+Generates --inputs synthetic requests from tools.json (tool names with and
+without typos, key=value arguments, example phrasings, inputs for the
+`intents` templates and noise) and reports intents per second for:
+
+- the old path: fuzzywuzzy process.extractOne over every tool name per
+  input, plus the hand-written intent_parser regexes (needs fuzzywuzzy)
+- IntentMatcher.detect, one input at a time
+- IntentMatcher.detect_many, one rapidfuzz cdist call for the whole batch
+  (on one core and on all of them)
+
+It also prints how often the detected tool agrees with the old path.
+
+Usage: python benchmarks/bench_intent_matcher.py [--inputs 10000] [--seed 0]
+"""
+import argparse
+import os
+import random
+import re
+import sys
+import time
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, PROJECT_ROOT)
+
+from src.rexode_cli.core.config import Config
+from src.rexode_cli.core.intent_matcher import IntentMatcher
+from src.rexode_cli.core.tool_manager import ToolManager
+
+NOISE = "please can you the my now quickly and then also for me thanks".split()
+
+
+def typo(word, rng):
+    if len(word) < 4:
+        return word
+    i = rng.randrange(1, len(word) - 1)
+    return word[:i] + word[i + 1:] if rng.random() < 0.5 else word[:i] + word[i + 1] + word[i] + word[i + 2:]
+
+
+def synthetic_inputs(registry, count, seed):
+    rng = random.Random(seed)
+    names = registry.names
+    examples = [example["input"] for name in names for example in registry.get_schema(name).get("examples", [])]
+    templated = ["please open whatsapp", "launch youtube for me", "weather in Lisbon", "weather in New York"]
+    inputs = []
+    for _ in range(count):
+        kind = rng.random()
+        name = rng.choice(names)
+        params = list(registry.get_schema(name).get("parameters", {}).get("properties", {}))
+        arguments = " ".join(f"{param}={rng.choice(NOISE)}" for param in params)
+        if kind < 0.3:
+            text = f"{name} {arguments}"
+        elif kind < 0.5:
+            text = f"{typo(name, rng)} {arguments}"
+        elif kind < 0.8:
+            text = rng.choice(examples)
+        elif kind < 0.9:
+            text = rng.choice(templated)
+        else:
+            text = " ".join(rng.sample(NOISE, 4))
+        inputs.append(text)
+    return inputs
+
+
+def old_detect(text, names, fuzz, process):
+    lowered = text.lower()
+    if re.search(r"(open|launch|start).*(whatsapp)", lowered):
+        return "open_application"
+    if re.search(r"(open|launch|start).*(youtube)", lowered):
+        return "open_application"
+    best = process.extractOne(text, names, scorer=fuzz.token_set_ratio)
+    return best[0] if best and best[1] > 60 else None
+
+
+def throughput(fn, count):
+    start = time.perf_counter()
+    results = fn()
+    return count / (time.perf_counter() - start), results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--inputs", type=int, default=10000, help="synthetic inputs to classify")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    registry = ToolManager(Config()).registry
+    inputs = synthetic_inputs(registry, args.inputs, args.seed)
+    start = time.perf_counter()
+    matcher = IntentMatcher(registry, cutoff=Config.INTENT_FUZZY_CUTOFF)
+    print(f"{len(inputs)} inputs, {len(registry)} tools, {len(matcher._templates)} templates; "
+          f"matcher compiled in {(time.perf_counter() - start) * 1000:.1f} ms")
+
+    def name_of(match):
+        return match.tool_name if match else None
+
+    rows = []
+    try:
+        from fuzzywuzzy import fuzz, process
+    except ImportError:
+        old = None
+        print("fuzzywuzzy not installed, skipping the old path")
+    else:
+        rate, old = throughput(lambda: [old_detect(text, registry.names, fuzz, process) for text in inputs],
+                               len(inputs))
+        rows.append(("fuzzywuzzy extractOne", rate))
+    rate, single = throughput(lambda: [name_of(matcher.detect(text)) for text in inputs], len(inputs))
+    rows.append(("IntentMatcher.detect", rate))
+    rate, batch = throughput(lambda: [name_of(match) for match in matcher.detect_many(inputs)], len(inputs))
+    rows.append(("detect_many, 1 worker", rate))
+    rate, _ = throughput(lambda: matcher.detect_many(inputs, workers=-1), len(inputs))
+    rows.append((f"detect_many, {os.cpu_count()} workers", rate))
+
+    for label, rate in rows:
+        print(f"{label:26} {rate:12,.0f} intents/s")
+    print(f"batch agrees with single: {batch == single}")
+    if old is not None:
+        agree = sum(a == b for a, b in zip(old, single))
+        print(f"agreement with the old path: {agree / len(inputs):.2%} "
+              f"(the rest are inputs only the new tools.json templates match, or near-ties)")
+
+
+if __name__ == "__main__":
+    main()
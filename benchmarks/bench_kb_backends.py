@@ -0,0 +1,93 @@
+"""Knowledge base backends: Chroma vs the local NumPy index.
+
+Indexes tools.json with each backend, then in a fresh interpreter per
+backend measures the time to import and open the knowledge base (and to
+open it alone, since chromadb is imported when the collection is opened),
+the latency of a top-k query for a precomputed query embedding (the index
+alone, not the model) and the peak RSS. --hash-embeddings swaps
+all-MiniLM-L6-v2 for a hashing embedder so the script runs offline.
+
+Usage: python benchmarks/bench_kb_backends.py [--queries 200] [--hash-embeddings]
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+import numpy as np
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, PROJECT_ROOT)
+sys.path.insert(0, os.path.dirname(__file__))
+
+from bench_kb_sync import HashEmbedding
+from src.rexode_cli.core.config import Config
+from src.rexode_cli.core.knowledge_base import KnowledgeBase, LazySentenceTransformer
+from src.rexode_cli.core.tool_manager import ToolManager
+
+MEASURE = """
+import json, resource, statistics, sys, time
+sys.path.insert(0, {root!r})
+started = time.perf_counter()
+from src.rexode_cli.core.knowledge_base import KnowledgeBase
+imported = time.perf_counter()
+knowledge_base = KnowledgeBase(persist_directory={directory!r}, backend={backend!r})
+load = time.perf_counter() - started
+opened = time.perf_counter() - imported
+
+import numpy as np
+vector = np.load({vector!r}).tolist()
+samples = []
+for _ in range({queries}):
+    start = time.perf_counter()
+    knowledge_base.collection.query(query_embeddings=[vector], n_results=24,
+                                    include=["documents", "metadatas", "distances"])
+    samples.append(time.perf_counter() - start)
+try:
+    # VmHWM starts over at exec; ru_maxrss would include the parent's peak.
+    with open("/proc/self/status") as f:
+        rss = next(int(line.split()[1]) for line in f if line.startswith("VmHWM"))
+except OSError:
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+print(json.dumps({{"load": load, "open": opened, "query": statistics.median(samples), "rss_kb": rss,
+                  "chromadb": "chromadb" in sys.modules, "documents": knowledge_base.collection.count()}}))
+"""
+
+
+def measure(directory, backend, vector_path, queries):
+    code = MEASURE.format(root=PROJECT_ROOT, directory=directory, backend=backend,
+                          vector=vector_path, queries=queries)
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True)
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1])
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--queries", type=int, default=200, help="queries timed per backend")
+    parser.add_argument("--hash-embeddings", action="store_true", help="use a hashing embedder (offline)")
+    args = parser.parse_args()
+
+    tools = ToolManager(Config()).tools
+    embedding = HashEmbedding() if args.hash_embeddings else LazySentenceTransformer()
+
+    with tempfile.TemporaryDirectory() as directory:
+        vector_path = os.path.join(directory, "query.npy")
+        np.save(vector_path, np.asarray(embedding(["read the file notes.txt"])[0], dtype=np.float32))
+        print(f"{'backend':8} {'load':>10} {'(open)':>10} {'query':>10} {'peak RSS':>10}  documents")
+        for backend in ("chroma", "local"):
+            backend_dir = os.path.join(directory, backend)
+            KnowledgeBase(persist_directory=backend_dir, embedding_function=embedding,
+                          backend=backend).sync_tools(tools)
+            row = measure(backend_dir, backend, vector_path, args.queries)
+            # Both are in KiB on Linux.
+            print(f"{backend:8} {row['load'] * 1000:8.1f}ms {row['open'] * 1000:8.1f}ms {row['query'] * 1000:8.3f}ms "
+                  f"{row['rss_kb'] / 1024:8.1f}MB  {row['documents']}"
+                  + ("" if row["chromadb"] else "  (chromadb not imported)"))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+"""Knowledge base startup and query latency: eager vs lazy model, query cache.
+
+Builds a throwaway knowledge base from tools.json, then reports:
+
+- startup: a fresh interpreter constructing KnowledgeBase with the lazy
+  model (now the default) vs the eager SentenceTransformerEmbeddingFunction,
+  and the cost of importing sentence-transformers on its own
+- first query (loads the model with the lazy default), repeated query
+  (served from the query-embedding cache) and an uncached query
+- every tools.json example as --batch single queries vs one query_many call
+
+--hash-embeddings swaps the model for a hashing embedder so the query part
+runs offline; startup is still measured with the real classes.
+
+Usage: python benchmarks/bench_kb_query.py [--batch 32] [--hash-embeddings]
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, PROJECT_ROOT)
+sys.path.insert(0, os.path.dirname(__file__))
+
+from bench_kb_sync import HashEmbedding
+from src.rexode_cli.core.config import Config
+from src.rexode_cli.core.knowledge_base import KnowledgeBase
+from src.rexode_cli.core.tool_manager import ToolManager
+
+STARTUP = """
+import sys, time
+sys.path.insert(0, {root!r})
+started = time.perf_counter()
+from src.rexode_cli.core.knowledge_base import KnowledgeBase
+{setup}
+knowledge_base = KnowledgeBase(persist_directory={directory!r}{argument})
+print(time.perf_counter() - started, "torch" in sys.modules)
+"""
+
+
+def startup(directory, eager):
+    setup = ("from chromadb.utils import embedding_functions\n"
+             "function = embedding_functions.SentenceTransformerEmbeddingFunction(model_name='all-MiniLM-L6-v2')"
+             if eager else "")
+    code = STARTUP.format(root=PROJECT_ROOT, directory=directory, setup=setup,
+                          argument=", embedding_function=function" if eager else "")
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True)
+    if result.returncode != 0:
+        return None, result.stderr.strip().splitlines()[-1]
+    seconds, torch_loaded = result.stdout.split()
+    return float(seconds), f"torch imported: {torch_loaded}"
+
+
+def import_cost():
+    """What the lazy model keeps off startup even when the model itself is
+    not available offline."""
+    code = "import time; t = time.perf_counter(); import sentence_transformers; print(time.perf_counter() - t)"
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True)
+    return float(result.stdout) if result.returncode == 0 else None
+
+
+def timed(fn, repeat=1):
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--batch", type=int, default=32, help="queries per query_many call")
+    parser.add_argument("--hash-embeddings", action="store_true", help="use a hashing embedder (offline)")
+    args = parser.parse_args()
+
+    tools = ToolManager(Config()).tools
+    queries = [example["input"] for category in tools for tool in category["tools"]
+               for example in tool.get("examples", [])][:args.batch]
+
+    with tempfile.TemporaryDirectory() as directory:
+        embedding = HashEmbedding() if args.hash_embeddings else None
+        KnowledgeBase(persist_directory=directory, embedding_function=embedding).sync_tools(tools)
+
+        for label, eager in (("startup, lazy model", False), ("startup, eager model", True)):
+            seconds, note = startup(directory, eager)
+            print(f"{label:24} " + (f"{seconds * 1000:8.1f} ms   ({note})" if seconds is not None
+                                      else f"     n/a   ({note})"))
+
+        seconds = import_cost()
+        if seconds is not None:
+            print(f"{'import sentence_transformers':24} {seconds * 1000:8.1f} ms   (deferred by the lazy model)")
+
+        knowledge_base = KnowledgeBase(persist_directory=directory, embedding_function=embedding)
+        first = timed(lambda: knowledge_base.query_knowledge_base("read the file notes.txt"))
+        cached = timed(lambda: knowledge_base.query_knowledge_base("Read the file  notes.txt"), repeat=50)
+        knowledge_base.query_cache_size = 0
+        uncached = timed(lambda: knowledge_base.query_knowledge_base("list the files in src"), repeat=20)
+        print(f"{'first query':24} {first * 1000:8.2f} ms")
+        print(f"{'cached query':24} {cached * 1000:8.2f} ms")
+        print(f"{'uncached query':24} {uncached * 1000:8.2f} ms")
+
+        singles = timed(lambda: [knowledge_base.query_knowledge_base(query) for query in queries], repeat=3)
+        batched = timed(lambda: knowledge_base.query_many(queries), repeat=3)
+        print(f"{len(queries)} queries one by one  {singles * 1000:8.2f} ms")
+        print(f"{len(queries)} queries query_many  {batched * 1000:8.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+"""Knowledge base indexing time: per-tool add vs batched, incremental sync.
+
+Indexes tools.json into throwaway knowledge bases four ways:
+
+- add:        add_tool_documentation once per tool (the old way)
+- full sync:  sync_tools into an empty index (batched upserts)
+- changed:    sync_tools after editing the descriptions of --changed tools
+- no-op:      sync_tools with tools.json unchanged
+
+and reports wall time and documents embedded for each. --hash-embeddings
+swaps all-MiniLM-L6-v2 for a hashing embedder so the script runs offline;
+the times then show the indexing overhead only, not the model.
+
+Usage: python benchmarks/bench_kb_sync.py [--changed 3] [--batch-size 256] [--hash-embeddings]
+"""
+import argparse
+import contextlib
+import copy
+import hashlib
+import io
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+from chromadb import EmbeddingFunction
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, PROJECT_ROOT)
+
+from src.rexode_cli.core.config import Config
+from src.rexode_cli.core.knowledge_base import KnowledgeBase
+from src.rexode_cli.core.tool_manager import ToolManager
+
+
+class HashEmbedding(EmbeddingFunction):
+    """384-d bag of hashed words, normalised; counts what it embeds."""
+
+    def __init__(self):
+        self.documents = 0
+
+    def __call__(self, input):
+        self.documents += len(input)
+        vectors = []
+        for text in input:
+            vector = np.zeros(384, dtype=np.float32)
+            for word in text.lower().split():
+                vector[int(hashlib.md5(word.encode()).hexdigest(), 16) % 384] += 1.0
+            vectors.append(vector / (np.linalg.norm(vector) or 1.0))
+        return vectors
+
+
+class CountingEmbedding(EmbeddingFunction):
+    def __init__(self, inner):
+        self.inner = inner
+        self.documents = 0
+
+    def __call__(self, input):
+        self.documents += len(input)
+        return self.inner(input)
+
+
+def make_embedding(args):
+    if args.hash_embeddings:
+        return HashEmbedding()
+    from chromadb.utils import embedding_functions
+    return CountingEmbedding(embedding_functions.SentenceTransformerEmbeddingFunction(model_name="all-MiniLM-L6-v2"))
+
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return time.perf_counter() - start, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--changed", type=int, default=3, help="tools to edit before the incremental sync")
+    parser.add_argument("--batch-size", type=int, default=Config.KB_SYNC_BATCH_SIZE)
+    parser.add_argument("--hash-embeddings", action="store_true", help="use a hashing embedder (offline)")
+    args = parser.parse_args()
+
+    tools = ToolManager(Config()).tools
+    embedding = make_embedding(args)
+    embedding(["warm up the model"])
+    rows = []
+
+    with tempfile.TemporaryDirectory() as old_dir, tempfile.TemporaryDirectory() as new_dir:
+        knowledge_base = KnowledgeBase(persist_directory=old_dir, embedding_function=embedding)
+        seen = set()
+
+        def add_each():
+            for category in tools:
+                for tool in category["tools"]:
+                    if tool["name"] not in seen:
+                        seen.add(tool["name"])
+                        knowledge_base.add_tool_documentation(tool["name"], tool["description"],
+                                                              tool.get("examples", []))
+
+        embedding.documents = 0
+        with contextlib.redirect_stdout(io.StringIO()):
+            elapsed, _ = timed(add_each)
+        rows.append(("add (per tool)", elapsed, embedding.documents, len(seen)))
+
+        knowledge_base = KnowledgeBase(persist_directory=new_dir, embedding_function=embedding)
+        for label in ("full sync", "changed sync", "no-op sync"):
+            if label == "changed sync":
+                tools = copy.deepcopy(tools)
+                for tool in [tool for category in tools for tool in category["tools"]][:args.changed]:
+                    tool["description"] += " (edited)"
+            embedding.documents = 0
+            elapsed, summary = timed(lambda: knowledge_base.sync_tools(tools, batch_size=args.batch_size))
+            rows.append((label, elapsed, embedding.documents, summary["added"] + summary["updated"]))
+
+    print(f"{'':16} {'time':>9} {'documents':>10} {'tools':>6}")
+    for label, elapsed, documents, count in rows:
+        print(f"{label:16} {elapsed * 1000:7.1f}ms {documents:10d} {count:6d}")
+
+
+if __name__ == "__main__":
+    main()
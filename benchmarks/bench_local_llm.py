@@ -0,0 +1,219 @@
+"""Local LLM turns against a stand-in Ollama server: first-token latency and tokens/s.
+
+The stand-in serves /api/generate like Ollama does on one runner, with a
+simple cost model instead of a model:
+
+- loading the model takes --load-ms, again whenever the runner's options
+  (num_ctx, num_thread) change or keep_alive (default 5m) has expired
+- prompts over num_ctx tokens (default 2048) are cut to their last num_ctx
+  tokens, as Ollama does
+- prompt tokens are evaluated at --prompt-tps, except the longest common
+  prefix with the previous request, whose KV cache is reused
+- the reply streams at --gen-tps
+
+Tokens are estimated at ~4 chars each, as elsewhere in Rexode. Each
+scenario runs --turns real prompts from LLMHandler.get_prompt through
+langchain's Ollama client, the way TaskOrchestrator streams them, with a
+--idle-minutes gap (on the server's clock) before the last turn:
+
+- before: Ollama(model) with server defaults, no warmup, full catalog
+- before + shortlist: the same, with the default top-8 tool shortlist
+- fast path (<mode>): the mode profile's num_ctx/num_thread/keep_alive and
+  a warmup at startup, --think-ms before the first request; full catalog
+  if it fits (stable prefix), otherwise the shortlist
+
+Usage: python benchmarks/bench_local_llm.py [--turns 5] [--mode power] [--load-ms 1500] [--prompt-tps 2000] [--gen-tps 50]
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, PROJECT_ROOT)
+
+from src.rexode_cli.core.config import Config
+from src.rexode_cli.core.tool_manager import ToolManager
+from src.rexode_cli.core.tool_retriever import ToolRetriever
+from src.rexode_cli.core.tool_shortlist import ToolShortlister
+from src.rexode_cli.llm_handler import LLMHandler
+from src.rexode_cli.mode_manager import MODES
+
+REPLY = json.dumps({"response": "Here is what I found. The file lists three entries, the largest is "
+                                "report.pdf, and nothing changed since yesterday. Anything else?"})
+
+
+def parse_keep_alive(value):
+    if value is None:
+        return 300.0
+    if isinstance(value, (int, float)):
+        return float("inf") if value < 0 else float(value)
+    text = str(value)
+    units = {"s": 1, "m": 60, "h": 3600}
+    if text[-1] in units:
+        return float(text[:-1]) * units[text[-1]]
+    return float("inf") if float(text) < 0 else float(text)
+
+
+class StandInOllama:
+    def __init__(self, load_s, prompt_tps, gen_tps):
+        self.load_s, self.prompt_tps, self.gen_tps = load_s, prompt_tps, gen_tps
+        self.lock = threading.Lock()  # one runner: requests are served one at a time
+        self.clock_offset = 0.0
+        self.runner = None
+        self.expires = 0.0
+        self.cached = ""
+        self.stats = []
+
+    def now(self):
+        return time.monotonic() + self.clock_offset
+
+    def generate(self, body, write):
+        options = body.get("options") or {}
+        num_ctx = options.get("num_ctx") or 2048
+        runner = (body["model"], num_ctx, options.get("num_thread"))
+        with self.lock:
+            loaded = False
+            if self.runner != runner or self.now() > self.expires:
+                time.sleep(self.load_s)
+                self.runner, self.cached, loaded = runner, "", True
+            prompt = body.get("prompt") or ""
+            truncated = max(0, len(prompt) // 4 - num_ctx)
+            if truncated:
+                prompt = prompt[-num_ctx * 4:]
+            common = len(os.path.commonprefix([prompt, self.cached]))
+            evaluated = len(prompt) // 4 - common // 4
+            time.sleep(evaluated / self.prompt_tps)
+            limit = options.get("num_predict")
+            pieces = [REPLY[i:i + 4] for i in range(0, len(REPLY), 4)]
+            pieces = pieces[:limit] if limit and limit > 0 else pieces
+            for piece in pieces:
+                time.sleep(1 / self.gen_tps)
+                write({"model": body["model"], "response": piece, "done": False})
+            self.cached = prompt + "".join(pieces)
+            self.expires = self.now() + parse_keep_alive(body.get("keep_alive"))
+            self.stats.append({"loaded": loaded, "prompt_tokens": len(prompt) // 4, "evaluated": evaluated,
+                               "truncated": truncated})
+            write({"model": body["model"], "response": "", "done": True, "prompt_eval_count": evaluated,
+                   "eval_count": len(pieces)})
+
+
+def make_handler(server_state):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, *args):
+            pass
+
+        def do_POST(self):
+            body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+            if self.path == "/bench/advance":
+                server_state.clock_offset += body["seconds"]
+                self.send_response(200)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return
+            self.send_response(200)
+            self.send_header("Content-Type", "application/x-ndjson")
+            self.send_header("Transfer-Encoding", "chunked")
+            self.end_headers()
+
+            def write(message):
+                data = (json.dumps(message) + "\n").encode()
+                self.wfile.write(f"{len(data):x}\r\n".encode() + data + b"\r\n")
+                self.wfile.flush()
+
+            server_state.generate(body, write)
+            self.wfile.write(b"0\r\n\r\n")
+
+    return Handler
+
+
+async def stream_turn(llm, prompt):
+    start = time.perf_counter()
+    first = None
+    chunks = []
+    async for chunk in llm.astream(prompt):
+        if chunk and first is None:
+            first = time.perf_counter()
+        chunks.append(chunk)
+    end = time.perf_counter()
+    return first - start, (len(chunks) - 1) / (end - first) if end > first else 0.0, "".join(chunks)
+
+
+def run_scenario(label, server_state, base_url, tools, tools_version, requests, args, options=None,
+                 warmup=False, shortlister=None, stable_prefix=False):
+    import requests as http
+
+    handler = LLMHandler()
+    server_state.runner, server_state.cached, server_state.stats = None, "", []
+    llm = handler.initialize_llm("local", model_name="stand-in", base_url=base_url, options=options)
+    if warmup:
+        handler.warm_up(llm, handler.get_static_prefix(tools, tools_version) if stable_prefix else "")
+        time.sleep(args.think_ms / 1000)
+    history, rows = [], []
+    for turn, request in enumerate(requests):
+        if turn == len(requests) - 1 and args.idle_minutes:
+            http.post(f"{base_url}/bench/advance", json={"seconds": args.idle_minutes * 60})
+        history.append({"role": "user", "content": request})
+        tool_names = None if stable_prefix or shortlister is None else shortlister.shortlist(request)
+        prompt = handler.get_prompt(history, tools, tools_version, tool_names)
+        ttft, rate, reply = asyncio.run(stream_turn(llm, prompt))
+        history.append({"role": "assistant", "content": reply})
+        rows.append((ttft, rate, server_state.stats[-1]))
+    print(f"\n{label}")
+    print(f"  {'turn':>4} {'first token':>12} {'tokens/s':>9} {'prompt tok':>10} {'evaluated':>9} {'dropped':>8}  model load")
+    for turn, (ttft, rate, stats) in enumerate(rows, 1):
+        note = "idle " + f"{args.idle_minutes}m, " if turn == len(rows) and args.idle_minutes else ""
+        print(f"  {turn:4} {ttft * 1000:10.0f}ms {rate:9.1f} {stats['prompt_tokens']:10} {stats['evaluated']:9} "
+              f"{stats['truncated']:8}  {note}{'yes' if stats['loaded'] else 'no'}")
+    mean = sum(ttft for ttft, _, _ in rows) / len(rows)
+    print(f"  mean first-token latency {mean * 1000:.0f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--turns", type=int, default=5)
+    parser.add_argument("--mode", default="power", choices=list(MODES), help="profile used by the fast path")
+    parser.add_argument("--load-ms", type=float, default=1500, help="stand-in model load time")
+    parser.add_argument("--prompt-tps", type=float, default=2000, help="stand-in prompt evaluation, tokens/s")
+    parser.add_argument("--gen-tps", type=float, default=50, help="stand-in generation, tokens/s")
+    parser.add_argument("--think-ms", type=float, default=3000, help="time between startup and the first request")
+    parser.add_argument("--idle-minutes", type=float, default=10, help="server-clock gap before the last turn")
+    args = parser.parse_args()
+
+    server_state = StandInOllama(args.load_ms / 1000, args.prompt_tps, args.gen_tps)
+    server = ThreadingHTTPServer(("127.0.0.1", 0), make_handler(server_state))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_url = f"http://127.0.0.1:{server.server_address[1]}"
+
+    config = Config()
+    tool_manager = ToolManager(config)
+    registry = tool_manager.registry
+    requests = [example["input"] for name in registry.names
+                for example in registry.get_schema(name).get("examples", [])][::9][:args.turns]
+    shortlister = ToolShortlister(registry, k=config.TOOL_SHORTLIST_K, min_score=config.TOOL_SHORTLIST_MIN_SCORE,
+                                  retriever=ToolRetriever(registry, semantic_weight=0.0))
+    tools, version = tool_manager.tools, tool_manager.tools_version
+    profile = MODES[args.mode]["local_llm"]
+    stable = LLMHandler().prefix_fits(tools, profile["num_ctx"], config.HISTORY_TOKEN_BUDGET
+                                      + config.LOCAL_LLM_REPLY_TOKENS, version)
+    print(f"{len(requests)} turns; full-catalog prefix ~{len(LLMHandler().get_static_prefix(tools, version)) // 4} "
+          f"tokens; '{args.mode}' profile {profile}, stable prefix: {stable}")
+
+    run_scenario("before: default options, no warmup, full catalog", server_state, base_url, tools, version,
+                 requests, args)
+    run_scenario("before + shortlist (top-8 tools per request)", server_state, base_url, tools, version,
+                 requests, args, shortlister=shortlister)
+    run_scenario(f"fast path ({args.mode}): profile options, warmup, {'stable prefix' if stable else 'shortlist'}",
+                 server_state, base_url, tools, version, requests, args, options=profile, warmup=True,
+                 shortlister=shortlister, stable_prefix=stable)
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""Rule-based parameter extraction: per-parameter regex scans vs one-pass parser.
+
+Builds synthetic tools with --sizes parameters each and an input that sets
+every parameter (a mix of plain, quoted and JSON values), then times the
+old TaskOrchestrator._extract_parameters (one regex search per parameter,
+then one per other parameter to find where the value ends: O(p^2) scans)
+against param_parser.extract_parameters (one pass over the input).
+
+Usage: python benchmarks/bench_param_extraction.py [--sizes 2,8,32,128] [--repeat 200]
+"""
+import argparse
+import os
+import re
+import sys
+import time
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, PROJECT_ROOT)
+
+from src.rexode_cli.core.param_parser import extract_parameters
+
+
+def old_extract_parameters(user_input, tool_info):
+    parameters = {}
+    missing_params = []
+    if 'properties' in tool_info['parameters']:
+        for param_name, param_details in tool_info['parameters']['properties'].items():
+            match = re.search(rf'{param_name}=', user_input, re.IGNORECASE)
+            if match:
+                value_str = user_input[match.end():].strip()
+                end_index = len(value_str)
+                for other_param_name in tool_info['parameters']['properties']:
+                    if other_param_name != param_name:
+                        other_match = re.search(rf'{other_param_name}=', value_str, re.IGNORECASE)
+                        if other_match and other_match.start() < end_index:
+                            end_index = other_match.start()
+                value = value_str[:end_index].strip()
+                if (value.startswith('"') and value.endswith('"')) or \
+                   (value.startswith("'") and value.endswith("'")):
+                    value = value[1:-1]
+                parameters[param_name] = value
+            elif param_name in tool_info['parameters'].get('required', []):
+                missing_params.append(param_name)
+    return parameters, missing_params
+
+
+def synthetic_tool(size):
+    kinds = ["string", "integer", "array", "string"]
+    properties = {f"param_{i}": {"type": kinds[i % len(kinds)]} for i in range(size)}
+    values = []
+    for i, (name, schema) in enumerate(properties.items()):
+        if schema["type"] == "integer":
+            values.append(f"{name}={i}")
+        elif schema["type"] == "array":
+            values.append(f"{name}=[{i}, {i + 1}]")
+        elif i % 8 == 0:
+            values.append(f"{name}='a quoted value {i}'")
+        else:
+            values.append(f"{name}=value{i} with words")
+    tool = {"name": f"tool_{size}", "parameters": {"type": "object", "properties": properties,
+                                                   "required": list(properties)}}
+    return tool, f"tool_{size} " + " ".join(values)
+
+
+def timed(fn, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) / repeat
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", default="2,8,32,128", help="comma-separated parameter counts")
+    parser.add_argument("--repeat", type=int, default=200, help="calls timed per size")
+    args = parser.parse_args()
+
+    print(f"{'params':>6} {'input':>8} {'old':>12} {'one-pass':>12} {'speedup':>8}")
+    for size in (int(part) for part in args.sizes.split(",")):
+        tool, text = synthetic_tool(size)
+        old = timed(lambda: old_extract_parameters(text, tool), args.repeat)
+        new = timed(lambda: extract_parameters(text, tool["parameters"]), args.repeat)
+        print(f"{size:6} {len(text):7}B {old * 1e6:10.1f}us {new * 1e6:10.1f}us {old / new:7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""Prompt build benchmark: legacy get_prompt vs cached prefix + incremental history.
+
+Replays a scripted 20-turn session. Each turn adds a user message, a tool
+call, a tool output and a final answer, and builds the prompt twice (before
+the tool call and after the tool output), like process_with_llm does.
+
+Usage: python benchmarks/bench_prompt_build.py [--turns 20]
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, PROJECT_ROOT)
+
+from src.rexode_cli.core.config import Config
+from src.rexode_cli.core.tool_manager import ToolManager
+from src.rexode_cli.llm_handler import LLMHandler
+
+
+def legacy_get_prompt(chat_history, tools):
+    # The pre-cache implementation: indented catalog and += history every turn.
+    history_str = ""
+    for entry in chat_history:
+        if entry["role"] == "user":
+            history_str += f"User: {entry['content']}\n"
+        elif entry["role"] == "assistant":
+            history_str += f"Assistant: {entry['content']}\n"
+        elif entry["role"] == "tool":
+            history_str += f"Tool Output: {entry['content']}\n"
+    return f"""You are Rexode, a helpful and powerful AI assistant. You have access to the following tools:
+
+{json.dumps(tools, indent=2)}
+
+**Chat History:**
+{history_str}
+
+**User's Current Request:** {chat_history[-1]['content']}
+
+**Your Response (JSON):**
+"""
+
+
+def timed(fn, *args):
+    start = time.perf_counter()
+    result = fn(*args)
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--turns", type=int, default=20)
+    args = parser.parse_args()
+
+    tool_manager = ToolManager(Config())
+    tools, version = tool_manager.tools, tool_manager.tools_version
+    handler = LLMHandler()
+    history = []
+
+    print(f"{'turn':>4} {'legacy KB':>10} {'cached KB':>10} {'legacy ms':>10} {'cached ms':>10}   (mean per prompt build)")
+    totals = [0, 0, 0.0, 0.0]
+    for turn in range(1, args.turns + 1):
+        history.append({"role": "user", "content": f"Read the file notes_{turn}.txt and summarize it"})
+        legacy_bytes = cached_bytes = 0
+        legacy_time = cached_time = 0.0
+        for step in range(2):
+            legacy, lt = timed(legacy_get_prompt, history, tools)
+            cached, ct = timed(handler.get_prompt, history, tools, version)
+            legacy_bytes += len(legacy.encode())
+            cached_bytes += len(cached.encode())
+            legacy_time += lt
+            cached_time += ct
+            if step == 0:
+                history.append({"role": "assistant", "content": json.dumps(
+                    {"tool_calls": [{"name": "read_file", "parameters": {"file_path": f"notes_{turn}.txt"}}]})})
+                history.append({"role": "tool", "content": "lorem ipsum dolor sit amet " * 60})
+        history.append({"role": "assistant", "content": json.dumps({"response": f"Summary of notes_{turn}.txt"})})
+        for i, value in enumerate((legacy_bytes, cached_bytes, legacy_time, cached_time)):
+            totals[i] += value
+        print(f"{turn:>4} {legacy_bytes / 2048:>10.1f} {cached_bytes / 2048:>10.1f} "
+              f"{legacy_time * 500:>10.3f} {cached_time * 500:>10.3f}")
+
+    builds = args.turns * 2
+    print(f"\nper build: legacy {totals[0] / builds / 1024:.1f} KB / {totals[2] / builds * 1000:.3f} ms, "
+          f"cached {totals[1] / builds / 1024:.1f} KB / {totals[3] / builds * 1000:.3f} ms")
+    print(f"static prefix: {len(handler.get_static_prefix(tools, version).encode()) / 1024:.1f} KB (identical every turn)")
+
+
+if __name__ == "__main__":
+    main()
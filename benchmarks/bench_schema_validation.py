@@ -0,0 +1,144 @@
+"""Tool call validation throughput: schema walker vs compiled validators.
+
+Generates --calls synthetic tool calls from tools.json (mostly valid, some
+with values as strings the way LLMs send them, some invalid) and reports
+validations per second for:
+
+- a walker that interprets each tool's schema on every call, with the same
+  coercion rules as CompiledValidator
+- jsonschema's Draft7Validator, built once per tool (checks only, no
+  coercion; skipped if jsonschema is not installed)
+- CompiledValidator, the code-generated validators ToolRegistry builds
+
+Usage: python benchmarks/bench_schema_validation.py [--calls 20000] [--seed 0]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, PROJECT_ROOT)
+
+from src.rexode_cli.core.config import Config
+from src.rexode_cli.core.schema_validator import _COERCERS, _FAST_CHECKS, _INVALID
+from src.rexode_cli.core.tool_manager import ToolManager
+
+_PYTHON_CHECKS = {name: eval(f"lambda v: {check}") for name, check in _FAST_CHECKS.items()}
+
+
+def walk(schema, value, path, errors):
+    types = schema.get("type")
+    types = [types] if isinstance(types, str) else list(types or [])
+    if types and not any(_PYTHON_CHECKS[name](value) for name in types):
+        for name in types:
+            converted = _COERCERS[name](value)
+            if converted is not _INVALID:
+                value = converted
+                break
+        else:
+            errors.append({"parameter": path, "error": "type"})
+            return _INVALID
+    if "enum" in schema and value not in schema["enum"]:
+        errors.append({"parameter": path, "error": "enum"})
+        return _INVALID
+    if isinstance(value, list) and schema.get("items"):
+        value = [walk(schema["items"], item, f"{path}[{i}]", errors) for i, item in enumerate(value)]
+        if _INVALID in value:
+            return _INVALID
+    return value
+
+
+def walker_validate(schema, parameters):
+    properties, errors, out = schema.get("properties", {}), [], {}
+    for name, value in parameters.items():
+        if name not in properties:
+            errors.append({"parameter": name, "error": "unknown"})
+            continue
+        value = walk(properties[name], value, name, errors)
+        if value is not _INVALID:
+            out[name] = value
+    for name in schema.get("required", []):
+        if name not in parameters:
+            errors.append({"parameter": name, "error": "required"})
+    return out, errors
+
+
+def sample_value(schema, rng, as_string):
+    if "enum" in schema:
+        return rng.choice(schema["enum"])
+    kind = schema.get("type", "string")
+    if kind == "integer":
+        number = rng.randrange(1, 100)
+        return str(number) if as_string else number
+    if kind == "array":
+        items = [sample_value(schema.get("items", {}), rng, False) for _ in range(rng.randrange(1, 4))]
+        return ", ".join(map(str, items)) if as_string else items
+    return rng.choice(["notes.txt", "https://example.com", "hello world", "main"])
+
+
+def synthetic_calls(registry, count, seed):
+    rng = random.Random(seed)
+    names = [name for name in registry.names if registry.get_schema(name).get("parameters", {}).get("properties")]
+    calls = []
+    for _ in range(count):
+        name = rng.choice(names)
+        schema = registry.get_schema(name)["parameters"]
+        kind = rng.random()
+        parameters = {param: sample_value(details, rng, kind > 0.7)
+                      for param, details in schema["properties"].items()
+                      if param in schema.get("required", []) or rng.random() < 0.5}
+        if kind > 0.9:
+            parameters["unexpected"] = 1
+            parameters.pop(next(iter(schema.get("required", [])), None), None)
+        calls.append((name, parameters))
+    return calls
+
+
+def throughput(fn, calls, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for name, parameters in calls:
+            fn(name, parameters)
+    return len(calls) * repeat / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--calls", type=int, default=20000, help="synthetic tool calls to validate")
+    parser.add_argument("--repeat", type=int, default=3, help="passes over the calls")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    registry = ToolManager(Config()).registry
+    calls = synthetic_calls(registry, args.calls, args.seed)
+    start = time.perf_counter()
+    validators = {name: registry.validator(name) for name in registry.names}
+    print(f"{len(calls)} calls over {len(registry)} tools; "
+          f"validators compiled in {(time.perf_counter() - start) * 1000:.1f} ms")
+
+    schemas = {name: registry.get_schema(name).get("parameters", {}) for name in registry.names}
+    rows = [("schema walker", throughput(lambda name, p: walker_validate(schemas[name], p), calls, args.repeat))]
+    try:
+        from jsonschema import Draft7Validator
+    except ImportError:
+        print("jsonschema not installed, skipping it")
+    else:
+        draft7 = {name: Draft7Validator(schema) for name, schema in schemas.items()}
+        rows.append(("jsonschema Draft7 (no coercion)",
+                     throughput(lambda name, p: list(draft7[name].iter_errors(p)), calls, args.repeat)))
+    rows.append(("CompiledValidator", throughput(lambda name, p: validators[name](p), calls, args.repeat)))
+
+    for label, rate in rows:
+        print(f"{label:32} {rate:12,.0f} validations/s")
+    walked = [walker_validate(schemas[name], p) for name, p in calls]
+    compiled = [validators[name](p) for name, p in calls]
+    agree = sum(a[0] == b[0] and {e["parameter"] for e in a[1]} == {e["parameter"] for e in b[1]}
+                for a, b in zip(walked, compiled))
+    invalid = sum(bool(errors) for _, errors in compiled)
+    print(f"{invalid / len(calls):.1%} of calls invalid; walker and compiled agree on {agree / len(calls):.2%}")
+
+
+if __name__ == "__main__":
+    main()
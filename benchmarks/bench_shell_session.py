@@ -0,0 +1,88 @@
+"""Time to run 50 small sequential shell commands: one process per command
+(subprocess.run with shell=True, and the streaming run_command) vs the
+persistent ShellSession.
+
+The commands are the kind a multi-step plan produces: cd, ls, cat, echo,
+grep, one after another.
+
+Usage: python benchmarks/bench_shell_session.py [--commands 50] [--repeat 3]
+"""
+import argparse
+import asyncio
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, PROJECT_ROOT)
+
+from src.rexode_cli.core.process_runner import run_command
+from src.rexode_cli.core.shell_session import ShellSession
+
+STEPS = ["echo step {i}", "ls", "cat notes.txt", "grep -c line notes.txt", "pwd"]
+
+
+def commands(directory, count):
+    # Every command names the directory, so the one-shot runners (which
+    # cannot keep a `cd`) do the same work as the session.
+    return [f"cd {directory} && " + STEPS[i % len(STEPS)].format(i=i) for i in range(count)]
+
+
+def run_subprocess(batch):
+    for command in batch:
+        subprocess.run(command, shell=True, capture_output=True, text=True)
+
+
+def run_async(batch):
+    async def run_all():
+        for command in batch:
+            await run_command(command)
+    asyncio.run(run_all())
+
+
+def run_session(batch):
+    session = ShellSession()
+    try:
+        for command in batch:
+            session.run(command)
+    finally:
+        session.close()
+
+
+def best_of(repeat, function, batch):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function(batch)
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--commands", type=int, default=50)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    if not ShellSession.supported():
+        sys.exit("The persistent shell session needs a POSIX shell.")
+
+    with tempfile.TemporaryDirectory() as directory:
+        with open(os.path.join(directory, "notes.txt"), "w") as f:
+            f.write("line\n" * 100)
+        batch = commands(directory, args.commands)
+        print(f"{args.commands} sequential commands, best of {args.repeat}\n")
+        print(f"{'runner':<28} {'total ms':>9} {'per command ms':>15}")
+        results = {}
+        for name, function in (("subprocess.run(shell=True)", run_subprocess),
+                               ("run_command (new process)", run_async),
+                               ("ShellSession (persistent)", run_session)):
+            results[name] = best_of(args.repeat, function, batch)
+            print(f"{name:<28} {results[name] * 1000:>9.1f} {results[name] * 1000 / args.commands:>15.2f}")
+        baseline = results["subprocess.run(shell=True)"]
+        print(f"\nspeedup of the persistent session: {baseline / results['ShellSession (persistent)']:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
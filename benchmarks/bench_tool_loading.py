@@ -0,0 +1,62 @@
+"""Startup benchmark: eager vs lazy tool loading in ToolManager.
+
+Each mode runs in a fresh interpreter so import caches do not leak between
+runs. The child builds a ToolManager, calls `read_file` once (the common
+"small session" case) and reports wall time, peak RSS and module count.
+
+Usage: python benchmarks/bench_tool_loading.py [--runs 5]
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+CHILD = r"""
+import json, os, resource, sys, time
+t0 = time.perf_counter()
+sys.path.insert(0, {root!r})
+from src.rexode_cli.core.config import Config
+from src.rexode_cli.core.tool_manager import ToolManager
+tm = ToolManager(Config(), lazy={lazy})
+t1 = time.perf_counter()
+read_file = tm.get_tool("read_file")
+read_file(os.path.join({root!r}, "README.md"))
+t2 = time.perf_counter()
+rss_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+print(json.dumps({{"startup": t1 - t0, "first_call": t2 - t1, "rss_kb": rss_kb,
+                   "modules": len(sys.modules), "tools": len(tm.tool_functions)}}))
+"""
+
+
+def run_once(lazy):
+    code = CHILD.format(root=PROJECT_ROOT, lazy=lazy)
+    out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, cwd=PROJECT_ROOT)
+    if out.returncode != 0:
+        raise RuntimeError(out.stderr)
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{'mode':<6} {'startup ms':>11} {'read_file ms':>13} {'peak RSS MB':>12} {'modules':>8} {'tools':>6}")
+    for label, lazy in (("eager", False), ("lazy", True)):
+        samples = [run_once(lazy) for _ in range(args.runs)]
+        print(
+            f"{label:<6} "
+            f"{statistics.median(s['startup'] for s in samples) * 1000:>11.1f} "
+            f"{statistics.median(s['first_call'] for s in samples) * 1000:>13.2f} "
+            f"{statistics.median(s['rss_kb'] for s in samples) / 1024:>12.1f} "
+            f"{samples[-1]['modules']:>8} "
+            f"{samples[-1]['tools']:>6}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""Tool retrieval accuracy and latency: BM25, embeddings and the hybrid.
+
+Every `examples[].input` in tools.json is a labeled query whose answer is
+the tool it belongs to. For each retrieval mode this reports top-1 and
+top-5 accuracy and the median and p95 time per query. Examples are part of
+what is indexed, so --no-examples rebuilds both indexes without them to see
+how retrieval does on phrasings it has never seen. --hash-embeddings swaps
+all-MiniLM-L6-v2 for a hashing embedder so the script runs offline (the
+semantic numbers are then meaningless, the timings are not).
+
+Usage: python benchmarks/bench_tool_retrieval.py [--no-examples] [--hash-embeddings] [--backend local]
+"""
+import argparse
+import copy
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, PROJECT_ROOT)
+sys.path.insert(0, os.path.dirname(__file__))
+
+from bench_kb_sync import HashEmbedding
+from src.rexode_cli.core.config import Config
+from src.rexode_cli.core.knowledge_base import KnowledgeBase
+from src.rexode_cli.core.tool_manager import ToolManager
+from src.rexode_cli.core.tool_registry import ToolRegistry
+from src.rexode_cli.core.tool_retriever import ToolRetriever
+
+
+def labeled_queries(tools):
+    seen = set()
+    for category in tools:
+        for tool in category["tools"]:
+            if tool["name"] in seen:
+                continue
+            seen.add(tool["name"])
+            for example in tool.get("examples", []):
+                yield example["input"], tool["name"]
+
+
+def evaluate(rank, queries):
+    hits_1 = hits_5 = 0
+    samples = []
+    for query, expected in queries:
+        start = time.perf_counter()
+        names = [name for name, _ in rank(query)]
+        samples.append(time.perf_counter() - start)
+        hits_1 += names[:1] == [expected]
+        hits_5 += expected in names[:5]
+    samples.sort()
+    return hits_1 / len(queries), hits_5 / len(queries), statistics.median(samples), \
+        samples[int(0.95 * (len(samples) - 1))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--no-examples", action="store_true", help="index tools without their examples")
+    parser.add_argument("--hash-embeddings", action="store_true", help="use a hashing embedder (offline)")
+    parser.add_argument("--backend", default=Config.KB_BACKEND, choices=("chroma", "local"))
+    parser.add_argument("--semantic-weight", type=float, default=Config.TOOL_RETRIEVAL_SEMANTIC_WEIGHT)
+    args = parser.parse_args()
+
+    tools = ToolManager(Config()).tools
+    queries = list(labeled_queries(tools))
+    indexed = copy.deepcopy(tools)
+    if args.no_examples:
+        for category in indexed:
+            for tool in category["tools"]:
+                tool["examples"] = []
+    registry = ToolRegistry(indexed)
+
+    with tempfile.TemporaryDirectory() as directory:
+        knowledge_base = KnowledgeBase(persist_directory=directory, backend=args.backend,
+                                       embedding_function=HashEmbedding() if args.hash_embeddings else None)
+        knowledge_base.sync_tools(indexed)
+
+        start = time.perf_counter()
+        retriever = ToolRetriever(registry, knowledge_base_factory=lambda: knowledge_base,
+                                  semantic_weight=args.semantic_weight, include_examples=not args.no_examples)
+        build = time.perf_counter() - start
+        # Loads the model outside the timed queries.
+        retriever.semantic("warm up")
+
+        modes = {
+            "bm25": lambda query: retriever.rank(query, k=5, semantic=False),
+            "embedding": lambda query: retriever.semantic(query, k=5)[:5],
+            "hybrid": lambda query: retriever.rank(query, k=5),
+        }
+        print(f"{len(queries)} labeled queries, {len(registry)} tools"
+              f"{', examples not indexed' if args.no_examples else ''}; BM25 index built in {build * 1000:.1f} ms")
+        print(f"{'mode':10} {'top-1':>7} {'top-5':>7} {'median':>10} {'p95':>10}")
+        for mode, rank in modes.items():
+            if mode == "hybrid":
+                # The embedding of each query is cached by now; time it cold.
+                knowledge_base._query_cache.clear()
+            top_1, top_5, median, p95 = evaluate(rank, queries)
+            print(f"{mode:10} {top_1:7.1%} {top_5:7.1%} {median * 1000:8.3f}ms {p95 * 1000:8.3f}ms")
+
+
+if __name__ == "__main__":
+    main()
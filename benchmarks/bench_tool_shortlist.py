@@ -0,0 +1,95 @@
+"""Prompt size and latency with and without knowledge-base tool shortlisting.
+
+Indexes tools.json into a throwaway knowledge base, then replays every
+`examples[].input` from tools.json as a request. For each one it reports the
+prompt size with the full catalog vs the shortlist, the shortlist lookup time
+and whether the expected tool made the shortlist. With --ollama-model it also
+times one end-to-end LLM call per request against a local Ollama server.
+
+Usage: python benchmarks/bench_tool_shortlist.py [--k 8] [--ollama-model llama3]
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, PROJECT_ROOT)
+
+from src.rexode_cli.core.config import Config
+from src.rexode_cli.core.knowledge_base import KnowledgeBase
+from src.rexode_cli.core.tool_manager import ToolManager
+from src.rexode_cli.core.tool_shortlist import ToolShortlister
+from src.rexode_cli.llm_handler import LLMHandler
+
+
+def labeled_queries(tools):
+    for category in tools:
+        for tool in category["tools"]:
+            for example in tool.get("examples", []):
+                yield example["input"], tool["name"]
+
+
+async def time_llm(llm, prompt):
+    start = time.perf_counter()
+    await llm.ainvoke(prompt)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--k", type=int, default=Config.TOOL_SHORTLIST_K)
+    parser.add_argument("--min-score", type=float, default=Config.TOOL_SHORTLIST_MIN_SCORE)
+    parser.add_argument("--ollama-model", help="also time end-to-end calls against this local Ollama model")
+    args = parser.parse_args()
+
+    tool_manager = ToolManager(Config())
+    handler = LLMHandler()
+    llm = handler.initialize_llm("local", model_name=args.ollama_model) if args.ollama_model else None
+
+    with tempfile.TemporaryDirectory() as persist_directory:
+        knowledge_base = KnowledgeBase(persist_directory=persist_directory)
+        for category in tool_manager.tools:
+            for tool in category["tools"]:
+                if tool["name"] in tool_manager.registry.tools_in_category(category["category"]):
+                    knowledge_base.add_tool_documentation(tool["name"], tool["description"], tool.get("examples", []))
+        shortlister = ToolShortlister(tool_manager.registry, knowledge_base_factory=lambda: knowledge_base,
+                                      k=args.k, min_score=args.min_score)
+
+        rows = []
+        for query, expected in labeled_queries(tool_manager.tools):
+            history = [{"role": "user", "content": query}]
+            full_prompt = handler.get_prompt(history, tool_manager.tools, tool_manager.tools_version)
+            start = time.perf_counter()
+            names = shortlister.shortlist(query)
+            lookup = time.perf_counter() - start
+            short_prompt = handler.get_prompt(history, tool_manager.tools, tool_manager.tools_version, names)
+            row = {
+                "full": len(full_prompt.encode()),
+                "short": len(short_prompt.encode()),
+                "lookup": lookup,
+                "fallback": names is None,
+                "hit": names is None or expected in names,
+            }
+            if llm is not None:
+                row["llm_full"] = asyncio.run(time_llm(llm, full_prompt))
+                row["llm_short"] = asyncio.run(time_llm(llm, short_prompt))
+            rows.append(row)
+
+    n = len(rows)
+    print(f"requests: {n}  (k={args.k}, min_score={args.min_score})")
+    print(f"prompt size  full: {statistics.mean(r['full'] for r in rows) / 1024:.1f} KB   "
+          f"shortlisted: {statistics.mean(r['short'] for r in rows) / 1024:.1f} KB")
+    print(f"shortlist lookup: median {statistics.median(r['lookup'] for r in rows) * 1000:.2f} ms")
+    print(f"expected tool kept: {sum(r['hit'] for r in rows) / n:.1%}   "
+          f"full-catalog fallbacks: {sum(r['fallback'] for r in rows)}")
+    if llm is not None:
+        print(f"end-to-end LLM latency  full: {statistics.median(r['llm_full'] for r in rows):.2f} s   "
+              f"shortlisted: {statistics.median(r['llm_short'] + r['lookup'] for r in rows):.2f} s")
+
+
+if __name__ == "__main__":
+    main()
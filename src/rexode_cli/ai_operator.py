@@ -1,14 +1,23 @@
+import asyncio
+import re
 import subprocess
 import pyautogui
 import time
 import webbrowser
-from .tools import tool_registry
+from .core.config import Config
+from .core.tool_manager import ToolManager
+from .core.task_orchestrator import TaskOrchestrator
+from .core.tool_executor import call_tool
+from .core.param_parser import extract_parameters
+from .core.schema_validator import format_validation_errors
+from .core.security import request_confirmation
 from .utils import speak_text
 
 class AIOperator:
-    def __init__(self, model):
+    def __init__(self, model, tool_manager: ToolManager = None):
         self.model = model  # Gemini/LLM client
         self.memory = []    # short-term memory of tasks
+        self.tool_manager = tool_manager or ToolManager(Config())
 
     async def run(self, task: str):
         """
@@ -83,32 +92,34 @@ class AIOperator:
     async def _run_tool(self, task: str):
         """
         Match the user request to one of Rexode’s registered tools.
+        Parameters are read from the task as key=value pairs and checked
+        against the tool's schema; sensitive tools ask for confirmation
+        first, as they do in the orchestrator.
         """
-        for name, tool_fn in tool_registry.items():
-            if name.lower() in task.lower():
-                speak_text(f"Using Rexode tool: {name}")
-                # Assuming tool_fn might be async or sync
-                if asyncio.iscoroutinefunction(tool_fn):
-                    return await tool_fn(task)
-                else:
-                    return tool_fn(task)
+        registry = self.tool_manager.registry
+        # Tool names are single \w+ tokens, so each word is one dict lookup.
+        for word in re.findall(r"\w+", task.lower()):
+            tool_fn = registry.get_callable(word)
+            if tool_fn:
+                schema = registry.get_schema(word).get("parameters", {})
+                parameters, _ = extract_parameters(task, schema)
+                validator = registry.validator(word)
+                parameters, errors = validator(parameters)
+                if errors:
+                    return format_validation_errors(word, errors, validator)
+                if registry.is_sensitive(word):
+                    if not request_confirmation(f"execute the '{word}' tool with parameters: {parameters}"):
+                        return "Action cancelled by user."
+                speak_text(f"Using Rexode tool: {word}")
+                return await call_tool(tool_fn, parameters)
         return "No matching tool found."
 
     async def _run_project(self, task: str):
         """
         For large 'make me a project' tasks.
-        AI generates full solution plan and executes step by step.
+        The LLM plans the work as a graph of tool calls; independent steps
+        run in parallel and failed branches are re-planned.
         """
         speak_text("Starting autonomous project builder")
-        plan_prompt = f"""
-        User requested: {task}.
-        Break it into clear executable steps:
-        1. Gather requirements
-        2. Search solutions
-        3. Generate code
-        4. Save to files
-        5. Run & debug
-        6. Report result
-        """
-        steps = (await self.model.ainvoke(plan_prompt)).content
-        return f"Project plan ready:\n{steps}"
+        orchestrator = TaskOrchestrator(self.tool_manager, llm=self.model)
+        return await orchestrator.process_with_plan(task)
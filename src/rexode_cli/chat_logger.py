@@ -1,36 +1,226 @@
 # chat_logger.py
 
+import atexit
+import glob
 import json
 import os
+import re
+import threading
+import time
 from datetime import datetime
+from typing import Dict, Iterator, Optional
 
-CHAT_LOG_FOLDER = "chat_history"
+from .core.config import Config
+from .core.logging import log_action
 
-def ensure_log_folder():
-    if not os.path.exists(CHAT_LOG_FOLDER):
-        os.makedirs(CHAT_LOG_FOLDER)
+CHAT_LOG_FOLDER = Config.CHAT_LOG_FOLDER
 
-def get_today_log_path():
+FSYNC_POLICIES = ("always", "interval", "never")
+
+# rexode_chat_2024-05-01.jsonl (current) and rexode_chat_2024-05-01.3.jsonl (rotated).
+_JOURNAL_NAME = re.compile(r"^rexode_chat_(\d{4}-\d{2}-\d{2})(?:\.(\d+))?\.jsonl$")
+# Array logs written by older versions of chat_logger and utils.log_chat.
+_LEGACY_NAME = re.compile(r"^(?:rexode_chat_)?(\d{4}-\d{2}-\d{2})\.json$")
+
+
+def ensure_log_folder(folder: str = None):
+    os.makedirs(folder or CHAT_LOG_FOLDER, exist_ok=True)
+
+
+def get_today_log_path(folder: str = None):
     today = datetime.now().strftime("%Y-%m-%d")
-    return os.path.join(CHAT_LOG_FOLDER, f"rexode_chat_{today}.json")
+    return os.path.join(folder or CHAT_LOG_FOLDER, f"rexode_chat_{today}.jsonl")
+
+
+class ChatJournal:
+    """Append-only JSONL chat log, one file per day.
+
+    Each entry is one line, so appending costs the same at the first and the
+    thousandth turn. Lines go through a buffered file handle that stays open;
+    `fsync` decides when they reach the disk:
+      "always"   flush and fsync after every entry,
+      "interval" flush after every entry, so a crash of the process loses
+                 nothing; fsync at most every `fsync_interval` seconds,
+      "never"    leave it to the OS; flushed on close.
+    When the day's file would grow past `max_bytes` it is renamed to
+    `rexode_chat_<date>.<n>.jsonl` and a fresh one is started.
+    """
+
+    def __init__(self, folder: str = None, fsync: str = "interval", fsync_interval: float = 1.0,
+                 max_bytes: int = 5 * 1024 * 1024):
+        if fsync not in FSYNC_POLICIES:
+            raise ValueError(f"Unknown fsync policy '{fsync}', expected one of {FSYNC_POLICIES}")
+        self.folder = folder or CHAT_LOG_FOLDER
+        self.fsync = fsync
+        self.fsync_interval = fsync_interval
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._file = None
+        self._path = None
+        self._size = 0
+        self._last_sync = 0.0
+
+    def append(self, entry: Dict) -> None:
+        line = json.dumps(entry, ensure_ascii=False) + "\n"
+        data = line.encode("utf-8")
+        with self._lock:
+            self._open_for(get_today_log_path(self.folder), len(data))
+            self._file.write(data)
+            self._size += len(data)
+            if self.fsync == "always" or (
+                self.fsync == "interval" and time.monotonic() - self._last_sync >= self.fsync_interval
+            ):
+                self._sync()
+            elif self.fsync == "interval":
+                self._file.flush()
+
+    def flush(self) -> None:
+        with self._lock:
+            if self._file:
+                self._sync()
+
+    def close(self) -> None:
+        with self._lock:
+            if self._file:
+                if self.fsync == "never":
+                    self._file.flush()
+                else:
+                    self._sync()
+                self._file.close()
+                self._file = None
+                self._path = None
+
+    def _sync(self):
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._last_sync = time.monotonic()
+
+    def _open_for(self, path: str, incoming: int):
+        if self._path != path:
+            # First write, or the date rolled over.
+            if self._file:
+                self._sync()
+                self._file.close()
+            ensure_log_folder(self.folder)
+            self._file = open(path, "ab")
+            self._path = path
+            self._size = self._file.tell()
+        if self._size and self._size + incoming > self.max_bytes:
+            self._rotate()
+
+    def _rotate(self):
+        self._sync()
+        self._file.close()
+        base = self._path[:-len(".jsonl")]
+        index = 1
+        while os.path.exists(f"{base}.{index}.jsonl"):
+            index += 1
+        os.replace(self._path, f"{base}.{index}.jsonl")
+        self._file = open(self._path, "ab")
+        self._size = 0
+
+
+def _journal_files(folder: str, date: str = None):
+    files = []
+    for path in glob.glob(os.path.join(folder, "rexode_chat_*.jsonl")):
+        match = _JOURNAL_NAME.match(os.path.basename(path))
+        if not match or (date and match.group(1) != date):
+            continue
+        # Rotated parts are older than the day's current file.
+        index = int(match.group(2)) if match.group(2) else float("inf")
+        files.append((match.group(1), index, path))
+    return [path for _, _, path in sorted(files)]
+
+
+def read_chats(date: str = None, folder: str = None) -> Iterator[Dict]:
+    """Yields journal entries oldest first, one line at a time.
+
+    `date` (YYYY-MM-DD) limits the read to one day. Lines that do not parse,
+    such as a half-written last line after a crash, are skipped.
+    """
+    if _default_journal is not None:
+        _default_journal.flush()
+    for path in _journal_files(folder or CHAT_LOG_FOLDER, date):
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    yield json.loads(line)
+                except ValueError:
+                    log_action(f"Skipping malformed chat log line in {path}")
+
+
+def migrate_json_logs(folder: str = None) -> int:
+    """Converts JSON-array chat logs in `folder` to the JSONL journal.
+
+    Handles both `rexode_chat_<date>.json` and the `<date>.json` files of
+    `utils.log_chat`. Entries go in front of anything already journaled for
+    that day and each converted file is renamed to `*.json.migrated`, so
+    running this again is a no-op. Returns the number of files migrated.
+    """
+    folder = folder or CHAT_LOG_FOLDER
+    migrated = 0
+    for path in sorted(glob.glob(os.path.join(folder, "*.json"))):
+        match = _LEGACY_NAME.match(os.path.basename(path))
+        if not match:
+            continue
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                entries = json.load(f)
+        except (OSError, ValueError) as e:
+            log_action(f"Could not migrate chat log {path}: {e}")
+            continue
+        if not isinstance(entries, list):
+            continue
+
+        target = os.path.join(folder, f"rexode_chat_{match.group(1)}.jsonl")
+        lines = []
+        for entry in entries:
+            if isinstance(entry, dict) and "timestamp" not in entry and "time" in entry:
+                entry = {"timestamp": entry.pop("time"), **entry}
+            lines.append(json.dumps(entry, ensure_ascii=False) + "\n")
+        if os.path.exists(target):
+            with open(target, "r", encoding="utf-8") as f:
+                lines.append(f.read())
+        temp_path = target + ".tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            f.writelines(lines)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, target)
+        os.replace(path, path + ".migrated")
+        migrated += 1
+    if migrated:
+        log_action(f"Migrated {migrated} JSON chat log(s) in {folder} to JSONL")
+    return migrated
+
+
+_default_journal: Optional[ChatJournal] = None
+
+
+def get_journal() -> ChatJournal:
+    global _default_journal
+    if _default_journal is None:
+        migrate_json_logs()
+        _default_journal = ChatJournal(
+            fsync=Config.CHAT_LOG_FSYNC,
+            fsync_interval=Config.CHAT_LOG_FSYNC_INTERVAL,
+            max_bytes=Config.CHAT_LOG_MAX_BYTES,
+        )
+        atexit.register(_default_journal.close)
+    return _default_journal
+
 
 def append_chat(user_msg: str, ai_msg: str):
-    ensure_log_folder()
-    log_path = get_today_log_path()
-    
-    log_data = []
-    if os.path.exists(log_path):
-        with open(log_path, "r", encoding="utf-8") as f:
-            try:
-                log_data = json.load(f)
-            except json.JSONDecodeError:
-                log_data = []
-
-    log_data.append({
+    get_journal().append({
         "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
         "user": user_msg,
         "rexode": ai_msg
     })
 
-    with open(log_path, "w", encoding="utf-8") as f:
-        json.dump(log_data, f, indent=2, ensure_ascii=False)
+
+if __name__ == "__main__":
+    count = migrate_json_logs()
+    print(f"Migrated {count} chat log file(s) in {CHAT_LOG_FOLDER}")
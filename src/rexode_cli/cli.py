@@ -17,6 +17,9 @@ from .popup_manager import show_confirmation
 
 from .core.tool_manager import ToolManager
 from .core.task_orchestrator import TaskOrchestrator
+from .core.tool_shortlist import ToolShortlister
+from .core.tool_retriever import ToolRetriever
+from .core.scheduler import get_scheduler
 from .llm_handler import LLMHandler
 from rich.console import Console
 from rich.panel import Panel
@@ -43,9 +46,10 @@ class CLI:
     def on_press(self, key):
         try:
             if key == keyboard.Key.esc:
+                # Keep listening: returning False would stop the listener
+                # and ESC would only work once per session.
                 if self.orchestrator:
                     self.orchestrator.cancel()
-                return False
         except AttributeError:
             pass
 
@@ -70,7 +74,9 @@ class CLI:
         if selected_mode == "1":
             self.console.print("Local LLM mode selected.", style="bold green")
             self.model_name = self.console.input("[bold green]Enter local model name (e.g., llama2, mistral): [/bold green]").strip()
-            self.llm = self.llm_handler.initialize_llm(llm_type="local", model_name=self.model_name)
+            self.llm = self.llm_handler.initialize_llm(llm_type="local", model_name=self.model_name,
+                                                       base_url=self.config.OLLAMA_BASE_URL,
+                                                       options=get_mode_config().get("local_llm"))
         elif selected_mode == "2":
             self.console.print("Online LLM mode selected.", style="bold green")
             valid_providers = ["openai", "google", "anthropic"]
@@ -124,20 +130,47 @@ class CLI:
         
 
         self.tool_manager = ToolManager(self.config)
-        self.orchestrator = TaskOrchestrator(self.tool_manager, llm=self.llm, llm_mode=self.model_name, llm_handler=self.llm_handler)
-
+        # Reminders and scheduled tasks fire from this event loop.
+        get_scheduler().start()
+        # Built once here: the lexical index is ready before the first request
+        # and the knowledge base behind it loads on the first semantic query.
+        retriever = ToolRetriever(self.tool_manager.registry,
+                                  semantic_weight=self.config.TOOL_RETRIEVAL_SEMANTIC_WEIGHT)
+        stable_prefix = False
+        if self.llm and self.mode == "1":
+            # Local model: a full catalog that fits in num_ctx is sent every
+            # turn, so the prefix the warmup evaluates is reused each time.
+            num_ctx = get_mode_config().get("local_llm", {}).get("num_ctx")
+            reserve = self.config.HISTORY_TOKEN_BUDGET + self.config.LOCAL_LLM_REPLY_TOKENS
+            stable_prefix = self.config.LOCAL_LLM_STABLE_PREFIX and self.llm_handler.prefix_fits(
+                self.tool_manager.tools, num_ctx, reserve, self.tool_manager.tools_version)
+            if self.config.LOCAL_LLM_WARMUP:
+                prefix = (self.llm_handler.get_static_prefix(self.tool_manager.tools, self.tool_manager.tools_version)
+                          if stable_prefix else "")
+                self.llm_handler.warm_up(self.llm, prefix)
+        shortlister = None
+        if self.llm and self.config.TOOL_SHORTLIST_ENABLED and not stable_prefix:
+            shortlister = ToolShortlister(
+                self.tool_manager.registry,
+                k=self.config.TOOL_SHORTLIST_K,
+                min_score=self.config.TOOL_SHORTLIST_MIN_SCORE,
+                retriever=retriever,
+            )
         agent_indicator = InlineActivityIndicator(self.console, "Rexode is thinking...")
+        self.orchestrator = TaskOrchestrator(self.tool_manager, llm=self.llm, llm_mode=self.model_name, llm_handler=self.llm_handler, shortlister=shortlister, activity_indicator=agent_indicator, retriever=retriever)
 
         while True:
             try:
                 response_content = ""
                 if self.chat_mode == "voice":
-                    user_input = get_voice_input()
+                    user_input = await asyncio.to_thread(get_voice_input)
                     if not user_input:
                         continue
                     self.console.print(Panel(user_input, title="You", title_align="left", border_style="blue"))
                 else:
-                    user_input = self.console.input(f"You ({self.model_name})> ").strip()
+                    # Read input off the loop so scheduled jobs keep firing
+                    # while the prompt waits.
+                    user_input = (await asyncio.to_thread(self.console.input, f"You ({self.model_name})> ")).strip()
 
                 if user_input.lower() in ["exit", "quit", "bye"]:
                     self.console.print("Goodbye from Rexode.", style="bold red")
@@ -154,7 +187,11 @@ class CLI:
                 
 
                 self.console.print(Panel(response_content, title="Rexode", title_align="left", border_style="green"))
-                self.console.print(f"[dim]Mode: {self.model_name}[/dim]", justify="right")
+                status = f"Mode: {self.model_name}"
+                tool_cache = self.orchestrator.tool_cache
+                if tool_cache is not None and tool_cache.hits + tool_cache.misses:
+                    status += f" | Tool cache: {tool_cache.hits} hits, {tool_cache.misses} misses"
+                self.console.print(f"[dim]{status}[/dim]", justify="right")
                 append_chat(f"", f"Rexode: {response_content}")
                 
 
@@ -0,0 +1,33 @@
+from typing import Any, Dict
+
+from chromadb.utils import embedding_functions
+
+from .knowledge_base import load_sentence_transformer, model_loaded
+
+
+class LazySentenceTransformerEmbedding(embedding_functions.SentenceTransformerEmbeddingFunction):
+    """chromadb's SentenceTransformerEmbeddingFunction, except that the model
+    (and sentence-transformers and torch with it) is loaded on the first
+    embedding rather than at construction. It reports the same name and
+    config, so collections created with the eager one accept it."""
+
+    def __init__(self, model_name: str = "all-MiniLM-L6-v2", device: str = "cpu",
+                 normalize_embeddings: bool = False, **kwargs):
+        self.model_name = model_name
+        self.device = device
+        self.normalize_embeddings = normalize_embeddings
+        self.kwargs = kwargs
+
+    @property
+    def loaded(self) -> bool:
+        return model_loaded(self.model_name)
+
+    @property
+    def _model(self):
+        return load_sentence_transformer(self.model_name, self.device, **self.kwargs)
+
+    @staticmethod
+    def build_from_config(config: Dict[str, Any]) -> "LazySentenceTransformerEmbedding":
+        return LazySentenceTransformerEmbedding(
+            model_name=config.get("model_name"), device=config.get("device"),
+            normalize_embeddings=config.get("normalize_embeddings"), **(config.get("kwargs") or {}))
@@ -2,3 +2,120 @@ import os
 
 class Config:
     TOOLS_JSON_PATH = os.path.join(os.path.dirname(__file__), "..", "..", "..", "tools.json")
+    TOOL_MANIFEST_PATH = os.path.join(os.path.dirname(__file__), "..", "..", "..", ".rexode", "tool_manifest.json")
+    # Full copies of tool outputs that were too long to keep in the history.
+    TOOL_OUTPUT_DIR = os.path.join(os.path.dirname(__file__), "..", "..", "..", ".rexode", "tool_outputs")
+    # Import tool modules on first call instead of at startup.
+    LAZY_TOOL_LOADING = True
+    # Send only the top-k tools retrieved for the request to the LLM.
+    # Below TOOL_SHORTLIST_MIN_SCORE (fused retrieval score) the full catalog is used.
+    TOOL_SHORTLIST_ENABLED = True
+    TOOL_SHORTLIST_K = 8
+    TOOL_SHORTLIST_MIN_SCORE = 0.3
+    # Without an LLM, a tool named in the request is found by fuzzy matching
+    # tool names (token_set_ratio, 0-100); only scores above this count.
+    INTENT_FUZZY_CUTOFF = 60
+    # Tool retrieval fuses BM25 over tool names, descriptions, parameter
+    # names and examples with knowledge base similarity; this is the share
+    # of the similarity in the fused score (0 = lexical only).
+    TOOL_RETRIEVAL_SEMANTIC_WEIGHT = 0.5
+    # Without an LLM, a request that names no tool is matched lexically and
+    # runs the top tool only if it scores at least this much.
+    TOOL_RETRIEVAL_RULES_MIN_SCORE = 0.4
+    # Knowledge base vector index: "chroma" (chromadb PersistentClient) or
+    # "local" (NumPy matrix in a memory-mapped .npy file; loads in
+    # milliseconds and needs no chromadb).
+    KB_BACKEND = "chroma"
+    # Documents per upsert/delete call when syncing tools.json into the
+    # knowledge base; the embedding model encodes each batch in one pass.
+    KB_SYNC_BATCH_SIZE = 256
+    # Query embeddings kept in memory, keyed by normalized query text.
+    KB_QUERY_CACHE_SIZE = 256
+    # Local LLM (Ollama). num_ctx, num_thread and keep_alive come from the
+    # mode profile (mode_manager.MODES). A warmup request loads the model in
+    # the background at startup. If the full tool catalog, the history budget
+    # and LOCAL_LLM_REPLY_TOKENS fit in num_ctx, the full catalog is sent
+    # every turn instead of a shortlist: the prompt prefix then stays
+    # byte-identical, the warmup evaluates it once and Ollama reuses its KV
+    # cache on every turn.
+    OLLAMA_BASE_URL = os.getenv("OLLAMA_HOST", "http://localhost:11434")
+    LOCAL_LLM_WARMUP = True
+    LOCAL_LLM_STABLE_PREFIX = True
+    LOCAL_LLM_REPLY_TOKENS = 1024
+    # Upper bound on tool calls from one LLM turn that run at the same time.
+    MAX_CONCURRENT_TOOLS = 4
+    # Stream LLM replies: tool calls start as soon as each one is parsed and
+    # plain responses render live in the activity indicator.
+    STREAM_LLM_RESPONSES = True
+    # Results of tools with a "cache" policy in tools.json are reused until
+    # their TTL expires. TOOL_CACHE_PERSIST keeps them across restarts.
+    TOOL_CACHE_ENABLED = True
+    TOOL_CACHE_MAX_ENTRIES = 256
+    TOOL_CACHE_PERSIST = False
+    TOOL_CACHE_PATH = os.path.join(os.path.dirname(__file__), "..", "..", "..", ".rexode", "tool_cache.json")
+    # Shared HTTP client for the web tools: timeouts in seconds, GET retries
+    # with exponential backoff, and a cap on parallel requests per host.
+    # Responses with an ETag/Last-Modified are kept in HTTP_CACHE_DIR and
+    # revalidated with conditional GETs; past HTTP_CACHE_MAX_ENTRIES URLs the
+    # least recently used are deleted.
+    HTTP_CONNECT_TIMEOUT = 5.0
+    HTTP_READ_TIMEOUT = 30.0
+    HTTP_RETRIES = 2
+    HTTP_BACKOFF = 0.5
+    HTTP_POOL_SIZE = 10
+    HTTP_PER_HOST_LIMIT = 4
+    HTTP_CACHE_DIR = os.path.join(os.path.dirname(__file__), "..", "..", "..", ".rexode", "http_cache")
+    HTTP_CACHE_MAX_ENTRIES = 256
+    # download_file: parallel range requests of DOWNLOAD_CHUNK_SIZE bytes,
+    # resumable from the .part file. Workers also count against
+    # HTTP_PER_HOST_LIMIT.
+    DOWNLOAD_WORKERS = 4
+    DOWNLOAD_CHUNK_SIZE = 4 * 1024 * 1024
+    DOWNLOAD_CHUNK_RETRIES = 3
+    # Batch crawler used by dataset_scraper: pages in flight overall and per
+    # host, minimum seconds between request starts to one host, and the most
+    # bytes read from a single page.
+    CRAWL_CONCURRENCY = 16
+    CRAWL_PER_DOMAIN = 4
+    CRAWL_DOMAIN_DELAY = 0.2
+    CRAWL_MAX_PAGE_BYTES = 5 * 1024 * 1024
+    # Shell commands run by the tools: output is echoed to the console as it
+    # arrives, the command is killed after SHELL_TIMEOUT seconds or
+    # SHELL_MAX_OUTPUT_BYTES of output, and only the first/last
+    # SHELL_OUTPUT_HEAD/TAIL characters of each stream are kept for the LLM.
+    SHELL_TIMEOUT = 300
+    SHELL_MAX_OUTPUT_BYTES = 10 * 1024 * 1024
+    SHELL_OUTPUT_HEAD = 4000
+    SHELL_OUTPUT_TAIL = 4000
+    SHELL_STREAM_OUTPUT = True
+    # Run those commands in one long-lived bash per task instead of a new
+    # shell each time; `cd` and exported variables carry over between the
+    # commands of one request, and each new request starts from a clean
+    # shell in the launch directory.
+    SHELL_PERSISTENT = True
+    # Planned tasks (TaskOrchestrator.process_with_plan): subtasks run at the
+    # same time, and how many times failed branches are sent back to the LLM.
+    PLAN_MAX_WORKERS = 4
+    PLAN_MAX_REPLANS = 2
+    # Scheduled reminders and tasks are kept in SQLite so they survive a
+    # restart. A job whose run time passed more than SCHEDULER_MISFIRE_GRACE
+    # seconds ago is handled by its misfire policy (see core/job_store.py).
+    SCHEDULER_PERSIST = True
+    SCHEDULER_DB_PATH = os.path.join(os.path.dirname(__file__), "..", "..", "..", ".rexode", "scheduler.db")
+    SCHEDULER_MISFIRE_GRACE = 60
+    # Spoken feedback and desktop notifications run on one background worker;
+    # at most SPEECH_MAX_PENDING wait, older ones are dropped past that.
+    SPEECH_ENABLED = True
+    SPEECH_MAX_PENDING = 3
+    # Conversation history sent to the LLM, in estimated tokens (~4 chars each).
+    # Older turns beyond the budget are folded into a summary; tool outputs
+    # longer than HISTORY_MAX_OUTPUT_TOKENS are cut to head + tail.
+    HISTORY_TOKEN_BUDGET = 6000
+    HISTORY_MAX_OUTPUT_TOKENS = 800
+    HISTORY_KEEP_RECENT = 6
+    # Chat journal: one JSONL file per day under CHAT_LOG_FOLDER, rotated past
+    # CHAT_LOG_MAX_BYTES. CHAT_LOG_FSYNC is "always", "interval" or "never".
+    CHAT_LOG_FOLDER = "chat_history"
+    CHAT_LOG_FSYNC = "interval"
+    CHAT_LOG_FSYNC_INTERVAL = 1.0
+    CHAT_LOG_MAX_BYTES = 5 * 1024 * 1024
@@ -0,0 +1,397 @@
+import asyncio
+import codecs
+import csv
+import json
+import re
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from html.parser import HTMLParser
+from typing import Any, Dict, Iterable, Optional
+from urllib.parse import urljoin, urlsplit
+from xml.sax.saxutils import escape, quoteattr
+
+import aiohttp
+
+from .config import Config
+from .logging import log_action
+
+# lxml's C parser is several times faster than html.parser; it is optional.
+try:
+    from lxml import etree
+except ImportError:
+    etree = None
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+OUTPUT_FORMATS = ("jsonl", "json", "csv", "xml")
+
+# Elements whose text is never page content. <form> is not one of them:
+# ASP.NET WebForms and many CMS themes wrap the whole page body in one.
+BOILERPLATE_TAGS = {
+    "script", "style", "noscript", "template", "svg", "canvas", "iframe",
+    "nav", "header", "footer", "aside", "button", "select",
+}
+BOILERPLATE_ROLES = {"navigation", "banner", "contentinfo", "complementary", "search"}
+BOILERPLATE_HINT = re.compile(
+    r"\b(nav|navbar|menu|sidebar|cookies?|banner|advert|ads|share|social|breadcrumbs?|footer)\b", re.IGNORECASE
+)
+BLOCK_TAGS = {
+    "p", "div", "br", "li", "ul", "ol", "tr", "table", "section", "article", "main",
+    "h1", "h2", "h3", "h4", "h5", "h6", "pre", "blockquote", "dd", "dt", "hr",
+}
+VOID_TAGS = {"area", "base", "br", "col", "embed", "hr", "img", "input", "link", "meta", "source", "track", "wbr"}
+
+
+class _TextCollector:
+    """Parser target shared by the lxml and html.parser backends: gets
+    start/end/data callbacks in document order and keeps only the title,
+    content text and content links."""
+
+    def __init__(self, base_url, max_chars, max_links):
+        self.base_url = base_url
+        self.max_chars = max_chars
+        self.max_links = max_links
+        self.title = []
+        self.pieces = []
+        self.links = []
+        self._seen_links = set()
+        self._chars = 0
+        self._in_title = False
+        # Open tags inside the boilerplate element currently being skipped.
+        self._skip_stack = []
+
+    def _is_boilerplate(self, tag, attrs):
+        if tag in BOILERPLATE_TAGS or attrs.get("role") in BOILERPLATE_ROLES:
+            return True
+        hint = f"{attrs.get('id') or ''} {attrs.get('class') or ''}"
+        return bool(hint.strip()) and BOILERPLATE_HINT.search(hint) is not None
+
+    def start(self, tag, attrs):
+        tag = tag.lower()
+        if self._skip_stack:
+            if tag not in VOID_TAGS:
+                self._skip_stack.append(tag)
+            return
+        if tag == "title":
+            self._in_title = True
+            return
+        if tag not in VOID_TAGS and self._is_boilerplate(tag, attrs):
+            self._skip_stack.append(tag)
+            return
+        if tag in BLOCK_TAGS:
+            self.pieces.append("\n")
+        if tag == "a" and attrs.get("href") and len(self.links) < self.max_links:
+            link = urljoin(self.base_url, attrs["href"]).split("#", 1)[0]
+            if link.startswith(("http://", "https://")) and link not in self._seen_links:
+                self._seen_links.add(link)
+                self.links.append(link)
+
+    def end(self, tag):
+        tag = tag.lower()
+        if self._skip_stack:
+            # Pop back to the matching open tag; unclosed children are
+            # common in real HTML.
+            if tag in self._skip_stack:
+                while self._skip_stack.pop() != tag:
+                    pass
+            return
+        if tag == "title":
+            self._in_title = False
+        elif tag in BLOCK_TAGS:
+            self.pieces.append("\n")
+
+    def data(self, text):
+        if self._in_title:
+            self.title.append(text)
+        elif not self._skip_stack and self._chars < self.max_chars:
+            self.pieces.append(text)
+            self._chars += len(text)
+
+    def close(self):
+        lines = (" ".join(line.split()) for line in "".join(self.pieces).split("\n"))
+        return {
+            "title": " ".join("".join(self.title).split()),
+            "text": "\n".join(line for line in lines if line)[:self.max_chars],
+            "links": self.links,
+        }
+
+
+class _StdlibParser(HTMLParser):
+    def __init__(self, target):
+        super().__init__(convert_charrefs=True)
+        self.target = target
+
+    def handle_starttag(self, tag, attrs):
+        self.target.start(tag, dict(attrs))
+        if tag in VOID_TAGS:
+            self.target.end(tag)
+
+    def handle_startendtag(self, tag, attrs):
+        self.target.start(tag, dict(attrs))
+        self.target.end(tag)
+
+    def handle_endtag(self, tag):
+        if tag not in VOID_TAGS:
+            self.target.end(tag)
+
+    def handle_data(self, data):
+        self.target.data(data)
+
+
+class PageTextExtractor:
+    """Incremental HTML to {title, text, links} with boilerplate stripped.
+
+    Feed decoded chunks as they arrive; nothing but the extracted text is
+    kept, so memory stays proportional to the page's content rather than
+    its DOM. Uses lxml when installed, html.parser otherwise.
+    """
+
+    def __init__(self, base_url: str = "", max_chars: int = 200_000, max_links: int = 200, backend: str = None):
+        self.collector = _TextCollector(base_url, max_chars, max_links)
+        self.backend = backend or ("lxml" if etree is not None else "html.parser")
+        if self.backend == "lxml":
+            self._parser = etree.HTMLParser(target=self.collector, recover=True, no_network=True)
+        else:
+            self._parser = _StdlibParser(self.collector)
+
+    def feed(self, text: str):
+        if text:
+            self._parser.feed(text)
+
+    def close(self) -> Dict[str, Any]:
+        if self.backend == "lxml":
+            try:
+                self._parser.close()
+            except etree.XMLSyntaxError:
+                # Empty or non-HTML documents; whatever was collected stands.
+                pass
+        else:
+            self._parser.close()
+        return self.collector.close()
+
+
+def extract_page_text(html: str, base_url: str = "") -> Dict[str, Any]:
+    extractor = PageTextExtractor(base_url)
+    extractor.feed(html)
+    return extractor.close()
+
+
+class Crawler:
+    """Fetches many URLs concurrently with aiohttp and extracts their text.
+
+    At most `concurrency` pages are in flight overall and `per_domain` per
+    host, and requests to one host start at least `domain_delay` seconds
+    apart. Pages are parsed while they download and yielded as soon as each
+    one is done, so callers can write them out without holding the crawl in
+    memory. `stats` has the counts, bytes and timing of the last crawl.
+    """
+
+    def __init__(self, concurrency: int = 16, per_domain: int = 4, domain_delay: float = 0.2,
+                 connect_timeout: float = 5.0, read_timeout: float = 30.0,
+                 max_page_bytes: int = 5 * 1024 * 1024, user_agent: str = "rexode-cli"):
+        self.concurrency = concurrency
+        self.per_domain = per_domain
+        self.domain_delay = domain_delay
+        self.timeout = aiohttp.ClientTimeout(sock_connect=connect_timeout, sock_read=read_timeout)
+        self.max_page_bytes = max_page_bytes
+        self.user_agent = user_agent
+        self.stats: Dict[str, Any] = {}
+        self._domain_slots: Dict[str, asyncio.Semaphore] = {}
+        self._next_start: Dict[str, float] = {}
+
+    async def _wait_turn(self, domain):
+        # Reserve the next start time for the domain before sleeping, so
+        # concurrent workers queue up behind each other.
+        loop = asyncio.get_running_loop()
+        now = loop.time()
+        start = max(now, self._next_start.get(domain, now))
+        self._next_start[domain] = start + self.domain_delay
+        if start > now:
+            await asyncio.sleep(start - now)
+
+    @staticmethod
+    def _empty_page(url: str) -> Dict[str, Any]:
+        return {"url": url, "status": None, "title": "", "text": "", "links": [], "bytes": 0, "error": None}
+
+    async def fetch(self, session: aiohttp.ClientSession, url: str) -> Dict[str, Any]:
+        domain = urlsplit(url).netloc.lower()
+        slot = self._domain_slots.setdefault(domain, asyncio.Semaphore(self.per_domain))
+        page = self._empty_page(url)
+        async with slot:
+            await self._wait_turn(domain)
+            try:
+                async with session.get(url) as response:
+                    page["status"] = response.status
+                    content_type = response.content_type or ""
+                    if response.status >= 400:
+                        page["error"] = f"HTTP {response.status}"
+                        return page
+                    if "html" not in content_type and not content_type.startswith("text/"):
+                        page["error"] = f"Unsupported content type: {content_type}"
+                        return page
+                    try:
+                        decoder = codecs.getincrementaldecoder(response.charset or "utf-8")(errors="replace")
+                    except LookupError:
+                        decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+                    extractor = PageTextExtractor(str(response.url))
+                    async for chunk in response.content.iter_chunked(64 * 1024):
+                        page["bytes"] += len(chunk)
+                        extractor.feed(decoder.decode(chunk))
+                        if page["bytes"] >= self.max_page_bytes:
+                            page["error"] = f"Truncated at {self.max_page_bytes} bytes"
+                            break
+                    extractor.feed(decoder.decode(b"", final=True))
+                    page.update(extractor.close())
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                page["error"] = f"{type(e).__name__}: {e}"
+        return page
+
+    async def crawl(self, urls: Iterable[str]):
+        """Async generator of page dicts, in completion order."""
+        pending: asyncio.Queue = asyncio.Queue()
+        for url in dict.fromkeys(urls):
+            pending.put_nowait(url)
+        # Bounded, so a slow consumer holds back the fetchers instead of
+        # letting finished pages pile up.
+        finished: asyncio.Queue = asyncio.Queue(maxsize=self.concurrency * 2)
+        self.stats = {"pages": 0, "failed": 0, "bytes": 0, "elapsed": 0.0}
+        # Semaphores belong to the running loop, so start fresh per crawl.
+        self._domain_slots = {}
+        self._next_start = {}
+        started = time.perf_counter()
+
+        async def worker(session):
+            while True:
+                try:
+                    url = pending.get_nowait()
+                except asyncio.QueueEmpty:
+                    await finished.put(None)
+                    return
+                try:
+                    page = await self.fetch(session, url)
+                except Exception as e:
+                    # Anything else one page raises (parser, decoder) fails
+                    # that page only; a dead worker would never send its
+                    # None and the crawl would wait forever.
+                    log_action(f"Crawling {url} failed: {e}")
+                    page = self._empty_page(url)
+                    page["error"] = f"{type(e).__name__}: {e}"
+                await finished.put(page)
+
+        connector = aiohttp.TCPConnector(limit=self.concurrency, limit_per_host=self.per_domain)
+        async with aiohttp.ClientSession(connector=connector, timeout=self.timeout,
+                                         headers={"User-Agent": self.user_agent}) as session:
+            workers = [asyncio.create_task(worker(session)) for _ in range(max(1, min(self.concurrency, pending.qsize())))]
+            running = len(workers)
+            try:
+                while running:
+                    page = await finished.get()
+                    if page is None:
+                        running -= 1
+                        continue
+                    self.stats["pages"] += 1
+                    self.stats["failed"] += page["error"] is not None and not page["text"]
+                    self.stats["bytes"] += page["bytes"]
+                    yield page
+            finally:
+                for task in workers:
+                    task.cancel()
+                await asyncio.gather(*workers, return_exceptions=True)
+                self.stats["elapsed"] = time.perf_counter() - started
+
+
+class PageWriter:
+    """Streams crawled pages to `save_path` as jsonl, json (one array), csv
+    or xml, one page at a time."""
+
+    CSV_FIELDS = ["url", "status", "title", "text", "error"]
+
+    def __init__(self, save_path: str, output_format: str):
+        if output_format not in OUTPUT_FORMATS:
+            raise ValueError(f"Unsupported output format '{output_format}', expected one of {OUTPUT_FORMATS}")
+        self.save_path = save_path
+        self.output_format = output_format
+        self.count = 0
+
+    def __enter__(self):
+        self._file = open(self.save_path, "w", encoding="utf-8", newline="")
+        if self.output_format == "json":
+            self._file.write("[")
+        elif self.output_format == "csv":
+            self._csv = csv.DictWriter(self._file, fieldnames=self.CSV_FIELDS, extrasaction="ignore")
+            self._csv.writeheader()
+        elif self.output_format == "xml":
+            self._file.write('<?xml version="1.0" encoding="utf-8"?>\n<pages>\n')
+        return self
+
+    def write(self, page: Dict[str, Any]):
+        if self.output_format == "jsonl":
+            self._file.write(json.dumps(page, ensure_ascii=False) + "\n")
+        elif self.output_format == "json":
+            self._file.write(("," if self.count else "") + "\n" + json.dumps(page, ensure_ascii=False))
+        elif self.output_format == "csv":
+            self._csv.writerow(page)
+        else:
+            self._file.write(
+                f"  <page url={quoteattr(page['url'])} status={quoteattr(str(page['status']))}>"
+                f"<title>{escape(page['title'])}</title><text>{escape(page['text'])}</text>"
+                + (f"<error>{escape(page['error'])}</error>" if page["error"] else "")
+                + "</page>\n"
+            )
+        self.count += 1
+
+    def __exit__(self, *exc):
+        if self.output_format == "json":
+            self._file.write("\n]\n")
+        elif self.output_format == "xml":
+            self._file.write("</pages>\n")
+        self._file.close()
+        return False
+
+
+def peak_memory_mb() -> Optional[float]:
+    """Peak resident set size of this process, where the OS reports it."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # macOS reports bytes, Linux KB.
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def crawl_to_file(urls: Iterable[str], output_format: str, save_path: str, crawler: Crawler = None) -> Dict[str, Any]:
+    """Crawls `urls` and streams the pages to `save_path`; returns the stats.
+
+    Callable from synchronous tools whether or not an event loop is already
+    running on this thread.
+    """
+    crawler = crawler or Crawler(
+        concurrency=Config.CRAWL_CONCURRENCY,
+        per_domain=Config.CRAWL_PER_DOMAIN,
+        domain_delay=Config.CRAWL_DOMAIN_DELAY,
+        connect_timeout=Config.HTTP_CONNECT_TIMEOUT,
+        read_timeout=Config.HTTP_READ_TIMEOUT,
+        max_page_bytes=Config.CRAWL_MAX_PAGE_BYTES,
+    )
+
+    async def run():
+        with PageWriter(save_path, output_format) as writer:
+            async for page in crawler.crawl(urls):
+                writer.write(page)
+        stats = dict(crawler.stats)
+        stats["pages_per_second"] = stats["pages"] / stats["elapsed"] if stats["elapsed"] else 0.0
+        stats["peak_memory_mb"] = peak_memory_mb()
+        log_action(f"Crawled {stats['pages']} pages to {save_path}: {stats}")
+        return stats
+
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(run())
+    # Called from inside a running loop (e.g. the rule-based path): crawl on
+    # a worker thread with its own loop.
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        return executor.submit(asyncio.run, run()).result()
@@ -0,0 +1,261 @@
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+from concurrent.futures import FIRST_EXCEPTION, ThreadPoolExecutor, wait
+from typing import Any, Dict, Optional
+
+import requests
+
+from .http_client import HttpClient
+from .logging import log_action
+
+# Step names for the TaskUI passed as `ui`, in the order they run.
+DOWNLOAD_STEPS = ["Checking server", "Downloading", "Verifying checksum", "Saving file"]
+
+_CONTENT_RANGE = re.compile(r"bytes\s+\d+-\d+/(\d+)")
+
+
+class DownloadError(Exception):
+    pass
+
+
+class _IncompleteChunk(Exception):
+    """The connection ended before the whole range arrived; worth a retry."""
+
+
+class Downloader:
+    """Downloads one file, in parallel ranges when the server allows it.
+
+    The file is written to `<save_path>.part`, preallocated to its full size,
+    with `chunk_size` ranges fetched by up to `workers` threads. Finished
+    ranges are recorded in `<save_path>.part.json`, so an interrupted
+    download resumes where it stopped as long as the server still reports
+    the same size and ETag/Last-Modified. Servers without range support get
+    a plain streamed download. An optional sha256 is checked before the
+    `.part` file is moved into place.
+
+    `ui` is anything with TaskUI's step methods (start_step,
+    update_step_message, complete_step, fail_step); steps follow
+    DOWNLOAD_STEPS.
+    """
+
+    def __init__(self, client: HttpClient, workers: int = 4, chunk_size: int = 4 * 1024 * 1024,
+                 chunk_retries: int = 3, ui=None, progress_interval: float = 1.0):
+        self.client = client
+        self.workers = workers
+        self.chunk_size = chunk_size
+        self.chunk_retries = chunk_retries
+        self.ui = ui
+        self.progress_interval = progress_interval
+        self._lock = threading.Lock()
+
+    # -- progress -------------------------------------------------------
+
+    def _step(self, index):
+        if self.ui:
+            self.ui.start_step(index)
+
+    def _message(self, method, message):
+        if self.ui:
+            getattr(self.ui, method)(message)
+
+    def _advance(self, amount):
+        with self._lock:
+            self._done_bytes += amount
+            now = time.monotonic()
+            if now - self._last_report < self.progress_interval:
+                return
+            self._last_report = now
+            done, total = self._done_bytes, self._total_bytes
+        elapsed = max(now - self._started, 1e-6)
+        rate = (done - self._resumed_bytes) / elapsed / (1024 * 1024)
+        percent = f"{done * 100 // total}% " if total else ""
+        self._message("update_step_message", f"Downloaded: {percent}({done / (1024 * 1024):.1f}MB @ {rate:.1f}MB/s)")
+
+    # -- server probe ---------------------------------------------------
+
+    def probe(self, url):
+        """Returns (size or None, supports_ranges, validator)."""
+        headers = {"Range": "bytes=0-0", "Accept-Encoding": "identity"}
+        with self.client.host_slot(url):
+            with self.client.session.get(url, headers=headers, stream=True, timeout=self.client.timeout) as response:
+                response.raise_for_status()
+                validator = response.headers.get("ETag") or response.headers.get("Last-Modified")
+                match = _CONTENT_RANGE.match(response.headers.get("Content-Range", ""))
+                if response.status_code == 206 and match:
+                    return int(match.group(1)), True, validator
+                length = response.headers.get("Content-Length")
+                return (int(length) if length and length.isdigit() else None), False, validator
+
+    # -- resumable state --------------------------------------------------
+
+    def _load_done(self, state_path, part_path, url, size, validator):
+        try:
+            with open(state_path, "r", encoding="utf-8") as f:
+                state = json.load(f)
+        except (OSError, ValueError):
+            return set()
+        if (state.get("url") != url or state.get("size") != size or state.get("validator") != validator
+                or state.get("chunk_size") != self.chunk_size
+                or not os.path.exists(part_path) or os.path.getsize(part_path) != size):
+            return set()
+        return set(state.get("done", []))
+
+    def _save_state(self, state_path, url, size, validator, done):
+        temp_path = state_path + ".tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump({"url": url, "size": size, "validator": validator,
+                       "chunk_size": self.chunk_size, "done": sorted(done)}, f)
+        os.replace(temp_path, state_path)
+
+    @staticmethod
+    def _preallocate(path, size):
+        with open(path, "wb") as f:
+            if size and hasattr(os, "posix_fallocate"):
+                try:
+                    os.posix_fallocate(f.fileno(), 0, size)
+                    return
+                except OSError:
+                    pass
+            f.truncate(size)
+
+    # -- transfer -------------------------------------------------------
+
+    def _fetch_range(self, url, part_path, start, end, validator):
+        expected = end - start + 1
+        for attempt in range(self.chunk_retries + 1):
+            written = 0
+            try:
+                headers = {"Range": f"bytes={start}-{end}", "Accept-Encoding": "identity"}
+                if validator:
+                    # If the file changed, the server answers 200 instead of 206.
+                    headers["If-Range"] = validator
+                with self.client.host_slot(url):
+                    with self.client.session.get(url, headers=headers, stream=True, timeout=self.client.timeout) as response:
+                        if response.status_code != 206:
+                            raise DownloadError(
+                                f"Server answered a range request with HTTP {response.status_code}; "
+                                "the file may have changed on the server"
+                            )
+                        with open(part_path, "r+b") as f:
+                            f.seek(start)
+                            for piece in response.iter_content(chunk_size=64 * 1024):
+                                piece = piece[:expected - written]
+                                f.write(piece)
+                                written += len(piece)
+                                self._advance(len(piece))
+                if written != expected:
+                    raise _IncompleteChunk(f"got {written} of {expected} bytes")
+                return
+            except (requests.RequestException, _IncompleteChunk) as e:
+                self._advance(-written)
+                if attempt == self.chunk_retries:
+                    raise DownloadError(f"Range {start}-{end} failed after {attempt + 1} attempts: {e}") from e
+                log_action(f"Retrying range {start}-{end} of {url}: {e}")
+                time.sleep(min(0.5 * 2 ** attempt, 8))
+
+    def _download_ranges(self, url, part_path, state_path, size, validator):
+        chunks = [(i, start, min(start + self.chunk_size, size) - 1)
+                  for i, start in enumerate(range(0, size, self.chunk_size))]
+        done = self._load_done(state_path, part_path, url, size, validator)
+        if done:
+            self._resumed_bytes = sum(end - start + 1 for i, start, end in chunks if i in done)
+            self._done_bytes = self._resumed_bytes
+            self._message("update_step_message", f"Resuming: {self._resumed_bytes / (1024 * 1024):.1f}MB already on disk")
+        else:
+            self._preallocate(part_path, size)
+            self._save_state(state_path, url, size, validator, done)
+
+        def fetch(chunk):
+            index, start, end = chunk
+            self._fetch_range(url, part_path, start, end, validator)
+            with self._lock:
+                done.add(index)
+                self._save_state(state_path, url, size, validator, done)
+
+        remaining = [chunk for chunk in chunks if chunk[0] not in done]
+        with ThreadPoolExecutor(max_workers=max(1, min(self.workers, len(remaining)))) as executor:
+            futures = [executor.submit(fetch, chunk) for chunk in remaining]
+            finished, _ = wait(futures, return_when=FIRST_EXCEPTION)
+            for future in finished:
+                if future.exception():
+                    # Ranges already in flight finish and are recorded, so a
+                    # retry has less to fetch; queued ones are dropped.
+                    for other in futures:
+                        other.cancel()
+                    raise future.exception()
+
+    def _download_stream(self, url, part_path, state_path):
+        if os.path.exists(state_path):
+            os.remove(state_path)
+        self.client.download(url, part_path, progress=self._advance)
+
+    @staticmethod
+    def _sha256(path):
+        digest = hashlib.sha256()
+        with open(path, "rb") as f:
+            for block in iter(lambda: f.read(1024 * 1024), b""):
+                digest.update(block)
+        return digest.hexdigest()
+
+    def download(self, url, save_path, sha256: Optional[str] = None) -> Dict[str, Any]:
+        part_path = save_path + ".part"
+        state_path = part_path + ".json"
+        self._done_bytes = self._resumed_bytes = 0
+        self._last_report = 0.0
+        self._started = time.monotonic()
+        directory = os.path.dirname(os.path.abspath(save_path))
+        os.makedirs(directory, exist_ok=True)
+
+        step = 0
+        try:
+            self._step(step)
+            size, ranges, validator = self.probe(url)
+            self._total_bytes = size
+            if ranges and size:
+                self._message("complete_step", f"{size / (1024 * 1024):.1f}MB, range requests supported")
+            else:
+                self._message("complete_step", "No range support; downloading as a single stream")
+
+            step = 1
+            self._step(step)
+            if ranges and size:
+                self._download_ranges(url, part_path, state_path, size, validator)
+            else:
+                self._download_stream(url, part_path, state_path)
+            elapsed = time.monotonic() - self._started
+            self._message("complete_step", f"Completed in {elapsed:.1f}s")
+
+            step = 2
+            digest = None
+            if sha256:
+                self._step(step)
+                digest = self._sha256(part_path)
+                if digest != sha256.strip().lower():
+                    # The bytes on disk are wrong; resuming would keep them.
+                    for path in (part_path, state_path):
+                        if os.path.exists(path):
+                            os.remove(path)
+                    raise DownloadError(f"Checksum mismatch: expected {sha256}, got {digest}")
+                self._message("complete_step", "sha256 matches")
+
+            step = 3
+            self._step(step)
+            os.replace(part_path, save_path)
+            if os.path.exists(state_path):
+                os.remove(state_path)
+            self._message("complete_step", f"Saved to {save_path}")
+        except Exception as e:
+            self._message("fail_step", str(e))
+            raise
+
+        return {
+            "bytes": os.path.getsize(save_path),
+            "resumed_bytes": self._resumed_bytes,
+            "parallel": bool(ranges and size),
+            "elapsed": elapsed,
+            "sha256": digest,
+        }
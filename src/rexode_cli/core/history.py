@@ -0,0 +1,149 @@
+import json
+import os
+import uuid
+from typing import Any, Callable, Dict, List, Optional
+
+from .logging import log_action
+
+
+def estimate_tokens(text: str) -> int:
+    # ~4 characters per token is close enough for budgeting and needs no tokenizer.
+    return len(text) // 4 + 1
+
+
+def content_to_text(content: Any) -> str:
+    if isinstance(content, str):
+        return content
+    try:
+        return json.dumps(content, ensure_ascii=False, default=str)
+    except (TypeError, ValueError):
+        return str(content)
+
+
+class OutputStore:
+    """Keeps full tool outputs out of the conversation, addressable by ID.
+
+    Outputs live in memory and, when a directory is given, are also written
+    to `<directory>/<id>.txt` so the `read_tool_output` tool can page
+    through them.
+    """
+
+    def __init__(self, directory: Optional[str] = None):
+        self.directory = directory
+        self._outputs: Dict[str, str] = {}
+        self._session = uuid.uuid4().hex[:8]
+        self._count = 0
+
+    def put(self, text: str) -> str:
+        self._count += 1
+        output_id = f"out-{self._session}-{self._count}"
+        self._outputs[output_id] = text
+        if self.directory:
+            try:
+                os.makedirs(self.directory, exist_ok=True)
+                with open(os.path.join(self.directory, f"{output_id}.txt"), "w", encoding="utf-8") as f:
+                    f.write(text)
+            except OSError as e:
+                log_action(f"Could not persist tool output {output_id}: {e}")
+        return output_id
+
+    def get(self, output_id: str) -> Optional[str]:
+        if output_id in self._outputs:
+            return self._outputs[output_id]
+        if self.directory:
+            path = os.path.join(self.directory, f"{os.path.basename(output_id)}.txt")
+            if os.path.exists(path):
+                with open(path, "r", encoding="utf-8") as f:
+                    return f.read()
+        return None
+
+
+def extractive_summary(entries: List[Dict[str, Any]], max_chars: int = 160) -> List[str]:
+    """One line per entry: its role and the start of its content."""
+    lines = []
+    for entry in entries:
+        text = " ".join(content_to_text(entry.get("content", "")).split())
+        if len(text) > max_chars:
+            text = text[:max_chars - 3] + "..."
+        lines.append(f"{entry.get('role', '?')}: {text}")
+    return lines
+
+
+class ConversationHistory(list):
+    """The orchestrator's chat history, kept within a token budget.
+
+    - Tool outputs above `max_output_tokens` are replaced by their head and
+      tail plus the ID of the full output in `store`.
+    - When the whole history exceeds `token_budget`, the oldest entries
+      (never the last `keep_recent`) are folded into a single leading
+      `summary` entry, itself capped at a quarter of the budget, until it
+      is back under three quarters of the budget. The headroom lets the
+      next few turns append without compacting (and rewriting) again.
+
+    `summarizer(entries) -> list of lines` can replace the default
+    extractive summary, e.g. with an LLM call. `revision` changes whenever
+    existing entries are rewritten, so incremental renderers know to start
+    over.
+    """
+
+    def __init__(self, token_budget: int = 6000, max_output_tokens: int = 800, keep_recent: int = 6,
+                 store: Optional[OutputStore] = None, summarizer: Callable = None):
+        super().__init__()
+        self.token_budget = token_budget
+        self.max_output_tokens = max_output_tokens
+        self.keep_recent = keep_recent
+        self.store = store or OutputStore()
+        self.summarizer = summarizer or extractive_summary
+        self.revision = 0
+        self._summary_lines: List[str] = []
+        self._tokens: List[int] = []
+
+    def append(self, entry):
+        if entry.get("role") == "tool":
+            entry = self._bound_tool_output(entry)
+        super().append(entry)
+        self._tokens.append(estimate_tokens(content_to_text(entry.get("content", ""))))
+        if self.total_tokens > self.token_budget:
+            self._compact()
+
+    @property
+    def total_tokens(self) -> int:
+        return sum(self._tokens)
+
+    def _bound_tool_output(self, entry):
+        text = content_to_text(entry.get("content", ""))
+        if estimate_tokens(text) <= self.max_output_tokens:
+            return entry
+        output_id = self.store.put(text)
+        keep = self.max_output_tokens * 4 // 2
+        excerpt = (
+            f"{text[:keep]}\n"
+            f"... [{len(text) - 2 * keep} characters omitted; full output stored as {output_id}, "
+            f"use read_tool_output to see it] ...\n"
+            f"{text[-keep:]}"
+        )
+        return {**entry, "content": excerpt, "output_id": output_id}
+
+    def _compact(self):
+        start = 1 if self._summary_lines else 0
+        folded = []
+        # Leave room for the summary and fold down to three quarters of the budget.
+        summary_budget = max(self.token_budget // 4, 1)
+        target = self.token_budget * 3 // 4 - summary_budget
+        total = self.total_tokens - sum(self._tokens[:start])
+        while total > target and len(self) - start - len(folded) > self.keep_recent:
+            folded.append(self[start + len(folded)])
+            total -= self._tokens[start + len(folded) - 1]
+        if not folded:
+            return
+
+        self._summary_lines.extend(self.summarizer(folded))
+        while len(self._summary_lines) > 1 and estimate_tokens("\n".join(self._summary_lines)) > summary_budget:
+            self._summary_lines.pop(0)
+        summary = {"role": "summary", "content": "\n".join(self._summary_lines)}
+
+        del self[:start + len(folded)]
+        del self._tokens[:start + len(folded)]
+        self.insert(0, summary)
+        self._tokens.insert(0, estimate_tokens(summary["content"]))
+        self.revision += 1
@@ -0,0 +1,232 @@
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Callable, Dict, Optional
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from .config import Config
+from .logging import log_action
+
+
+class ConditionalCache:
+    """Bodies of GET responses that carried an ETag or Last-Modified header,
+    stored as `<sha1(url)>.body` plus a `.json` file with the validators and
+    headers, so the next request for the URL can be conditional.
+
+    At most `max_entries` URLs are kept; past that the least recently used
+    one is deleted. Use is tracked by the mtime of the `.json` file, so the
+    order survives restarts."""
+
+    def __init__(self, directory: str, max_entries: int = 256):
+        self.directory = directory
+        self.max_entries = max_entries
+        self._order: Optional["OrderedDict[str, None]"] = None  # least recently used first
+        self._lock = threading.Lock()
+
+    def _paths(self, name):
+        return os.path.join(self.directory, name + ".json"), os.path.join(self.directory, name + ".body")
+
+    def load(self, url):
+        name = _cache_name(url)
+        meta_path, body_path = self._paths(name)
+        try:
+            with open(meta_path, "r", encoding="utf-8") as f:
+                meta = json.load(f)
+            with open(body_path, "rb") as f:
+                body = f.read()
+            os.utime(meta_path)
+        except (OSError, ValueError):
+            return None, None
+        with self._lock:
+            self._touch(name)
+        return meta, body
+
+    def store(self, url, response):
+        meta = {
+            "url": url,
+            "etag": response.headers.get("ETag"),
+            "last_modified": response.headers.get("Last-Modified"),
+            "headers": dict(response.headers),
+            "encoding": response.encoding,
+        }
+        name = _cache_name(url)
+        meta_path, body_path = self._paths(name)
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            with open(body_path, "wb") as f:
+                f.write(response.content)
+            with open(meta_path, "w", encoding="utf-8") as f:
+                json.dump(meta, f)
+        except OSError as e:
+            log_action(f"Could not cache response for {url}: {e}")
+            return
+        with self._lock:
+            self._touch(name)
+            while len(self._order) > self.max_entries:
+                evicted, _ = self._order.popitem(last=False)
+                for path in self._paths(evicted):
+                    try:
+                        os.remove(path)
+                    except OSError:
+                        pass
+
+    def _touch(self, name):
+        if self._order is None:
+            self._order = OrderedDict.fromkeys(self._scan())
+        self._order[name] = None
+        self._order.move_to_end(name)
+
+    def _scan(self):
+        """Names already on disk, least recently used first."""
+        def mtime(name):
+            try:
+                return os.path.getmtime(self._paths(name)[0])
+            except OSError:
+                return 0.0
+
+        try:
+            names = [f[:-len(".json")] for f in os.listdir(self.directory) if f.endswith(".json")]
+        except OSError:
+            return []
+        return sorted(names, key=mtime)
+
+
+def _cache_name(url):
+    return hashlib.sha1(url.encode("utf-8")).hexdigest()
+
+
+class HttpClient:
+    """One pooled, keep-alive requests.Session for every web tool.
+
+    - connect/read timeouts on every request, so a hung host cannot stall
+      the orchestrator;
+    - GET/HEAD retries with exponential backoff on connection errors and on
+      429/5xx responses;
+    - at most `per_host_limit` requests in flight per host (tools run on the
+      thread pool, so several can hit the same site at once);
+    - with a `cache_dir`, GETs become conditional: a stored ETag/Last-Modified
+      is sent and a 304 is answered from the stored body; the least recently
+      used of more than `cache_max_entries` stored responses are dropped.
+    """
+
+    RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+    def __init__(self, connect_timeout: float = 5.0, read_timeout: float = 30.0, retries: int = 2,
+                 backoff: float = 0.5, pool_size: int = 10, per_host_limit: int = 4,
+                 cache_dir: Optional[str] = None, cache_max_entries: int = 256, user_agent: str = "rexode-cli"):
+        self.timeout = (connect_timeout, read_timeout)
+        self.per_host_limit = per_host_limit
+        self.cache = ConditionalCache(cache_dir, cache_max_entries) if cache_dir else None
+        self.session = requests.Session()
+        self.session.headers["User-Agent"] = user_agent
+        retry = Retry(
+            total=retries,
+            backoff_factor=backoff,
+            status_forcelist=self.RETRY_STATUSES,
+            allowed_methods=frozenset(["GET", "HEAD"]),
+            raise_on_status=False,
+        )
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self._host_slots: Dict[str, threading.BoundedSemaphore] = {}
+        self._slots_lock = threading.Lock()
+
+    @contextmanager
+    def host_slot(self, url):
+        host = urlsplit(url).netloc.lower()
+        with self._slots_lock:
+            slot = self._host_slots.get(host)
+            if slot is None:
+                slot = self._host_slots[host] = threading.BoundedSemaphore(self.per_host_limit)
+        with slot:
+            yield
+
+    def get(self, url, conditional: bool = True, **kwargs) -> requests.Response:
+        """GET with the shared pool and timeouts. The returned response has a
+        `from_cache` attribute, True when it was rebuilt from a 304."""
+        kwargs.setdefault("timeout", self.timeout)
+        use_cache = conditional and self.cache is not None and not kwargs.get("stream")
+        meta, body = self.cache.load(url) if use_cache else (None, None)
+        if meta:
+            headers = dict(kwargs.pop("headers", None) or {})
+            if meta.get("etag"):
+                headers["If-None-Match"] = meta["etag"]
+            if meta.get("last_modified"):
+                headers["If-Modified-Since"] = meta["last_modified"]
+            kwargs["headers"] = headers
+
+        with self.host_slot(url):
+            response = self.session.get(url, **kwargs)
+            if not kwargs.get("stream"):
+                # Read the body while holding the host slot.
+                response.content
+        response.from_cache = False
+
+        if meta and response.status_code == 304:
+            return self._from_cache(response, meta, body)
+        if use_cache and response.status_code == 200 and (
+            response.headers.get("ETag") or response.headers.get("Last-Modified")
+        ):
+            self.cache.store(url, response)
+        return response
+
+    def _from_cache(self, not_modified, meta, body):
+        response = requests.Response()
+        response.status_code = 200
+        response.url = not_modified.url
+        response.headers.update(meta.get("headers", {}))
+        # Validators may be refreshed on the 304.
+        response.headers.update({k: v for k, v in not_modified.headers.items() if k in ("ETag", "Last-Modified", "Date")})
+        response.encoding = meta.get("encoding")
+        response._content = body
+        response.request = not_modified.request
+        response.from_cache = True
+        return response
+
+    def download(self, url, save_path, chunk_size: int = 64 * 1024, progress: Callable[[int], None] = None) -> int:
+        """Streams `url` to `save_path`; returns the number of bytes written.
+        `progress(n)` is called after each chunk with its size."""
+        written = 0
+        with self.host_slot(url):
+            with self.session.get(url, stream=True, timeout=self.timeout) as response:
+                response.raise_for_status()
+                with open(save_path, "wb") as f:
+                    for chunk in response.iter_content(chunk_size=chunk_size):
+                        f.write(chunk)
+                        written += len(chunk)
+                        if progress:
+                            progress(len(chunk))
+        return written
+
+    def close(self):
+        self.session.close()
+
+
+_client: Optional[HttpClient] = None
+_client_lock = threading.Lock()
+
+
+def get_http_client() -> HttpClient:
+    """The process-wide client configured from Config."""
+    global _client
+    with _client_lock:
+        if _client is None:
+            _client = HttpClient(
+                connect_timeout=Config.HTTP_CONNECT_TIMEOUT,
+                read_timeout=Config.HTTP_READ_TIMEOUT,
+                retries=Config.HTTP_RETRIES,
+                backoff=Config.HTTP_BACKOFF,
+                pool_size=Config.HTTP_POOL_SIZE,
+                per_host_limit=Config.HTTP_PER_HOST_LIMIT,
+                cache_dir=Config.HTTP_CACHE_DIR,
+                cache_max_entries=Config.HTTP_CACHE_MAX_ENTRIES,
+            )
+        return _client
@@ -0,0 +1,189 @@
+import json
+import re
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+from rapidfuzz import fuzz, process
+
+from .config import Config
+from .logging import log_action
+from .tool_registry import ToolRegistry
+
+# fuzzywuzzy's full_process: anything but letters, digits and "_" becomes a
+# space, so a tool name such as "list_files" stays one token.
+_NON_WORD_RE = re.compile(r"(?u)\W")
+_FIELD_RE = re.compile(r"\{(\w+)(?::([dfw]))?\}")
+_FIELD_PATTERNS = {None: r".+?", "w": r"\w+", "d": r"[-+]?\d+", "f": r"[-+]?(?:\d+\.?\d*|\.\d+)"}
+_FIELD_TYPES = {None: str, "w": str, "d": int, "f": float}
+_GROUP_RE = re.compile(r"\(\?P(<|=)(\w+)")
+_NUMBERED_BACKREF_RE = re.compile(r"\\[1-9]")
+
+
+def preprocess(text: str) -> str:
+    return _NON_WORD_RE.sub(" ", text).lower().strip()
+
+
+class IntentMatch(NamedTuple):
+    tool_name: str
+    score: int  # 0-100
+    parameters: Dict[str, Any]
+    source: str  # "template" or "name"
+
+
+def template_to_regex(template: str) -> Tuple[str, Dict[str, Callable]]:
+    """Turns a parse-style template ("weather in {location}", "{count:d}
+    items") into a regex with one named group per field. Literal whitespace
+    matches any run of whitespace. Returns the regex and field -> converter."""
+    pattern, fields, position = [], {}, 0
+    for field in _FIELD_RE.finditer(template):
+        pattern.append(_literal(template[position:field.start()]))
+        name, spec = field.group(1), field.group(2)
+        pattern.append(f"(?P<{name}>{_FIELD_PATTERNS[spec]})")
+        fields[name] = _FIELD_TYPES[spec]
+        position = field.end()
+    pattern.append(_literal(template[position:]))
+    return "".join(pattern), fields
+
+
+def _literal(text: str) -> str:
+    return "".join(r"\s+" if part.isspace() else re.escape(part) for part in re.split(r"(\s+)", text) if part)
+
+
+class IntentMatcher:
+    """Rule-based tool detection, compiled once from the tool registry.
+
+    Two stages, cheapest and most specific first:
+
+    - templates: each tool's `intents` in tools.json, either
+      `{"regex": ...}` (matched anywhere in the input) or `{"template": ...}`
+      (a parse-style pattern for the whole input), optionally with fixed
+      `parameters`. All of them are compiled into one alternation, so the
+      input is matched with a single regex call whatever the number of
+      templates; the first template in tools.json order wins.
+    - names: the input is fuzzy matched against every tool name with
+      token_set_ratio. Name tokens are preprocessed once into an inverted
+      index, so an input that contains a tool name (score 100) is resolved
+      by dict lookups; otherwise rapidfuzz scores all names in one call,
+      skipping those that cannot reach `cutoff`.
+    """
+
+    def __init__(self, registry: ToolRegistry, cutoff: float = 60):
+        self.registry = registry
+        self.cutoff = cutoff
+        self.names = list(registry.names)
+        self._choices = [preprocess(name) for name in self.names]
+        self._token_sets = [frozenset(choice.split()) for choice in self._choices]
+        self._postings: Dict[str, List[int]] = {}
+        for position, tokens in enumerate(self._token_sets):
+            for token in tokens:
+                self._postings.setdefault(token, []).append(position)
+        self._templates: List[Tuple[str, Dict[str, Callable], Dict[str, Any]]] = []
+        self._pattern = self._compile_templates()
+
+    def _compile_templates(self) -> Optional[re.Pattern]:
+        alternatives = []
+        for name in self.names:
+            for intent in self.registry.get_schema(name).get("intents", []):
+                index = len(self._templates)
+                try:
+                    fragment, fields = self._template_fragment(intent, index)
+                    # Checked on its own so one bad template cannot break the rest.
+                    re.compile(f"^(?:{fragment})", re.IGNORECASE | re.DOTALL)
+                except (re.error, KeyError, ValueError) as e:
+                    log_action(f"Ignoring intent template of '{name}': {intent!r} ({e})")
+                    continue
+                self._templates.append((name, fields, dict(intent.get("parameters", {}))))
+                alternatives.append(f"(?P<_t{index}>{fragment})")
+        if not alternatives:
+            return None
+        return re.compile("^(?:" + "|".join(alternatives) + ")", re.IGNORECASE | re.DOTALL)
+
+    @staticmethod
+    def _template_fragment(intent: Dict[str, Any], index: int) -> Tuple[str, Dict[str, Callable]]:
+        if "template" in intent:
+            regex, fields = template_to_regex(intent["template"])
+            regex = rf"\s*{regex}\s*$"
+        elif "regex" in intent:
+            regex = intent["regex"]
+            if _NUMBERED_BACKREF_RE.search(regex):
+                raise ValueError("numbered backreferences are not supported, use (?P=name)")
+            fields = {name: str for name in re.compile(regex).groupindex}
+            regex = f".*?(?:{regex})"
+        else:
+            raise KeyError("an intent needs a 'template' or a 'regex'")
+        # Group names only have to be unique within the combined pattern.
+        regex = _GROUP_RE.sub(lambda m: f"(?P{m.group(1)}_t{index}_{m.group(2)}", regex)
+        return regex, fields
+
+    def match_template(self, user_input: str) -> Optional[IntentMatch]:
+        if self._pattern is None:
+            return None
+        match = self._pattern.match(user_input)
+        if match is None:
+            return None
+        # The template's own group closes last.
+        index = int(match.lastgroup[2:])
+        tool_name, fields, parameters = self._templates[index]
+        parameters = dict(parameters)
+        for field, convert in fields.items():
+            value = match.group(f"_t{index}_{field}")
+            if value is not None:
+                parameters[field] = convert(value.strip())
+        return IntentMatch(tool_name, 100, parameters, "template")
+
+    def _contained_name(self, tokens: frozenset) -> Optional[int]:
+        # token_set_ratio is 100 when one token set contains the other.
+        counts: Dict[int, int] = {}
+        for token in tokens:
+            for position in self._postings.get(token, ()):
+                counts[position] = counts.get(position, 0) + 1
+        full = [position for position, count in counts.items()
+                if count == len(self._token_sets[position]) or count == len(tokens)]
+        return min(full) if full else None
+
+    def match_name(self, user_input: str) -> Optional[IntentMatch]:
+        query = preprocess(user_input)
+        tokens = frozenset(query.split())
+        if not tokens:
+            return None
+        position = self._contained_name(tokens)
+        if position is not None:
+            return IntentMatch(self.names[position], 100, {}, "name")
+        best = process.extractOne(query, self._choices, scorer=fuzz.token_set_ratio, processor=None,
+                                  score_cutoff=self.cutoff)
+        # Scores are rounded as fuzzywuzzy did, so the cutoff means what it used to.
+        if best is None or round(best[1]) <= self.cutoff:
+            return None
+        return IntentMatch(self.names[best[2]], round(best[1]), {}, "name")
+
+    def detect(self, user_input: str) -> Optional[IntentMatch]:
+        return self.match_template(user_input) or self.match_name(user_input)
+
+    def detect_many(self, inputs: Sequence[str], workers: int = 1) -> List[Optional[IntentMatch]]:
+        """detect() for a batch: inputs no template claims are scored against
+        every tool name in one rapidfuzz cdist call (workers=-1 uses every
+        core)."""
+        results: List[Optional[IntentMatch]] = [self.match_template(text) for text in inputs]
+        pending = [i for i, result in enumerate(results) if result is None]
+        if not pending or not self._choices:
+            return results
+        queries = [preprocess(inputs[i]) for i in pending]
+        scores = process.cdist(queries, self._choices, scorer=fuzz.token_set_ratio, processor=None,
+                               score_cutoff=self.cutoff, dtype=np.float32, workers=workers)
+        best = scores.argmax(axis=1)
+        for i, row, position in zip(pending, scores, best):
+            if round(row[position]) > self.cutoff:
+                results[i] = IntentMatch(self.names[position], round(float(row[position])), {}, "name")
+        return results
+
+
+_matcher: Optional[IntentMatcher] = None
+
+
+def get_intent_matcher() -> IntentMatcher:
+    """Shared matcher over tools.json, for callers without a ToolManager."""
+    global _matcher
+    if _matcher is None:
+        with open(Config.TOOLS_JSON_PATH, "r", encoding="utf-8") as f:
+            _matcher = IntentMatcher(ToolRegistry(json.load(f)), cutoff=Config.INTENT_FUZZY_CUTOFF)
+    return _matcher
@@ -0,0 +1,239 @@
+import heapq
+import importlib
+import itertools
+import json
+import os
+import sqlite3
+import time
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from .logging import log_action
+from .triggers import trigger_from_dict
+
+# What to do with a job whose run time passed more than the grace period ago
+# (the CLI was not running, or the machine was asleep):
+#   run_once - run it once now; a repeating job then continues from now
+#   skip     - do not run it; a repeating job moves on to its next run
+#   coalesce - like run_once, but identical missed jobs (same callback and
+#              arguments) run only once between them
+MISFIRE_POLICIES = ("run_once", "skip", "coalesce")
+
+
+def callback_ref(callback: Callable) -> str:
+    """"module:qualname" for a module-level function, so a stored job can
+    find its callback again after a restart."""
+    module, name = getattr(callback, "__module__", None), getattr(callback, "__qualname__", "")
+    if not module or not name or "<" in name:
+        raise ValueError(f"{callback!r} is not a module-level function and cannot be stored")
+    return f"{module}:{name}"
+
+
+def resolve_callback(ref: str) -> Callable:
+    module, _, name = ref.partition(":")
+    target = importlib.import_module(module)
+    for part in name.split("."):
+        target = getattr(target, part)
+    return target
+
+
+class Job:
+    def __init__(self, callback: Optional[Callable], args: Tuple, trigger, next_run: datetime,
+                 name: str, kind: str, misfire: str = "run_once", key: Optional[str] = None,
+                 job_id: Optional[int] = None, runs: int = 0, callback_name: Optional[str] = None):
+        if misfire not in MISFIRE_POLICIES:
+            raise ValueError(f"Unknown misfire policy '{misfire}'; expected one of {', '.join(MISFIRE_POLICIES)}")
+        self.id = job_id
+        self.callback = callback
+        self.callback_name = callback_name
+        self.args = args
+        self.trigger = trigger
+        self.next_run = next_run
+        self.name = name
+        self.kind = kind
+        self.misfire = misfire
+        self.key = key
+        self.runs = runs
+        self.cancelled = False
+
+    def describe(self) -> Dict[str, Any]:
+        return {"id": self.id, "kind": self.kind, "name": self.name, "trigger": str(self.trigger),
+                "next_run": self.next_run, "runs": self.runs, "misfire": self.misfire}
+
+
+class MemoryJobStore:
+    """Pending jobs in a heap ordered by next run time. Lost on exit; any
+    callable works, including lambdas."""
+
+    def __init__(self):
+        self._heap: List[Tuple[float, int, Job]] = []
+        self._jobs: Dict[int, Job] = {}
+        self._keys: Dict[str, int] = {}
+        self._ids = itertools.count(1)
+        self._stale = 0
+
+    def add(self, job: Job) -> Job:
+        job.id = next(self._ids)
+        self._jobs[job.id] = job
+        if job.key:
+            self._keys[job.key] = job.id
+        heapq.heappush(self._heap, (job.next_run.timestamp(), job.id, job))
+        return job
+
+    def get_by_key(self, key: str) -> Optional[Job]:
+        job_id = self._keys.get(key)
+        return self._jobs.get(job_id) if job_id is not None else None
+
+    def remove(self, job_id: int) -> Optional[Job]:
+        job = self._jobs.pop(job_id, None)
+        if job is None:
+            return None
+        job.cancelled = True
+        self._keys.pop(job.key, None)
+        self._stale += 1
+        # Removed entries are skipped when popped; rebuild the heap if they
+        # start to make up most of it.
+        if self._stale > 64 and self._stale > len(self._heap) // 2:
+            self._heap = [entry for entry in self._heap if not entry[2].cancelled]
+            heapq.heapify(self._heap)
+            self._stale = 0
+        return job
+
+    def due(self, now: float) -> List[Job]:
+        """Takes every job due at `now` off the queue. Each must then be
+        passed to reschedule() or finish()."""
+        due = []
+        while self._heap and (self._heap[0][2].cancelled or self._heap[0][0] <= now):
+            _, _, job = heapq.heappop(self._heap)
+            if job.cancelled:
+                self._stale = max(0, self._stale - 1)
+            else:
+                due.append(job)
+        return due
+
+    def reschedule(self, job: Job):
+        heapq.heappush(self._heap, (job.next_run.timestamp(), job.id, job))
+
+    def finish(self, job: Job):
+        self._jobs.pop(job.id, None)
+        self._keys.pop(job.key, None)
+
+    def next_run_time(self) -> Optional[float]:
+        while self._heap and self._heap[0][2].cancelled:
+            heapq.heappop(self._heap)
+            self._stale = max(0, self._stale - 1)
+        return self._heap[0][0] if self._heap else None
+
+    def jobs(self) -> List[Job]:
+        return sorted(self._jobs.values(), key=lambda job: (job.next_run, job.id))
+
+    def __len__(self):
+        return len(self._jobs)
+
+    def close(self):
+        pass
+
+
+class SQLiteJobStore:
+    """Pending jobs in a SQLite table with an index on next_run, so they
+    survive restarts and finding the next due job is an index lookup.
+
+    Callbacks are stored as "module:qualname" and arguments as JSON, so
+    only module-level functions with JSON-serialisable arguments can be
+    stored. A job is finished (or rescheduled) before its callback runs:
+    a crash mid-run does not replay it.
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS jobs (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            callback TEXT NOT NULL,
+            args TEXT NOT NULL,
+            trigger TEXT NOT NULL,
+            next_run REAL NOT NULL,
+            name TEXT NOT NULL,
+            kind TEXT NOT NULL,
+            misfire TEXT NOT NULL,
+            idempotency_key TEXT UNIQUE,
+            runs INTEGER NOT NULL DEFAULT 0,
+            created REAL NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS jobs_next_run ON jobs (next_run);
+    """
+    COLUMNS = "id, callback, args, trigger, next_run, name, kind, misfire, idempotency_key, runs"
+
+    def __init__(self, path: str):
+        self.path = path
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        # The scheduler serialises access with its own lock.
+        self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.executescript(self.SCHEMA)
+
+    def _row_to_job(self, row) -> Job:
+        job_id, ref, args, trigger, next_run, name, kind, misfire, key, runs = row
+        return Job(None, tuple(json.loads(args)), trigger_from_dict(json.loads(trigger)),
+                   datetime.fromtimestamp(next_run), name, kind, misfire, key, job_id, runs, ref)
+
+    def add(self, job: Job) -> Job:
+        job.callback_name = callback_ref(job.callback)
+        try:
+            args = json.dumps(list(job.args))
+        except TypeError as e:
+            raise ValueError(f"Arguments of '{job.name}' cannot be stored: {e}") from e
+        cursor = self._db.execute(
+            "INSERT INTO jobs (callback, args, trigger, next_run, name, kind, misfire, idempotency_key, runs, created)"
+            " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (job.callback_name, args, json.dumps(job.trigger.to_dict()),
+             job.next_run.timestamp(), job.name, job.kind, job.misfire, job.key, job.runs, time.time()),
+        )
+        job.id = cursor.lastrowid
+        return job
+
+    def get_by_key(self, key: str) -> Optional[Job]:
+        row = self._db.execute(f"SELECT {self.COLUMNS} FROM jobs WHERE idempotency_key = ?", (key,)).fetchone()
+        return self._row_to_job(row) if row else None
+
+    def remove(self, job_id: int) -> Optional[Job]:
+        row = self._db.execute(f"SELECT {self.COLUMNS} FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        if row is None:
+            return None
+        self._db.execute("DELETE FROM jobs WHERE id = ?", (job_id,))
+        return self._row_to_job(row)
+
+    def due(self, now: float) -> List[Job]:
+        rows = self._db.execute(
+            f"SELECT {self.COLUMNS} FROM jobs WHERE next_run <= ? ORDER BY next_run, id", (now,)
+        ).fetchall()
+        jobs = []
+        for row in rows:
+            job = self._row_to_job(row)
+            try:
+                job.callback = resolve_callback(job.callback_name)
+            except Exception as e:
+                log_action(f"Dropping scheduled job #{job.id}: cannot load {job.callback_name}: {e}")
+                self.finish(job)
+                continue
+            jobs.append(job)
+        return jobs
+
+    def reschedule(self, job: Job):
+        self._db.execute("UPDATE jobs SET next_run = ?, runs = ? WHERE id = ?",
+                         (job.next_run.timestamp(), job.runs, job.id))
+
+    def finish(self, job: Job):
+        self._db.execute("DELETE FROM jobs WHERE id = ?", (job.id,))
+
+    def next_run_time(self) -> Optional[float]:
+        return self._db.execute("SELECT MIN(next_run) FROM jobs").fetchone()[0]
+
+    def jobs(self) -> List[Job]:
+        rows = self._db.execute(f"SELECT {self.COLUMNS} FROM jobs ORDER BY next_run, id").fetchall()
+        return [self._row_to_job(row) for row in rows]
+
+    def __len__(self):
+        return self._db.execute("SELECT COUNT(*) FROM jobs").fetchone()[0]
+
+    def close(self):
+        self._db.close()
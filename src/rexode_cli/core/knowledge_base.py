@@ -1,32 +1,126 @@
-import chromadb
-from chromadb.utils import embedding_functions
+import hashlib
+import json
 import os
+import threading
+import time
+from collections import OrderedDict
 from typing import List, Dict, Any
 
+import numpy as np
+
+from .config import Config
+from .logging import log_action
+
+# Bump when the documents built for a tool change shape; the next sync then
+# re-embeds everything instead of trusting the stored per-tool hashes.
+INDEX_VERSION = 1
+
+
+def tool_hash(tool: Dict[str, Any]) -> str:
+    """Fingerprint of the parts of a tool that end up in its documents."""
+    payload = json.dumps({
+        "description": tool.get("description", ""),
+        "examples": [example.get("input") for example in tool.get("examples", [])],
+    }, sort_keys=True)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:16]
+
+
+_models: Dict[str, Any] = {}
+_models_lock = threading.Lock()
+
+
+def load_sentence_transformer(model_name: str, device: str = "cpu", **kwargs):
+    """The sentence-transformers model, loaded once per process on first use.
+    Importing sentence-transformers pulls in torch and takes seconds, so
+    nothing does it until something is actually embedded."""
+    with _models_lock:
+        if model_name not in _models:
+            started = time.perf_counter()
+            from sentence_transformers import SentenceTransformer
+            _models[model_name] = SentenceTransformer(model_name_or_path=model_name, device=device, **kwargs)
+            log_action(f"Loaded embedding model {model_name} in {time.perf_counter() - started:.1f}s")
+        return _models[model_name]
+
+
+def model_loaded(model_name: str) -> bool:
+    return model_name in _models
+
+
+class LazySentenceTransformer:
+    """Embedding function for the local backend: a sentence-transformers
+    model loaded on the first call, without chromadb."""
+
+    def __init__(self, model_name: str = "all-MiniLM-L6-v2", device: str = "cpu"):
+        self.model_name = model_name
+        self.device = device
+
+    @property
+    def loaded(self) -> bool:
+        return model_loaded(self.model_name)
+
+    def __call__(self, input: List[str]) -> List[Any]:
+        embeddings = load_sentence_transformer(self.model_name, self.device).encode(list(input), convert_to_numpy=True)
+        return [np.asarray(embedding, dtype=np.float32) for embedding in embeddings]
+
+
+def normalize_query(text: str) -> str:
+    return " ".join(text.lower().split())
+
+
 class KnowledgeBase:
-    def __init__(self, persist_directory: str = "knowledge_base_db"):
+    """Tool documentation and examples in a vector index.
+
+    `backend` is "chroma" (a Chroma PersistentClient collection) or "local"
+    (a NumPy matrix in a memory-mapped .npy file, see local_index.py); both
+    live under `persist_directory` and default to Config.KB_BACKEND.
+    """
+
+    def __init__(self, persist_directory: str = "knowledge_base_db", embedding_function=None,
+                 query_cache_size: int = None, backend: str = None):
         self.persist_directory = os.path.join(os.path.dirname(__file__), "..", "..", "..", persist_directory)
         os.makedirs(self.persist_directory, exist_ok=True)
-        self.client = chromadb.PersistentClient(path=self.persist_directory)
-        
-        # Using a default embedding function. For production, consider more robust ones.
-        self.embedding_function = embedding_functions.SentenceTransformerEmbeddingFunction(model_name="all-MiniLM-L6-v2")
-        
-        self.collection = self.client.get_or_create_collection(
-            name="rexode_tools_knowledge",
-            embedding_function=self.embedding_function
-        )
+        self.backend = backend or Config.KB_BACKEND
+        # Query embeddings by normalized text, least recently used first.
+        self.query_cache_size = Config.KB_QUERY_CACHE_SIZE if query_cache_size is None else query_cache_size
+        self._query_cache: "OrderedDict[str, Any]" = OrderedDict()
+        self._query_cache_lock = threading.Lock()
 
-    def add_tool_documentation(self, tool_name: str, description: str, examples: List[Dict[str, str]]):
-        """Adds tool documentation and examples to the knowledge base."""
+        if self.backend == "chroma":
+            import chromadb
+            from .chroma_embedding import LazySentenceTransformerEmbedding
+            self.client = chromadb.PersistentClient(path=self.persist_directory)
+            # Using a default embedding function. For production, consider more robust ones.
+            self.embedding_function = embedding_function or LazySentenceTransformerEmbedding(model_name="all-MiniLM-L6-v2")
+            self.collection = self.client.get_or_create_collection(
+                name="rexode_tools_knowledge",
+                embedding_function=self.embedding_function
+            )
+        elif self.backend == "local":
+            from .local_index import LocalCollection
+            self.client = None
+            self.embedding_function = embedding_function or LazySentenceTransformer(model_name="all-MiniLM-L6-v2")
+            self.collection = LocalCollection(os.path.join(self.persist_directory, "rexode_tools_knowledge"),
+                                              self.embedding_function)
+        else:
+            raise ValueError(f"Unknown knowledge base backend '{self.backend}'; expected 'chroma' or 'local'")
+
+    @staticmethod
+    def _tool_documents(tool_name: str, description: str, examples: List[Dict[str, str]], extra=None):
+        """One document for the description and one per example."""
+        extra = extra or {}
         documents = [description]
-        metadatas = [{"type": "tool_description", "tool_name": tool_name}]
+        metadatas = [{"type": "tool_description", "tool_name": tool_name, **extra}]
         ids = [f"{tool_name}_description"]
 
         for i, example in enumerate(examples):
             documents.append(f"Example for {tool_name}: {example.get('input')}")
-            metadatas.append({"type": "tool_example", "tool_name": tool_name, "example_id": i})
+            metadatas.append({"type": "tool_example", "tool_name": tool_name, "example_id": i, **extra})
             ids.append(f"{tool_name}_example_{i}")
+        return documents, metadatas, ids
+
+    def add_tool_documentation(self, tool_name: str, description: str, examples: List[Dict[str, str]]):
+        """Adds tool documentation and examples to the knowledge base."""
+        documents, metadatas, ids = self._tool_documents(tool_name, description, examples)
         
         self.collection.add(
             documents=documents,
@@ -35,14 +129,100 @@ class KnowledgeBase:
         )
         print(f"Added documentation for tool: {tool_name}")
 
-    def query_knowledge_base(self, query_text: str, n_results: int = 5) -> List[Dict[str, Any]]:
-        """Queries the knowledge base for relevant information."""
+    def sync_tools(self, tools: List[Dict[str, Any]], batch_size: int = None) -> Dict[str, int]:
+        """Brings the index in line with tools.json (`tools` is its list of
+        categories). Only tools whose description or examples changed are
+        re-embedded, in batches of `batch_size` documents; tools no longer
+        listed are deleted. Returns how many tools were added, updated,
+        removed and left unchanged."""
+        batch_size = batch_size or Config.KB_SYNC_BATCH_SIZE
+        catalog = {}
+        for category in tools:
+            for tool in category["tools"]:
+                # As in the registry, the first definition of a name wins.
+                catalog.setdefault(tool["name"], tool)
+        hashes = {name: tool_hash(tool) for name, tool in catalog.items()}
+        catalog_hash = hashlib.sha256(json.dumps(hashes, sort_keys=True).encode("utf-8")).hexdigest()[:16]
+        summary = {"added": 0, "updated": 0, "removed": 0, "unchanged": 0}
+
+        state = self.collection.metadata or {}
+        rebuild = state.get("index_version") != INDEX_VERSION
+        if not rebuild and state.get("catalog_hash") == catalog_hash:
+            summary["unchanged"] = len(catalog)
+            return summary
+
+        indexed_ids: Dict[str, List[str]] = {}
+        indexed_hashes: Dict[str, str] = {}
+        existing = self.collection.get(include=["metadatas"])
+        for doc_id, metadata in zip(existing["ids"], existing["metadatas"]):
+            name = (metadata or {}).get("tool_name")
+            indexed_ids.setdefault(name, []).append(doc_id)
+            indexed_hashes[name] = (metadata or {}).get("tool_hash")
+
+        documents, metadatas, ids, stale = [], [], [], []
+        for name, tool in catalog.items():
+            if not rebuild and indexed_hashes.get(name) == hashes[name]:
+                summary["unchanged"] += 1
+                continue
+            tool_documents, tool_metadatas, tool_ids = self._tool_documents(
+                name, tool.get("description", ""), tool.get("examples", []), {"tool_hash": hashes[name]})
+            documents += tool_documents
+            metadatas += tool_metadatas
+            ids += tool_ids
+            # A tool that lost examples leaves their documents behind.
+            stale += [doc_id for doc_id in indexed_ids.get(name, []) if doc_id not in tool_ids]
+            summary["updated" if name in indexed_ids else "added"] += 1
+        for name, doc_ids in indexed_ids.items():
+            if name not in catalog:
+                stale += doc_ids
+                summary["removed"] += 1
+
+        for start in range(0, len(stale), batch_size):
+            self.collection.delete(ids=stale[start:start + batch_size])
+        for start in range(0, len(ids), batch_size):
+            self.collection.upsert(documents=documents[start:start + batch_size],
+                                   metadatas=metadatas[start:start + batch_size],
+                                   ids=ids[start:start + batch_size])
+        self.collection.modify(metadata={"index_version": INDEX_VERSION, "catalog_hash": catalog_hash})
+        log_action(f"Knowledge base synced (index v{INDEX_VERSION}, {catalog_hash}): {summary}, "
+                   f"{len(ids)} documents embedded")
+        return summary
+
+    def embed_queries(self, query_texts: List[str]) -> List[Any]:
+        """Embeddings for `query_texts`. Texts that differ only in case and
+        whitespace share a cache entry; all misses are embedded in one call
+        to the model."""
+        keys = [normalize_query(text) for text in query_texts]
+        with self._query_cache_lock:
+            cached = {key: self._query_cache[key] for key in keys if key in self._query_cache}
+            for key in cached:
+                self._query_cache.move_to_end(key)
+        missing = list(dict.fromkeys(key for key in keys if key not in cached))
+        if missing:
+            cached.update(zip(missing, self.embedding_function(missing)))
+            with self._query_cache_lock:
+                for key in missing:
+                    self._query_cache[key] = cached[key]
+                while len(self._query_cache) > self.query_cache_size:
+                    self._query_cache.popitem(last=False)
+        return [cached[key] for key in keys]
+
+    def query_many(self, query_texts: List[str], n_results: int = 5) -> List[tuple]:
+        """query_knowledge_base for several queries in one embedding pass and
+        one collection query; returns a (documents, metadatas, distances)
+        tuple per query."""
+        if not query_texts:
+            return []
         results = self.collection.query(
-            query_texts=[query_text],
+            query_embeddings=self.embed_queries(query_texts),
             n_results=n_results,
             include=['documents', 'metadatas', 'distances']
         )
-        return results['documents'][0], results['metadatas'][0], results['distances'][0]
+        return list(zip(results['documents'], results['metadatas'], results['distances']))
+
+    def query_knowledge_base(self, query_text: str, n_results: int = 5) -> List[Dict[str, Any]]:
+        """Queries the knowledge base for relevant information."""
+        return self.query_many([query_text], n_results=n_results)[0]
 
 # Example usage (for testing purposes)
 if __name__ == "__main__":
@@ -0,0 +1,162 @@
+import json
+import os
+import threading
+from typing import Any, Callable, Dict, List, Optional
+
+import numpy as np
+
+from .logging import log_action
+
+
+class LocalCollection:
+    """The part of the Chroma collection API that KnowledgeBase uses, backed
+    by NumPy instead of chromadb.
+
+    Embeddings are L2-normalised and kept as one float32 matrix in
+    `<path>.npy`, memory-mapped on load; ids, documents, metadata and the
+    collection metadata live in `<path>.json`. A query is one matrix product
+    and an exact top-k, which for a few hundred tool documents needs no ANN
+    index. Distances are squared L2 between unit vectors (2 - 2 * cosine),
+    the same as Chroma's default space.
+    """
+
+    def __init__(self, path: str, embedding_function: Callable[[List[str]], List[Any]]):
+        self.path = path
+        self.embedding_function = embedding_function
+        self.metadata: Optional[Dict[str, Any]] = None
+        self._ids: List[str] = []
+        self._documents: List[str] = []
+        self._metadatas: List[Dict[str, Any]] = []
+        self._vectors = np.zeros((0, 0), dtype=np.float32)
+        self._lock = threading.Lock()
+        self._load()
+
+    # -- storage ----------------------------------------------------------
+
+    def _load(self):
+        try:
+            with open(self.path + ".json", "r", encoding="utf-8") as f:
+                state = json.load(f)
+            vectors = np.load(self.path + ".npy", mmap_mode="r")
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError) as e:
+            log_action(f"Ignoring unreadable local index {self.path}: {e}")
+            return
+        if len(state["ids"]) != len(vectors):
+            log_action(f"Ignoring local index {self.path}: {len(state['ids'])} ids but {len(vectors)} vectors")
+            return
+        self.metadata = state.get("metadata")
+        self._ids, self._documents, self._metadatas = state["ids"], state["documents"], state["metadatas"]
+        self._vectors = vectors
+
+    def _save(self):
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        state = {"metadata": self.metadata, "ids": self._ids, "documents": self._documents,
+                 "metadatas": self._metadatas}
+        if isinstance(self._vectors, np.memmap):
+            # Windows will not replace a file that is still mapped, so the
+            # loaded matrix moves into memory before it is written back.
+            self._vectors = np.array(self._vectors, dtype=np.float32)
+        # Write both files aside and swap them in, so a crash never leaves a
+        # matrix that does not match its ids.
+        with open(self.path + ".npy.tmp", "wb") as f:
+            np.save(f, np.ascontiguousarray(self._vectors, dtype=np.float32))
+        with open(self.path + ".json.tmp", "w", encoding="utf-8") as f:
+            json.dump(state, f)
+        os.replace(self.path + ".npy.tmp", self.path + ".npy")
+        os.replace(self.path + ".json.tmp", self.path + ".json")
+
+    @staticmethod
+    def _normalize(embeddings) -> np.ndarray:
+        matrix = np.asarray(embeddings, dtype=np.float32)
+        if matrix.ndim == 1:
+            matrix = matrix[np.newaxis, :]
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        return matrix / np.where(norms == 0, 1.0, norms)
+
+    # -- Chroma collection API ----------------------------------------------
+
+    def count(self) -> int:
+        return len(self._ids)
+
+    def modify(self, metadata: Optional[Dict[str, Any]] = None):
+        with self._lock:
+            self.metadata = dict(metadata) if metadata is not None else None
+            self._save()
+
+    def get(self, ids: Optional[List[str]] = None, include=None) -> Dict[str, Any]:
+        with self._lock:
+            if ids is None:
+                positions = range(len(self._ids))
+            else:
+                wanted = set(ids)
+                positions = [i for i, doc_id in enumerate(self._ids) if doc_id in wanted]
+            return {
+                "ids": [self._ids[i] for i in positions],
+                "documents": [self._documents[i] for i in positions],
+                "metadatas": [self._metadatas[i] for i in positions],
+            }
+
+    def add(self, documents: List[str], metadatas: List[Dict[str, Any]], ids: List[str], embeddings=None):
+        existing = set(self._ids).intersection(ids)
+        if existing:
+            raise ValueError(f"Documents already exist: {', '.join(sorted(existing))}")
+        self.upsert(documents=documents, metadatas=metadatas, ids=ids, embeddings=embeddings)
+
+    def upsert(self, documents: List[str], metadatas: List[Dict[str, Any]], ids: List[str], embeddings=None):
+        if not ids:
+            return
+        vectors = self._normalize(embeddings if embeddings is not None else self.embedding_function(documents))
+        with self._lock:
+            position = {doc_id: i for i, doc_id in enumerate(self._ids)}
+            matrix = np.array(self._vectors, dtype=np.float32) if len(self._ids) else \
+                np.zeros((0, vectors.shape[1]), dtype=np.float32)
+            new_rows = []
+            for doc_id, document, metadata, vector in zip(ids, documents, metadatas, vectors):
+                if doc_id in position:
+                    i = position[doc_id]
+                    matrix[i] = vector
+                    self._documents[i], self._metadatas[i] = document, metadata
+                else:
+                    position[doc_id] = len(self._ids)
+                    self._ids.append(doc_id)
+                    self._documents.append(document)
+                    self._metadatas.append(metadata)
+                    new_rows.append(vector)
+            if new_rows:
+                matrix = np.vstack([matrix, np.stack(new_rows)])
+            self._vectors = matrix
+            self._save()
+
+    def delete(self, ids: List[str]):
+        with self._lock:
+            removed = set(ids)
+            keep = [i for i, doc_id in enumerate(self._ids) if doc_id not in removed]
+            if len(keep) == len(self._ids):
+                return
+            self._ids = [self._ids[i] for i in keep]
+            self._documents = [self._documents[i] for i in keep]
+            self._metadatas = [self._metadatas[i] for i in keep]
+            self._vectors = np.array(self._vectors[keep], dtype=np.float32)
+            self._save()
+
+    def query(self, query_embeddings, n_results: int = 10, include=None) -> Dict[str, List[List[Any]]]:
+        queries = self._normalize(query_embeddings)
+        results = {"ids": [], "documents": [], "metadatas": [], "distances": []}
+        with self._lock:
+            vectors, ids, documents, metadatas = self._vectors, self._ids, self._documents, self._metadatas
+        k = min(n_results, len(ids))
+        if k == 0:
+            for values in results.values():
+                values.extend([] for _ in range(len(queries)))
+            return results
+        similarities = queries @ np.asarray(vectors).T
+        for row in similarities:
+            top = np.argpartition(-row, k - 1)[:k]
+            top = top[np.argsort(-row[top], kind="stable")]
+            results["ids"].append([ids[i] for i in top])
+            results["documents"].append([documents[i] for i in top])
+            results["metadatas"].append([metadatas[i] for i in top])
+            results["distances"].append([float(2.0 - 2.0 * row[i]) for i in top])
+        return results
@@ -1,6 +1,9 @@
 import subprocess
+import sys
 from rich.console import Console
 
+from .process_runner import run_command_sync
+
 console = Console()
 
 def execute_nl_command(command: str, confirm: bool = True):
@@ -28,6 +31,24 @@ def execute_nl_command(command: str, confirm: bool = True):
                 console.print("Execution cancelled.", style="bold yellow")
                 return "Execution cancelled."
     
+    if sys.platform != "win32":
+        # Runs in the task's persistent shell when there is one.
+        result = run_command_sync(command, stream=False)
+        output_str = ""
+        if result["stdout"]:
+            output_str += "[bold green]Output:[/bold green]\n"
+            output_str += result["stdout"]
+        if result["stderr"]:
+            output_str += "[bold red]Errors:[/bold red]\n"
+            output_str += result["stderr"]
+        if result.get("error") or result["returncode"] != 0:
+            output_str = f"[bold red]An error occurred while executing the command:[/bold red]\n" \
+                         f"[bold red]Return Code:[/bold red] {result['returncode']} {result.get('error', '')}\n" + output_str
+        elif not output_str:
+            output_str = "Command executed successfully with no output."
+        console.print(output_str)
+        return output_str
+
     try:
         # Use powershell for better compatibility on Windows, especially for chained commands
         # Using -Command "& { ... }" ensures proper parsing of complex commands
@@ -0,0 +1,212 @@
+import json
+import math
+import re
+from typing import Any, Dict, List, Optional, Tuple
+
+# A parameter key at the start of a word: "path=", "--path=", "--path", "-v".
+_KEY_RE = re.compile(r"(--?)?([A-Za-z_][\w-]*)(=)?")
+_WORD_RE = re.compile(r"\S+")
+_INTEGER_RE = re.compile(r"[-+]?\d+")
+_JSON = json.JSONDecoder()
+
+TRUE_WORDS = frozenset({"true", "yes", "y", "on", "1"})
+FALSE_WORDS = frozenset({"false", "no", "n", "off", "0"})
+
+# How a value was written, which decides how it is coerced.
+UNQUOTED, QUOTED, JSON_LITERAL, FLAG = "unquoted", "quoted", "json", "flag"
+_NO_MATCH = object()
+
+
+def _key(name: str) -> str:
+    return name.lower().replace("-", "_")
+
+
+def _boundary(text: str, i: int) -> bool:
+    return i == len(text) or text[i].isspace()
+
+
+def _scan_quoted(text: str, start: int) -> Optional[Tuple[str, int]]:
+    """Reads a quoted string at `start`. It ends at a matching quote followed
+    by whitespace or the end, so "it's" inside 'it's fine' is kept; \\ escapes
+    the quote and itself, other backslashes are literal (Windows paths).
+    Returns (value, end) or None if the quote is never closed."""
+    quote, chars, i, n = text[start], [], start + 1, len(text)
+    while i < n:
+        c = text[i]
+        if c == "\\" and i + 1 < n and text[i + 1] in (quote, "\\"):
+            chars.append(text[i + 1])
+            i += 2
+            continue
+        if c == quote and _boundary(text, i + 1):
+            return "".join(chars), i + 1
+        chars.append(c)
+        i += 1
+    return None
+
+
+def scan_parameters(text: str, properties: Dict[str, Any]) -> Dict[str, Tuple[str, Any, str]]:
+    """Splits rule-based input into raw parameter values in one pass.
+
+    Understands `name=value`, `--name value`, `--name=value` and a bare
+    `--name` (a flag). Values may be quoted with ' or " (spaces and `x=`
+    inside are kept) or be JSON arrays/objects. An unquoted value runs until
+    the next key of this tool, so `content=Hello World` needs no quotes.
+    Keys are case-insensitive and `-` matches `_`; words before the first
+    key (the tool name) and unknown keys are ordinary words.
+
+    Returns {parameter: (kind, value, source text)}, where kind is UNQUOTED,
+    QUOTED, JSON_LITERAL or FLAG. Later values win.
+    """
+    keys = {_key(name): name for name in properties}
+    switches = {name for name, schema in properties.items() if "boolean" in _types(schema)}
+    values: Dict[str, Tuple[str, Any, str]] = {}
+    current = None  # parameter collecting an unquoted value, or awaiting one
+    flag = False  # current came from "--name" with no "="
+    value_start = value_end = -1
+    i, n = 0, len(text)
+
+    def close():
+        if current is None:
+            return
+        if value_start < 0:
+            values[current] = (FLAG, True, "") if flag else (UNQUOTED, "", "")
+        else:
+            raw = text[value_start:value_end]
+            values[current] = (UNQUOTED, raw, raw)
+
+    while i < n:
+        if text[i].isspace():
+            i += 1
+            continue
+        match = _KEY_RE.match(text, i)
+        if match:
+            dashes, key, equals = match.groups()
+            name = keys.get(_key(key))
+            if name is not None and (equals or (dashes and _boundary(text, match.end()))):
+                close()
+                current, flag, value_start, value_end = name, not equals, -1, -1
+                i = match.end()
+                if flag or _boundary(text, i):
+                    continue  # the value, if any, is the next word
+                # else fall through and read the value right after "="
+        if current is not None and flag and current in switches and value_start < 0:
+            # "--verbose" only takes the next word if it is a yes/no.
+            word = _WORD_RE.match(text, i).group().lower()
+            if word not in TRUE_WORDS and word not in FALSE_WORDS:
+                close()
+                current = None
+        if current is None:
+            i = _WORD_RE.match(text, i).end()
+            continue
+        if value_start < 0:
+            c = text[i]
+            if c in "'\"":
+                quoted = _scan_quoted(text, i)
+                if quoted is not None:
+                    values[current] = (QUOTED, quoted[0], text[i:quoted[1]])
+                    current, i = None, quoted[1]
+                    continue
+            elif c in "[{":
+                try:
+                    literal, end = _JSON.raw_decode(text, i)
+                except ValueError:
+                    pass
+                else:
+                    if _boundary(text, end):
+                        values[current] = (JSON_LITERAL, literal, text[i:end])
+                        current, i = None, end
+                        continue
+            value_start = i
+        value_end = i = _WORD_RE.match(text, i).end()
+    close()
+    return values
+
+
+def _types(schema: Dict[str, Any]) -> List[str]:
+    declared = schema.get("type")
+    if declared is None:
+        return []
+    return [declared] if isinstance(declared, str) else list(declared)
+
+
+def coerce_value(kind: str, value: Any, source: str, schema: Dict[str, Any]) -> Any:
+    """Converts a scanned value to the parameter's JSON schema type. Values
+    that do not convert are returned as written (a string), for the caller's
+    validation to report."""
+    types = _types(schema)
+    if kind == FLAG:
+        return True if not types or "boolean" in types else ""
+    if not types:
+        return value
+    for type_name in types:
+        converted = _coerce_as(type_name, kind, value, source, schema)
+        if converted is not _NO_MATCH:
+            return converted
+    return source if kind == JSON_LITERAL else value
+
+
+def _coerce_as(type_name: str, kind: str, value: Any, source: str, schema: Dict[str, Any]) -> Any:
+    if kind == JSON_LITERAL:
+        if type_name == "array" and isinstance(value, list):
+            return [_coerce_json(item, schema.get("items", {})) for item in value]
+        if type_name == "object" and isinstance(value, dict):
+            return value
+        if type_name == "string":
+            return source
+        if type_name == "boolean":
+            return value if isinstance(value, bool) else _NO_MATCH
+        if type_name == "integer":
+            return value if isinstance(value, int) and not isinstance(value, bool) else _NO_MATCH
+        if type_name == "number":
+            return value if isinstance(value, (int, float)) and not isinstance(value, bool) else _NO_MATCH
+        if type_name == "null":
+            return None if value is None else _NO_MATCH
+        return _NO_MATCH
+    text = value.strip() if kind == UNQUOTED else value
+    if type_name == "string":
+        return value
+    if type_name == "integer":
+        return int(text) if _INTEGER_RE.fullmatch(text) else _NO_MATCH
+    if type_name == "number":
+        if _INTEGER_RE.fullmatch(text):
+            return int(text)
+        try:
+            number = float(text)
+        except ValueError:
+            return _NO_MATCH
+        return number if math.isfinite(number) else _NO_MATCH
+    if type_name == "boolean":
+        lowered = text.lower()
+        if lowered in TRUE_WORDS:
+            return True
+        if lowered in FALSE_WORDS:
+            return False
+        return _NO_MATCH
+    if type_name == "array":
+        # Unquoted lists are comma-separated: tags=a, b,c
+        items = schema.get("items", {})
+        parts = [part.strip() for part in text.split(",")]
+        return [coerce_value(UNQUOTED, part, part, items) for part in parts if part]
+    if type_name == "null":
+        return None if text.lower() in ("null", "none", "") else _NO_MATCH
+    return _NO_MATCH
+
+
+def _coerce_json(value: Any, schema: Dict[str, Any]) -> Any:
+    # Items of a JSON array: strings convert like quoted values, the rest
+    # must already have the right type.
+    if isinstance(value, str):
+        return coerce_value(QUOTED, value, value, schema)
+    return coerce_value(JSON_LITERAL, value, json.dumps(value), schema)
+
+
+def extract_parameters(text: str, parameters_schema: Dict[str, Any]) -> Tuple[Dict[str, Any], List[str]]:
+    """Parses rule-based input against a tool's `parameters` JSON schema.
+    Returns (parameters coerced to their schema types, missing required
+    parameter names)."""
+    properties = parameters_schema.get("properties", {})
+    scanned = scan_parameters(text, properties)
+    parameters = {name: coerce_value(kind, value, source, properties[name])
+                  for name, (kind, value, source) in scanned.items()}
+    missing = [name for name in parameters_schema.get("required", []) if name not in parameters]
+    return parameters, missing
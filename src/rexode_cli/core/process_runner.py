@@ -0,0 +1,257 @@
+import asyncio
+import codecs
+import os
+import signal
+import subprocess
+import sys
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, Optional
+
+from .config import Config
+from .logging import log_action
+
+
+class OutputBuffer:
+    """Keeps the first `head` and the last `tail` characters of a stream,
+    however long it gets; the middle is only counted."""
+
+    def __init__(self, head: int = 4000, tail: int = 4000):
+        self.head_limit = head
+        self.tail_limit = tail
+        self._head = []
+        self._head_size = 0
+        self._tail = deque()
+        self._tail_size = 0
+        self.total = 0
+
+    def write(self, text: str):
+        self.total += len(text)
+        if self._head_size < self.head_limit:
+            take = text[:self.head_limit - self._head_size]
+            self._head.append(take)
+            self._head_size += len(take)
+            text = text[len(take):]
+        if not text:
+            return
+        self._tail.append(text)
+        self._tail_size += len(text)
+        while self._tail_size - len(self._tail[0]) >= self.tail_limit:
+            self._tail_size -= len(self._tail.popleft())
+
+    @property
+    def omitted(self) -> int:
+        return max(0, self.total - self.head_limit - self.tail_limit)
+
+    def text(self) -> str:
+        head = "".join(self._head)
+        tail = "".join(self._tail)
+        if len(tail) > self.tail_limit:
+            tail = tail[-self.tail_limit:]
+        if not self.omitted:
+            return head + tail
+        return f"{head}\n... [{self.omitted} characters omitted] ...\n{tail}"
+
+
+# Processes running a command right now. cancel_running() is called from
+# other threads (the ESC key listener), so access is locked.
+_running = set()
+_running_lock = threading.Lock()
+
+# Persistent shell used by run_command_sync while set; the orchestrator sets
+# it for the duration of a task and asyncio.to_thread carries it into the
+# threads sync tools run on.
+_shell_session = ContextVar("rexode_shell_session", default=None)
+
+
+@contextmanager
+def tracked(process):
+    """Registers a process with cancel_running() while the block runs.
+    `process.rexode_cancelled` is True afterwards if it was cancelled."""
+    process.rexode_cancelled = False
+    with _running_lock:
+        _running.add(process)
+    try:
+        yield process
+    finally:
+        with _running_lock:
+            _running.discard(process)
+
+
+@contextmanager
+def use_shell_session(session):
+    """Routes run_command_sync calls without a `cwd` through `session` (a
+    ShellSession) until the block exits."""
+    token = _shell_session.set(session)
+    try:
+        yield session
+    finally:
+        _shell_session.reset(token)
+
+
+def kill_process_tree(process):
+    """Kills the process and, on POSIX, everything in its process group."""
+    try:
+        if sys.platform != "win32":
+            os.killpg(process.pid, signal.SIGKILL)
+        else:
+            subprocess.run(["taskkill", "/F", "/T", "/PID", str(process.pid)], capture_output=True)
+            process.kill()
+    except (ProcessLookupError, PermissionError, OSError):
+        pass
+
+
+def cancel_running() -> int:
+    """Kills every command started by run_command that is still running.
+    Safe to call from any thread; returns how many were cancelled."""
+    with _running_lock:
+        processes = list(_running)
+    for process in processes:
+        process.rexode_cancelled = True
+        kill_process_tree(process)
+    return len(processes)
+
+
+async def run_command(command: str, cwd: Optional[str] = None, timeout: Optional[float] = None,
+                      max_output_bytes: Optional[int] = None, on_output: Callable[[str, str], None] = None,
+                      head: int = 4000, tail: int = 4000, env: Optional[Dict[str, str]] = None) -> Dict[str, Any]:
+    """Runs a shell command without blocking the event loop.
+
+    stdout and stderr are read as they are produced: each decoded piece is
+    passed to `on_output(stream_name, text)` and kept in an OutputBuffer, so
+    memory stays bounded however chatty the command is. The command is
+    killed when it runs longer than `timeout` seconds, prints more than
+    `max_output_bytes`, or cancel_running() is called.
+
+    Returns stdout, stderr, returncode, elapsed and, when the command was
+    killed, an `error` explaining why.
+    """
+    started = time.monotonic()
+    process = await asyncio.create_subprocess_shell(
+        command,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE,
+        stdin=asyncio.subprocess.DEVNULL,
+        cwd=cwd,
+        env=env,
+        # Own process group, so the whole tree can be killed at once.
+        start_new_session=sys.platform != "win32",
+    )
+    buffers = {"stdout": OutputBuffer(head, tail), "stderr": OutputBuffer(head, tail)}
+    received = 0
+    over_limit = False
+
+    async def pump(stream, name):
+        nonlocal received, over_limit
+        decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+        while True:
+            data = await stream.read(8192)
+            if not data:
+                text = decoder.decode(b"", final=True)
+            else:
+                received += len(data)
+                text = decoder.decode(data)
+            if text:
+                buffers[name].write(text)
+                if on_output:
+                    on_output(name, text)
+            if not data:
+                return
+            if max_output_bytes and received > max_output_bytes and not over_limit:
+                over_limit = True
+                kill_process_tree(process)
+
+    error = None
+    with tracked(process):
+        try:
+            readers = asyncio.gather(pump(process.stdout, "stdout"), pump(process.stderr, "stderr"))
+            try:
+                await asyncio.wait_for(asyncio.shield(readers), timeout)
+            except asyncio.TimeoutError:
+                error = f"Killed after exceeding the {timeout:g} s time limit"
+                kill_process_tree(process)
+                await readers
+            await process.wait()
+        except asyncio.CancelledError:
+            kill_process_tree(process)
+            raise
+
+    if process.rexode_cancelled:
+        error = "Cancelled by user"
+    elif over_limit:
+        error = f"Killed after exceeding the {max_output_bytes} byte output limit"
+    if error:
+        log_action(f"Command '{command}': {error}")
+    result = {
+        "stdout": buffers["stdout"].text(),
+        "stderr": buffers["stderr"].text(),
+        "returncode": process.returncode,
+        "elapsed": round(time.monotonic() - started, 3),
+    }
+    if error:
+        result["error"] = error
+    return result
+
+
+class LineEcho:
+    """on_output callback that prints complete lines to a rich console as
+    they arrive, dimmed, with stderr in red."""
+
+    def __init__(self, console, prefix: str = "  │ "):
+        self.console = console
+        self.prefix = prefix
+        self._partial = {"stdout": "", "stderr": ""}
+
+    def __call__(self, name, text):
+        lines = (self._partial[name] + text).split("\n")
+        self._partial[name] = lines.pop()
+        for line in lines:
+            self._print(name, line)
+
+    def flush(self):
+        for name, line in self._partial.items():
+            if line:
+                self._print(name, line)
+        self._partial = {"stdout": "", "stderr": ""}
+
+    def _print(self, name, line):
+        self.console.print(self.prefix + line.rstrip("\r"), style="red" if name == "stderr" else "dim",
+                           markup=False, highlight=False)
+
+
+def run_command_sync(command: str, cwd: Optional[str] = None, timeout: Optional[float] = None,
+                     stream: Optional[bool] = None, **kwargs) -> Dict[str, Any]:
+    """run_command for synchronous tools, with the limits from Config.
+
+    With `stream` (Config.SHELL_STREAM_OUTPUT by default) output is echoed
+    to the console line by line while the command runs. Inside
+    use_shell_session, commands without a `cwd` or `env` run in that
+    persistent shell instead of a new process. Works whether or not an
+    event loop is running on the calling thread.
+    """
+    kwargs.setdefault("max_output_bytes", Config.SHELL_MAX_OUTPUT_BYTES)
+    kwargs.setdefault("head", Config.SHELL_OUTPUT_HEAD)
+    kwargs.setdefault("tail", Config.SHELL_OUTPUT_TAIL)
+    echo = None
+    if stream if stream is not None else Config.SHELL_STREAM_OUTPUT:
+        from rich.console import Console
+        echo = kwargs["on_output"] = LineEcho(Console())
+    timeout = timeout if timeout is not None else Config.SHELL_TIMEOUT
+    session = _shell_session.get() if cwd is None and "env" not in kwargs else None
+    try:
+        if session is not None:
+            return session.run(command, timeout=timeout, **kwargs)
+        coroutine = run_command(command, cwd=cwd, timeout=timeout, **kwargs)
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return asyncio.run(coroutine)
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            return executor.submit(asyncio.run, coroutine).result()
+    finally:
+        if echo:
+            echo.flush()
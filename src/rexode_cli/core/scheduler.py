@@ -0,0 +1,218 @@
+import asyncio
+import threading
+import time
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from .config import Config
+from .job_store import Job, MemoryJobStore, SQLiteJobStore
+from .logging import log_action
+from .triggers import After, At, Cron, parse_trigger
+
+
+class Scheduler:
+    """Timed jobs on one asyncio event loop.
+
+    Pending jobs live in a job store ordered by their next run time (a heap
+    in memory, or a SQLite table indexed on next_run); a single coroutine
+    sleeps until the earliest one is due, so a thousand reminders cost one
+    entry each rather than one sleeping thread each. Sync callbacks run on
+    the loop's executor, async ones as tasks.
+
+    start() attaches the scheduler to the running loop (the CLI does this at
+    startup). If a job is added before that, the scheduler starts its own
+    loop on a single background thread instead. add/cancel/list_jobs are
+    safe to call from any thread.
+    """
+
+    MAX_SLEEP = 60.0
+
+    def __init__(self, store=None, misfire_grace: Optional[float] = None):
+        self.store = store if store is not None else MemoryJobStore()
+        self.misfire_grace = Config.SCHEDULER_MISFIRE_GRACE if misfire_grace is None else misfire_grace
+        self._lock = threading.Lock()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._wake: Optional[asyncio.Event] = None
+        self._runner = None
+        self._thread = None
+        self._start_lock = threading.Lock()
+
+    # -- lifecycle --------------------------------------------------------
+
+    def start(self):
+        """Runs the scheduler on the event loop of the calling coroutine."""
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            if self._loop is not None:
+                return
+            self._loop = loop
+        self._runner = loop.create_task(self._run())
+
+    def _start_thread(self):
+        ready = threading.Event()
+
+        def run_loop():
+            async def main():
+                self.start()
+                ready.set()
+                await self._runner
+            try:
+                asyncio.run(main())
+            except asyncio.CancelledError:
+                pass
+
+        self._thread = threading.Thread(target=run_loop, name="rexode-scheduler", daemon=True)
+        self._thread.start()
+        ready.wait()
+
+    def stop(self):
+        with self._lock:
+            loop, runner = self._loop, self._runner
+            self._loop = self._runner = self._wake = None
+        if loop is not None and runner is not None and not loop.is_closed():
+            loop.call_soon_threadsafe(runner.cancel)
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+    def _notify(self):
+        loop, wake = self._loop, self._wake
+        if loop is not None and wake is not None:
+            try:
+                loop.call_soon_threadsafe(wake.set)
+            except RuntimeError:
+                pass  # loop already closed
+
+    # -- jobs -------------------------------------------------------------
+
+    def add(self, callback: Callable, trigger, args: Tuple = (), name: Optional[str] = None,
+            kind: str = "task", key: Optional[str] = None, misfire: str = "run_once") -> Job:
+        """Schedules `callback(*args)`; `trigger` is an At/After/Cron or
+        anything parse_trigger accepts. If a pending job already has the
+        idempotency `key`, that job is returned and nothing is added."""
+        if not hasattr(trigger, "first"):
+            trigger = parse_trigger(trigger)
+        next_run = trigger.first(datetime.now())
+        if next_run is None:
+            raise ValueError(f"The trigger {trigger} never fires")
+        job = Job(callback, tuple(args), trigger, next_run,
+                  name or getattr(callback, "__name__", "job"), kind, misfire, key)
+        with self._lock:
+            existing = self.store.get_by_key(key) if key else None
+            if existing is None:
+                self.store.add(job)
+        if existing is not None:
+            log_action(f"Not scheduling '{job.name}' again: #{existing.id} has the same key '{key}'")
+            return existing
+        with self._start_lock:
+            if self._loop is None:
+                self._start_thread()
+        log_action(f"Scheduled {kind} #{job.id} '{job.name}' ({trigger}), next run {next_run}")
+        self._notify()
+        return job
+
+    def cancel(self, job_id: int) -> bool:
+        with self._lock:
+            job = self.store.remove(int(job_id))
+        if job is None:
+            return False
+        log_action(f"Cancelled scheduled {job.kind} #{job.id} '{job.name}'")
+        return True
+
+    def list_jobs(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            jobs = self.store.jobs()
+        return [job.describe() for job in jobs]
+
+    def __len__(self):
+        with self._lock:
+            return len(self.store)
+
+    # -- runner -----------------------------------------------------------
+
+    def _due_jobs(self):
+        """Takes every job that is due off the store, applying misfire
+        policies; returns the jobs to run now and the seconds until the next
+        one (None if nothing is pending)."""
+        run = []
+        coalesced = set()
+        now = time.time()
+        now_dt = datetime.fromtimestamp(now)
+        with self._lock:
+            for job in self.store.due(now):
+                missed = now - job.next_run.timestamp() > self.misfire_grace
+                signature = (job.callback_name or id(job.callback), repr(job.args))
+                if missed and job.misfire == "skip":
+                    log_action(f"Skipping missed run of {job.kind} #{job.id} '{job.name}' due {job.next_run}")
+                elif missed and job.misfire == "coalesce" and signature in coalesced:
+                    log_action(f"Coalescing missed run of {job.kind} #{job.id} '{job.name}' due {job.next_run}")
+                else:
+                    if missed:
+                        coalesced.add(signature)
+                    job.runs += 1
+                    run.append(job)
+                following = job.trigger.next(max(job.next_run, now_dt))
+                if following is None:
+                    self.store.finish(job)
+                else:
+                    job.next_run = following
+                    self.store.reschedule(job)
+            next_run = self.store.next_run_time()
+        return run, (next_run - now if next_run is not None else None)
+
+    async def _run(self):
+        self._wake = asyncio.Event()
+        loop = asyncio.get_running_loop()
+        while True:
+            self._wake.clear()
+            due, delay = self._due_jobs()
+            for job in due:
+                if asyncio.iscoroutinefunction(job.callback):
+                    loop.create_task(self._guard(job, job.callback(*job.args)))
+                else:
+                    loop.create_task(self._guard(job, loop.run_in_executor(None, job.callback, *job.args)))
+            timeout = self.MAX_SLEEP if delay is None else min(max(delay, 0), self.MAX_SLEEP)
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+
+    @staticmethod
+    async def _guard(job, awaitable):
+        try:
+            await awaitable
+        except Exception as e:
+            log_action(f"Scheduled {job.kind} #{job.id} '{job.name}' failed: {e}")
+
+
+_scheduler: Optional[Scheduler] = None
+_scheduler_lock = threading.Lock()
+
+
+def get_scheduler() -> Scheduler:
+    """The process-wide scheduler shared by the timed tools."""
+    global _scheduler
+    with _scheduler_lock:
+        if _scheduler is None:
+            store = SQLiteJobStore(Config.SCHEDULER_DB_PATH) if Config.SCHEDULER_PERSIST else None
+            _scheduler = Scheduler(store)
+        return _scheduler
+
+
+def idempotency_key(kind: str, name: str, trigger, now: Optional[datetime] = None) -> str:
+    """A key that is the same when the same job is requested twice, e.g. a
+    retried tool call: repeating triggers by their schedule, one-shot ones
+    by the minute they fire."""
+    if isinstance(trigger, Cron) or getattr(trigger, "repeat", False):
+        when = str(trigger)
+    else:
+        when = f"{trigger.first(now or datetime.now()):%Y-%m-%d %H:%M}"
+    return f"{kind}:{name}:{when}"
+
+
+def format_jobs(jobs: List[Dict[str, Any]]) -> str:
+    return "\n".join(
+        f"#{job['id']} {job['kind'].upper()} at {job['next_run']:%Y-%m-%d %H:%M:%S} -> {job['name']}"
+        + (f" ({job['trigger']})" if not str(job['trigger']).startswith(("at ", "in ")) else "")
+        for job in jobs
+    )
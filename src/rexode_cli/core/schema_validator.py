@@ -0,0 +1,317 @@
+import json
+import math
+import re
+from typing import Any, Dict, List, Optional, Tuple
+
+from .param_parser import FALSE_WORDS, TRUE_WORDS
+
+_INVALID = object()
+_INTEGER_RE = re.compile(r"\s*[-+]?\d+\s*")
+_IDENTIFIER_RE = re.compile(r"\W")
+
+# Exact-type checks inlined into the generated code; only values that fail
+# them go through the (slower) coercion helpers below.
+_FAST_CHECKS = {
+    "string": "type(v) is str",
+    "integer": "type(v) is int",
+    "number": "(type(v) is int or type(v) is float)",
+    "boolean": "type(v) is bool",
+    "array": "type(v) is list",
+    "object": "type(v) is dict",
+    "null": "v is None",
+}
+
+
+def _coerce_string(v):
+    if isinstance(v, (int, float)) and not isinstance(v, bool):
+        return str(v)
+    return _INVALID
+
+
+def _coerce_integer(v):
+    if isinstance(v, bool):
+        return _INVALID
+    if isinstance(v, float) and v.is_integer():
+        return int(v)
+    if isinstance(v, str) and _INTEGER_RE.fullmatch(v):
+        return int(v)
+    return _INVALID
+
+
+def _coerce_number(v):
+    if isinstance(v, str):
+        if _INTEGER_RE.fullmatch(v):
+            return int(v)
+        try:
+            number = float(v)
+        except ValueError:
+            return _INVALID
+        return number if math.isfinite(number) else _INVALID
+    return _INVALID
+
+
+def _coerce_boolean(v):
+    if isinstance(v, str):
+        lowered = v.strip().lower()
+        if lowered in TRUE_WORDS:
+            return True
+        if lowered in FALSE_WORDS:
+            return False
+    elif type(v) is int and v in (0, 1):
+        return bool(v)
+    return _INVALID
+
+
+def _coerce_array(v):
+    if isinstance(v, tuple):
+        return list(v)
+    if isinstance(v, str):
+        text = v.strip()
+        if text.startswith("["):
+            try:
+                parsed = json.loads(text)
+            except ValueError:
+                return _INVALID
+            return parsed if isinstance(parsed, list) else _INVALID
+        # "a, b" -> ["a", "b"], the way the rule-based parser reads lists.
+        return [part.strip() for part in text.split(",") if part.strip()]
+    if isinstance(v, (int, float, bool)):
+        return [v]
+    return _INVALID
+
+
+def _coerce_object(v):
+    if isinstance(v, str):
+        try:
+            parsed = json.loads(v)
+        except ValueError:
+            return _INVALID
+        return parsed if isinstance(parsed, dict) else _INVALID
+    return _INVALID
+
+
+def _coerce_null(v):
+    if isinstance(v, str) and v.strip().lower() in ("null", "none"):
+        return None
+    return _INVALID
+
+
+_COERCERS = {
+    "string": _coerce_string, "integer": _coerce_integer, "number": _coerce_number,
+    "boolean": _coerce_boolean, "array": _coerce_array, "object": _coerce_object, "null": _coerce_null,
+}
+
+
+def _coerce_union(v, types):
+    for type_name in types:
+        converted = _COERCERS[type_name](v)
+        if converted is not _INVALID:
+            return converted
+    return _INVALID
+
+
+def _error(path, keyword, message, **details):
+    error = {"parameter": path, "error": keyword, "message": message}
+    error.update(details)
+    return error
+
+
+class _CodeWriter:
+    """Emits the check for one schema node as straight-line Python. Constants
+    (enums, compiled patterns, type tuples) go into the namespace the code
+    is executed in."""
+
+    def __init__(self):
+        self.lines: List[str] = []
+        self.namespace: Dict[str, Any] = {
+            "_INVALID": _INVALID, "_error": _error, "_coerce_union": _coerce_union,
+            **{f"_coerce_{name}": fn for name, fn in _COERCERS.items()},
+        }
+        self._constants = 0
+
+    def constant(self, value) -> str:
+        name = f"_c{self._constants}"
+        self._constants += 1
+        self.namespace[name] = value
+        return name
+
+    def emit(self, indent: int, line: str):
+        self.lines.append("    " * indent + line)
+
+    def node(self, schema: Dict[str, Any], path: str, indent: int, depth: int = 0):
+        """Checks and coerces `v` in place. On failure appends to `errors`
+        and sets v to _INVALID. `path` is an expression for the error path."""
+        declared = schema.get("type")
+        types = [declared] if isinstance(declared, str) else list(declared or [])
+        types = [name for name in types if name in _FAST_CHECKS]
+        if types:
+            fast = " or ".join(_FAST_CHECKS[name] for name in types)
+            expected = "|".join(types)
+            self.emit(indent, f"if not ({fast}):")
+            self.emit(indent + 1, "original = v")
+            if len(types) == 1:
+                self.emit(indent + 1, f"v = _coerce_{types[0]}(v)")
+            else:
+                self.emit(indent + 1, f"v = _coerce_union(v, {self.constant(tuple(types))})")
+            self.emit(indent + 1, "if v is _INVALID:")
+            self.emit(indent + 2, f"errors.append(_error({path}, 'type', {'expected ' + expected + ', got '!r} "
+                                  f"+ repr(original)[:80], expected={expected!r}))")
+        self.emit(indent, "if v is not _INVALID:")
+        body = len(self.lines)
+        self.constraints(schema, path, indent + 1, depth)
+        if len(self.lines) == body:
+            self.emit(indent + 1, "pass")
+
+    def _fail(self, indent, path, keyword, message, show_value=False, **details):
+        message_expr = repr(message + ", got ") + " + repr(v)[:80]" if show_value else repr(message)
+        extra = "".join(f", {key}={self.constant(value)}" for key, value in details.items())
+        self.emit(indent, f"errors.append(_error({path}, {keyword!r}, {message_expr}{extra}))")
+        self.emit(indent, "v = _INVALID")
+
+    def constraints(self, schema: Dict[str, Any], path: str, indent: int, depth: int):
+        if "enum" in schema:
+            allowed = schema["enum"]
+            try:
+                container = self.constant(frozenset(allowed))
+            except TypeError:
+                container = self.constant(list(allowed))
+            self.emit(indent, f"if v not in {container}:")
+            self._fail(indent + 1, path, "enum", f"must be one of {allowed!r}", True, allowed=allowed)
+        numeric = "(type(v) is int or type(v) is float)"
+        for keyword, op in (("minimum", "<"), ("maximum", ">"), ("exclusiveMinimum", "<="), ("exclusiveMaximum", ">=")):
+            if isinstance(schema.get(keyword), (int, float)):
+                bound = schema[keyword]
+                self.emit(indent, f"if {numeric} and v {op} {bound!r}:")
+                self._fail(indent + 1, path, keyword, f"must not be {op} {bound!r}", True)
+        for keyword, op in (("minLength", "<"), ("maxLength", ">")):
+            if isinstance(schema.get(keyword), int):
+                self.emit(indent, f"if type(v) is str and len(v) {op} {schema[keyword]}:")
+                self._fail(indent + 1, path, keyword, f"length must not be {op} {schema[keyword]}", True)
+        if isinstance(schema.get("pattern"), str):
+            pattern = self.constant(re.compile(schema["pattern"]))
+            self.emit(indent, f"if type(v) is str and not {pattern}.search(v):")
+            self._fail(indent + 1, path, "pattern", f"must match {schema['pattern']}", True)
+        for keyword, op in (("minItems", "<"), ("maxItems", ">")):
+            if isinstance(schema.get(keyword), int):
+                self.emit(indent, f"if type(v) is list and len(v) {op} {schema[keyword]}:")
+                self._fail(indent + 1, path, keyword, f"must not have {op} {schema[keyword]} items")
+        if isinstance(schema.get("items"), dict) and schema["items"]:
+            # Each level of nesting gets its own loop variables.
+            index, items, parent = f"i{depth}", f"items{depth}", f"parent{depth}"
+            self.emit(indent, "if type(v) is list:")
+            self.emit(indent + 1, f"{parent}, {items} = v, []")
+            self.emit(indent + 1, f"for {index}, v in enumerate({parent}):")
+            self.node(schema["items"], f"{path} + '[' + str({index}) + ']'", indent + 2, depth + 1)
+            self.emit(indent + 2, f"{items}.append(v)")
+            self.emit(indent + 1, f"v = {items} if _INVALID not in {items} else _INVALID")
+        if isinstance(schema.get("properties"), dict) and schema["properties"]:
+            obj = f"obj{depth}"
+            self.emit(indent, "if type(v) is dict:")
+            self.emit(indent + 1, f"{obj} = dict(v)")
+            for name, child in schema["properties"].items():
+                self.emit(indent + 1, f"if {name!r} in {obj}:")
+                self.emit(indent + 2, f"v = {obj}[{name!r}]")
+                self.node(child, f"{path} + {'.' + name!r}", indent + 2, depth + 1)
+                self.emit(indent + 2, f"{obj}[{name!r}] = v")
+            for name in schema.get("required", []):
+                self.emit(indent + 1, f"if {name!r} not in {obj}:")
+                self.emit(indent + 2, f"errors.append(_error({path} + {'.' + name!r}, 'required', "
+                                      f"'required parameter is missing'))")
+            self.emit(indent + 1, f"v = {obj} if _INVALID not in {obj}.values() else _INVALID")
+
+
+class CompiledValidator:
+    """A tool's `parameters` schema compiled into Python functions.
+
+    `validator(parameters)` returns (coerced parameters, errors). Values are
+    coerced where the intent is unambiguous ("5" -> 5 for an integer,
+    "yes" -> True, "a, b" -> ["a", "b"]) and checked against type, enum,
+    minimum/maximum, minLength/maxLength, pattern, minItems/maxItems, items
+    and nested properties. Each error is a dict with `parameter` (a path such
+    as `tags[2]`), `error` (the JSON Schema keyword, or `unknown`) and a
+    `message`. Unknown top-level parameters are errors unless the schema
+    sets `additionalProperties` (or has no `properties` at all), since the
+    tool would fail on them anyway.
+
+    The schema is turned into source code once (see `source`), so checking
+    is straight-line code with no walking of the schema per call.
+    """
+
+    def __init__(self, schema: Optional[Dict[str, Any]], tool_name: str = "tool"):
+        schema = schema or {}
+        self.tool_name = tool_name
+        self.properties: Dict[str, Any] = schema.get("properties", {}) or {}
+        self.required: List[str] = [name for name in schema.get("required", []) if name in self.properties]
+        # A schema without `properties` does not describe the tool's
+        # arguments, so anything goes.
+        allow_unknown = "properties" not in schema or schema.get("additionalProperties", False) not in (False, None)
+        writer = _CodeWriter()
+        self._fields = {}
+        for position, (name, child) in enumerate(self.properties.items()):
+            function = f"check_{position}_{_IDENTIFIER_RE.sub('_', name)}"
+            writer.emit(0, f"def {function}(v, errors):")
+            writer.node(child, repr(name), 1)
+            writer.emit(1, "return v")
+            self._fields[name] = function
+        known = writer.constant(list(self.properties))
+        required = writer.constant(tuple(self.required))
+        writer.emit(0, "def validate(parameters):")
+        writer.emit(1, "if type(parameters) is not dict:")
+        writer.emit(2, "return {}, [_error('', 'type', 'parameters must be a JSON object', expected='object')]")
+        writer.emit(1, "errors = []")
+        writer.emit(1, "out = {}")
+        writer.emit(1, "for name, v in parameters.items():")
+        for index, (name, function) in enumerate(self._fields.items()):
+            writer.emit(2, f"{'if' if index == 0 else 'elif'} name == {name!r}:")
+            writer.emit(3, f"v = {function}(v, errors)")
+            writer.emit(3, "if v is not _INVALID:")
+            writer.emit(4, f"out[{name!r}] = v")
+        writer.emit(2, "else:" if self._fields else "if True:")
+        if allow_unknown:
+            writer.emit(3, "out[name] = v")
+        else:
+            writer.emit(3, f"errors.append(_error(str(name), 'unknown', 'unknown parameter', allowed={known}))")
+        writer.emit(1, f"for name in {required}:")
+        writer.emit(2, "if name not in parameters:")
+        writer.emit(3, "errors.append(_error(name, 'required', 'required parameter is missing'))")
+        writer.emit(1, "return out, errors")
+        self.source = "\n".join(writer.lines) + "\n"
+        namespace = writer.namespace
+        exec(compile(self.source, f"<validator {tool_name}>", "exec"), namespace)
+        self._validate = namespace["validate"]
+        self._checks = {name: namespace[function] for name, function in self._fields.items()}
+
+    def __call__(self, parameters: Dict[str, Any]) -> Tuple[Dict[str, Any], List[Dict[str, Any]]]:
+        return self._validate(parameters)
+
+    def check(self, name: str, value: Any) -> Tuple[Any, List[Dict[str, Any]]]:
+        """Validates one parameter value, e.g. one typed in at a prompt."""
+        if name not in self._checks:
+            return value, [_error(name, "unknown", "unknown parameter", allowed=list(self.properties))]
+        errors: List[Dict[str, Any]] = []
+        return self._checks[name](value, errors), errors
+
+    def describe(self, name: str) -> Dict[str, Any]:
+        """The parts of a parameter's schema that help fix a value."""
+        schema = self.properties.get(name, {})
+        return {key: schema[key] for key in ("type", "enum", "items", "description") if key in schema}
+
+
+def failed_parameters(errors: List[Dict[str, Any]]) -> List[str]:
+    """The top-level parameter names in `errors`, in order ("tags[2]" -> "tags")."""
+    return list(dict.fromkeys(error["parameter"].split(".")[0].split("[")[0] for error in errors))
+
+
+def format_validation_errors(tool_name: str, errors: List[Dict[str, Any]],
+                             validator: Optional[CompiledValidator] = None) -> str:
+    """A tool result for the LLM: every problem at once, with the expected
+    schema of the parameters involved, so one corrected call can fix them.
+    Starts with "Error" so it counts as a failed result."""
+    report: Dict[str, Any] = {"tool": tool_name, "errors": errors}
+    if validator is not None:
+        names = failed_parameters(errors)
+        report["expected"] = {name: validator.describe(name) for name in names if name in validator.properties}
+        report["required"] = validator.required
+        report["parameters"] = list(validator.properties)
+    return (f"Error: invalid parameters for tool '{tool_name}'; fix all of them and call it again: "
+            + json.dumps(report, default=str))
@@ -0,0 +1,223 @@
+import codecs
+import os
+import queue
+import re
+import shlex
+import shutil
+import subprocess
+import sys
+import threading
+import time
+import uuid
+from typing import Any, Callable, Dict, Optional
+
+from .logging import log_action
+from .process_runner import OutputBuffer, kill_process_tree, tracked
+
+_STATUS = re.compile(r" (-?\d+) (.*)")
+
+
+class ShellSession:
+    """One long-lived bash (or sh) process that runs commands one after
+    another, so they share `cd` and exported variables and do not pay shell
+    startup each time.
+
+    Each command is sent as `eval '<command>'` followed by a line printing a
+    random sentinel with the exit code and working directory, on stdout and
+    stderr; output up to the sentinels belongs to that command. Syntax errors
+    stay inside the eval, so the framing cannot be broken by the command.
+
+    A command that times out, floods output, is cancelled or runs `exit`
+    takes the shell down with it; the next command starts a fresh shell in
+    the last known working directory (exported variables are lost).
+
+    reset() discards the shell's state between tasks: the next command
+    starts a fresh shell in the directory the session was created in.
+    """
+
+    def __init__(self, shell: Optional[str] = None, cwd: Optional[str] = None):
+        self.shell = shell or shutil.which("bash") or "/bin/sh"
+        self.cwd = cwd or os.getcwd()
+        self.home = self.cwd
+        self.process = None
+        self._reset = False
+        self.commands = 0
+        self.restarts = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def supported() -> bool:
+        return sys.platform != "win32"
+
+    def _start(self):
+        args = [self.shell]
+        if os.path.basename(self.shell) == "bash":
+            args += ["--noprofile", "--norc"]
+        cwd = self.cwd if os.path.isdir(self.cwd) else None
+        self.process = subprocess.Popen(
+            args, stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+            cwd=cwd, start_new_session=True,
+        )
+        self._token = f"__rexode_{uuid.uuid4().hex}__"
+        self._events = queue.Queue()
+        for name, stream in (("stdout", self.process.stdout), ("stderr", self.process.stderr)):
+            threading.Thread(target=self._read, args=(stream, name, self._events), daemon=True).start()
+
+    @staticmethod
+    def _read(stream, name, events):
+        fd = stream.fileno()
+        while True:
+            try:
+                data = os.read(fd, 8192)
+            except OSError:
+                data = b""
+            events.put((name, data))
+            if not data:
+                return
+
+    def _stop(self):
+        process, self.process = self.process, None
+        if process is None:
+            return
+        if process.poll() is None:
+            kill_process_tree(process)
+        process.wait()
+        for stream in (process.stdin, process.stdout, process.stderr):
+            try:
+                stream.close()
+            except OSError:
+                pass
+
+    def _send(self, command):
+        script = (
+            f"eval {shlex.quote(command)} < /dev/null\n"
+            f"printf '%s %d %s\\n' {self._token} \"$?\" \"$PWD\"\n"
+            f"printf '%s\\n' {self._token} >&2\n"
+        )
+        self.process.stdin.write(script.encode("utf-8"))
+        self.process.stdin.flush()
+
+    def run(self, command: str, timeout: Optional[float] = None, max_output_bytes: Optional[int] = None,
+            on_output: Callable[[str, str], None] = None, head: int = 4000, tail: int = 4000) -> Dict[str, Any]:
+        """Runs one command in the session; same arguments and result as
+        process_runner.run_command."""
+        with self._lock:
+            started = time.monotonic()
+            for attempt in range(2):
+                if self.process is None or self.process.poll() is not None:
+                    self._stop()
+                    if self.commands and not self._reset:
+                        self.restarts += 1
+                        log_action(f"Restarting persistent shell in {self.cwd}")
+                    self._start()
+                    self._reset = False
+                try:
+                    self._send(command)
+                    break
+                except (BrokenPipeError, OSError):
+                    # The shell died between commands; start it again once.
+                    if attempt:
+                        raise
+            self.commands += 1
+            return self._collect(command, started, timeout, max_output_bytes, on_output, head, tail)
+
+    def _collect(self, command, started, timeout, max_output_bytes, on_output, head, tail):
+        process, events, token = self.process, self._events, self._token
+        buffers = {"stdout": OutputBuffer(head, tail), "stderr": OutputBuffer(head, tail)}
+        decoders = {name: codecs.getincrementaldecoder("utf-8")(errors="replace") for name in buffers}
+        pending = {"stdout": "", "stderr": ""}
+        finished = {"stdout": False, "stderr": False}
+        deadline = started + timeout if timeout else None
+        received = 0
+        returncode = None
+        error = None
+
+        def emit(name, text):
+            if text:
+                buffers[name].write(text)
+                if on_output:
+                    on_output(name, text)
+
+        with tracked(process):
+            while not all(finished.values()):
+                wait = None if deadline is None else deadline - time.monotonic()
+                if wait is not None and wait <= 0:
+                    error = f"Killed after exceeding the {timeout:g} s time limit"
+                    break
+                try:
+                    name, data = events.get(timeout=wait)
+                except queue.Empty:
+                    continue
+                if not data:
+                    error = "The shell exited; the next command starts a new one"
+                    break
+                received += len(data)
+                text = pending[name] + decoders[name].decode(data)
+                index = text.find(token)
+                if index < 0:
+                    # Hold back enough to recognise a sentinel split across reads.
+                    keep = len(token)
+                    emit(name, text[:-keep])
+                    pending[name] = text[-keep:]
+                elif name == "stdout":
+                    end = text.find("\n", index)
+                    if end < 0:
+                        pending[name] = text
+                        continue
+                    match = _STATUS.match(text[index + len(token):end])
+                    if match:
+                        returncode, self.cwd = int(match.group(1)), match.group(2)
+                    emit(name, text[:index])
+                    pending[name] = ""
+                    finished[name] = True
+                else:
+                    emit(name, text[:index])
+                    pending[name] = ""
+                    finished[name] = True
+                if max_output_bytes and received > max_output_bytes:
+                    error = f"Killed after exceeding the {max_output_bytes} byte output limit"
+                    break
+
+        if error:
+            for name in pending:
+                emit(name, pending[name])
+            self._stop()
+            returncode = process.returncode
+            if process.rexode_cancelled:
+                error = "Cancelled by user"
+            log_action(f"Command '{command}': {error}")
+        result = {
+            "stdout": buffers["stdout"].text(),
+            "stderr": buffers["stderr"].text(),
+            "returncode": returncode,
+            "elapsed": round(time.monotonic() - started, 3),
+        }
+        if error:
+            result["error"] = error
+        return result
+
+    def reset(self):
+        """Drops `cd`, variables and anything else earlier commands left in
+        the shell, so one task cannot change what the next one runs against.
+        The shell is only restarted if it ran a command since the last
+        reset."""
+        with self._lock:
+            if self.process is not None:
+                self._stop()
+                self._reset = True
+            self.cwd = self.home
+
+    @property
+    def stats(self) -> Dict[str, int]:
+        return {"commands": self.commands, "restarts": self.restarts}
+
+    def close(self):
+        with self._lock:
+            if self.process is not None and self.process.poll() is None:
+                try:
+                    self.process.stdin.write(b"exit\n")
+                    self.process.stdin.flush()
+                    self.process.wait(timeout=1)
+                except (OSError, subprocess.TimeoutExpired):
+                    pass
+            self._stop()
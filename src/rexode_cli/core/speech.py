@@ -0,0 +1,139 @@
+import os
+import platform
+import threading
+from collections import deque
+from typing import Callable, Optional
+
+from .config import Config
+from .logging import log_action
+
+
+def _pyttsx3_engine():
+    import pyttsx3
+    return pyttsx3.init()
+
+
+def send_notification(title: str, message: str):
+    """A desktop notification, falling back to printing it (and a beep)."""
+    try:
+        from notifypy import Notify
+        notification = Notify()
+        notification.title = title
+        notification.message = message
+        notification.send()
+    except ImportError:
+        print(f"🔔 {title}: {message}")
+        try:
+            if platform.system() == "Windows":
+                import winsound
+                winsound.MessageBeep()
+            else:
+                os.system("say 'Notification'")
+        except Exception:
+            pass
+
+
+class SpeechWorker:
+    """Speaks and shows notifications on one background thread, so callers
+    never wait for the text-to-speech engine.
+
+    The engine is created on the worker thread at the first utterance (and
+    only used from that thread, as pyttsx3 requires). At most `max_pending`
+    items wait in the queue: an utterance identical to the last queued one
+    is dropped, and when the queue is full the oldest waiting item makes
+    room, since stale spoken feedback is worse than none.
+    """
+
+    def __init__(self, max_pending: int = 3, engine_factory: Callable = _pyttsx3_engine,
+                 notifier: Callable[[str, str], None] = send_notification):
+        self.max_pending = max(1, max_pending)
+        self.engine_factory = engine_factory
+        self.notifier = notifier
+        self.dropped = 0
+        self._queue = deque()
+        self._cond = threading.Condition()
+        self._busy = False
+        self._engine = None
+        self._engine_failed = False
+        self._thread: Optional[threading.Thread] = None
+
+    def say(self, text: str):
+        """Queues `text` to be spoken and returns immediately."""
+        self._put(("say", str(text)))
+
+    def notify(self, title: str, message: str):
+        """Queues a desktop notification and returns immediately."""
+        self._put(("notify", str(title), str(message)))
+
+    def _put(self, item):
+        with self._cond:
+            if self._queue and self._queue[-1] == item:
+                self.dropped += 1
+                return
+            while len(self._queue) >= self.max_pending:
+                self._queue.popleft()
+                self.dropped += 1
+            self._queue.append(item)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._work, name="rexode-speech", daemon=True)
+                self._thread.start()
+            self._cond.notify()
+
+    def wait_idle(self, timeout: Optional[float] = None) -> bool:
+        """Blocks until everything queued so far has been handled."""
+        with self._cond:
+            return self._cond.wait_for(lambda: not self._queue and not self._busy, timeout)
+
+    def _work(self):
+        while True:
+            with self._cond:
+                self._cond.wait_for(lambda: self._queue)
+                item = self._queue.popleft()
+                self._busy = True
+            try:
+                if item[0] == "say":
+                    self._speak(item[1])
+                else:
+                    self.notifier(item[1], item[2])
+            except Exception as e:
+                log_action(f"Speech worker failed on {item[0]}: {e}")
+            finally:
+                with self._cond:
+                    self._busy = False
+                    self._cond.notify_all()
+
+    def _speak(self, text):
+        if self._engine is None and not self._engine_failed:
+            try:
+                self._engine = self.engine_factory()
+            except Exception as e:
+                # No speech backend (e.g. no espeak on a server): stay silent.
+                self._engine_failed = True
+                log_action(f"Text-to-speech unavailable: {e}")
+        if self._engine is not None:
+            self._engine.say(text)
+            self._engine.runAndWait()
+
+
+_worker: Optional[SpeechWorker] = None
+_worker_lock = threading.Lock()
+
+
+def get_speech_worker() -> SpeechWorker:
+    """The process-wide speech worker configured from Config."""
+    global _worker
+    with _worker_lock:
+        if _worker is None:
+            _worker = SpeechWorker(max_pending=Config.SPEECH_MAX_PENDING)
+        return _worker
+
+
+def say(text: str):
+    """Speaks `text` in the background, if spoken feedback is enabled."""
+    if Config.SPEECH_ENABLED:
+        get_speech_worker().say(text)
+
+
+def notify(title: str, message: str):
+    """Shows a desktop notification in the background."""
+    get_speech_worker().notify(title, message)
@@ -0,0 +1,128 @@
+import json
+
+_ESCAPES = {'"': '"', '\\': '\\', '/': '/', 'b': '\b', 'f': '\f', 'n': '\n', 'r': '\r', 't': '\t'}
+
+
+class ToolCallStreamParser:
+    """Incrementally scans a streamed LLM reply of the form
+    `{"tool_calls": [{...}, ...]}` or `{"response": "..."}`.
+
+    `feed(text)` returns the events completed by that chunk:
+      ("tool_call", {"name": ..., "parameters": ...})  as soon as each
+          element of the tool_calls array closes, and
+      ("response", delta) for every piece of the response string decoded
+          so far.
+    Anything before the first `{` (e.g. a ```json fence) is ignored. The
+    parser never raises; malformed input simply produces no events and the
+    caller falls back to parsing the full text.
+    """
+
+    def __init__(self):
+        self.buffer = []
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._unicode = None
+        self._high_surrogate = None
+        self._expect_key = False
+        self._key = None
+        self._reading_key = False
+        self._key_chars = []
+        self._in_tool_calls = False
+        self._element_start = None
+        self._in_response = False
+
+    def feed(self, text):
+        events = []
+        response_chars = []
+        for ch in text:
+            position = len(self.buffer)
+            self.buffer.append(ch)
+            if self._in_string:
+                self._scan_string_char(ch, response_chars)
+                continue
+            if ch == '"':
+                self._in_string = True
+                if self._depth == 1 and self._expect_key:
+                    self._reading_key = True
+                    self._key_chars = []
+                elif self._depth == 1 and self._key == "response":
+                    self._in_response = True
+            elif ch in "{[":
+                self._depth += 1
+                if self._depth == 1:
+                    self._expect_key = True
+                elif self._depth == 2 and ch == "[" and self._key == "tool_calls":
+                    self._in_tool_calls = True
+                elif self._depth == 3 and ch == "{" and self._in_tool_calls:
+                    self._element_start = position
+            elif ch in "}]":
+                self._depth -= 1
+                if self._depth == 2 and ch == "}" and self._element_start is not None:
+                    raw = "".join(self.buffer[self._element_start:position + 1])
+                    self._element_start = None
+                    try:
+                        tool_call = json.loads(raw)
+                    except ValueError:
+                        tool_call = None
+                    if isinstance(tool_call, dict) and "name" in tool_call:
+                        events.append(("tool_call", tool_call))
+                elif self._depth == 1 and ch == "]":
+                    self._in_tool_calls = False
+            elif self._depth == 1 and ch == ",":
+                self._expect_key = True
+            elif self._depth == 1 and ch == ":":
+                self._expect_key = False
+        if response_chars:
+            events.append(("response", "".join(response_chars)))
+        return events
+
+    def _scan_string_char(self, ch, response_chars):
+        decoded = None
+        if self._unicode is not None:
+            self._unicode += ch
+            if len(self._unicode) == 4:
+                try:
+                    code = int(self._unicode, 16)
+                except ValueError:
+                    code = None
+                self._unicode = None
+                if code is None:
+                    decoded = ""
+                elif 0xD800 <= code < 0xDC00:
+                    # First half of a surrogate pair; wait for the second.
+                    self._high_surrogate = code
+                    return
+                elif 0xDC00 <= code < 0xE000 and self._high_surrogate is not None:
+                    decoded = chr(0x10000 + ((self._high_surrogate - 0xD800) << 10) + (code - 0xDC00))
+                else:
+                    decoded = chr(code)
+                self._high_surrogate = None
+        elif self._escape:
+            self._escape = False
+            if ch == "u":
+                self._unicode = ""
+            else:
+                decoded = _ESCAPES.get(ch, ch)
+        elif ch == "\\":
+            self._escape = True
+        elif ch == '"':
+            self._in_string = False
+            if self._reading_key:
+                self._reading_key = False
+                self._key = "".join(self._key_chars)
+            self._in_response = False
+            return
+        else:
+            decoded = ch
+
+        if decoded is None:
+            return
+        if self._reading_key:
+            self._key_chars.append(decoded)
+        elif self._in_response:
+            response_chars.append(decoded)
+
+    @property
+    def text(self):
+        return "".join(self.buffer)
@@ -1,38 +1,155 @@
-import re
+import asyncio
+import atexit
+from .config import Config
 from .tool_manager import ToolManager
+from .tool_executor import ToolCallPlanner, call_tool, iterate_tool_calls
+from .stream_parser import ToolCallStreamParser
+from .tool_shortlist import ToolShortlister
+from .tool_retriever import ToolRetriever
+from .intent_matcher import IntentMatcher
+from .param_parser import extract_parameters
+from .schema_validator import failed_parameters, format_validation_errors
+from .tool_cache import ToolResultCache
+from .process_runner import cancel_running, use_shell_session
+from .shell_session import ShellSession
+from .task_planner import DagScheduler, PlanError, SubtaskError, TaskPlanner, is_failed_result
+from .history import ConversationHistory, OutputStore
 from ..llm_handler import LLMHandler
+from ..task_ui import TaskUI
 from .security import request_confirmation
 from .logging import log_action
 import json
 import shlex
-from fuzzywuzzy import fuzz, process
 from rich.console import Console
 from parse import parse
 
 class TaskOrchestrator:
-    def __init__(self, tool_manager: ToolManager, llm=None, llm_mode=None, llm_handler: LLMHandler = None):
+    def __init__(self, tool_manager: ToolManager, llm=None, llm_mode=None, llm_handler: LLMHandler = None,
+                 shortlister: ToolShortlister = None, activity_indicator=None, tool_cache: ToolResultCache = None,
+                 retriever: ToolRetriever = None):
         self.tool_manager = tool_manager
         self.llm = llm
         self.llm_mode = llm_mode
         self.llm_handler = llm_handler
-        self.history = []
+        self.shortlister = shortlister
+        self._retriever = retriever or (shortlister.retriever if shortlister else None)
+        self._intent_matcher = None
+        self.max_concurrent_tools = Config.MAX_CONCURRENT_TOOLS
+        self.stream_responses = Config.STREAM_LLM_RESPONSES
+        self.activity_indicator = activity_indicator
+        self.history = ConversationHistory(
+            token_budget=Config.HISTORY_TOKEN_BUDGET,
+            max_output_tokens=Config.HISTORY_MAX_OUTPUT_TOKENS,
+            keep_recent=Config.HISTORY_KEEP_RECENT,
+            store=OutputStore(Config.TOOL_OUTPUT_DIR),
+        )
+        if tool_cache is None and Config.TOOL_CACHE_ENABLED:
+            tool_cache = ToolResultCache(
+                max_entries=Config.TOOL_CACHE_MAX_ENTRIES,
+                persist_path=Config.TOOL_CACHE_PATH if Config.TOOL_CACHE_PERSIST else None,
+            )
+            if tool_cache.persist_path:
+                atexit.register(tool_cache.save)
+        self.tool_cache = tool_cache
+        self.shell_session = ShellSession() if Config.SHELL_PERSISTENT and ShellSession.supported() else None
+        if self.shell_session:
+            atexit.register(self.shell_session.close)
         self.console = Console()
+        self.is_cancelled = False
 
     async def process_task(self, user_input):
         self.is_cancelled = False
-        if self.llm:
-            # LLM mode: Use the LLM to determine the tool to use
-            return await self.process_with_llm(user_input)
-        else:
-            # No LLM mode: Use a rule-based approach
-            return self.process_with_rules(user_input)
+        # Shell commands run by the task's tools share one warm shell, which
+        # starts clean for every task.
+        if self.shell_session:
+            self.shell_session.reset()
+        with use_shell_session(self.shell_session):
+            if self.llm:
+                # LLM mode: Use the LLM to determine the tool to use
+                return await self.process_with_llm(user_input)
+            else:
+                # No LLM mode: Use a rule-based approach
+                return self.process_with_rules(user_input)
+
+    def cancel(self):
+        """Stops the current task: kills running shell commands and makes the
+        task loop return at its next check. Called from the ESC key listener
+        thread."""
+        self.is_cancelled = True
+        killed = cancel_running()
+        log_action(f"Task cancelled by user ({killed} running command(s) killed)")
+
+    @property
+    def registry(self):
+        return self.tool_manager.registry
+
+    @property
+    def retriever(self):
+        # Built on first use when none was passed in; the index covers the
+        # registry it was built from.
+        registry = self.registry
+        if self._retriever is None or self._retriever.registry is not registry:
+            self._retriever = ToolRetriever(registry, semantic_weight=Config.TOOL_RETRIEVAL_SEMANTIC_WEIGHT)
+        return self._retriever
+
+    @property
+    def intent_matcher(self):
+        registry = self.registry
+        if self._intent_matcher is None or self._intent_matcher.registry is not registry:
+            self._intent_matcher = IntentMatcher(registry, cutoff=Config.INTENT_FUZZY_CUTOFF)
+        return self._intent_matcher
+
+    def detect_tool(self, user_input):
+        """Returns (tool_name, confidence, parameters) for rule-based input,
+        or (None, None, {}). An `intents` template from tools.json wins, then
+        a tool named in the input (fuzzy matched); otherwise the best lexical
+        retrieval candidate is taken if it is confident enough."""
+        match = self.intent_matcher.detect(user_input)
+        if match:
+            return match.tool_name, match.score, match.parameters
+        # Lexical only: the rules path never waits on the embedding model.
+        ranked = self.retriever.rank(user_input, k=1, semantic=False)
+        if ranked and ranked[0][1] >= Config.TOOL_RETRIEVAL_RULES_MIN_SCORE:
+            return ranked[0][0], round(ranked[0][1] * 100), {}
+        return None, None, {}
 
     def get_tool_info(self, tool_name):
-        for category in self.tool_manager.tools:
-            for tool_info in category['tools']:
-                if tool_info['name'] == tool_name:
-                    return tool_info
-        return None
+        return self.registry.get_schema(tool_name)
+
+    def validate_parameters(self, tool_name, parameters):
+        """Checks and coerces a call's parameters against the tool's schema.
+        Returns (parameters, None), or (parameters, error) where the error
+        lists every problem for the LLM to fix in one go. Unknown tools pass
+        through to the fallback."""
+        validator = self.registry.validator(tool_name)
+        if validator is None:
+            return parameters, None
+        coerced, errors = validator(parameters)
+        if errors:
+            log_action(f"Invalid parameters for {tool_name}: {errors}")
+            return parameters, format_validation_errors(tool_name, errors, validator)
+        return coerced, None
+
+    def cache_policy(self, tool_name):
+        """The tool's cache policy, or None if its results must not be reused."""
+        if self.tool_cache is None or self.registry.is_sensitive(tool_name):
+            return None
+        return self.registry.cache_policy(tool_name)
+
+    def cached_result(self, tool_name, parameters):
+        policy = self.cache_policy(tool_name)
+        if policy is None:
+            return ToolResultCache.MISS
+        result = self.tool_cache.get(tool_name, parameters, policy)
+        if result is not ToolResultCache.MISS:
+            log_action(f"Tool cache hit: {tool_name} with parameters: {parameters}")
+            self.console.print(f"[green]V Reused cached result for '{tool_name}'.[/green]")
+        return result
+
+    def store_result(self, tool_name, parameters, result):
+        policy = self.cache_policy(tool_name)
+        if policy is not None:
+            self.tool_cache.put(tool_name, parameters, result, policy)
 
     def fallback(self, tool_name, parameters, error=None):
         if error:
@@ -42,6 +159,9 @@ class TaskOrchestrator:
             log_action(f"Tool '{tool_name}' not found, attempting fallback.")
             self.console.print(f"[yellow]... Tool '{tool_name}' not found. Attempting fallback...[/yellow]")
         
+        get_tool = self.tool_manager.get_tool
+        execute_shell_command = get_tool("execute_shell_command")
+
         # Fallback for OS & File Management (existing logic)
         if tool_name in ["list_files", "read_file", "write_file", "delete_file"]:
             try:
@@ -57,7 +177,7 @@ class TaskOrchestrator:
                     shell_command = f"rm {parameters.get('file_path')}"
                 
                 if shell_command:
-                    result = self.tool_manager.get_tool("execute_shell_command")(shell_command)
+                    result = execute_shell_command(shell_command)
                     self.console.print(f"[green]V Fallback to 'execute_shell_command' for {tool_name} successful.[/green]")
                     return result
             except Exception as e:
@@ -69,22 +189,24 @@ class TaskOrchestrator:
             try:
                 query = parameters.get("query") or parameters.get("topic") or parameters.get("location")
                 url = parameters.get("url")
+                search_web = get_tool("search_web")
+                scrape_website = get_tool("scrape_website")
 
-                if query and self.tool_manager.get_tool("search_web"):
+                if query and search_web:
                     self.console.print(f"[yellow]... Attempting web search for: {query}[/yellow]")
-                    search_results = self.tool_manager.get_tool("search_web")(query)
+                    search_results = search_web(query)
                     self.console.print(f"[green]V Web search successful.[/green]")
-                    if search_results and self.tool_manager.get_tool("scrape_website"):
+                    if search_results and scrape_website:
                         first_link = search_results[0].get("link") # Assuming search_web returns list of dicts with 'link'
                         if first_link:
                             self.console.print(f"[yellow]... Attempting to scrape: {first_link}[/yellow]")
-                            scraped_content = self.tool_manager.get_tool("scrape_website")(first_link)
+                            scraped_content = scrape_website(first_link)
                             self.console.print(f"[green]V Website scraping successful.[/green]")
                             return scraped_content
                     return search_results
-                elif url and self.tool_manager.get_tool("scrape_website"):
+                elif url and scrape_website:
                     self.console.print(f"[yellow]... Attempting to scrape: {url}[/yellow]")
-                    scraped_content = self.tool_manager.get_tool("scrape_website")(url)
+                    scraped_content = scrape_website(url)
                     self.console.print(f"[green]V Website scraping successful.[/green]")
                     return scraped_content
             except Exception as e:
@@ -101,9 +223,10 @@ class TaskOrchestrator:
                     self.console.print(f"[yellow]Could not determine API URL for {tool_name}. Cannot use fetch_api_data fallback.[/yellow]")
                     return f"Fallback failed: Could not determine API URL for {tool_name}."
 
-                if self.tool_manager.get_tool("fetch_api_data"):
+                fetch_api_data = get_tool("fetch_api_data")
+                if fetch_api_data:
                     self.console.print(f"[yellow]... Attempting to fetch API data from: {api_url}[/yellow]")
-                    api_data = self.tool_manager.get_tool("fetch_api_data")(api_url)
+                    api_data = fetch_api_data(api_url)
                     self.console.print(f"[green]V API data fetch successful.[/green]")
                     return api_data
             except Exception as e:
@@ -114,9 +237,10 @@ class TaskOrchestrator:
         if tool_name in ["generate_code", "analyze_data", "train_ml_model", "optimize_ml_model"]:
             try:
                 prompt = f"Generate a Python script to perform a task similar to '{tool_name}' with parameters {parameters}. Focus on the core logic."
-                if self.tool_manager.get_tool("generate_code"):
+                generate_code = get_tool("generate_code")
+                if generate_code:
                     self.console.print(f"[yellow]... Attempting to generate code for '{tool_name}'...\nPrompt: {prompt}[/yellow]")
-                    generated_code = self.tool_manager.get_tool("generate_code")(prompt=prompt, language="python")
+                    generated_code = generate_code(prompt=prompt, language="python")
                     self.console.print(f"[green]V Code generation successful.[/green]")
                     return generated_code
             except Exception as e:
@@ -124,7 +248,7 @@ class TaskOrchestrator:
                 return f"Code generation fallback failed: {e}"
 
         # Generic fallback to execute_shell_command if applicable (existing logic)
-        if self.tool_manager.get_tool("execute_shell_command"):
+        if execute_shell_command:
             self.console.print(f"[yellow]... No specific fallback for '{tool_name}'. Attempting generic shell command.[/yellow]")
             try:
                 # Attempt a generic shell command if parameters look like a command
@@ -135,7 +259,7 @@ class TaskOrchestrator:
                 else:
                     return f"Tool '{tool_name}' not found and no suitable generic fallback command could be constructed."
                 
-                result = self.tool_manager.get_tool("execute_shell_command")(command)
+                result = execute_shell_command(command)
                 self.console.print(f"[green]V Fallback to generic shell command successful.[/green]")
                 return result
             except Exception as e:
@@ -145,61 +269,163 @@ class TaskOrchestrator:
         self.console.print(f"[red]x Tool '{tool_name}' not found and no fallback available.[/red]")
         return f"Tool '{tool_name}' not found and no fallback available."
 
+    async def execute_tool_calls(self, tool_calls):
+        """Runs one turn's tool_calls and appends their outputs to the history.
+
+        Independent, non-sensitive calls run concurrently (sync tools on the
+        thread pool, async tools natively); sensitive calls are confirmed and
+        run one at a time, in order. Outputs are appended in the order the LLM
+        listed the calls, whatever order they finish in. Returns False if the
+        user declined a sensitive call.
+
+        `tool_calls` may also be an async iterator, so calls parsed from a
+        streaming reply start running before the reply is complete.
+        """
+        planner = ToolCallPlanner(self.registry)
+        outputs = []
+        semaphore = asyncio.Semaphore(self.max_concurrent_tools)
+        declined = False
+        tasks = []
+
+        async def run(index, tc, dependencies):
+            nonlocal declined
+            if dependencies:
+                await asyncio.gather(*(tasks[j] for j in dependencies))
+            if declined or self.is_cancelled:
+                return
+            tool_name = tc['name']
+            parameters, invalid = self.validate_parameters(tool_name, tc.get('parameters', {}))
+            if invalid:
+                # Goes back to the LLM as is; running the fallback on bad
+                # arguments would only hide what needs fixing.
+                self.console.print(f"[red]x Invalid parameters for '{tool_name}'.[/red]")
+                outputs[index].append(invalid)
+                return
+
+            # Sensitive calls run after everything before them has finished,
+            # so confirmations are asked one at a time, in order.
+            if self.registry.is_sensitive(tool_name):
+                if not request_confirmation(f"execute the '{tool_name}' tool with parameters: {parameters}"):
+                    log_action(f"User cancelled action: {tool_name}")
+                    declined = True
+                    return
+
+            cached = self.cached_result(tool_name, parameters)
+            if cached is not ToolResultCache.MISS:
+                outputs[index].append(cached)
+                return
+
+            tool = self.tool_manager.get_tool(tool_name)
+            async with semaphore:
+                if tool:
+                    self.console.print(f"[yellow]... Executing tool: {tool_name}...[/yellow]")
+                    log_action(f"Executing tool: {tool_name} with parameters: {parameters}")
+                    try:
+                        result = await call_tool(tool, parameters)
+                        self.store_result(tool_name, parameters, result)
+                        self.console.print(f"[green]V Tool '{tool_name}' executed successfully.[/green]")
+                        if result is not None:
+                            self.console.print(f"[dim]Output:[/dim] {str(result)[:500]}{'...' if len(str(result)) > 500 else ''}")
+                        outputs[index].append(result)
+                    except Exception as tool_e:
+                        log_action(f"Error executing tool {tool_name}: {tool_e}")
+                        self.console.print(f"[red]x Error executing tool '{tool_name}': {tool_e}[/red]")
+                        outputs[index].append(f"Error executing tool {tool_name}: {tool_e}")
+                        # Attempt fallback on tool execution failure
+                        self.console.print(f"[yellow]... Attempting fallback for '{tool_name}' due to execution error...[/yellow]")
+                        outputs[index].append(await asyncio.to_thread(self.fallback, tool_name, parameters, str(tool_e)))
+                else:
+                    self.console.print(f"[red]x Tool '{tool_name}' not found.[/red]")
+                    outputs[index].append(await asyncio.to_thread(self.fallback, tool_name, parameters))
+
+        async for tc in iterate_tool_calls(tool_calls):
+            outputs.append([])
+            tasks.append(asyncio.ensure_future(run(len(tasks), tc, planner.add(tc))))
+        await asyncio.gather(*tasks)
+
+        for results in outputs:
+            for result in results:
+                self.history.append({"role": "tool", "content": result})
+        return not declined
+
+    async def stream_llm_turn(self, prompt):
+        """Streams one LLM reply. Each tool call starts executing as soon as
+        its JSON object is complete, and `response` text is shown live in the
+        activity indicator. Returns the full reply text and the
+        execute_tool_calls result (None if the reply had no tool calls)."""
+        parser = ToolCallStreamParser()
+        pending_calls = asyncio.Queue()
+        executor = None
+
+        async def streamed_calls():
+            while True:
+                tc = await pending_calls.get()
+                if tc is None:
+                    return
+                yield tc
+
+        try:
+            async for chunk in self.llm.astream(prompt):
+                text = chunk if isinstance(chunk, str) else getattr(chunk, "content", "")
+                if not isinstance(text, str):
+                    continue
+                for kind, value in parser.feed(text):
+                    if kind == "tool_call":
+                        if executor is None:
+                            executor = asyncio.ensure_future(self.execute_tool_calls(streamed_calls()))
+                        pending_calls.put_nowait(value)
+                    elif kind == "response" and self.activity_indicator:
+                        self.activity_indicator.update_message(value)
+        finally:
+            # The assistant turn goes into history before any tool output.
+            self.history.append({"role": "assistant", "content": parser.text})
+            pending_calls.put_nowait(None)
+        completed = await executor if executor is not None else None
+        return parser.text, completed
+
     async def process_with_llm(self, user_input):
         self.history.append({"role": "user", "content": user_input})
+        # Only the tools relevant to this request go into the prompt; None
+        # means the shortlist was not confident and the full catalog is sent.
+        tool_names = self.shortlister.shortlist(user_input) if self.shortlister else None
+        if tool_names:
+            log_action(f"Tool shortlist for request: {tool_names}")
         while True:
+            if self.is_cancelled:
+                return "Task cancelled by user."
             try:
                 self.console.print("[yellow]... Rexode is thinking...[/yellow]")
-                prompt = self.llm_handler.get_prompt(self.history, self.tool_manager.tools)
-                response = await self.llm.ainvoke(prompt)
-                self.history.append({"role": "assistant", "content": response.content})
+                prompt = self.llm_handler.get_prompt(
+                    self.history, self.tool_manager.tools, self.tool_manager.tools_version, tool_names
+                )
+                streamed_result = None
+                if self.stream_responses and hasattr(self.llm, "astream"):
+                    content, streamed_result = await self.stream_llm_turn(prompt)
+                else:
+                    response = await self.llm.ainvoke(prompt)
+                    # Chat models return a message, plain LLMs (Ollama) a str.
+                    content = response if isinstance(response, str) else response.content
+                    self.history.append({"role": "assistant", "content": content})
                 
                 try:
-                    tool_call = json.loads(response.content)
+                    tool_call = json.loads(content)
                 except json.JSONDecodeError:
-                    log_action(f"LLM returned non-JSON response: {response.content}")
-                    self.console.print(f"[green]V Rexode response: {response.content}[/green]")
-                    return response.content # Treat as direct response
+                    log_action(f"LLM returned non-JSON response: {content}")
+                    self.console.print(f"[green]V Rexode response: {content}[/green]")
+                    return content # Treat as direct response
 
                 if "tool_calls" in tool_call:
-                    for tc in tool_call["tool_calls"]:
-                        tool_name = tc['name']
-                        parameters = tc['parameters']
-                        
-                        tool_info = self.get_tool_info(tool_name)
-                        if tool_info and tool_info.get('sensitive'):
-                            if not request_confirmation(f"execute the '{tool_name}' tool with parameters: {parameters}"):
-                                log_action(f"User cancelled action: {tool_name}")
-                                return "Action cancelled by user."
-
-                        tool = self.tool_manager.get_tool(tool_name)
-                        if tool:
-                            self.console.print(f"[yellow]... Executing tool: {tool_name}...[/yellow]")
-                            log_action(f"Executing tool: {tool_name} with parameters: {parameters}")
-                            try:
-                                result = tool(**parameters)
-                                self.console.print(f"[green]V Tool '{tool_name}' executed successfully.[/green]")
-                                if result is not None:
-                                    self.console.print(f"[dim]Output:[/dim] {str(result)[:500]}{'...' if len(str(result)) > 500 else ''}")
-                                self.history.append({"role": "tool", "content": result})
-                            except Exception as tool_e:
-                                log_action(f"Error executing tool {tool_name}: {tool_e}")
-                                self.console.print(f"[red]x Error executing tool '{tool_name}': {tool_e}[/red]")
-                                self.history.append({"role": "tool", "content": f"Error executing tool {tool_name}: {tool_e}"})
-                                # Attempt fallback on tool execution failure
-                                self.console.print(f"[yellow]... Attempting fallback for '{tool_name}' due to execution error...[/yellow]")
-                                result = self.fallback(tool_name, parameters, error=str(tool_e))
-                                self.history.append({"role": "tool", "content": result})
-                        else:
-                            self.console.print(f"[red]x Tool '{tool_name}' not found.[/red]")
-                            result = self.fallback(tool_name, parameters)
-                            self.history.append({"role": "tool", "content": result})
+                    # Calls already started while streaming are not run twice.
+                    if streamed_result is None:
+                        streamed_result = await self.execute_tool_calls(tool_call["tool_calls"])
+                    if not streamed_result:
+                        return "Action cancelled by user."
                 elif "response" in tool_call:
                     log_action(f"LLM response: {tool_call['response']}")
                     self.console.print(f"[green]V Rexode response: {tool_call['response']}[/green]")
                     return tool_call["response"]
                 else:
-                    log_action(f"LLM returned unexpected format: {response.content}")
+                    log_action(f"LLM returned unexpected format: {content}")
                     self.console.print(f"[red]x LLM returned an unexpected format. Please try rephrasing your request.[/red]")
                     return "Error: LLM returned an unexpected format."
 
@@ -208,116 +434,177 @@ class TaskOrchestrator:
                 self.console.print(f"[red]x An unexpected error occurred during LLM processing: {e}[/red]")
                 return f"An unexpected error occurred: {e}"
 
+    async def run_subtask(self, node, parameters):
+        """Runs one planned subtask. If the tool raises, returns an error or
+        does not exist, the fallback gets one try before the subtask fails."""
+        if self.is_cancelled:
+            raise SubtaskError("Task cancelled by user.")
+        tool_name = node["tool"]
+        parameters, invalid = self.validate_parameters(tool_name, parameters)
+        if invalid:
+            raise SubtaskError(invalid)
+        cached = self.cached_result(tool_name, parameters)
+        if cached is not ToolResultCache.MISS:
+            return cached
+
+        error = None
+        tool = self.tool_manager.get_tool(tool_name)
+        if tool:
+            try:
+                result = await call_tool(tool, parameters)
+            except Exception as e:
+                error = str(e)
+            else:
+                if not is_failed_result(result):
+                    self.store_result(tool_name, parameters, result)
+                    return result
+                error = str(result)
+        result = await asyncio.to_thread(self.fallback, tool_name, parameters, error)
+        if result is None or is_failed_result(result):
+            raise SubtaskError(error or str(result))
+        return result
+
+    def confirm_plan(self, nodes):
+        """Asks once for all sensitive subtasks of a plan (unknown tools go to
+        the fallback, which may run shell commands)."""
+        sensitive = [node for node in nodes if node["tool"] not in self.registry or self.registry.is_sensitive(node["tool"])]
+        if not sensitive:
+            return True
+        steps = "; ".join(f"{node['tool']} {node['parameters']}" for node in sensitive)
+        if request_confirmation(f"run a plan that includes: {steps}"):
+            return True
+        log_action(f"User cancelled plan steps: {steps}")
+        return False
+
+    async def process_with_plan(self, user_input, ui_factory=TaskUI):
+        """Asks the LLM once for a DAG of subtasks and runs it with
+        DagScheduler: independent subtasks run concurrently, failed ones are
+        retried through the fallback, and only the failed branches are sent
+        back to the LLM for a new plan (up to Config.PLAN_MAX_REPLANS times).
+        Progress is shown as TaskUI step dots."""
+        self.is_cancelled = False
+        # Subtasks share the warm shell, as the tool calls of process_task do.
+        if self.shell_session:
+            self.shell_session.reset()
+        with use_shell_session(self.shell_session):
+            return await self._run_plan(user_input, ui_factory)
+
+    async def _run_plan(self, user_input, ui_factory):
+        started = asyncio.get_running_loop().time()
+        tool_names = self.shortlister.shortlist(user_input) if self.shortlister else None
+        catalog = (self.llm_handler or LLMHandler()).render_tool_catalog(self.tool_manager.tools, tool_names)
+        planner = TaskPlanner(self.llm, self.registry, catalog)
+        self.console.print("[yellow]... Rexode is planning...[/yellow]")
+        try:
+            nodes = await planner.plan(user_input)
+        except PlanError as e:
+            log_action(f"Planning failed: {e}")
+            self.console.print(f"[red]x Could not plan the task: {e}[/red]")
+            return f"Error: could not plan the task: {e}"
+        log_action(f"Plan for '{user_input}': {json.dumps(nodes)}")
+        if not self.confirm_plan(nodes):
+            return "Action cancelled by user."
+
+        steps = []
+        scheduler = DagScheduler(self.run_subtask, workers=Config.PLAN_MAX_WORKERS,
+                                 ui=ui_factory(steps) if ui_factory else None, steps=steps)
+        every_node = list(nodes)
+        results, errors, replans = {}, {}, 0
+        while True:
+            results, new_errors, skipped = await scheduler.run(nodes, results)
+            errors.update(new_errors)
+            if not (new_errors or skipped) or self.is_cancelled or replans >= Config.PLAN_MAX_REPLANS:
+                break
+            # Only the failed branch goes back to the LLM; finished results stay.
+            try:
+                replacement = await planner.replan(user_input, nodes, results, new_errors)
+            except PlanError as e:
+                log_action(f"Re-planning failed: {e}")
+                break
+            if not self.confirm_plan(replacement):
+                break
+            replans += 1
+            log_action(f"Re-plan {replans} for '{user_input}': {json.dumps(replacement)}")
+            every_node.extend(replacement)
+            nodes = [node for node in nodes if node["id"] in results] + replacement
+
+        elapsed = asyncio.get_running_loop().time() - started
+        lines = []
+        for node in every_node:
+            if node["id"] in results:
+                lines.append(f"- {node['id']}: {node['description']} -> {str(results[node['id']])[:200]}")
+            elif node["id"] in errors:
+                lines.append(f"- {node['id']}: {node['description']} -> failed: {errors[node['id']][:200]}")
+            else:
+                lines.append(f"- {node['id']}: {node['description']} -> not run")
+        succeeded = sum(node["id"] in results for node in nodes)
+        summary = (f"Plan finished: {succeeded} of {len(nodes)} subtasks succeeded in {elapsed:.1f}s"
+                   f"{f' after {replans} re-plan(s)' if replans else ''}.")
+        self.console.print(f"[{'green' if succeeded == len(nodes) else 'red'}]{summary}[/]")
+        return summary + "\n" + "\n".join(lines)
+
     def _extract_parameters(self, user_input, tool_info):
-        parameters = {}
-        missing_params = []
-
-        if 'properties' in tool_info['parameters']:
-            for param_name, param_details in tool_info['parameters']['properties'].items():
-                # Look for the parameter name followed by an equals sign
-                param_pattern = rf'{param_name}='
-                match = re.search(param_pattern, user_input, re.IGNORECASE)
-
-                if match:
-                    start_index = match.end()
-                    value_str = user_input[start_index:].strip()
-
-                    # Find the end of the current parameter's value
-                    # This is either the start of the next parameter or the end of the string
-                    end_index = len(value_str)
-                    for other_param_name in tool_info['parameters']['properties']:
-                        if other_param_name != param_name:
-                            other_param_pattern = rf'{other_param_name}='
-                            other_match = re.search(other_param_pattern, value_str, re.IGNORECASE)
-                            if other_match and other_match.start() < end_index:
-                                end_index = other_match.start()
-                    
-                    value = value_str[:end_index].strip()
-
-                    # Remove quotes if present
-                    if (value.startswith('"') and value.endswith('"')) or \
-                       (value.startswith("'") and value.endswith("'")):
-                        value = value[1:-1]
-
-                    parameters[param_name] = value
-                elif param_name in tool_info['parameters'].get('required', []):
-                    missing_params.append(param_name)
-        
-        return parameters, missing_params
+        # One pass over the input; values come back as their schema types.
+        return extract_parameters(user_input, tool_info.get('parameters', {}))
 
     def process_with_rules(self, user_input):
         if self.is_cancelled:
             return "Task cancelled by user."
         try:
-            # Attempt to find the best matching tool using fuzzy matching
-            all_tool_names = [t['name'] for category in self.tool_manager.tools for t in category['tools']]
-            
             # Use the entire user_input to find the best tool match
-            best_match = process.extractOne(user_input, all_tool_names, scorer=fuzz.token_set_ratio)
-
-            tool_name = None
-            if best_match and best_match[1] > 60:  # Threshold for a good match
-                tool_name = best_match[0]
-                self.console.print(f"[dim]Detected tool: {tool_name} (Confidence: {best_match[1]})[/dim]")
+            tool_name, confidence, template_parameters = self.detect_tool(user_input)
+            if tool_name:
+                self.console.print(f"[dim]Detected tool: {tool_name} (Confidence: {confidence})[/dim]")
             else:
                 self.console.print(f"[red]x No clear tool detected in your input. Please be more specific.[/red]")
                 return "No tool detected."
 
             tool_info = self.get_tool_info(tool_name)
-            if not tool_info: # Should not happen if tool_name came from all_tool_names
-                self.console.print(f"[red]x Internal error: Tool '{tool_name}' not found after fuzzy match.[/red]")
+            if not tool_info: # Should not happen if tool_name came from the registry
+                self.console.print(f"[red]x Internal error: Tool '{tool_name}' not found after matching.[/red]")
                 return "Internal error."
 
-            parameters, missing_params = self._extract_parameters(user_input, tool_info)
-            
-            if missing_params:
+            parameters, _ = self._extract_parameters(user_input, tool_info)
+            if template_parameters:
+                # Values captured by the template fill what key=value did not.
+                parameters = {**template_parameters, **parameters}
+
+            # Missing and invalid parameters are asked for, one at a time.
+            validator = self.registry.validator(tool_name)
+            parameters, errors = validator(parameters)
+            unknown = [error for error in errors if error['error'] == 'unknown']
+            if unknown:
+                return format_validation_errors(tool_name, unknown, validator)
+            to_ask = failed_parameters(errors)
+            if to_ask:
                 self.console.print(f"[yellow]I need more information to execute '{tool_name}'.[/yellow]")
-                for param_name in missing_params:
-                    param_details = tool_info['parameters']['properties'][param_name]
-                    prompt_message = f"[bold green]Please provide value for '{param_name}' ({param_details.get('description', 'no description')}) (Type: {param_details.get('type', 'string')}): [/bold green]"
-                    while True:
-                        user_provided_value = self.console.input(prompt_message).strip()
-                        if user_provided_value.lower() == 'cancel':
-                            self.console.print("[red]Action cancelled by user.[/red]")
-                            return "Action cancelled by user."
-                        
-                        # Attempt to convert and validate input
-                        try:
-                            if param_details.get('type') == 'integer':
-                                user_provided_value = int(user_provided_value)
-                            elif param_details.get('type') == 'number':
-                                user_provided_value = float(user_provided_value)
-                            elif param_details.get('type') == 'boolean':
-                                if user_provided_value.lower() in ['true', 'yes']:
-                                    user_provided_value = True
-                                elif user_provided_value.lower() in ['false', 'no']:
-                                    user_provided_value = False
-                                else:
-                                    raise ValueError("Invalid boolean value.")
-                            elif param_details.get('type') == 'array':
-                                user_provided_value = [item.strip() for item in user_provided_value.split(',')]
-
-                            # Check enum if applicable
-                            if 'enum' in param_details and user_provided_value not in param_details['enum']:
-                                if isinstance(user_provided_value, list):
-                                    user_provided_value = [item for item in user_provided_value if item in param_details['enum']]
-                                    if not user_provided_value:
-                                        raise ValueError(f"None of the provided values are valid for enum: {param_details['enum']}")
-                                else:
-                                    raise ValueError(f"Value not in allowed enum values: {param_details['enum']}")
-
-                            parameters[param_name] = value.strip().strip("'").strip('"')
-                            break # Exit inner loop if input is valid
-                        except ValueError as ve:
-                            self.console.print(f"[red]Invalid input for '{param_name}': {ve}. Please try again or type 'cancel'.[/red]")
-                        except Exception as e:
-                            self.console.print(f"[red]An unexpected error occurred during input for '{param_name}': {e}. Please try again or type 'cancel'.[/red]")
+            for error in errors:
+                if error['error'] != 'required':
+                    self.console.print(f"[red]Invalid value for '{error['parameter']}': {error['message']}.[/red]")
+            for param_name in to_ask:
+                param_details = validator.describe(param_name)
+                prompt_message = f"[bold green]Please provide value for '{param_name}' ({param_details.get('description', 'no description')}) (Type: {param_details.get('type', 'string')}): [/bold green]"
+                while True:
+                    user_provided_value = self.console.input(prompt_message).strip()
+                    if user_provided_value.lower() == 'cancel':
+                        self.console.print("[red]Action cancelled by user.[/red]")
+                        return "Action cancelled by user."
+                    value, value_errors = validator.check(param_name, user_provided_value)
+                    if not value_errors:
+                        parameters[param_name] = value
+                        break
+                    messages = "; ".join(error['message'] for error in value_errors)
+                    self.console.print(f"[red]Invalid input for '{param_name}': {messages}. Please try again or type 'cancel'.[/red]")
 
             if tool_info.get('sensitive'):
                 if not request_confirmation(f"execute the '{tool_name}' tool with parameters: {parameters}"):
                     log_action(f"User cancelled action: {tool_name}")
                     return "Action cancelled by user."
 
+            cached = self.cached_result(tool_name, parameters)
+            if cached is not ToolResultCache.MISS:
+                return cached
+
             tool = self.tool_manager.get_tool(tool_name)
 
             if tool:
@@ -325,6 +612,7 @@ class TaskOrchestrator:
                 log_action(f"Executing tool: {tool_name} with parameters: {parameters}")
                 try:
                     result = tool(**parameters)
+                    self.store_result(tool_name, parameters, result)
                     self.console.print(f"[green]V Tool '{tool_name}' executed successfully.[/green]")
                     if result is not None:
                         self.console.print(f"[dim]Output:[/dim] {str(result)[:500]}{'...' if len(str(result)) > 500 else ''}")
@@ -0,0 +1,262 @@
+import asyncio
+import json
+import re
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from .logging import log_action
+from .tool_registry import ToolRegistry
+
+PLAN_PROMPT_TEMPLATE = """You are Rexode's planner. Available tools:
+
+{tool_catalog}
+
+Break the user's request into subtasks, one tool call each. Respond ONLY with
+JSON of the form:
+{{"subtasks": [{{"id": "short_id", "description": "what this step does",
+  "tool": "tool_name", "parameters": {{...}}, "depends_on": ["other_id", ...]}}]}}
+
+- List in `depends_on` only the subtasks whose result this one needs;
+  independent subtasks run at the same time.
+- A string parameter may contain {{{{other_id}}}} to insert the result of a
+  subtask it depends on.
+- Use as few subtasks as the request needs.
+
+User request: {task}
+"""
+
+REPLAN_PROMPT_TEMPLATE = """You are Rexode's planner. Available tools:
+
+{tool_catalog}
+
+While working on the user's request, part of the plan failed.
+
+User request: {task}
+
+Completed subtasks (results may be used with {{{{id}}}} placeholders):
+{completed}
+
+Failed subtasks and the steps that were waiting on them:
+{failed}
+
+Respond ONLY with JSON {{"subtasks": [...]}} in the same format as before,
+replacing just the failed part of the plan. Use new ids; `depends_on` may
+name completed subtasks.
+"""
+
+_PLACEHOLDER = re.compile(r"\{\{\s*([\w.-]+)\s*\}\}")
+
+
+class PlanError(Exception):
+    pass
+
+
+class SubtaskError(Exception):
+    """Raised by a subtask runner when the subtask failed for good."""
+
+
+def is_failed_result(result) -> bool:
+    """Whether a tool result reports a failure. Tools return error strings
+    rather than raising; execute_shell_command returns a dict."""
+    if isinstance(result, dict):
+        return bool(result.get("error")) or result.get("returncode") not in (None, 0)
+    if not isinstance(result, str):
+        return False
+    lowered = result.lower()
+    return (lowered.startswith(("error", "exception", "unsupported"))
+            or "fallback failed" in lowered or "no fallback available" in lowered
+            or "no suitable generic fallback" in lowered)
+
+
+def _extract_json(text):
+    """The JSON object in an LLM reply, tolerating ``` fences and prose."""
+    start, end = text.find("{"), text.rfind("}")
+    if start < 0 or end < start:
+        raise PlanError("The planner reply contains no JSON object")
+    try:
+        return json.loads(text[start:end + 1])
+    except json.JSONDecodeError as e:
+        raise PlanError(f"The planner reply is not valid JSON: {e}") from e
+
+
+def parse_plan(text: str, registry: ToolRegistry, known_ids=()) -> List[Dict[str, Any]]:
+    """Validates a planner reply and returns its subtasks in dependency
+    order. `known_ids` are subtasks that already finished (for replans)."""
+    data = _extract_json(text)
+    subtasks = data.get("subtasks") if isinstance(data, dict) else None
+    if not isinstance(subtasks, list) or not subtasks:
+        raise PlanError("The plan has no subtasks")
+
+    nodes = {}
+    for i, raw in enumerate(subtasks):
+        if not isinstance(raw, dict) or not raw.get("tool"):
+            raise PlanError(f"Subtask {i} has no tool")
+        node_id = str(raw.get("id") or f"step{i + 1}")
+        if node_id in nodes or node_id in known_ids:
+            raise PlanError(f"Duplicate subtask id '{node_id}'")
+        depends_on = raw.get("depends_on") or []
+        if not isinstance(depends_on, list):
+            depends_on = [depends_on]
+        nodes[node_id] = {
+            "id": node_id,
+            "description": str(raw.get("description") or raw["tool"]),
+            "tool": raw["tool"],
+            "parameters": raw.get("parameters") if isinstance(raw.get("parameters"), dict) else {},
+            "depends_on": [str(d) for d in depends_on],
+        }
+        if raw["tool"] not in registry:
+            # Unknown tools are kept; the scheduler sends them to the fallback.
+            log_action(f"Planner chose unknown tool '{raw['tool']}' for subtask '{node_id}'")
+
+    for node in nodes.values():
+        for dependency in node["depends_on"]:
+            if dependency not in nodes and dependency not in known_ids:
+                raise PlanError(f"Subtask '{node['id']}' depends on unknown subtask '{dependency}'")
+    return topological_order(list(nodes.values()))
+
+
+def topological_order(nodes: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Kahn's algorithm, keeping the planner's order among ready nodes.
+    Dependencies outside `nodes` count as satisfied."""
+    by_id = {node["id"]: node for node in nodes}
+    waiting = {node["id"]: {d for d in node["depends_on"] if d in by_id} for node in nodes}
+    ordered = []
+    while waiting:
+        ready = [node_id for node_id in by_id if node_id in waiting and not waiting[node_id]]
+        if not ready:
+            raise PlanError(f"The plan has a dependency cycle among: {', '.join(sorted(waiting))}")
+        for node_id in ready:
+            ordered.append(by_id[node_id])
+            del waiting[node_id]
+        for dependencies in waiting.values():
+            dependencies.difference_update(ready)
+    return ordered
+
+
+def fill_parameters(parameters, results: Dict[str, Any]):
+    """Replaces {{id}} placeholders in string parameters with that subtask's
+    result. A parameter that is only a placeholder gets the raw result."""
+    def fill(value):
+        if isinstance(value, str):
+            whole = _PLACEHOLDER.fullmatch(value.strip())
+            if whole and whole.group(1) in results:
+                return results[whole.group(1)]
+            return _PLACEHOLDER.sub(
+                lambda m: str(results[m.group(1)]) if m.group(1) in results else m.group(0), value)
+        if isinstance(value, list):
+            return [fill(v) for v in value]
+        if isinstance(value, dict):
+            return {k: fill(v) for k, v in value.items()}
+        return value
+    return fill(parameters)
+
+
+class TaskPlanner:
+    """Asks the LLM once for a DAG of subtasks, and again only for the
+    branches that failed."""
+
+    def __init__(self, llm, registry: ToolRegistry, tool_catalog: str):
+        self.llm = llm
+        self.registry = registry
+        self.tool_catalog = tool_catalog
+
+    async def _ask(self, prompt):
+        response = await self.llm.ainvoke(prompt)
+        # Chat models return a message, plain LLMs (Ollama) a str.
+        return response if isinstance(response, str) else response.content
+
+    async def plan(self, task: str) -> List[Dict[str, Any]]:
+        reply = await self._ask(PLAN_PROMPT_TEMPLATE.format(tool_catalog=self.tool_catalog, task=task))
+        return parse_plan(reply, self.registry)
+
+    async def replan(self, task: str, nodes: List[Dict[str, Any]], results: Dict[str, Any],
+                     errors: Dict[str, str]) -> List[Dict[str, Any]]:
+        completed = "\n".join(
+            f"- {node['id']} ({node['tool']}): {str(results[node['id']])[:300]}"
+            for node in nodes if node["id"] in results
+        ) or "(none)"
+        failed = "\n".join(
+            f"- {node['id']} ({node['tool']} {json.dumps(node['parameters'])}): "
+            + (f"failed: {errors[node['id']][:300]}" if node["id"] in errors else "not run")
+            for node in nodes if node["id"] not in results
+        )
+        reply = await self._ask(REPLAN_PROMPT_TEMPLATE.format(
+            tool_catalog=self.tool_catalog, task=task, completed=completed, failed=failed))
+        return parse_plan(reply, self.registry, known_ids=set(results))
+
+
+class DagScheduler:
+    """Runs a plan's subtasks as soon as their dependencies are done, at most
+    `workers` at a time, so a plan takes about as long as its critical path
+    rather than the sum of its steps.
+
+    `run_subtask(node, parameters)` does the work and raises on failure;
+    nodes downstream of a failed one are skipped. `ui` is anything with
+    TaskUI's step methods; a node's step index is its position in `steps`.
+    """
+
+    def __init__(self, run_subtask: Callable[[Dict[str, Any], Dict[str, Any]], Awaitable[Any]],
+                 workers: int = 4, ui=None, steps: Optional[List[str]] = None):
+        self.run_subtask = run_subtask
+        self.workers = max(1, workers)
+        self.ui = ui
+        self.steps = steps if steps is not None else []
+
+    def _ui(self, method, *args):
+        if self.ui:
+            getattr(self.ui, method)(*args)
+
+    async def run(self, nodes: List[Dict[str, Any]], results: Optional[Dict[str, Any]] = None):
+        """Runs every node not already in `results`. Returns (results,
+        errors, skipped): results and error messages by node id, and the ids
+        that never ran because something they depend on failed."""
+        results = dict(results or {})
+        errors: Dict[str, str] = {}
+        skipped = set()
+        pending = [node for node in nodes if node["id"] not in results]
+        index_of = {}
+        for node in pending:
+            index_of[node["id"]] = len(self.steps)
+            self.steps.append(node["description"])
+        running = {}
+
+        def start(node):
+            self._ui("start_step", index_of[node["id"]])
+            parameters = fill_parameters(node["parameters"], results)
+            log_action(f"Starting subtask '{node['id']}': {node['tool']} with parameters: {parameters}")
+            task = asyncio.ensure_future(self._timed(node, parameters))
+            running[task] = node
+
+        while pending or running:
+            for node in list(pending):
+                if len(running) >= self.workers:
+                    break
+                if any(d in errors or d in skipped for d in node["depends_on"]):
+                    pending.remove(node)
+                    skipped.add(node["id"])
+                    log_action(f"Skipping subtask '{node['id']}': a dependency failed")
+                elif all(d in results for d in node["depends_on"]):
+                    pending.remove(node)
+                    start(node)
+            if not running:
+                # Whatever is left waits on something that will never finish.
+                skipped.update(node["id"] for node in pending)
+                break
+            done, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                node = running.pop(task)
+                try:
+                    result, elapsed = task.result()
+                except Exception as e:
+                    errors[node["id"]] = str(e)
+                    log_action(f"Subtask '{node['id']}' failed: {e}")
+                    self._ui("fail_step", f"{node['description']}: {e}")
+                else:
+                    results[node["id"]] = result
+                    self._ui("complete_step", f"{node['description']} ({elapsed:.1f}s)")
+        return results, errors, skipped
+
+    async def _timed(self, node, parameters):
+        started = time.monotonic()
+        result = await self.run_subtask(node, parameters)
+        return result, time.monotonic() - started
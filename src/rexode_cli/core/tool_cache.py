@@ -0,0 +1,153 @@
+import copy
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional
+
+from .logging import log_action
+
+
+def mtime_fingerprint(path):
+    """Changes whenever the file is rewritten or, for a directory, whenever
+    an entry is added, removed or renamed."""
+    try:
+        stat = os.stat(path)
+    except (OSError, TypeError, ValueError):
+        return None
+    return [stat.st_mtime_ns, stat.st_size]
+
+
+# Invalidation hooks selectable with "invalidate" in a tool's cache policy.
+# Each takes the value of the policy's "path_parameter" and returns a
+# JSON-serializable fingerprint; a cached result is dropped when it changes.
+FINGERPRINTS: Dict[str, Callable[[Any], Any]] = {
+    "mtime": mtime_fingerprint,
+}
+
+
+def make_key(tool_name, parameters) -> str:
+    # Sorted keys and fixed separators make {"a": 1, "b": 2} and
+    # {"b": 2, "a": 1} the same entry.
+    return json.dumps([tool_name, parameters], sort_keys=True, separators=(",", ":"), default=str)
+
+
+class ToolResultCache:
+    """LRU cache of tool results keyed on (tool name, canonical parameters).
+
+    `policy` is the tool's `cache` entry from tools.json, e.g.
+      "cache": {"ttl": 600}
+      "cache": {"ttl": 60, "invalidate": "mtime", "path_parameter": "file_path"}
+    None results and the "Error ..." strings tools return on failure are
+    never stored.
+
+    With `persist_path`, `save()` writes the JSON-serializable entries to
+    disk and the next cache picks up those that have not expired.
+    """
+
+    MISS = object()
+
+    def __init__(self, max_entries: int = 256, persist_path: Optional[str] = None):
+        self.max_entries = max_entries
+        self.persist_path = persist_path
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[str, list]" = OrderedDict()
+        self._lock = threading.Lock()
+        if persist_path:
+            self.load()
+
+    def _fingerprint(self, policy, parameters):
+        hook = FINGERPRINTS.get(policy.get("invalidate"))
+        if hook is None:
+            return None
+        return hook(parameters.get(policy.get("path_parameter", "path")))
+
+    def get(self, tool_name, parameters, policy: Dict[str, Any]):
+        """Returns the cached result or ToolResultCache.MISS."""
+        key = make_key(tool_name, parameters)
+        fingerprint = self._fingerprint(policy, parameters)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                value, expires_at, cached_fingerprint = entry
+                if expires_at > time.time() and cached_fingerprint == fingerprint:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return value if isinstance(value, str) else copy.deepcopy(value)
+                del self._entries[key]
+            self.misses += 1
+        return self.MISS
+
+    def put(self, tool_name, parameters, result, policy: Dict[str, Any]):
+        if result is None:
+            return
+        if isinstance(result, str) and result.startswith("Error"):
+            return
+        key = make_key(tool_name, parameters)
+        # Fingerprint after the call, so the entry matches what the tool saw.
+        fingerprint = self._fingerprint(policy, parameters)
+        value = result if isinstance(result, str) else copy.deepcopy(result)
+        with self._lock:
+            self._entries[key] = [value, time.time() + policy.get("ttl", 300), fingerprint]
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, tool_name=None):
+        """Drops every entry, or only those of `tool_name`."""
+        with self._lock:
+            if tool_name is None:
+                self._entries.clear()
+                return
+            prefix = make_key(tool_name, None)[:-len("null]")]
+            for key in [k for k in self._entries if k.startswith(prefix)]:
+                del self._entries[key]
+
+    def __len__(self):
+        return len(self._entries)
+
+    @property
+    def stats(self) -> Dict[str, int]:
+        return {"hits": self.hits, "misses": self.misses, "entries": len(self._entries)}
+
+    def load(self):
+        try:
+            with open(self.persist_path, "r", encoding="utf-8") as f:
+                saved = json.load(f)
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError) as e:
+            log_action(f"Ignoring unreadable tool cache {self.persist_path}: {e}")
+            return
+        now = time.time()
+        with self._lock:
+            for key, value, expires_at, fingerprint in saved.get("entries", []):
+                if expires_at > now:
+                    self._entries[key] = [value, expires_at, fingerprint]
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def save(self):
+        if not self.persist_path:
+            return
+        now = time.time()
+        entries = []
+        with self._lock:
+            for key, (value, expires_at, fingerprint) in self._entries.items():
+                if expires_at <= now:
+                    continue
+                try:
+                    json.dumps(value)
+                except (TypeError, ValueError):
+                    continue
+                entries.append([key, value, expires_at, fingerprint])
+        try:
+            os.makedirs(os.path.dirname(self.persist_path), exist_ok=True)
+            temp_path = self.persist_path + ".tmp"
+            with open(temp_path, "w", encoding="utf-8") as f:
+                json.dump({"entries": entries}, f, ensure_ascii=False)
+            os.replace(temp_path, self.persist_path)
+        except OSError as e:
+            log_action(f"Could not save tool cache to {self.persist_path}: {e}")
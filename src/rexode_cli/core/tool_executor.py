@@ -0,0 +1,70 @@
+import asyncio
+import inspect
+
+from .tool_registry import ToolRegistry
+
+
+class ToolCallPlanner:
+    """Works out, for each call in one LLM turn, the indices of the earlier
+    calls it has to wait for. Calls are added one at a time, in order, so a
+    turn can be planned while it is still streaming in.
+
+    Only tools marked `"read_only": true` in tools.json run concurrently.
+    Every other tool (anything that writes a file, the clipboard or the
+    screen, runs commands, ...) and unknown tools, whose fallback may run
+    shell commands, act as barriers: they wait for every earlier call and
+    every later call waits for them. So a screenshot followed by OCR of the
+    saved file runs in order, while several reads between two barriers run
+    at once. An explicit `depends_on` list of earlier indices on a call is
+    honoured as well.
+    """
+
+    def __init__(self, registry: ToolRegistry):
+        self.registry = registry
+        self.count = 0
+        self._barrier = None
+
+    def add(self, tool_call):
+        index = self.count
+        self.count += 1
+        name = tool_call.get("name")
+        deps = {
+            j for j in tool_call.get("depends_on", []) or []
+            if isinstance(j, int) and 0 <= j < index
+        }
+        if not self.registry.is_read_only(name):
+            deps.update(range(index))
+            self._barrier = index
+        elif self._barrier is not None:
+            deps.add(self._barrier)
+        return sorted(deps)
+
+
+def plan_tool_calls(tool_calls, registry: ToolRegistry):
+    planner = ToolCallPlanner(registry)
+    return [planner.add(tool_call) for tool_call in tool_calls]
+
+
+async def iterate_tool_calls(tool_calls):
+    """Accepts a list or an async iterator of tool calls."""
+    if hasattr(tool_calls, "__aiter__"):
+        async for tool_call in tool_calls:
+            yield tool_call
+    else:
+        for tool_call in tool_calls:
+            yield tool_call
+
+
+def is_async_tool(tool):
+    return asyncio.iscoroutinefunction(tool) or getattr(tool, "is_async", False)
+
+
+async def call_tool(tool, parameters):
+    """Runs a tool without blocking the event loop: async tools are awaited
+    natively, sync tools run on the default thread pool."""
+    if is_async_tool(tool):
+        return await tool(**parameters)
+    result = await asyncio.to_thread(tool, **parameters)
+    if inspect.isawaitable(result):
+        result = await result
+    return result
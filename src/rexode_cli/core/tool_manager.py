@@ -1,33 +1,48 @@
+import hashlib
 import json
 import os
-import importlib.util
 
 from .config import Config
+from .logging import log_action
+from .tool_manifest import LazyTool, load_manifest
+from .tool_registry import ToolRegistry
 
 class ToolManager:
-    def __init__(self, config: Config):
+    def __init__(self, config: Config, lazy: bool = None):
+        self.tools_dir = os.path.join(os.path.dirname(__file__), "..", "tools")
         self.tools = self.load_tools(config.TOOLS_JSON_PATH)
+        self.manifest = load_manifest(
+            self.tools,
+            config.TOOLS_JSON_PATH,
+            self.tools_dir,
+            cache_path=getattr(config, "TOOL_MANIFEST_PATH", None),
+        )
+        self.lazy = getattr(config, "LAZY_TOOL_LOADING", True) if lazy is None else lazy
         self.tool_functions = self.load_tool_functions()
+        self.registry = ToolRegistry(self.tools, self.tool_functions)
 
     def load_tools(self, tools_json_path):
-        with open(tools_json_path, 'r') as f:
-            return json.load(f)
+        with open(tools_json_path, 'rb') as f:
+            raw = f.read()
+        # Identifies this revision of tools.json; used to key prompt caches.
+        self.tools_version = f"{os.path.getmtime(tools_json_path)}:{hashlib.sha256(raw).hexdigest()[:16]}"
+        return json.loads(raw)
 
     def load_tool_functions(self):
-        tool_functions = {}
-        tools_dir = os.path.join(os.path.dirname(__file__), "..", "tools")
-        for filename in os.listdir(tools_dir):
-            if filename.endswith(".py") and not filename.startswith("__"):
-                module_name = filename[:-3]
-                module_path = os.path.join(tools_dir, filename)
-                spec = importlib.util.spec_from_file_location(module_name, module_path)
-                module = importlib.util.module_from_spec(spec)
-                spec.loader.exec_module(module)
-                for tool_category in self.tools:
-                    for tool in tool_category['tools']:
-                        if hasattr(module, tool['name']):
-                            tool_functions[tool['name']] = getattr(module, tool['name'])
+        # Tool modules are only imported when a tool is first called, so a
+        # session that never touches media tools never imports cv2/pyaudio.
+        tool_functions = {
+            name: LazyTool(name, entry["module"], entry["async"])
+            for name, entry in self.manifest.items()
+        }
+        if not self.lazy:
+            for name, proxy in list(tool_functions.items()):
+                try:
+                    tool_functions[name] = proxy.resolve()
+                except Exception as e:
+                    log_action(f"Could not load tool '{name}' from {proxy.module_name}: {e}")
+                    del tool_functions[name]
         return tool_functions
 
     def get_tool(self, tool_name):
-        return self.tool_functions.get(tool_name)
+        return self.registry.get_callable(tool_name)
@@ -0,0 +1,114 @@
+import ast
+import importlib
+import json
+import os
+
+from .logging import log_action
+
+TOOLS_PACKAGE = __name__.rsplit(".", 2)[0] + ".tools"
+MANIFEST_VERSION = 1
+
+
+def scan_tool_modules(tools_dir):
+    """Parses every module in the tools package (without importing it) and
+    returns {function_name: [(module_name, arg_names, is_async), ...]}."""
+    definitions = {}
+    for filename in sorted(os.listdir(tools_dir)):
+        if not filename.endswith(".py") or filename.startswith("__"):
+            continue
+        module_name = filename[:-3]
+        with open(os.path.join(tools_dir, filename), "r", encoding="utf-8") as f:
+            try:
+                tree = ast.parse(f.read(), filename=filename)
+            except SyntaxError as e:
+                log_action(f"Skipping tool module {filename}: {e}")
+                continue
+        for node in tree.body:
+            if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)) and not node.name.startswith("_"):
+                arg_names = [a.arg for a in node.args.args + node.args.kwonlyargs]
+                definitions.setdefault(node.name, []).append(
+                    (module_name, arg_names, isinstance(node, ast.AsyncFunctionDef))
+                )
+    return definitions
+
+
+def _pick_definition(tool_info, candidates):
+    # Several modules define the same function name (e.g. git_clone, run_tests).
+    # Prefer the one whose signature covers the most parameters from tools.json.
+    params = set(tool_info.get("parameters", {}).get("properties", {}))
+    return max(candidates, key=lambda c: (len(params & set(c[1])), -len(set(c[1]) - params)))
+
+
+def build_manifest(tools, tools_dir):
+    """Maps every tool in tools.json to the module that implements it."""
+    definitions = scan_tool_modules(tools_dir)
+    entries = {}
+    for category in tools:
+        for tool_info in category["tools"]:
+            candidates = definitions.get(tool_info["name"])
+            if not candidates:
+                continue
+            module_name, _, is_async = _pick_definition(tool_info, candidates)
+            entries[tool_info["name"]] = {"module": module_name, "async": is_async}
+    return entries
+
+
+def _source_stamps(tools_json_path, tools_dir):
+    stamps = {os.path.abspath(tools_json_path): os.path.getmtime(tools_json_path)}
+    for filename in os.listdir(tools_dir):
+        if filename.endswith(".py"):
+            path = os.path.join(tools_dir, filename)
+            stamps[os.path.abspath(path)] = os.path.getmtime(path)
+    return stamps
+
+
+def load_manifest(tools, tools_json_path, tools_dir, cache_path=None):
+    """Returns the tool->module manifest, reusing the cached copy on disk when
+    neither tools.json nor any tool module has changed since it was written."""
+    stamps = _source_stamps(tools_json_path, tools_dir)
+    if cache_path and os.path.exists(cache_path):
+        try:
+            with open(cache_path, "r", encoding="utf-8") as f:
+                cached = json.load(f)
+            if cached.get("version") == MANIFEST_VERSION and cached.get("sources") == stamps:
+                return cached["tools"]
+        except (OSError, ValueError, KeyError):
+            pass
+
+    entries = build_manifest(tools, tools_dir)
+    if cache_path:
+        try:
+            os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+            with open(cache_path, "w", encoding="utf-8") as f:
+                json.dump({"version": MANIFEST_VERSION, "sources": stamps, "tools": entries}, f)
+        except OSError as e:
+            log_action(f"Could not write tool manifest cache {cache_path}: {e}")
+    return entries
+
+
+class LazyTool:
+    """Callable stand-in for a tool function that imports its module on the
+    first call, so heavy dependencies are only paid for by tools actually used."""
+
+    def __init__(self, name, module_name, is_async=False):
+        self.__name__ = name
+        self.module_name = module_name
+        self.is_async = is_async
+        self._function = None
+
+    @property
+    def is_loaded(self):
+        return self._function is not None
+
+    def resolve(self):
+        if self._function is None:
+            module = importlib.import_module(f"{TOOLS_PACKAGE}.{self.module_name}")
+            self._function = getattr(module, self.__name__)
+        return self._function
+
+    def __call__(self, *args, **kwargs):
+        return self.resolve()(*args, **kwargs)
+
+    def __repr__(self):
+        state = "loaded" if self.is_loaded else "deferred"
+        return f"<LazyTool {self.__name__} from {self.module_name} ({state})>"
@@ -0,0 +1,85 @@
+from typing import Any, Callable, Dict, List, Optional
+
+from .schema_validator import CompiledValidator
+
+
+class ToolRegistry:
+    """Indexes tools.json once so every lookup on the hot path is a dict hit.
+
+    Holds name -> schema, name -> callable, category -> names and
+    parameter name -> tool names. Built by ToolManager and shared with the
+    orchestrator and the AI operator.
+    """
+
+    def __init__(self, tools: List[Dict[str, Any]], tool_functions: Optional[Dict[str, Callable]] = None):
+        self.source = tools
+        self._schemas: Dict[str, Dict[str, Any]] = {}
+        self._categories: Dict[str, List[str]] = {}
+        self._by_parameter: Dict[str, List[str]] = {}
+        self._category_of: Dict[str, str] = {}
+
+        for category in tools:
+            names = self._categories.setdefault(category.get("category", ""), [])
+            for tool_info in category["tools"]:
+                name = tool_info["name"]
+                if name in self._schemas:
+                    # tools.json lists a few tools under two categories; the
+                    # first definition wins, as it did with the linear scan.
+                    continue
+                self._schemas[name] = tool_info
+                self._category_of[name] = category.get("category", "")
+                names.append(name)
+                for param_name in tool_info.get("parameters", {}).get("properties", {}):
+                    self._by_parameter.setdefault(param_name, []).append(name)
+
+        self.names = list(self._schemas)
+        self._callables: Dict[str, Callable] = {
+            name: fn for name, fn in (tool_functions or {}).items() if name in self._schemas
+        }
+        self._validators: Dict[str, CompiledValidator] = {}
+
+    def __contains__(self, tool_name):
+        return tool_name in self._schemas
+
+    def __len__(self):
+        return len(self._schemas)
+
+    def get_schema(self, tool_name) -> Optional[Dict[str, Any]]:
+        return self._schemas.get(tool_name)
+
+    def get_callable(self, tool_name) -> Optional[Callable]:
+        return self._callables.get(tool_name)
+
+    def is_sensitive(self, tool_name) -> bool:
+        schema = self._schemas.get(tool_name)
+        return bool(schema and schema.get("sensitive"))
+
+    def is_read_only(self, tool_name) -> bool:
+        schema = self._schemas.get(tool_name)
+        return bool(schema and schema.get("read_only") and not schema.get("sensitive"))
+
+    def validator(self, tool_name) -> Optional[CompiledValidator]:
+        """The tool's parameter schema compiled into a validator, built on
+        first use."""
+        validator = self._validators.get(tool_name)
+        if validator is None and tool_name in self._schemas:
+            validator = CompiledValidator(self._schemas[tool_name].get("parameters"), tool_name)
+            self._validators[tool_name] = validator
+        return validator
+
+    def cache_policy(self, tool_name) -> Optional[Dict[str, Any]]:
+        schema = self._schemas.get(tool_name)
+        return schema.get("cache") if schema else None
+
+    def category_of(self, tool_name) -> Optional[str]:
+        return self._category_of.get(tool_name)
+
+    def tools_in_category(self, category) -> List[str]:
+        return self._categories.get(category, [])
+
+    def tools_with_parameter(self, param_name) -> List[str]:
+        return self._by_parameter.get(param_name, [])
+
+    @property
+    def categories(self) -> List[str]:
+        return list(self._categories)
@@ -0,0 +1,191 @@
+import heapq
+import math
+import re
+from collections import Counter
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from .logging import log_action
+from .tool_registry import ToolRegistry
+
+# Identifiers stay whole ("list_files") and are also split into their parts,
+# so both "list_files path=." and "list the files" reach list_files.
+_TOKEN_RE = re.compile(r"[a-z0-9]+(?:_[a-z0-9]+)*")
+STOPWORDS = frozenset(
+    "a an and are as at be by can do for from how i in is it me my of on or please "
+    "so that the this to up what with you your".split()
+)
+# How much one occurrence of a term counts, by the field it came from.
+FIELD_WEIGHTS = {"name": 3.0, "parameters": 1.5, "description": 1.0, "examples": 1.0}
+
+
+def _stem(word: str) -> str:
+    # Just enough to fold plurals: "files" -> "file", "directories" -> "directory".
+    if len(word) > 4 and word.endswith("ies"):
+        return word[:-3] + "y"
+    if len(word) > 3 and word.endswith("s") and not word.endswith("ss"):
+        return word[:-1]
+    return word
+
+
+def tokenize(text: str) -> List[str]:
+    tokens = []
+    for match in _TOKEN_RE.findall(text.lower()):
+        parts = match.split("_")
+        if len(parts) > 1:
+            tokens.append(match)
+        tokens.extend(_stem(part) for part in parts if part not in STOPWORDS)
+    return tokens
+
+
+class BM25Index:
+    """Okapi BM25 over a fixed set of documents, scored through an inverted
+    index whose postings already hold each term's final weight per document.
+    A query is then a few dict lookups and additions, with no per-query
+    length normalisation or idf work.
+
+    Documents are given as term -> (possibly fractional) frequency, so
+    callers can weight fields by scaling counts.
+    """
+
+    def __init__(self, documents: Dict[str, Dict[str, float]], k1: float = 1.2, b: float = 0.75):
+        self.ids = list(documents)
+        self.k1 = k1
+        count = len(self.ids)
+        lengths = [sum(terms.values()) for terms in documents.values()]
+        average = (sum(lengths) / count) if count else 0.0
+        document_frequency = Counter(term for terms in documents.values() for term in terms)
+        # Lucene's idf, which stays positive for terms in most documents.
+        self.idf = {term: math.log(1.0 + (count - df + 0.5) / (df + 0.5))
+                    for term, df in document_frequency.items()}
+        # Words no tool mentions are mostly arguments (a file name, a city),
+        # so they count as much as a typical indexed term, not as the rarest.
+        self.unknown_idf = (sum(self.idf.values()) / len(self.idf)) if self.idf else 0.0
+        self.postings: Dict[str, List[Tuple[int, float]]] = {}
+        for position, (terms, length) in enumerate(zip(documents.values(), lengths)):
+            norm = k1 * (1.0 - b + b * length / average) if average else k1
+            for term, frequency in terms.items():
+                weight = self.idf[term] * frequency * (k1 + 1.0) / (frequency + norm)
+                self.postings.setdefault(term, []).append((position, weight))
+
+    def search(self, terms: Iterable[str], k: Optional[int] = None) -> List[Tuple[str, float]]:
+        """Returns [(document id, score)] best first, for documents sharing
+        at least one term with the query."""
+        scores: Dict[int, float] = {}
+        for term in set(terms):
+            for position, weight in self.postings.get(term, ()):
+                scores[position] = scores.get(position, 0.0) + weight
+        if k is None:
+            best = sorted(scores.items(), key=lambda item: item[1], reverse=True)
+        else:
+            best = heapq.nlargest(k, scores.items(), key=lambda item: item[1])
+        return [(self.ids[position], score) for position, score in best]
+
+    def ideal_score(self, terms: Iterable[str]) -> float:
+        """The score no document can reach: every query term with a
+        saturated frequency. Dividing by it puts scores on a 0..1 scale that
+        does not depend on the query, so a fixed threshold means something;
+        unknown terms count too, so queries that are mostly
+        out-of-vocabulary stay low."""
+        return (self.k1 + 1.0) * sum(self.idf.get(term, self.unknown_idf) for term in set(terms))
+
+
+class ToolRetriever:
+    """Ranks tools for a request by fusing BM25 over tools.json with
+    knowledge base similarity.
+
+    The lexical index covers each tool's name, description, parameter names
+    and `examples[].input`, and is built once when the retriever is created;
+    a lexical ranking takes well under a millisecond. The semantic side
+    queries the `rexode_tools_knowledge` collection, groups hits by tool and
+    keeps each tool's best cosine similarity. The fused score is
+    `semantic_weight * cosine + (1 - semantic_weight) * bm25 / ideal`, both
+    in 0..1. Without a knowledge base (not installed, or `semantic=False`)
+    the lexical score is used alone.
+    """
+
+    def __init__(self, registry: ToolRegistry, knowledge_base_factory: Callable = None,
+                 semantic_weight: float = 0.5, include_examples: bool = True):
+        self.registry = registry
+        self.semantic_weight = semantic_weight
+        self._knowledge_base_factory = knowledge_base_factory
+        self._knowledge_base = None
+        self._disabled = False
+        self.index = BM25Index({name: self._tool_terms(registry.get_schema(name), include_examples)
+                                for name in registry.names})
+
+    @staticmethod
+    def _tool_terms(tool: Dict, include_examples: bool) -> Dict[str, float]:
+        fields = {
+            "name": [tool["name"]],
+            "description": [tool.get("description", "")],
+            "parameters": list(tool.get("parameters", {}).get("properties", {})),
+            "examples": [example.get("input", "") for example in tool.get("examples", [])]
+                        if include_examples else [],
+        }
+        terms: Dict[str, float] = {}
+        for field, texts in fields.items():
+            weight = FIELD_WEIGHTS[field]
+            for text in texts:
+                for term in tokenize(text):
+                    terms[term] = terms.get(term, 0.0) + weight
+        return terms
+
+    def _get_knowledge_base(self):
+        # The knowledge base pulls in an embedding model (and chromadb with
+        # the default backend), so it is only built on the first semantic
+        # ranking.
+        if self._knowledge_base is None and not self._disabled:
+            try:
+                if self._knowledge_base_factory is None:
+                    self._knowledge_base_factory = self._synced_knowledge_base
+                self._knowledge_base = self._knowledge_base_factory()
+            except Exception as e:
+                log_action(f"Semantic tool retrieval disabled, knowledge base unavailable: {e}")
+                self._disabled = True
+        return self._knowledge_base
+
+    def _synced_knowledge_base(self):
+        # Re-embeds only tools that changed since the last run; a no-op
+        # when tools.json is unchanged.
+        from .knowledge_base import KnowledgeBase
+        knowledge_base = KnowledgeBase()
+        knowledge_base.sync_tools(self.registry.source)
+        return knowledge_base
+
+    def lexical(self, query_text: str, k: Optional[int] = None) -> List[Tuple[str, float]]:
+        """Returns [(tool_name, score)] best first; score is BM25 / ideal, in 0..1."""
+        terms = tokenize(query_text)
+        ideal = self.index.ideal_score(terms)
+        if not ideal:
+            return []
+        return [(name, score / ideal) for name, score in self.index.search(terms, k)]
+
+    def semantic(self, query_text: str, k: int = 10) -> List[Tuple[str, float]]:
+        """Returns [(tool_name, score)] best first; score is cosine similarity."""
+        knowledge_base = self._get_knowledge_base()
+        if knowledge_base is None:
+            return []
+        # Each tool has several documents (description + examples), so ask for
+        # more hits than tools wanted.
+        documents, metadatas, distances = knowledge_base.query_knowledge_base(query_text, n_results=k * 3)
+        best = {}
+        for metadata, distance in zip(metadatas, distances):
+            tool_name = (metadata or {}).get("tool_name")
+            if tool_name not in self.registry:
+                continue
+            # The collection reports squared L2 over unit vectors: d = 2 - 2 * cos.
+            score = 1.0 - distance / 2.0
+            if score > best.get(tool_name, float("-inf")):
+                best[tool_name] = score
+        return sorted(best.items(), key=lambda item: item[1], reverse=True)
+
+    def rank(self, query_text: str, k: int = 10, semantic: bool = True) -> List[Tuple[str, float]]:
+        """Returns up to k [(tool_name, fused score)] best first."""
+        lexical = dict(self.lexical(query_text))
+        similar = dict(self.semantic(query_text, k)) if semantic and self.semantic_weight > 0 else {}
+        if not similar:
+            return sorted(lexical.items(), key=lambda item: item[1], reverse=True)[:k]
+        weight = self.semantic_weight
+        fused = {name: (1.0 - weight) * lexical.get(name, 0.0) + weight * similar.get(name, 0.0)
+                 for name in lexical.keys() | similar.keys()}
+        return heapq.nlargest(k, fused.items(), key=lambda item: item[1])
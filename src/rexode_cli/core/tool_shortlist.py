@@ -0,0 +1,38 @@
+from typing import Callable, List, Optional
+
+from .logging import log_action
+from .tool_registry import ToolRegistry
+from .tool_retriever import ToolRetriever
+
+
+class ToolShortlister:
+    """Picks the few tools relevant to a request so the prompt only carries
+    their schemas instead of the whole catalog.
+
+    Candidates come from ToolRetriever, which fuses BM25 over tools.json
+    with similarity from the `rexode_tools_knowledge` collection. When
+    nothing scores above `min_score`, `shortlist` returns None and the
+    caller falls back to the full catalog. If the knowledge base is
+    unavailable, the lexical ranking is used on its own.
+    """
+
+    def __init__(self, registry: ToolRegistry, knowledge_base_factory: Callable = None,
+                 k: int = 8, min_score: float = 0.3, retriever: ToolRetriever = None):
+        self.registry = registry
+        self.k = k
+        self.min_score = min_score
+        self.retriever = retriever or ToolRetriever(registry, knowledge_base_factory)
+
+    def rank(self, query_text: str):
+        """Returns [(tool_name, score)] best first; see ToolRetriever.rank."""
+        return self.retriever.rank(query_text, k=self.k)
+
+    def shortlist(self, query_text: str) -> Optional[List[str]]:
+        try:
+            ranked = self.rank(query_text)
+        except Exception as e:
+            log_action(f"Tool shortlisting failed, using full catalog: {e}")
+            return None
+        if not ranked or ranked[0][1] < self.min_score:
+            return None
+        return [name for name, _ in ranked[:self.k]]
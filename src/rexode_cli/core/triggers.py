@@ -0,0 +1,210 @@
+import re
+from datetime import datetime, timedelta
+from typing import Any, Dict, Optional
+
+
+class At:
+    """Fires once, at `when` (immediately if that is already past)."""
+
+    def __init__(self, when: datetime):
+        self.when = when
+
+    def first(self, now: datetime) -> datetime:
+        return self.when
+
+    def next(self, after: datetime) -> Optional[datetime]:
+        return None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"type": "at", "when": self.when.isoformat()}
+
+    def __str__(self):
+        return f"at {self.when:%Y-%m-%d %H:%M:%S}"
+
+
+class After:
+    """Fires `seconds` from now; with `repeat`, every `seconds` after that."""
+
+    def __init__(self, seconds: float, repeat: bool = False):
+        if seconds < 0 or (repeat and seconds <= 0):
+            raise ValueError(f"Invalid interval: {seconds} seconds")
+        self.seconds = seconds
+        self.repeat = repeat
+
+    def first(self, now: datetime) -> datetime:
+        return now + timedelta(seconds=self.seconds)
+
+    def next(self, after: datetime) -> Optional[datetime]:
+        return after + timedelta(seconds=self.seconds) if self.repeat else None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"type": "after", "seconds": self.seconds, "repeat": self.repeat}
+
+    def __str__(self):
+        return f"{'every' if self.repeat else 'in'} {self.seconds:g}s"
+
+
+class Cron:
+    """Standard five-field cron expression: minute hour day-of-month month
+    day-of-week (0 or 7 = Sunday), with `*`, lists, ranges and `/steps`."""
+
+    _RANGES = [(0, 59), (0, 23), (1, 31), (1, 12), (0, 7)]
+
+    def __init__(self, expression: str):
+        fields = expression.split()
+        if len(fields) != 5:
+            raise ValueError(f"A cron expression has five fields, got {len(fields)}: '{expression}'")
+        self.expression = expression
+        self.minutes, self.hours, self.days, self.months, weekdays = (
+            self._parse_field(field, low, high) for field, (low, high) in zip(fields, self._RANGES)
+        )
+        self.weekdays = {day % 7 for day in weekdays}
+        # As in cron, a restricted day-of-month and day-of-week are OR-ed.
+        self._any_day = fields[2] == "*"
+        self._any_weekday = fields[4] == "*"
+        self._sorted_hours = sorted(self.hours)
+        self._sorted_minutes = sorted(self.minutes)
+
+    @staticmethod
+    def _parse_field(field, low, high):
+        values = set()
+        for part in field.split(","):
+            part, _, step = part.partition("/")
+            step = int(step) if step else 1
+            if part == "*":
+                start, end = low, high
+            elif "-" in part:
+                start, end = (int(v) for v in part.split("-", 1))
+            else:
+                start = end = int(part)
+                if step > 1:
+                    end = high
+            if not (low <= start <= end <= high) or step < 1:
+                raise ValueError(f"Cron field '{field}' is outside {low}-{high}")
+            values.update(range(start, end + 1, step))
+        return values
+
+    def _day_matches(self, day: datetime) -> bool:
+        in_month = day.day in self.days
+        in_week = (day.weekday() + 1) % 7 in self.weekdays
+        if self._any_day and self._any_weekday:
+            return True
+        if self._any_day:
+            return in_week
+        if self._any_weekday:
+            return in_month
+        return in_month or in_week
+
+    def first(self, now: datetime) -> Optional[datetime]:
+        return self.next(now)
+
+    def next(self, after: datetime) -> Optional[datetime]:
+        start = after.replace(second=0, microsecond=0) + timedelta(minutes=1)
+        day = start.replace(hour=0, minute=0)
+        for _ in range(366 * 5):
+            if day.month in self.months and self._day_matches(day):
+                for hour in self._sorted_hours:
+                    for minute in self._sorted_minutes:
+                        candidate = day.replace(hour=hour, minute=minute)
+                        if candidate >= start:
+                            return candidate
+            day += timedelta(days=1)
+        return None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"type": "cron", "expression": self.expression}
+
+    def __str__(self):
+        return f"cron '{self.expression}'"
+
+
+_DURATION = re.compile(r"(\d+(?:\.\d+)?)\s*(s|secs?|seconds?|m|mins?|minutes?|h|hrs?|hours?|d|days?)\b", re.I)
+_UNIT_SECONDS = {"s": 1, "m": 60, "h": 3600, "d": 86400}
+_CLOCK = re.compile(r"(\d{1,2})(?::(\d{2}))?\s*(am|pm)?", re.I)
+
+
+def _parse_duration(text):
+    text = text.strip()
+    if re.fullmatch(r"\d+(?:\.\d+)?", text):
+        return float(text)
+    matches = list(_DURATION.finditer(text))
+    if not matches or _DURATION.sub("", text).strip(" ,and"):
+        return None
+    return sum(float(m.group(1)) * _UNIT_SECONDS[m.group(2)[0].lower()] for m in matches)
+
+
+def _parse_clock(text):
+    match = _CLOCK.fullmatch(text.strip())
+    if not match or (match.group(2) is None and match.group(3) is None):
+        return None
+    hour, minute, meridiem = int(match.group(1)), int(match.group(2) or 0), (match.group(3) or "").lower()
+    if meridiem:
+        if not 1 <= hour <= 12:
+            return None
+        hour = hour % 12 + (12 if meridiem == "pm" else 0)
+    if hour > 23 or minute > 59:
+        return None
+    return hour, minute
+
+
+def parse_trigger(spec, now: Optional[datetime] = None):
+    """Turns what a user or the LLM typed into a trigger:
+
+    - a number or duration ("90", "10m", "in 1h 30m") -> one-shot, relative
+    - "every 15m" -> repeating interval
+    - "14:30", "6 PM", "2025-08-15 14:00" -> one-shot at that time (a clock
+      time already past today means tomorrow)
+    - "daily 07:00" / "every day at 7 AM" -> every day at that time
+    - "cron */5 * * * *" or a bare five-field expression -> cron
+    """
+    now = now or datetime.now()
+    if isinstance(spec, (int, float)):
+        return After(float(spec))
+    text = str(spec).strip()
+    lowered = text.lower()
+
+    if lowered.startswith("cron "):
+        return Cron(text[5:].strip())
+    if len(text.split()) == 5 and re.fullmatch(r"[\d*/,\-\s]+", text):
+        return Cron(text)
+
+    for prefix in ("every day at ", "daily at ", "daily ", "every day "):
+        if lowered.startswith(prefix):
+            clock = _parse_clock(text[len(prefix):])
+            if clock:
+                return Cron(f"{clock[1]} {clock[0]} * * *")
+            raise ValueError(f"Could not understand the time in '{text}'")
+    if lowered.startswith("every "):
+        seconds = _parse_duration(text[6:])
+        if seconds:
+            return After(seconds, repeat=True)
+        raise ValueError(f"Could not understand the interval in '{text}'")
+
+    seconds = _parse_duration(text[3:] if lowered.startswith("in ") else text)
+    if seconds is not None:
+        return After(seconds)
+
+    clock = _parse_clock(text)
+    if clock:
+        when = now.replace(hour=clock[0], minute=clock[1], second=0, microsecond=0)
+        if when <= now:
+            when += timedelta(days=1)
+        return At(when)
+    for fmt in ("%Y-%m-%d %H:%M", "%Y-%m-%d %H:%M:%S", "%Y-%m-%dT%H:%M", "%Y-%m-%dT%H:%M:%S"):
+        try:
+            return At(datetime.strptime(text, fmt))
+        except ValueError:
+            pass
+    raise ValueError(f"Could not understand the time '{text}'")
+
+
+def trigger_from_dict(data: Dict[str, Any]):
+    """Inverse of the triggers' to_dict(), for jobs loaded from a store."""
+    kind = data.get("type")
+    if kind == "at":
+        return At(datetime.fromisoformat(data["when"]))
+    if kind == "after":
+        return After(data["seconds"], repeat=data.get("repeat", False))
+    if kind == "cron":
+        return Cron(data["expression"])
+    raise ValueError(f"Unknown trigger type: {kind}")
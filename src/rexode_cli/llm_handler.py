@@ -4,17 +4,72 @@ from langchain_google_genai import ChatGoogleGenerativeAI
 from langchain_community.llms import Ollama
 import os
 import json
+import threading
+import time
+from .core.logging import log_action
+
+# Options of the mode profile passed on to Ollama.
+OLLAMA_OPTIONS = ("num_ctx", "num_thread", "keep_alive")
+
+PROMPT_PREFIX_TEMPLATE = """You are Rexode, a helpful and powerful AI assistant. You have access to the following tools:
+
+{tool_catalog}
+
+Your goal is to assist the user by selecting and using the most appropriate tool(s) to fulfill their requests.
+
+**Instructions:**
+1.  **Tool Use:** If a tool is required, respond ONLY with a JSON object containing a "tool_calls" array. Each object in the array must have:
+    *   `name`: The name of the tool to call.
+    *   `parameters`: A JSON object containing the parameters for the tool.
+    *   Example:
+        ```json
+        {{
+          "tool_calls": [
+            {{
+              "name": "tool_name_here",
+              "parameters": {{
+                "param1": "value1",
+                "param2": "value2"
+              }}
+            }}
+          ]
+        }}
+        ```
+2.  **Direct Response:** If no tool is needed, or if you have already used a tool and want to provide a final answer or ask for more information, respond ONLY with a JSON object containing a "response" key.
+    *   Example:
+        ```json
+        {{
+          "response": "Your direct response here."
+        }}
+        ```
+3.  **Clarification:** If you need more information from the user to use a tool or provide a direct response, use the "response" format to ask for it.
+4.  **ALWAYS return valid JSON.**
+"""
 
 class LLMHandler:
     def __init__(self):
-        pass
-
-    def initialize_llm(self, llm_type: str, provider: str = None, model_name: str = None):
+        self._prefix = None
+        self._prefix_key = None
+        self._prefix_tools = None
+        self._history_source = None
+        self._history_count = 0
+        self._history_revision = 0
+        self._history_text = ""
+
+    def initialize_llm(self, llm_type: str, provider: str = None, model_name: str = None,
+                       base_url: str = None, options: dict = None):
+        """`base_url` and `options` (num_ctx, num_thread, keep_alive from the
+        mode profile) only apply to local models."""
         if llm_type == "local":
             if not model_name:
                 model_name = os.getenv("LOCAL_LLM_MODEL", "llama2")
             try:
-                llm = Ollama(model=model_name)
+                settings = {key: value for key, value in (options or {}).items()
+                            if key in OLLAMA_OPTIONS and value is not None}
+                if base_url:
+                    # OLLAMA_HOST is often given without a scheme.
+                    settings["base_url"] = base_url if "://" in base_url else f"http://{base_url}"
+                llm = Ollama(model=model_name, **settings)
                 print(f"✅ Local LLM '{model_name}' initialized.")
                 return llm
             except Exception as e:
@@ -62,6 +117,32 @@ class LLMHandler:
             print("❌ Invalid LLM type specified.")
             return None
 
+    def warm_up(self, llm, prompt=""):
+        """Sends one request in the background so a local model is loaded
+        before the first turn. Given the static prefix as `prompt`, Ollama
+        also evaluates it, and every prompt starting with the same text
+        reuses that KV cache instead of evaluating the tool catalog again.
+        Returns the thread; failures are only logged."""
+        def run():
+            start = time.perf_counter()
+            try:
+                llm.invoke(prompt, num_predict=1)
+            except Exception as e:
+                log_action(f"Local LLM warmup failed: {e}")
+            else:
+                log_action(f"Local LLM warmed up in {time.perf_counter() - start:.1f}s ({len(prompt)} prompt chars)")
+
+        thread = threading.Thread(target=run, name="llm-warmup", daemon=True)
+        thread.start()
+        return thread
+
+    def prefix_fits(self, tools, num_ctx, reserve_tokens, tools_version=None):
+        """Whether the full-catalog prefix plus `reserve_tokens` (history and
+        reply) fits in a context of `num_ctx` tokens, at ~4 chars a token."""
+        if not num_ctx:
+            return False
+        return len(self.get_static_prefix(tools, tools_version)) // 4 + reserve_tokens <= num_ctx
+
     def get_api_key(self, provider):
         api_key = os.getenv(f"{provider.upper()}_API_KEY")
         if not api_key:
@@ -82,51 +163,73 @@ class LLMHandler:
         else:
             return "default_online_model"
 
-    def get_prompt(self, chat_history, tools):
-        # Convert chat_history to a string format suitable for the prompt
-        history_str = ""
-        for entry in chat_history:
-            if entry["role"] == "user":
-                history_str += f"User: {entry['content']}\n"
-            elif entry["role"] == "assistant":
-                history_str += f"Assistant: {entry['content']}\n"
-            elif entry["role"] == "tool":
-                history_str += f"Tool Output: {entry['content']}\n"
-
-        prompt = f"""You are Rexode, a helpful and powerful AI assistant. You have access to the following tools:
-
-{json.dumps(tools, indent=2)}
-
-Your goal is to assist the user by selecting and using the most appropriate tool(s) to fulfill their requests.
-
-**Instructions:**
-1.  **Tool Use:** If a tool is required, respond ONLY with a JSON object containing a "tool_calls" array. Each object in the array must have:
-    *   `name`: The name of the tool to call.
-    *   `parameters`: A JSON object containing the parameters for the tool.
-    *   Example:
-        ```json
-        {{
-          "tool_calls": [
-            {{
-              "name": "tool_name_here",
-              "parameters": {{
-                "param1": "value1",
-                "param2": "value2"
-              }}
-            }}
-          ]
-        }}
-        ```
-2.  **Direct Response:** If no tool is needed, or if you have already used a tool and want to provide a final answer or ask for more information, respond ONLY with a JSON object containing a "response" key.
-    *   Example:
-        ```json
-        {{
-          "response": "Your direct response here."
-        }}
-        ```
-3.  **Clarification:** If you need more information from the user to use a tool or provide a direct response, use the "response" format to ask for it.
-4.  **ALWAYS return valid JSON.**
-
+    def render_tool_catalog(self, tools, tool_names=None):
+        """Minified tool catalog for the prompt: name, description and
+        parameter schema per tool. Examples and the `sensitive` flag are only
+        needed locally, so they are left out to keep the prompt small.
+        If `tool_names` is given, only those tools are included."""
+        wanted = set(tool_names) if tool_names is not None else None
+        catalog = []
+        for category in tools:
+            entries = [
+                {"name": t["name"], "description": t.get("description", ""), "parameters": t.get("parameters", {})}
+                for t in category["tools"]
+                if wanted is None or t["name"] in wanted
+            ]
+            if entries:
+                catalog.append({"category": category.get("category", ""), "tools": entries})
+        return json.dumps(catalog, separators=(",", ":"), ensure_ascii=False)
+
+    def get_static_prefix(self, tools, tools_version=None, tool_names=None):
+        """Returns the system text + tool catalog, rendered once per tools.json
+        version (and shortlist). The prefix is byte-identical across turns and
+        sits at the very start of the prompt so provider-side prompt caching
+        can reuse it."""
+        # Without an explicit version, key on the identity of the tools list;
+        # holding a reference keeps that id from being reused.
+        key = (
+            tools_version if tools_version is not None else id(tools),
+            tuple(tool_names) if tool_names is not None else None,
+        )
+        if self._prefix is None or self._prefix_key != key:
+            self._prefix = PROMPT_PREFIX_TEMPLATE.format(tool_catalog=self.render_tool_catalog(tools, tool_names))
+            self._prefix_key = key
+            self._prefix_tools = tools
+        return self._prefix
+
+    def render_history_entry(self, entry):
+        if entry["role"] == "user":
+            return f"User: {entry['content']}\n"
+        elif entry["role"] == "assistant":
+            return f"Assistant: {entry['content']}\n"
+        elif entry["role"] == "tool":
+            return f"Tool Output: {entry['content']}\n"
+        elif entry["role"] == "summary":
+            return f"Summary of earlier conversation:\n{entry['content']}\n"
+        return ""
+
+    def render_history(self, chat_history):
+        # Only entries appended since the last call are rendered. Anything
+        # else (a new list, one that shrank, or a ConversationHistory whose
+        # revision changed after compaction) triggers a full re-render.
+        revision = getattr(chat_history, "revision", 0)
+        if (chat_history is not self._history_source or len(chat_history) < self._history_count
+                or revision != self._history_revision):
+            self._history_source = chat_history
+            self._history_revision = revision
+            self._history_count = 0
+            self._history_text = ""
+        if len(chat_history) > self._history_count:
+            self._history_text += "".join(
+                self.render_history_entry(entry) for entry in chat_history[self._history_count:]
+            )
+            self._history_count = len(chat_history)
+        return self._history_text
+
+    def get_prompt(self, chat_history, tools, tools_version=None, tool_names=None):
+        prefix = self.get_static_prefix(tools, tools_version, tool_names)
+        history_str = self.render_history(chat_history)
+        return f"""{prefix}
 **Chat History:**
 {history_str}
 
@@ -134,7 +237,6 @@ Your goal is to assist the user by selecting and using the most appropriate tool
 
 **Your Response (JSON):**
 """
-        return prompt
 
 # Example usage (for testing purposes)
 if __name__ == "__main__":
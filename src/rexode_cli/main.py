@@ -16,6 +16,18 @@ def main():
     # Initialize LLMHandler once
     llm_handler = LLMHandler()
 
+    if len(sys.argv) > 1 and sys.argv[1] == "sync-kb":
+        # Re-index tools.json into the knowledge base; only changed tools are
+        # re-embedded.
+        from .core.config import Config
+        from .core.knowledge_base import KnowledgeBase
+        from .core.tool_manager import ToolManager
+
+        tool_manager = ToolManager(Config())
+        summary = KnowledgeBase().sync_tools(tool_manager.tools)
+        print(", ".join(f"{count} {state}" for state, count in summary.items()))
+        return
+
     if len(sys.argv) > 1 and sys.argv[1] == "auto":
         task = " ".join(sys.argv[2:])
         if not task:
@@ -2,10 +2,17 @@ import json
 
 MODE_FILE = "config/mode_config.json"
 
+# "local_llm" holds the Ollama options for the mode. num_ctx has to fit the
+# whole prompt (Ollama silently drops the start of longer ones); num_thread
+# None lets Ollama choose; keep_alive is how long the model stays loaded
+# after the last request.
 MODES = {
-    "power": {"speed": "fast", "accuracy": "high"},
-    "balanced": {"speed": "medium", "accuracy": "medium"},
-    "eco": {"speed": "slow", "accuracy": "low"}
+    "power": {"speed": "fast", "accuracy": "high",
+              "local_llm": {"num_ctx": 20480, "num_thread": None, "keep_alive": "30m"}},
+    "balanced": {"speed": "medium", "accuracy": "medium",
+                 "local_llm": {"num_ctx": 12288, "num_thread": None, "keep_alive": "15m"}},
+    "eco": {"speed": "slow", "accuracy": "low",
+            "local_llm": {"num_ctx": 8192, "num_thread": 2, "keep_alive": "5m"}}
 }
 
 def load_mode():
@@ -1,7 +1,4 @@
 # src/rexode_cli/tools/__init__.py
-
-tool_registry = {
-    "open_application": lambda app_name: f"Simulating opening {app_name}",
-    "launch_app": lambda app_name: f"Simulating launching {app_name}",
-    # Add other tools as needed for testing AIOperator
-}
\ No newline at end of file
+#
+# Tool modules in this package are discovered by core.tool_manifest and
+# imported on demand; tools are looked up through core.tool_registry.ToolRegistry.
@@ -1,5 +1,4 @@
 import subprocess
-import schedule
 import time
 
 def trigger_ci_pipeline(pipeline_name, branch=None):
@@ -1,7 +1,7 @@
 import pyperclip
-import schedule
-import time
-from datetime import datetime
+import re
+
+from ..core.scheduler import format_jobs, get_scheduler, idempotency_key, parse_trigger
 
 def send_message(recipient, message):
     """Sends a message."""
@@ -11,27 +11,35 @@ def send_message(recipient, message):
 def _run_scheduled_task(task_description):
     print(f"\n[SCHEDULED TASK EXECUTING]: {task_description}")
 
-def schedule_task(task, time_str):
+def schedule_task(task, time):
     """Schedules a task at a specific time."""
+    time_str = str(time)
     try:
-        # Basic time parsing. Assumes HH:MM format for simplicity.
-        # For more complex time strings, a dedicated parser would be needed.
-        try:
-            # Attempt to parse as HH:MM
-            hour, minute = map(int, time_str.split(':'))
-            schedule.every().day.at(f"{hour:02d}:{minute:02d}").do(_run_scheduled_task, task)
-            return f"Task '{task}' scheduled daily for {time_str}."
-        except ValueError:
-            # If not HH:MM, try to parse as a full datetime string
-            # This is a very basic attempt and might fail for many formats
-            scheduled_time = datetime.strptime(time_str, "%Y-%m-%d %H:%M")
-            # For one-time scheduling at a specific datetime, you'd typically use a different library
-            # or a more complex schedule setup. For simplicity, we'll just acknowledge.
-            return f"Task '{task}' acknowledged for one-time execution at {time_str}. (Advanced scheduling needed)"
-
+        # A bare HH:MM has always meant "every day at"; anything else
+        # ("in 10m", "6 PM", "2025-08-15 14:00", "every 2h", cron) is parsed
+        # by parse_trigger.
+        if re.fullmatch(r"\d{1,2}:\d{2}", time_str.strip()):
+            time_str = f"daily {time_str.strip()}"
+        trigger = parse_trigger(time_str)
+        # Copies of the same task that were all missed while Rexode was
+        # closed run once between them on start-up.
+        job = get_scheduler().add(_run_scheduled_task, trigger, args=(task,), name=task,
+                                  key=idempotency_key("task", task, trigger), misfire="coalesce")
+        return f"Task '{task}' scheduled as #{job.id} ({job.trigger}), next run {job.next_run:%Y-%m-%d %H:%M}."
     except Exception as e:
         return f"Error scheduling task: {e}"
 
+def list_scheduled_tasks():
+    """Lists pending scheduled tasks and reminders."""
+    jobs = get_scheduler().list_jobs()
+    return format_jobs(jobs) if jobs else "No pending scheduled tasks."
+
+def cancel_scheduled_task(task_id):
+    """Cancels a scheduled task by its id."""
+    if get_scheduler().cancel(int(str(task_id).lstrip("#"))):
+        return f"Cancelled scheduled task #{task_id}."
+    return f"Error: no pending scheduled task #{task_id}."
+
 def calendar_event(title, start_time, end_time):
     """Creates a calendar event."""
     # This is a placeholder and would require integration with a calendar API (e.g., Google Calendar, Outlook)
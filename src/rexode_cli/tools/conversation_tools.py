@@ -0,0 +1,20 @@
+import os
+
+from ..core.config import Config
+
+def read_tool_output(output_id, offset=0, length=4000):
+    """Reads part of a tool output stored outside the conversation history."""
+    path = os.path.join(Config.TOOL_OUTPUT_DIR, f"{os.path.basename(output_id)}.txt")
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            content = f.read()
+    except FileNotFoundError:
+        return f"No stored output with ID {output_id}."
+    except Exception as e:
+        return f"Error reading stored output: {e}"
+    offset, length = int(offset), int(length)
+    chunk = content[offset:offset + length]
+    remaining = max(len(content) - offset - len(chunk), 0)
+    if remaining:
+        chunk += f"\n... [{remaining} more characters; continue with offset={offset + len(chunk)}]"
+    return chunk
@@ -1,5 +1,7 @@
 import subprocess
 
+from ..core.crawler import OUTPUT_FORMATS, crawl_to_file
+
 def train_ml_model(model_type, dataset_path, config_path=None):
     """Trains a machine learning model with a given dataset."""
     # This is a placeholder. Real implementation would use ML frameworks like TensorFlow, PyTorch, scikit-learn.
@@ -41,5 +43,16 @@ def data_visualization(dataset_path, chart_type, save_path):
 
 def dataset_scraper(source_urls, output_format, save_path):
     """Scrapes data from web sources to create a dataset."""
-    # This is a placeholder. Real implementation would use web scraping libraries like Beautiful Soup, Scrapy.
-    return f"Scraping data from {len(source_urls)} URLs, saving as {output_format} to {save_path}. (Placeholder)"
+    if isinstance(source_urls, str):
+        source_urls = source_urls.replace(",", " ").split()
+    if output_format not in OUTPUT_FORMATS:
+        return f"Error: unsupported output format '{output_format}'. Use one of: {', '.join(OUTPUT_FORMATS)}."
+    try:
+        stats = crawl_to_file(source_urls, output_format, save_path)
+    except Exception as e:
+        return f"Error scraping dataset: {e}"
+    memory = f", peak memory {stats['peak_memory_mb']:.0f} MB" if stats["peak_memory_mb"] is not None else ""
+    return (
+        f"Scraped {stats['pages'] - stats['failed']}/{stats['pages']} pages in {stats['elapsed']:.1f} s "
+        f"({stats['pages_per_second']:.1f} pages/s{memory}), saved as {output_format} to {save_path}."
+    )
@@ -1,4 +1,4 @@
-import subprocess
+from ..core.process_runner import run_command_sync
 
 def deploy_app(app_path, target_type):
     """Deploys an application to a specified target (desktop, mobile, web)."""
@@ -31,10 +31,12 @@ def container_deploy(image_name, orchestrator, config_path=None):
         return f"Unsupported orchestrator: {orchestrator}"
 
     try:
-        result = subprocess.run(command, shell=True, capture_output=True, text=True)
-        if result.returncode == 0:
-            return f"Successfully deployed {image_name} using {orchestrator}.\nStdout: {result.stdout}"
+        result = run_command_sync(command)
+        if "error" in result:
+            return f"Error deploying {image_name} using {orchestrator}: {result['error']}.\nStderr: {result['stderr']}"
+        if result["returncode"] == 0:
+            return f"Successfully deployed {image_name} using {orchestrator}.\nStdout: {result['stdout']}"
         else:
-            return f"Error deploying {image_name} using {orchestrator}.\nStderr: {result.stderr}"
+            return f"Error deploying {image_name} using {orchestrator}.\nStderr: {result['stderr']}"
     except Exception as e:
         return f"Exception during deployment: {e}"
@@ -1,13 +1,11 @@
-import re
+from ..core.intent_matcher import get_intent_matcher
 
-def detect_tool(user_input: str):
-    text = user_input.lower()
-
-    if re.search(r"(open|launch|start).*(whatsapp)", text):
-        return "open_application", {"application_name": "whatsapp"}
 
-    if re.search(r"(open|launch|start).*(youtube)", text):
-        return "open_application", {"application_name": "youtube"}
-
-    # fallback
-    return None, None
\ No newline at end of file
+def detect_tool(user_input: str):
+    """Returns (tool_name, parameters) for rule-based input, or (None, None).
+    The rules are the `intents` templates in tools.json, compiled once, with
+    a fuzzy match on tool names behind them."""
+    match = get_intent_matcher().detect(user_input)
+    if match is None:
+        return None, None
+    return match.tool_name, match.parameters
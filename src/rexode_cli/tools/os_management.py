@@ -4,6 +4,8 @@ import shutil
 import zipfile
 import platform
 
+from ..core.process_runner import run_command_sync
+
 def open_application(application_name):
     """Opens an application on the user's operating system."""
     try:
@@ -92,13 +94,18 @@ def system_info():
         return f"Error getting system info: {e}"
 
 def execute_shell_command(command):
-    """Executes a shell command."""
+    """Executes a shell command, streaming its output to the console. Long
+    output is cut to head + tail; `error` is set if the command was killed
+    (time or output limit, or ESC)."""
     try:
-        result = subprocess.run(command, shell=True, capture_output=True, text=True)
-        return {
-            "stdout": result.stdout,
-            "stderr": result.stderr,
-            "returncode": result.returncode
+        result = run_command_sync(command)
+        output = {
+            "stdout": result["stdout"],
+            "stderr": result["stderr"],
+            "returncode": result["returncode"]
         }
+        if "error" in result:
+            output["error"] = result["error"]
+        return output
     except Exception as e:
         return f"Error executing shell command: {e}"
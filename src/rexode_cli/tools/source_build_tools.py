@@ -1,6 +1,7 @@
 import git
 import os
-import subprocess
+
+from ..core.process_runner import run_command_sync
 
 def git_clone(repository_url, destination_path):
     """Clones a Git repository."""
@@ -57,11 +58,13 @@ def build_project(project_path, build_system):
         return f"Unsupported build system: {build_system}"
 
     try:
-        result = subprocess.run(command, shell=True, capture_output=True, text=True, cwd=project_path)
-        if result.returncode == 0:
-            return f"Successfully built project using {build_system}.\nStdout: {result.stdout}"
+        result = run_command_sync(command, cwd=project_path)
+        if "error" in result:
+            return f"Error building project using {build_system}: {result['error']}.\nStderr: {result['stderr']}"
+        if result["returncode"] == 0:
+            return f"Successfully built project using {build_system}.\nStdout: {result['stdout']}"
         else:
-            return f"Error building project using {build_system}.\nStderr: {result.stderr}"
+            return f"Error building project using {build_system}.\nStderr: {result['stderr']}"
     except Exception as e:
         return f"Exception during build: {e}"
 
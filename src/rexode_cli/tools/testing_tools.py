@@ -1,4 +1,4 @@
-import subprocess
+from ..core.process_runner import run_command_sync
 
 def run_tests(project_path, test_type="all"):
     """Runs tests for a project (unit, integration, regression)."""
@@ -7,11 +7,13 @@ def run_tests(project_path, test_type="all"):
     if test_type != "all":
         command += f" -m {test_type}" # Assuming markers for test types
     try:
-        result = subprocess.run(command, shell=True, capture_output=True, text=True, cwd=project_path)
-        if result.returncode == 0:
-            return f"Tests ({test_type}) for {project_path} passed.\nStdout: {result.stdout}"
+        result = run_command_sync(command, cwd=project_path)
+        if "error" in result:
+            return f"Tests ({test_type}) for {project_path} did not finish: {result['error']}.\nStdout: {result['stdout']}"
+        if result["returncode"] == 0:
+            return f"Tests ({test_type}) for {project_path} passed.\nStdout: {result['stdout']}"
         else:
-            return f"Tests ({test_type}) for {project_path} failed.\nStderr: {result.stderr}"
+            return f"Tests ({test_type}) for {project_path} failed.\nStderr: {result['stderr']}"
     except Exception as e:
         return f"Error running tests: {e}"
 
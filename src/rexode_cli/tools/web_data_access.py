@@ -1,12 +1,17 @@
-import requests
 from bs4 import BeautifulSoup
 import os
 
+from ..core.config import Config
+from ..core.crawler import extract_page_text
+from ..core.downloader import DOWNLOAD_STEPS, Downloader
+from ..core.http_client import get_http_client
+from ..task_ui import TaskUI
+
 def search_web(query):
     """Searches the web for a given query."""
     try:
         # This is a placeholder and should be replaced with a proper search API
-        response = requests.get(f"https://www.google.com/search?q={query}")
+        response = get_http_client().get(f"https://www.google.com/search?q={query}")
         soup = BeautifulSoup(response.text, 'html.parser')
         results = []
         for g in soup.find_all('div', class_='g'):
@@ -26,20 +31,25 @@ def search_web(query):
 def scrape_website(url):
     """Scrapes the content of a website."""
     try:
-        response = requests.get(url)
-        soup = BeautifulSoup(response.text, 'html.parser')
-        return soup.get_text()
+        response = get_http_client().get(url)
+        return extract_page_text(response.text, response.url)["text"]
     except Exception as e:
         return f"Error scraping website: {e}"
 
-def download_file(url, save_path):
+def download_file(url, save_path, sha256=None):
     """Downloads a file from a URL."""
     try:
-        response = requests.get(url, stream=True)
-        with open(save_path, 'wb') as f:
-            for chunk in response.iter_content(chunk_size=8192):
-                f.write(chunk)
-        return f"Successfully downloaded file to {save_path}"
+        downloader = Downloader(
+            get_http_client(),
+            workers=Config.DOWNLOAD_WORKERS,
+            chunk_size=Config.DOWNLOAD_CHUNK_SIZE,
+            chunk_retries=Config.DOWNLOAD_CHUNK_RETRIES,
+            ui=TaskUI(DOWNLOAD_STEPS),
+        )
+        result = downloader.download(url, save_path, sha256=sha256)
+        resumed = f", resumed after {result['resumed_bytes']} bytes" if result["resumed_bytes"] else ""
+        verified = ", sha256 verified" if result["sha256"] else ""
+        return f"Successfully downloaded file to {save_path} ({result['bytes']} bytes{resumed}{verified})"
     except Exception as e:
         return f"Error downloading file: {e}"
 
@@ -47,7 +57,7 @@ def get_weather(location):
     """Gets the weather for a given location."""
     try:
         # This is a placeholder and should be replaced with a proper weather API
-        response = requests.get(f"https://wttr.in/{location}?format=%C+%t")
+        response = get_http_client().get(f"https://wttr.in/{location}?format=%C+%t")
         return response.text
     except Exception as e:
         return f"Error getting weather: {e}"
@@ -56,7 +66,7 @@ def get_news(topic):
     """Gets the latest news."""
     try:
         # This is a placeholder and should be replaced with a proper news API
-        response = requests.get(f"https://news.google.com/search?q={topic}")
+        response = get_http_client().get(f"https://news.google.com/search?q={topic}")
         soup = BeautifulSoup(response.text, 'html.parser')
         articles = []
         for article in soup.find_all('article', limit=5):
@@ -70,7 +80,7 @@ def get_news(topic):
 def fetch_api_data(api_url):
     """Fetches data from an API."""
     try:
-        response = requests.get(api_url)
+        response = get_http_client().get(api_url)
         return response.json()
     except Exception as e:
         return f"Error fetching API data: {e}"
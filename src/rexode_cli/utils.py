@@ -1,25 +1,15 @@
 import os
 import json
-import datetime
 import platform
 
+from .chat_logger import append_chat
+from .core.speech import say
+
 def split_input(text: str, sep: str = "|||"):
     return [s.strip() for s in text.split(sep)]
 
 def log_chat(user, ai):
-    folder = "chat_history"
-    os.makedirs(folder, exist_ok=True)
-    now = datetime.datetime.now().strftime("%Y-%m-%d")
-    filepath = os.path.join(folder, f"{now}.json")
-    chat = {"time": str(datetime.datetime.now()), "user": user, "rexode": ai}
-    if os.path.exists(filepath):
-        with open(filepath, "r", encoding="utf-8") as f:
-            history = json.load(f)
-    else:
-        history = []
-    history.append(chat)
-    with open(filepath, "w", encoding="utf-8") as f:
-        json.dump(history, f, indent=2)
+    append_chat(user, ai)
 
 def get_mode_config(mode="balanced"):
     return {
@@ -46,9 +36,6 @@ def notify_user(message: str):
         # fallback for mac/linux
         print(f"🔔 {message}")
 
-import pyttsx3
-
 def speak_text(text):
-    engine = pyttsx3.init()
-    engine.say(text)
-    engine.runAndWait()
+    """Speaks `text` on the background speech worker without waiting."""
+    say(text)
@@ -0,0 +1,87 @@
+import unittest
+import json
+import os
+import sys
+import tempfile
+
+# Add the project root to the Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.rexode_cli.chat_logger import ChatJournal, get_today_log_path, migrate_json_logs, read_chats
+
+class TestChatJournal(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.folder = self.temp_dir.name
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_entries_are_appended_as_json_lines(self):
+        """Test that each entry is one line and the reader streams them back in order."""
+        journal = ChatJournal(self.folder, fsync="always")
+        for i in range(3):
+            journal.append({"user": f"question {i}", "rexode": f"answer {i}"})
+        journal.close()
+
+        with open(get_today_log_path(self.folder), encoding="utf-8") as f:
+            lines = f.read().splitlines()
+        self.assertEqual(len(lines), 3)
+        self.assertEqual(json.loads(lines[1])["user"], "question 1")
+        self.assertEqual([e["rexode"] for e in read_chats(folder=self.folder)], ["answer 0", "answer 1", "answer 2"])
+
+    def test_rotation_keeps_all_entries_in_order(self):
+        """Test that a full journal file is rotated and the reader walks rotated parts first."""
+        journal = ChatJournal(self.folder, fsync="never", max_bytes=200)
+        for i in range(20):
+            journal.append({"user": f"question {i}", "rexode": "x" * 20})
+        journal.close()
+
+        files = os.listdir(self.folder)
+        self.assertGreater(len(files), 1)
+        for name in files:
+            self.assertLessEqual(os.path.getsize(os.path.join(self.folder, name)), 200)
+        self.assertEqual([e["user"] for e in read_chats(folder=self.folder)], [f"question {i}" for i in range(20)])
+
+    def test_interval_policy_flushes_every_entry(self):
+        """Test that with "interval" every turn is in the file before the next fsync is due."""
+        journal = ChatJournal(self.folder, fsync="interval", fsync_interval=3600)
+        for i in range(3):
+            journal.append({"user": f"question {i}", "rexode": f"answer {i}"})
+        # Read through a second handle while the journal is still open, as after a crash.
+        self.assertEqual([e["user"] for e in read_chats(folder=self.folder)], ["question 0", "question 1", "question 2"])
+        journal.close()
+
+    def test_malformed_line_is_skipped(self):
+        """Test that a half-written trailing line does not stop the reader."""
+        journal = ChatJournal(self.folder, fsync="always")
+        journal.append({"user": "hello", "rexode": "hi"})
+        journal.close()
+        with open(get_today_log_path(self.folder), "a", encoding="utf-8") as f:
+            f.write('{"user": "cut of')
+
+        self.assertEqual(list(read_chats(folder=self.folder)), [{"user": "hello", "rexode": "hi"}])
+
+    def test_unknown_fsync_policy_is_rejected(self):
+        with self.assertRaises(ValueError):
+            ChatJournal(self.folder, fsync="sometimes")
+
+    def test_migrate_json_logs(self):
+        """Test that both legacy array formats are converted once and the originals are kept aside."""
+        with open(os.path.join(self.folder, "rexode_chat_2024-05-01.json"), "w", encoding="utf-8") as f:
+            json.dump([{"timestamp": "2024-05-01 10:00:00", "user": "a", "rexode": ""}], f, indent=2)
+        with open(os.path.join(self.folder, "2024-05-02.json"), "w", encoding="utf-8") as f:
+            json.dump([{"time": "2024-05-02 11:00:00", "user": "b", "rexode": "c"}], f, indent=2)
+
+        self.assertEqual(migrate_json_logs(self.folder), 2)
+        self.assertEqual(migrate_json_logs(self.folder), 0)
+
+        entries = list(read_chats(folder=self.folder))
+        self.assertEqual([e["user"] for e in entries], ["a", "b"])
+        self.assertEqual(entries[1]["timestamp"], "2024-05-02 11:00:00")
+        self.assertEqual(list(read_chats(date="2024-05-02", folder=self.folder)), [entries[1]])
+        self.assertTrue(os.path.exists(os.path.join(self.folder, "2024-05-02.json.migrated")))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,173 @@
+import unittest
+import asyncio
+import csv
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Add the project root to the Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.rexode_cli.core.crawler import Crawler, PageTextExtractor, crawl_to_file, etree
+
+PAGE = """<html><head><title>Page {n}</title><script>var tracking = 1;</script></head><body>
+<nav><a href="/">Home</a> <a href="/about">About</a></nav>
+<div class="cookie-banner">We use cookies</div>
+<article><h1>Article {n}</h1><p>Body of <b>page</b> {n} &amp; more.</p><p><a href="/page/{next}">next</a></p></article>
+<footer>Copyright</footer></body></html>"""
+
+class FixtureHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        server = self.server
+        with server.lock:
+            server.in_flight += 1
+            server.max_in_flight = max(server.max_in_flight, server.in_flight)
+        try:
+            time.sleep(0.05)
+            if self.path.startswith("/page/"):
+                n = int(self.path.rsplit("/", 1)[1])
+                body, status, content_type = PAGE.format(n=n, next=n + 1).encode(), 200, "text/html; charset=utf-8"
+            elif self.path == "/image.png":
+                body, status, content_type = b"\x89PNG", 200, "image/png"
+            else:
+                body, status, content_type = b"missing", 404, "text/plain"
+            self.send_response(status)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+        finally:
+            with server.lock:
+                server.in_flight -= 1
+
+    def log_message(self, *args):
+        pass
+
+class TestPageTextExtractor(unittest.TestCase):
+
+    def _extract(self, backend):
+        html = PAGE.format(n=1, next=2)
+        extractor = PageTextExtractor("http://example.com/page/1", backend=backend)
+        # Feed in small chunks, as the crawler does while downloading.
+        for i in range(0, len(html), 17):
+            extractor.feed(html[i:i + 17])
+        return extractor.close()
+
+    def test_boilerplate_is_stripped(self):
+        page = self._extract("html.parser")
+        self.assertEqual(page["title"], "Page 1")
+        self.assertEqual(page["text"], "Article 1\nBody of page 1 & more.\nnext")
+        self.assertEqual(page["links"], ["http://example.com/page/2"])
+
+    def test_form_wrapped_page_keeps_its_content(self):
+        html = ('<html><body><form id="aspnetForm"><nav>Menu</nav><div><h1>Title</h1>'
+                '<p>Real article text.</p></div><button>Submit</button></form></body></html>')
+        page = PageTextExtractor("http://example.com/", backend="html.parser")
+        page.feed(html)
+        self.assertEqual(page.close()["text"], "Title\nReal article text.")
+
+    @unittest.skipIf(etree is None, "lxml is not installed")
+    def test_lxml_backend_matches_stdlib(self):
+        self.assertEqual(self._extract("lxml"), self._extract("html.parser"))
+
+class TestCrawler(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.server = ThreadingHTTPServer(("127.0.0.1", 0), FixtureHandler)
+        cls.server.lock = threading.Lock()
+        cls.base = f"http://127.0.0.1:{cls.server.server_address[1]}"
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def setUp(self):
+        self.server.in_flight = 0
+        self.server.max_in_flight = 0
+        self.temp_dir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def _crawl(self, crawler, urls):
+        async def run():
+            return [page async for page in crawler.crawl(urls)]
+        return asyncio.run(run())
+
+    def test_pages_are_fetched_concurrently_within_the_per_domain_limit(self):
+        urls = [f"{self.base}/page/{n}" for n in range(12)]
+        crawler = Crawler(concurrency=8, per_domain=3, domain_delay=0)
+        start = time.perf_counter()
+        pages = self._crawl(crawler, urls)
+        elapsed = time.perf_counter() - start
+
+        self.assertEqual(sorted(page["url"] for page in pages), sorted(urls))
+        self.assertEqual(self.server.max_in_flight, 3)
+        # 12 pages at 50 ms each, three at a time.
+        self.assertLess(elapsed, 12 * 0.05 * 0.75)
+        self.assertEqual(crawler.stats["pages"], 12)
+        self.assertEqual(crawler.stats["failed"], 0)
+
+    def test_domain_delay_spaces_out_requests(self):
+        crawler = Crawler(per_domain=4, domain_delay=0.1)
+        start = time.perf_counter()
+        self._crawl(crawler, [f"{self.base}/page/{n}" for n in range(4)])
+        self.assertGreaterEqual(time.perf_counter() - start, 0.3)
+
+    def test_failures_are_recorded_not_raised(self):
+        pages = {page["url"]: page for page in self._crawl(Crawler(domain_delay=0), [
+            f"{self.base}/missing", f"{self.base}/image.png", "http://127.0.0.1:1/unreachable",
+        ])}
+        self.assertEqual(pages[f"{self.base}/missing"]["error"], "HTTP 404")
+        self.assertIn("image/png", pages[f"{self.base}/image.png"]["error"])
+        self.assertIsNotNone(pages["http://127.0.0.1:1/unreachable"]["error"])
+
+    def test_unexpected_page_errors_do_not_stall_the_crawl(self):
+        class BrokenParserCrawler(Crawler):
+            async def fetch(self, session, url):
+                if url.endswith("/1"):
+                    raise ValueError("parser blew up")
+                return await super().fetch(session, url)
+
+        async def run():
+            crawler = BrokenParserCrawler(concurrency=2, domain_delay=0)
+            return [page async for page in crawler.crawl(f"{self.base}/page/{n}" for n in range(4))]
+        pages = {page["url"]: page for page in asyncio.run(asyncio.wait_for(run(), 5))}
+
+        self.assertEqual(len(pages), 4)
+        self.assertEqual(pages[f"{self.base}/page/1"]["error"], "ValueError: parser blew up")
+        self.assertIsNone(pages[f"{self.base}/page/2"]["error"])
+
+    def test_crawl_to_file_streams_each_format(self):
+        urls = [f"{self.base}/page/{n}" for n in range(3)]
+        crawler = Crawler(domain_delay=0)
+        for output_format in ("jsonl", "json", "csv", "xml"):
+            save_path = os.path.join(self.temp_dir.name, f"pages.{output_format}")
+            stats = crawl_to_file(urls, output_format, save_path, crawler=crawler)
+            self.assertEqual(stats["pages"], 3)
+            self.assertGreater(stats["pages_per_second"], 0)
+            with open(save_path, encoding="utf-8", newline="") as f:
+                if output_format == "jsonl":
+                    records = [json.loads(line) for line in f]
+                elif output_format == "json":
+                    records = json.load(f)
+                elif output_format == "csv":
+                    records = list(csv.DictReader(f))
+                else:
+                    content = f.read()
+                    self.assertEqual(content.count("<page "), 3)
+                    self.assertIn("Body of page 1 &amp; more.", content)
+                    continue
+            self.assertEqual(sorted(r["title"] for r in records), ["Page 0", "Page 1", "Page 2"])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,126 @@
+import unittest
+import hashlib
+import json
+import os
+import re
+import sys
+import tempfile
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import Mock
+
+# Add the project root to the Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.rexode_cli.core.downloader import DownloadError, Downloader
+from src.rexode_cli.core.http_client import HttpClient
+
+CONTENT = os.urandom(1024 * 1024 + 123)
+
+class RangeHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        server = self.server
+        match = re.match(r"bytes=(\d+)-(\d+)", self.headers.get("Range", ""))
+        if self.path == "/plain" or not match:
+            start, end, status = 0, len(CONTENT) - 1, 200
+        else:
+            start, end, status = int(match.group(1)), min(int(match.group(2)), len(CONTENT) - 1), 206
+            if server.fail_from is not None and end >= server.fail_from:
+                # Send half the range, then drop the connection.
+                self.send_response(206)
+                self.send_header("Content-Range", f"bytes {start}-{end}/{len(CONTENT)}")
+                self.send_header("Content-Length", str(end - start + 1))
+                self.end_headers()
+                self.wfile.write(CONTENT[start:start + (end - start) // 2])
+                self.close_connection = True
+                return
+        body = CONTENT[start:end + 1]
+        with server.lock:
+            server.served += len(body)
+            server.ranges += status == 206
+        self.send_response(status)
+        self.send_header("ETag", '"content-v1"')
+        if status == 206:
+            self.send_header("Content-Range", f"bytes {start}-{end}/{len(CONTENT)}")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+class TestDownloader(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.server = ThreadingHTTPServer(("127.0.0.1", 0), RangeHandler)
+        cls.server.lock = threading.Lock()
+        cls.base = f"http://127.0.0.1:{cls.server.server_address[1]}"
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def setUp(self):
+        self.server.served = 0
+        self.server.ranges = 0
+        self.server.fail_from = None
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.save_path = os.path.join(self.temp_dir.name, "artifact.bin")
+        self.client = HttpClient(retries=0)
+
+    def tearDown(self):
+        self.client.close()
+        self.temp_dir.cleanup()
+
+    def _read(self):
+        with open(self.save_path, "rb") as f:
+            return f.read()
+
+    def test_parallel_range_download_with_checksum(self):
+        ui = Mock()
+        sha256 = hashlib.sha256(CONTENT).hexdigest()
+        result = Downloader(self.client, workers=4, chunk_size=256 * 1024, ui=ui).download(
+            self.base + "/file", self.save_path, sha256=sha256)
+
+        self.assertEqual(self._read(), CONTENT)
+        self.assertTrue(result["parallel"])
+        self.assertEqual(result["sha256"], sha256)
+        self.assertEqual(self.server.ranges, 1 + 5)  # probe + five chunks
+        self.assertEqual(os.listdir(self.temp_dir.name), ["artifact.bin"])
+        self.assertEqual([c.args[0] for c in ui.start_step.call_args_list], [0, 1, 2, 3])
+        ui.fail_step.assert_not_called()
+
+    def test_interrupted_download_resumes_from_part_file(self):
+        """Test that finished chunks are kept and only the rest is fetched again."""
+        self.server.fail_from = 768 * 1024
+        downloader = Downloader(self.client, workers=2, chunk_size=256 * 1024, chunk_retries=0)
+        with self.assertRaises(DownloadError):
+            downloader.download(self.base + "/file", self.save_path)
+        with open(self.save_path + ".part.json") as f:
+            self.assertEqual(json.load(f)["done"], [0, 1, 2])
+
+        self.server.fail_from = None
+        self.server.served = 0
+        result = downloader.download(self.base + "/file", self.save_path)
+
+        self.assertEqual(self._read(), CONTENT)
+        self.assertEqual(result["resumed_bytes"], 768 * 1024)
+        self.assertLess(self.server.served, len(CONTENT) - 700 * 1024)
+
+    def test_checksum_mismatch_discards_the_download(self):
+        with self.assertRaises(DownloadError):
+            Downloader(self.client, chunk_size=256 * 1024).download(self.base + "/file", self.save_path, sha256="0" * 64)
+        self.assertEqual(os.listdir(self.temp_dir.name), [])
+
+    def test_server_without_ranges_streams_the_whole_file(self):
+        result = Downloader(self.client).download(self.base + "/plain", self.save_path)
+        self.assertFalse(result["parallel"])
+        self.assertEqual(self._read(), CONTENT)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,67 @@
+import unittest
+import os
+import sys
+import tempfile
+
+# Add the project root to the Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.rexode_cli.core.history import ConversationHistory, OutputStore, estimate_tokens
+
+class TestConversationHistory(unittest.TestCase):
+
+    def test_large_tool_output_is_stored_out_of_line(self):
+        """Test that a long tool output is cut to head + tail and kept in full in the store."""
+        with tempfile.TemporaryDirectory() as directory:
+            history = ConversationHistory(max_output_tokens=50, store=OutputStore(directory))
+            output = "A" * 1000 + "B" * 1000
+            history.append({"role": "tool", "content": output})
+
+            entry = history[-1]
+            self.assertLess(len(entry["content"]), 400)
+            self.assertTrue(entry["content"].startswith("A" * 100))
+            self.assertTrue(entry["content"].endswith("B" * 100))
+            self.assertIn(entry["output_id"], entry["content"])
+            self.assertEqual(history.store.get(entry["output_id"]), output)
+            self.assertTrue(os.path.exists(os.path.join(directory, f"{entry['output_id']}.txt")))
+
+    def test_old_turns_are_folded_into_a_summary(self):
+        """Test that the history stays within budget and keeps the recent entries verbatim."""
+        history = ConversationHistory(token_budget=200, keep_recent=4)
+        for turn in range(50):
+            history.append({"role": "user", "content": f"request {turn} " + "x" * 80})
+            history.append({"role": "assistant", "content": f"answer {turn}"})
+
+        self.assertLessEqual(history.total_tokens, 200)
+        self.assertEqual(history[0]["role"], "summary")
+        self.assertIn("answer 49", history[-1]["content"])
+        self.assertEqual(history[-4]["content"], "request 48 " + "x" * 80)
+        self.assertGreater(history.revision, 0)
+        self.assertLessEqual(estimate_tokens(history[0]["content"]), 50)
+
+    def test_compaction_leaves_headroom(self):
+        """Test that once compacted, the following turns append without rewriting the history again."""
+        history = ConversationHistory(token_budget=2000, keep_recent=4)
+        turn = 0
+        while history.revision == 0:
+            history.append({"role": "user", "content": f"request {turn} " + "x" * 400})
+            turn += 1
+        self.assertLessEqual(history.total_tokens, 1500)
+
+        revisions = []
+        for turn in range(turn, turn + 40):
+            history.append({"role": "user", "content": f"request {turn} " + "x" * 400})
+            revisions.append(history.revision)
+        self.assertEqual(revisions[:2], [1, 1])
+        self.assertLessEqual(revisions[-1] - revisions[0], len(revisions) // 4)
+
+    def test_small_history_is_untouched(self):
+        """Test that nothing is rewritten while under budget."""
+        history = ConversationHistory()
+        history.append({"role": "user", "content": "hi"})
+        history.append({"role": "tool", "content": ["a.txt", "b.txt"]})
+        self.assertEqual(history, [{"role": "user", "content": "hi"}, {"role": "tool", "content": ["a.txt", "b.txt"]}])
+        self.assertEqual(history.revision, 0)
+
+if __name__ == '__main__':
+    unittest.main()
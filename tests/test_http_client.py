@@ -0,0 +1,135 @@
+import unittest
+import os
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+
+# Add the project root to the Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.rexode_cli.core.http_client import HttpClient
+
+class StandInHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    body = b"hello " * 100
+
+    def do_GET(self):
+        server = self.server
+        with server.lock:
+            server.requests.append((self.path, self.client_address[1], self.headers.get("If-None-Match")))
+            server.in_flight += 1
+            server.max_in_flight = max(server.max_in_flight, server.in_flight)
+        try:
+            if self.path == "/slow":
+                time.sleep(0.2)
+            if self.path == "/flaky" and len([r for r in server.requests if r[0] == "/flaky"]) == 1:
+                self._send(503, b"busy")
+            elif self.headers.get("If-None-Match") == '"v1"':
+                self._send(304, b"", etag='"v1"')
+            else:
+                self._send(200, self.body, etag='"v1"' if self.path.startswith("/page") else None)
+        finally:
+            with server.lock:
+                server.in_flight -= 1
+
+    def _send(self, status, body, etag=None):
+        self.send_response(status)
+        if etag:
+            self.send_header("ETag", etag)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+class TestHttpClient(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.server = ThreadingHTTPServer(("127.0.0.1", 0), StandInHandler)
+        cls.server.lock = threading.Lock()
+        cls.base = f"http://127.0.0.1:{cls.server.server_address[1]}"
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def setUp(self):
+        self.server.requests = []
+        self.server.in_flight = 0
+        self.server.max_in_flight = 0
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.client = HttpClient(backoff=0, cache_dir=self.temp_dir.name)
+
+    def tearDown(self):
+        self.client.close()
+        self.temp_dir.cleanup()
+
+    def test_connections_are_reused(self):
+        """Test that repeated requests go over one keep-alive connection."""
+        for _ in range(5):
+            self.assertEqual(self.client.get(self.base + "/other").status_code, 200)
+        self.assertEqual(len({port for _, port, _ in self.server.requests}), 1)
+
+    def test_conditional_get_serves_304_from_cache(self):
+        """Test that the stored ETag is sent and a 304 is answered with the cached body."""
+        first = self.client.get(self.base + "/page")
+        second = self.client.get(self.base + "/page")
+
+        self.assertFalse(first.from_cache)
+        self.assertTrue(second.from_cache)
+        self.assertEqual(second.status_code, 200)
+        self.assertEqual(second.text, first.text)
+        self.assertEqual([etag for _, _, etag in self.server.requests], [None, '"v1"'])
+
+    def test_cache_evicts_least_recently_used(self):
+        """Test that past its entry cap the cache drops the URL used longest ago."""
+        client = HttpClient(backoff=0, cache_dir=self.temp_dir.name, cache_max_entries=3)
+        urls = [f"{self.base}/page?n={n}" for n in range(4)]
+        for url in urls[:3]:
+            client.get(url)
+        client.get(urls[0])
+        client.get(urls[3])
+        client.close()
+
+        self.assertEqual([client.cache.load(url)[0] is not None for url in urls], [True, False, True, True])
+        self.assertEqual(len(os.listdir(self.temp_dir.name)), 6)
+
+    def test_server_errors_are_retried(self):
+        response = self.client.get(self.base + "/flaky")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(self.server.requests), 2)
+
+    def test_read_timeout(self):
+        client = HttpClient(read_timeout=0.05, retries=0)
+        with self.assertRaises(requests.exceptions.RequestException):
+            client.get(self.base + "/slow")
+        client.close()
+
+    def test_per_host_limit(self):
+        """Test that no more than per_host_limit requests reach one host at a time."""
+        client = HttpClient(per_host_limit=2)
+        threads = [threading.Thread(target=client.get, args=(self.base + "/slow",)) for _ in range(5)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        client.close()
+        self.assertEqual(len(self.server.requests), 5)
+        self.assertLessEqual(self.server.max_in_flight, 2)
+
+    def test_download(self):
+        save_path = os.path.join(self.temp_dir.name, "download.bin")
+        self.assertEqual(self.client.download(self.base + "/file", save_path), len(StandInHandler.body))
+        with open(save_path, "rb") as f:
+            self.assertEqual(f.read(), StandInHandler.body)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,65 @@
+import unittest
+import os
+import sys
+
+# Add the project root to the Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.rexode_cli.core.intent_matcher import IntentMatcher, template_to_regex
+from src.rexode_cli.core.tool_registry import ToolRegistry
+
+TOOLS = [{"category": "Test Tools", "tools": [
+    {"name": "open_application", "parameters": {}, "intents": [
+        {"regex": "(open|launch|start).*whatsapp", "parameters": {"application_name": "whatsapp"}},
+        {"regex": "(?P<verb>play) (?P<application_name>\\w+) (?P=application_name)"},
+    ]},
+    {"name": "list_files", "parameters": {}},
+    {"name": "get_weather", "parameters": {}, "intents": [
+        {"template": "weather in {location}"},
+        {"template": "forecast for {days:d} days in {location}"},
+        {"regex": "(unbalanced"},
+        {"pattern": "not a template"},
+    ]},
+    {"name": "list_files_recursive", "parameters": {}},
+]}]
+
+class TestIntentMatcher(unittest.TestCase):
+
+    def setUp(self):
+        self.matcher = IntentMatcher(ToolRegistry(TOOLS), cutoff=60)
+
+    def test_template_to_regex(self):
+        regex, fields = template_to_regex("move {count:d} items to {path}")
+        self.assertEqual(regex, r"move\s+(?P<count>[-+]?\d+)\s+items\s+to\s+(?P<path>.+?)")
+        self.assertEqual(fields, {"count": int, "path": str})
+
+    def test_templates_are_combined_and_bad_ones_skipped(self):
+        self.assertEqual(len(self.matcher._templates), 4)
+        match = self.matcher.detect("Please LAUNCH WhatsApp")
+        self.assertEqual((match.tool_name, match.parameters, match.source),
+                         ("open_application", {"application_name": "whatsapp"}, "template"))
+        self.assertEqual(self.matcher.detect("play chess chess").parameters,
+                         {"verb": "play", "application_name": "chess"})
+        self.assertIsNone(self.matcher.match_template("play chess checkers"))
+        self.assertEqual(self.matcher.detect("weather in  New York ").parameters, {"location": "New York"})
+        self.assertEqual(self.matcher.detect("Forecast for 3 days in Oslo").parameters, {"days": 3, "location": "Oslo"})
+        # Parse templates match the whole input, regexes anywhere in it.
+        self.assertIsNone(self.matcher.match_template("what is the weather in Oslo"))
+
+    def test_names_in_the_input_and_fuzzy_names(self):
+        match = self.matcher.detect("list_files path=.")
+        self.assertEqual((match.tool_name, match.score, match.source), ("list_files", 100, "name"))
+        self.assertEqual(self.matcher.detect("list_files_recursive path=.").tool_name, "list_files_recursive")
+        match = self.matcher.detect("get_wether Oslo")
+        self.assertEqual(match.tool_name, "get_weather")
+        self.assertLess(match.score, 100)
+        self.assertIsNone(self.matcher.detect("something else entirely"))
+        self.assertIsNone(self.matcher.detect("?!"))
+
+    def test_batch_detection_matches_single_detection(self):
+        inputs = ["list_files path=.", "get_wether Oslo", "launch whatsapp", "nothing at all",
+                  "weather in Rome", "list files"]
+        self.assertEqual(self.matcher.detect_many(inputs), [self.matcher.detect(text) for text in inputs])
+
+if __name__ == '__main__':
+    unittest.main()
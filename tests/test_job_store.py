@@ -0,0 +1,86 @@
+import unittest
+import os
+import sys
+import tempfile
+from datetime import datetime, timedelta
+
+# Add the project root to the Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.rexode_cli.core.job_store import Job, SQLiteJobStore
+from src.rexode_cli.core.scheduler import Scheduler
+from src.rexode_cli.core.triggers import After, At, Cron
+
+FIRED = []
+
+def record(value):
+    FIRED.append(value)
+
+class TestSQLiteJobStore(unittest.TestCase):
+
+    def setUp(self):
+        FIRED.clear()
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "scheduler.db")
+        self.store = SQLiteJobStore(self.path)
+        self.scheduler = Scheduler(self.store, misfire_grace=60)
+
+    def tearDown(self):
+        self.scheduler.stop()
+        self.store.close()
+        self.tmp.cleanup()
+
+    def _add_missed(self, trigger, args, misfire, minutes_late=120):
+        job = Job(record, args, trigger, datetime.now() - timedelta(minutes=minutes_late),
+                  "missed", "task", misfire)
+        return self.store.add(job)
+
+    def test_jobs_survive_a_restart_and_keys_are_idempotent(self):
+        first = self.scheduler.add(record, After(3600), args=("x",), name="later", key="later:x")
+        again = self.scheduler.add(record, After(3600), args=("x",), name="later", key="later:x")
+        self.scheduler.add(record, Cron("0 9 * * 1-5"), args=("standup",), name="standup")
+        self.assertEqual(again.id, first.id)
+        self.scheduler.stop()
+        self.store.close()
+
+        self.store = SQLiteJobStore(self.path)
+        self.scheduler = Scheduler(self.store)
+        jobs = self.scheduler.list_jobs()
+        self.assertEqual(sorted(job["name"] for job in jobs), ["later", "standup"])
+        self.assertEqual(jobs, sorted(jobs, key=lambda job: job["next_run"]))
+        self.assertEqual({job["trigger"] for job in jobs}, {"in 3600s", "cron '0 9 * * 1-5'"})
+        self.assertTrue(self.scheduler.cancel(first.id))
+        self.assertEqual(len(self.scheduler), 1)
+
+    def test_only_importable_callbacks_can_be_stored(self):
+        with self.assertRaises(ValueError):
+            self.scheduler.add(lambda: None, After(60))
+        with self.assertRaises(ValueError):
+            self.scheduler.add(record, After(60), args=(object(),))
+        self.assertEqual(len(self.scheduler), 0)
+
+    def test_misfire_policies(self):
+        self._add_missed(At(datetime.now()), ("run_once",), "run_once")
+        self._add_missed(At(datetime.now()), ("skip",), "skip")
+        self._add_missed(At(datetime.now()), ("coalesce",), "coalesce")
+        self._add_missed(At(datetime.now()), ("coalesce",), "coalesce", minutes_late=90)
+        hourly = self._add_missed(After(3600, repeat=True), ("hourly",), "skip")
+        # Within the grace period a job is merely late, whatever its policy.
+        self._add_missed(At(datetime.now()), ("late",), "skip", minutes_late=0.5)
+
+        due, delay = self.scheduler._due_jobs()
+        for job in due:
+            job.callback(*job.args)
+        self.assertEqual(sorted(FIRED), ["coalesce", "late", "run_once"])
+        # The repeating job moved on to its next run in the future.
+        self.assertEqual([job["id"] for job in self.scheduler.list_jobs()], [hourly.id])
+        self.assertGreater(delay, 3500)
+
+    def test_due_jobs_are_found_through_the_next_run_index(self):
+        plan = self.store._db.execute(
+            "EXPLAIN QUERY PLAN SELECT id FROM jobs WHERE next_run <= ? ORDER BY next_run, id", (0,)
+        ).fetchall()
+        self.assertIn("jobs_next_run", " ".join(str(row) for row in plan))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -2,12 +2,26 @@ import unittest
 from unittest.mock import Mock, patch
 import os
 import sys
+import tempfile
+
+import numpy as np
+from chromadb import EmbeddingFunction
 
 # Add the project root to the Python path
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
 from src.rexode_cli.core.knowledge_base import KnowledgeBase
 
+class WordEmbedding(EmbeddingFunction):
+    """Tiny offline embedder that counts the documents it is asked to embed."""
+
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, input):
+        self.calls.append(len(input))
+        return [[float(len(text)), float(text.count(" ")), 1.0] for text in input]
+
 class TestKnowledgeBase(unittest.TestCase):
 
     @patch('chromadb.PersistentClient')
@@ -43,16 +57,118 @@ class TestKnowledgeBase(unittest.TestCase):
             'distances': [[0.1, 0.2]]
         }
 
+        self.knowledge_base.embedding_function = WordEmbedding()
         documents, metadatas, distances = self.knowledge_base.query_knowledge_base(query_text)
 
-        self.mock_collection.query.assert_called_once_with(
-            query_texts=[query_text],
-            n_results=5,
-            include=['documents', 'metadatas', 'distances']
-        )
+        self.mock_collection.query.assert_called_once()
+        call_kwargs = self.mock_collection.query.call_args.kwargs
+        self.assertEqual([list(e) for e in call_kwargs['query_embeddings']], [[20.0, 4.0, 1.0]])
+        self.assertEqual(call_kwargs['n_results'], 5)
+        self.assertEqual(call_kwargs['include'], ['documents', 'metadatas', 'distances'])
         self.assertEqual(len(documents), 2)
         self.assertEqual(len(metadatas), 2)
         self.assertEqual(len(distances), 2)
 
+    def test_embedding_model_is_loaded_lazily(self):
+        """Test that constructing the knowledge base does not load the model."""
+        self.assertFalse(self.knowledge_base.embedding_function.loaded)
+
+    def test_query_embeddings_are_cached_and_batched(self):
+        """Test that repeated queries reuse embeddings and misses are embedded together."""
+        embedding = WordEmbedding()
+        self.knowledge_base.embedding_function = embedding
+        self.knowledge_base.query_cache_size = 2
+        self.mock_collection.query.return_value = {
+            'documents': [['a'], ['b'], ['c']],
+            'metadatas': [[{}], [{}], [{}]],
+            'distances': [[0.1], [0.2], [0.3]],
+        }
+
+        results = self.knowledge_base.query_many(["read a file", "Read  a FILE", "list dir"])
+        self.assertEqual([r[0] for r in results], [['a'], ['b'], ['c']])
+        self.assertEqual(embedding.calls, [2])  # one model call, duplicates folded
+        self.knowledge_base.embed_queries(["read a file"])
+        self.assertEqual(embedding.calls, [2])
+        # "list dir" is now the least recently used, so it is evicted first.
+        self.knowledge_base.embed_queries(["new query"])
+        self.assertEqual(list(self.knowledge_base._query_cache), ["read a file", "new query"])
+        self.knowledge_base.embed_queries(["list dir"])
+        self.assertEqual(embedding.calls, [2, 1, 1])
+
+class TestSyncTools(unittest.TestCase):
+
+    backend = "chroma"
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.embedding = WordEmbedding()
+        self.knowledge_base = KnowledgeBase(persist_directory=self.tmp.name, embedding_function=self.embedding,
+                                            backend=self.backend)
+        self.tools = [{"category": "Files", "tools": [
+            {"name": "read_file", "description": "Reads a file.", "examples": [{"input": "show a.txt"}, {"input": "cat b"}]},
+            {"name": "write_file", "description": "Writes a file.", "examples": []},
+        ]}, {"category": "Web", "tools": [
+            {"name": "fetch", "description": "Fetches a page.", "examples": [{"input": "get example.com"}]},
+            {"name": "read_file", "description": "Duplicate entry, ignored.", "examples": []},
+        ]}]
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def _ids(self):
+        return sorted(self.knowledge_base.collection.get()["ids"])
+
+    def test_only_changed_tools_are_re_embedded(self):
+        summary = self.knowledge_base.sync_tools(self.tools, batch_size=2)
+        self.assertEqual(summary, {"added": 3, "updated": 0, "removed": 0, "unchanged": 0})
+        self.assertEqual(self.embedding.calls, [2, 2, 2])  # six documents in batches of two
+        self.assertEqual(self.knowledge_base.collection.get(ids=["read_file_description"])["documents"],
+                         ["Reads a file."])
+
+        self.embedding.calls.clear()
+        self.assertEqual(self.knowledge_base.sync_tools(self.tools)["unchanged"], 3)
+        self.assertEqual(self.embedding.calls, [])
+
+        # read_file loses an example, fetch is removed, write_file is untouched.
+        self.tools[0]["tools"][0]["examples"] = [{"input": "show a.txt please"}]
+        del self.tools[1]["tools"][0]
+        summary = self.knowledge_base.sync_tools(self.tools)
+        self.assertEqual(summary, {"added": 0, "updated": 1, "removed": 1, "unchanged": 1})
+        self.assertEqual(self.embedding.calls, [2])
+        self.assertEqual(self._ids(), ["read_file_description", "read_file_example_0", "write_file_description"])
+
+    def test_documents_from_add_tool_documentation_are_replaced(self):
+        self.knowledge_base.add_tool_documentation("read_file", "Old text.", [{"input": "a"}, {"input": "b"}])
+        summary = self.knowledge_base.sync_tools(self.tools)
+        self.assertEqual(summary["updated"], 1)
+        self.assertEqual(len(self._ids()), 6)
+
+class TestLocalBackend(TestSyncTools):
+    """The same sync behaviour on the NumPy index, plus its own queries."""
+
+    backend = "local"
+
+    def test_exact_top_k_survives_a_reload(self):
+        self.knowledge_base.sync_tools(self.tools)
+        reloaded = KnowledgeBase(persist_directory=self.tmp.name, embedding_function=self.embedding,
+                                 backend="local")
+        self.assertIsInstance(reloaded.collection._vectors, np.memmap)
+        self.assertEqual(reloaded.collection.metadata, self.knowledge_base.collection.metadata)
+
+        documents, metadatas, distances = reloaded.query_knowledge_base("Reads a file.", n_results=2)
+        self.assertEqual(documents[0], "Reads a file.")
+        self.assertAlmostEqual(distances[0], 0.0, places=5)
+        self.assertLessEqual(distances[0], distances[1])
+        self.assertEqual(len(reloaded.query_many(["a", "b c"], n_results=10)[1][0]), 6)
+
+    def test_saving_does_not_replace_a_mapped_file(self):
+        self.knowledge_base.sync_tools(self.tools)
+        reloaded = KnowledgeBase(persist_directory=self.tmp.name, embedding_function=self.embedding,
+                                 backend="local")
+        # Only the catalog hash changes: nothing is upserted, the files are rewritten.
+        reloaded.collection.modify(metadata={"catalog_hash": "changed"})
+        self.assertNotIsInstance(reloaded.collection._vectors, np.memmap)
+        self.assertEqual(reloaded.query_knowledge_base("Reads a file.", n_results=1)[0], ["Reads a file."])
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
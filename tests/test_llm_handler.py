@@ -0,0 +1,80 @@
+import json
+import unittest
+import os
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Add the project root to the Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.rexode_cli.llm_handler import LLMHandler
+
+class StandInOllama(BaseHTTPRequestHandler):
+    """Records /api/generate bodies and answers with a one-line stream."""
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self):
+        self.server.bodies.append(json.loads(self.rfile.read(int(self.headers["Content-Length"]))))
+        body = json.dumps({"response": "ok", "done": True}).encode() + b"\n"
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+class TestLLMHandler(unittest.TestCase):
+
+    def setUp(self):
+        """Set up a handler and a small tool catalog before each test."""
+        self.handler = LLMHandler()
+        self.tools = [{"category": "Test Tools", "tools": [
+            {"name": "read_file", "description": "Reads a file.", "parameters": {"type": "object"},
+             "sensitive": False, "examples": [{"input": "read a.txt", "tool_call": {}}]}
+        ]}]
+
+    def test_static_prefix_is_cached_per_version(self):
+        """Test that the prefix is rendered once per tools version and leads every prompt."""
+        prefix = self.handler.get_static_prefix(self.tools, "v1")
+        self.assertIs(self.handler.get_static_prefix(self.tools, "v1"), prefix)
+        self.assertIn('"name":"read_file"', prefix)
+        self.assertNotIn("examples", prefix)
+
+        history = [{"role": "user", "content": "read a.txt"}]
+        self.assertTrue(self.handler.get_prompt(history, self.tools, "v1").startswith(prefix))
+        self.assertIsNot(self.handler.get_static_prefix(self.tools, "v2"), prefix)
+
+    def test_history_is_rendered_incrementally(self):
+        """Test that appended entries extend the rendered history and a new list starts over."""
+        history = [{"role": "user", "content": "hi"}]
+        self.assertEqual(self.handler.render_history(history), "User: hi\n")
+        history.append({"role": "assistant", "content": "hello"})
+        history.append({"role": "tool", "content": {"ok": True}})
+        self.assertEqual(self.handler.render_history(history), "User: hi\nAssistant: hello\nTool Output: {'ok': True}\n")
+        self.assertEqual(self.handler.render_history([{"role": "user", "content": "new"}]), "User: new\n")
+
+    def test_local_llm_uses_profile_options_and_warms_up_the_prefix(self):
+        """Test that Ollama gets the mode profile's options and the warmup evaluates the static prefix."""
+        server = ThreadingHTTPServer(("127.0.0.1", 0), StandInOllama)
+        server.bodies = []
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        self.addCleanup(server.server_close)
+        self.addCleanup(server.shutdown)
+
+        llm = self.handler.initialize_llm("local", model_name="tiny", base_url=f"127.0.0.1:{server.server_address[1]}",
+                                          options={"num_ctx": 4096, "num_thread": None, "keep_alive": "30m"})
+        prefix = self.handler.get_static_prefix(self.tools, "v1")
+        self.handler.warm_up(llm, prefix).join(5)
+
+        (body,) = server.bodies
+        self.assertEqual((body["model"], body["prompt"], body["keep_alive"]), ("tiny", prefix, "30m"))
+        self.assertEqual((body["options"]["num_ctx"], body["options"]["num_thread"], body["options"]["num_predict"]),
+                         (4096, None, 1))
+        self.assertTrue(self.handler.prefix_fits(self.tools, 4096, 2000, "v1"))
+        self.assertFalse(self.handler.prefix_fits(self.tools, 2048, 2000, "v1"))
+        self.assertFalse(self.handler.prefix_fits(self.tools, None, 0, "v1"))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,123 @@
+import json
+import random
+import unittest
+import os
+import sys
+
+# Add the project root to the Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.rexode_cli.core.param_parser import extract_parameters
+
+SCHEMA = {
+    "type": "object",
+    "properties": {
+        "file_path": {"type": "string"},
+        "content": {"type": "string"},
+        "path": {"type": "string"},
+        "count": {"type": "integer"},
+        "ratio": {"type": "number"},
+        "verbose": {"type": "boolean"},
+        "tags": {"type": "array", "items": {"type": "integer"}},
+        "options": {"type": "object"},
+    },
+    "required": ["file_path", "content"],
+}
+
+class TestExtractParameters(unittest.TestCase):
+
+    def test_key_value_forms(self):
+        parameters, missing = extract_parameters(
+            "write_file file_path=/tmp/a.txt content=Hello World count=3 --verbose", SCHEMA)
+        self.assertEqual(parameters, {"file_path": "/tmp/a.txt", "content": "Hello World", "count": 3, "verbose": True})
+        self.assertEqual(missing, [])
+        parameters, missing = extract_parameters('tool --file-path "a b.txt" --RATIO=.5 --verbose no', SCHEMA)
+        self.assertEqual(parameters, {"file_path": "a b.txt", "ratio": 0.5, "verbose": False})
+        self.assertEqual(missing, ["content"])
+
+    def test_quoted_values_keep_keys_and_quotes_inside(self):
+        parameters, _ = extract_parameters(
+            "write_file content='path=/etc it\\'s done' file_path='C:\\Users\\me\\x.txt' path=it's", SCHEMA)
+        self.assertEqual(parameters, {"content": "path=/etc it's done", "file_path": "C:\\Users\\me\\x.txt",
+                                      "path": "it's"})
+
+    def test_json_literals_and_coercion(self):
+        parameters, _ = extract_parameters(
+            'x tags=[1, "2", 3] options={"depth": 2, "names": ["a b"]} count=x1 content=[not json', SCHEMA)
+        self.assertEqual(parameters, {"tags": [1, 2, 3], "options": {"depth": 2, "names": ["a b"]},
+                                      "count": "x1", "content": "[not json"})
+        self.assertEqual(extract_parameters("x tags=4, 5,6 content=[1]", SCHEMA)[0],
+                         {"tags": [4, 5, 6], "content": "[1]"})
+
+    def test_unknown_keys_belong_to_the_value(self):
+        parameters, _ = extract_parameters("x content=a=b --debug filepath=c path=", SCHEMA)
+        self.assertEqual(parameters, {"content": "a=b --debug filepath=c", "path": ""})
+
+class TestExtractParametersProperties(unittest.TestCase):
+    """Randomized checks in place of a property-based testing library:
+    values written in any supported form, in any order, come back intact."""
+
+    ALPHABET = "ab z=-'\"\\[]{}:,.xyz/_"
+    WORDS = ["alpha", "beta", "/tmp/x.txt", "C:\\dir", "a,b", "it's", "x=y"]
+    SEEDS = range(300)
+
+    def _quoted(self, rng, value):
+        quote = rng.choice("'\"")
+        return quote + value.replace("\\", "\\\\").replace(quote, "\\" + quote) + quote
+
+    def _render(self, rng, name, value):
+        prop = SCHEMA["properties"][name]
+        key = rng.choice([f"{name}=", f"--{name}=", f"--{name.replace('_', '-')} ", f"{name.upper()}="])
+        if prop["type"] == "string":
+            if value and " " not in value and value[0] not in "'\"[{" and rng.random() < 0.5:
+                return key + value
+            return key + self._quoted(rng, value)
+        if prop["type"] == "boolean":
+            if value and rng.random() < 0.3:
+                return f"--{name}"
+            return key + rng.choice(["true", "yes", "on", "1"] if value else ["false", "no", "off", "0"])
+        if prop["type"] == "array":
+            return key + (json.dumps(value) if rng.random() < 0.5 else ",".join(map(str, value)))
+        if prop["type"] == "object":
+            return key + json.dumps(value)
+        return key + repr(value)
+
+    def _random_value(self, rng, name):
+        kind = SCHEMA["properties"][name]["type"]
+        if kind == "string":
+            if rng.random() < 0.5:
+                return " ".join(rng.choice(self.WORDS) for _ in range(rng.randint(1, 3)))
+            return "".join(rng.choice(self.ALPHABET) for _ in range(rng.randint(0, 12)))
+        if kind == "integer":
+            return rng.randint(-10**6, 10**6)
+        if kind == "number":
+            return rng.uniform(-1e3, 1e3)
+        if kind == "boolean":
+            return rng.random() < 0.5
+        if kind == "array":
+            return [rng.randint(0, 99) for _ in range(rng.randint(1, 4))]
+        return {"k": rng.choice(self.WORDS), "n": [rng.randint(0, 9)]}
+
+    def test_round_trip_in_any_order_and_form(self):
+        for seed in self.SEEDS:
+            rng = random.Random(seed)
+            names = rng.sample(list(SCHEMA["properties"]), rng.randint(1, len(SCHEMA["properties"])))
+            expected = {name: self._random_value(rng, name) for name in names}
+            text = "some_tool " + " ".join(self._render(rng, name, value) for name, value in expected.items())
+            parameters, missing = extract_parameters(text, SCHEMA)
+            self.assertEqual(parameters, expected, msg=f"seed {seed}: {text!r}")
+            self.assertEqual(missing, [name for name in SCHEMA["required"] if name not in expected])
+
+    def test_arbitrary_input_never_raises(self):
+        alphabet = self.ALPHABET + "\t\n"
+        keys = ["content=", "--verbose ", "count=", "tags=[", "--file-path "]
+        for seed in self.SEEDS:
+            rng = random.Random(seed)
+            text = "".join(rng.choice(keys) if rng.random() < 0.2 else rng.choice(alphabet)
+                           for _ in range(rng.randint(0, 60)))
+            parameters, missing = extract_parameters(text, SCHEMA)
+            self.assertLessEqual(set(parameters), set(SCHEMA["properties"]))
+            self.assertEqual(set(missing), set(SCHEMA["required"]) - set(parameters))
+
+if __name__ == '__main__':
+    unittest.main()
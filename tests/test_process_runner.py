@@ -0,0 +1,76 @@
+import unittest
+import asyncio
+import os
+import sys
+import threading
+import time
+
+# Add the project root to the Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.rexode_cli.core.process_runner import OutputBuffer, cancel_running, run_command, run_command_sync
+
+PYTHON = f'"{sys.executable}" -c'
+
+class TestOutputBuffer(unittest.TestCase):
+
+    def test_short_output_is_kept_whole(self):
+        buffer = OutputBuffer(head=10, tail=10)
+        buffer.write("hello ")
+        buffer.write("world")
+        self.assertEqual(buffer.text(), "hello world")
+
+    def test_long_output_keeps_head_and_tail(self):
+        buffer = OutputBuffer(head=5, tail=5)
+        for i in range(1000):
+            buffer.write(f"{i:04d}")
+        self.assertEqual(buffer.omitted, 4000 - 10)
+        self.assertEqual(buffer.text(), "00000\n... [3990 characters omitted] ...\n80999")
+
+@unittest.skipIf(sys.platform == "win32", "uses POSIX process groups")
+class TestRunCommand(unittest.TestCase):
+
+    def test_output_is_streamed_while_the_command_runs(self):
+        seen = []
+        script = "import sys, time\nfor i in range(3):\n    print(i, flush=True); time.sleep(0.2)\nsys.stderr.write('done')"
+        started = time.monotonic()
+
+        def on_output(name, text):
+            seen.append((name, text, time.monotonic() - started))
+
+        result = asyncio.run(run_command(f"{PYTHON} \"{script}\"", on_output=on_output))
+        self.assertEqual(result["returncode"], 0)
+        self.assertEqual(result["stdout"].split(), ["0", "1", "2"])
+        self.assertEqual(result["stderr"], "done")
+        self.assertNotIn("error", result)
+        # The first line arrived long before the command finished.
+        self.assertLess(seen[0][2], result["elapsed"] - 0.3)
+
+    def test_timeout_kills_the_process_tree(self):
+        started = time.monotonic()
+        result = asyncio.run(run_command("sleep 30 & sleep 30; echo never", timeout=0.5))
+        self.assertLess(time.monotonic() - started, 5)
+        self.assertIn("time limit", result["error"])
+        self.assertNotIn("never", result["stdout"])
+
+    def test_output_limit_stops_runaway_commands(self):
+        script = "while True: print('x' * 1000)"
+        result = asyncio.run(run_command(f"{PYTHON} \"{script}\"", max_output_bytes=200_000, head=100, tail=100))
+        self.assertIn("output limit", result["error"])
+        self.assertIn("characters omitted", result["stdout"])
+        self.assertLess(len(result["stdout"]), 300)
+
+    def test_cancel_running_from_another_thread(self):
+        threading.Timer(0.3, cancel_running).start()
+        started = time.monotonic()
+        result = run_command_sync("sleep 30", stream=False)
+        self.assertLess(time.monotonic() - started, 5)
+        self.assertEqual(result["error"], "Cancelled by user")
+
+    def test_sync_wrapper_works_inside_an_event_loop(self):
+        async def tool_called_from_loop():
+            return run_command_sync("echo hi", stream=False)
+        self.assertEqual(asyncio.run(tool_called_from_loop())["stdout"], "hi\n")
+
+if __name__ == '__main__':
+    unittest.main()
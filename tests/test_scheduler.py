@@ -0,0 +1,102 @@
+import unittest
+import asyncio
+import os
+import sys
+import threading
+import time
+from datetime import datetime
+
+# Add the project root to the Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.rexode_cli.core.scheduler import After, At, Cron, Scheduler, parse_trigger
+
+NOW = datetime(2025, 8, 15, 14, 0, 30)  # a Friday
+
+class TestTriggers(unittest.TestCase):
+
+    def test_parse_trigger_forms(self):
+        self.assertEqual(parse_trigger("in 1h 30m", NOW).first(NOW), datetime(2025, 8, 15, 15, 30, 30))
+        self.assertEqual(parse_trigger(90, NOW).first(NOW), datetime(2025, 8, 15, 14, 2))
+        self.assertEqual(parse_trigger("6 PM", NOW).first(NOW), datetime(2025, 8, 15, 18, 0))
+        # A clock time already past today means tomorrow.
+        self.assertEqual(parse_trigger("09:15", NOW).first(NOW), datetime(2025, 8, 16, 9, 15))
+        self.assertEqual(parse_trigger("2025-09-01 08:00", NOW).first(NOW), datetime(2025, 9, 1, 8, 0))
+        every = parse_trigger("every 15m", NOW)
+        self.assertEqual(every.next(every.first(NOW)), datetime(2025, 8, 15, 14, 30, 30))
+        self.assertEqual(str(parse_trigger("daily 7:30 am", NOW)), "cron '30 7 * * *'")
+        with self.assertRaises(ValueError):
+            parse_trigger("sometime soon", NOW)
+
+    def test_cron_next_run(self):
+        weekdays_9am = Cron("0 9 * * 1-5")
+        self.assertEqual(weekdays_9am.next(NOW), datetime(2025, 8, 18, 9, 0))  # Monday
+        every_5 = Cron("*/5 * * * *")
+        self.assertEqual(every_5.next(NOW), datetime(2025, 8, 15, 14, 5))
+        # Day-of-month and day-of-week are OR-ed when both are restricted.
+        self.assertEqual(Cron("0 0 1 * 0").next(NOW), datetime(2025, 8, 17, 0, 0))
+        with self.assertRaises(ValueError):
+            Cron("61 * * * *")
+
+class TestScheduler(unittest.TestCase):
+
+    def setUp(self):
+        self.scheduler = Scheduler()
+
+    def tearDown(self):
+        self.scheduler.stop()
+
+    def test_jobs_fire_in_time_order_on_one_thread(self):
+        fired = []
+        threads_before = threading.active_count()
+        for delay in (0.3, 0.1, 0.2):
+            self.scheduler.add(fired.append, After(delay), args=(delay,))
+        # Thousands of pending jobs add no threads.
+        for _ in range(2000):
+            self.scheduler.add(fired.append, After(3600), args=("later",))
+        self.assertLessEqual(threading.active_count(), threads_before + 1)
+
+        time.sleep(0.6)
+        self.assertEqual(fired, [0.1, 0.2, 0.3])
+        self.assertEqual(len(self.scheduler), 2000)
+
+    def test_cancel_and_list(self):
+        fired = []
+        keep = self.scheduler.add(fired.append, After(0.2), args=("keep",), name="keep")
+        drop = self.scheduler.add(fired.append, After(0.1), args=("drop",), name="drop")
+        self.scheduler.add(fired.append, "daily 07:00", name="standup", kind="reminder")
+        self.assertEqual([job["name"] for job in self.scheduler.list_jobs()], ["drop", "keep", "standup"])
+
+        self.assertTrue(self.scheduler.cancel(drop.id))
+        self.assertFalse(self.scheduler.cancel(drop.id))
+        time.sleep(0.4)
+        self.assertEqual(fired, ["keep"])
+        self.assertEqual([job["name"] for job in self.scheduler.list_jobs()], ["standup"])
+        self.assertEqual(keep.runs, 1)
+
+    def test_repeating_and_async_jobs_on_the_callers_loop(self):
+        ticks = []
+
+        async def tick():
+            ticks.append(threading.get_ident())
+
+        async def main():
+            self.scheduler.start()
+            job = self.scheduler.add(tick, After(0.05, repeat=True))
+            await asyncio.sleep(0.28)
+            self.scheduler.cancel(job.id)
+            await asyncio.sleep(0.1)
+
+        asyncio.run(main())
+        self.assertIn(len(ticks), (4, 5))
+        self.assertEqual(set(ticks), {threading.get_ident()})
+
+    def test_failing_job_does_not_stop_the_scheduler(self):
+        fired = []
+        self.scheduler.add(lambda: 1 / 0, At(datetime.now()))
+        self.scheduler.add(fired.append, After(0.1), args=("after",))
+        time.sleep(0.3)
+        self.assertEqual(fired, ["after"])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,81 @@
+import json
+import unittest
+import os
+import sys
+
+# Add the project root to the Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.rexode_cli.core.schema_validator import CompiledValidator, format_validation_errors
+
+SCHEMA = {
+    "type": "object",
+    "properties": {
+        "path": {"type": "string", "minLength": 1},
+        "count": {"type": "integer", "minimum": 1, "maximum": 10},
+        "ratio": {"type": "number"},
+        "verbose": {"type": "boolean"},
+        "mode": {"type": "string", "enum": ["fast", "safe"]},
+        "ids": {"type": "array", "items": {"type": "integer"}, "maxItems": 3},
+        "env": {"type": "object", "properties": {"name": {"type": "string", "pattern": "^[A-Z_]+$"}},
+                "required": ["name"]},
+        "limit": {"type": ["integer", "null"]},
+    },
+    "required": ["path"],
+}
+
+class TestCompiledValidator(unittest.TestCase):
+
+    def setUp(self):
+        self.validator = CompiledValidator(SCHEMA, "sample")
+
+    def test_valid_parameters_pass_unchanged(self):
+        parameters = {"path": "/tmp", "count": 3, "ratio": 0.5, "verbose": False, "mode": "safe",
+                      "ids": [1, 2], "env": {"name": "HOME"}, "limit": None}
+        self.assertEqual(self.validator(parameters), (parameters, []))
+
+    def test_unambiguous_values_are_coerced(self):
+        parameters, errors = self.validator({"path": 7, "count": "4", "ratio": "2.5", "verbose": "yes",
+                                             "ids": "1, 2", "env": '{"name": "PATH"}', "limit": "none"})
+        self.assertEqual(errors, [])
+        self.assertEqual(parameters, {"path": "7", "count": 4, "ratio": 2.5, "verbose": True,
+                                      "ids": [1, 2], "env": {"name": "PATH"}, "limit": None})
+        self.assertEqual(self.validator({"path": "a", "count": 5.0, "ids": 3})[0], {"path": "a", "count": 5, "ids": [3]})
+
+    def test_every_problem_is_reported_with_its_path(self):
+        parameters, errors = self.validator({"count": 11, "verbose": "maybe", "mode": "turbo",
+                                             "ids": [1, "x", 3], "env": {"name": "lower"}, "colour": "red"})
+        found = {(error["parameter"], error["error"]) for error in errors}
+        self.assertEqual(found, {("count", "maximum"), ("verbose", "type"), ("mode", "enum"), ("ids[1]", "type"),
+                                 ("env.name", "pattern"), ("colour", "unknown"), ("path", "required")})
+        self.assertEqual(parameters, {})
+        self.assertEqual(self.validator({"path": "", "ids": [1, 2, 3, 4], "env": {}})[1], [
+            {"parameter": "path", "error": "minLength", "message": "length must not be < 1, got ''"},
+            {"parameter": "ids", "error": "maxItems", "message": "must not have > 3 items"},
+            {"parameter": "env.name", "error": "required", "message": "required parameter is missing"},
+        ])
+
+    def test_booleans_are_not_numbers(self):
+        _, errors = self.validator({"path": "a", "count": True})
+        self.assertEqual([error["error"] for error in errors], ["type"])
+
+    def test_check_validates_one_prompted_value(self):
+        self.assertEqual(self.validator.check("count", "7"), (7, []))
+        value, errors = self.validator.check("mode", "slow")
+        self.assertEqual(errors[0]["allowed"], ["fast", "safe"])
+
+    def test_schemas_without_properties_accept_anything(self):
+        self.assertEqual(CompiledValidator({}, "free")({"x": 1}), ({"x": 1}, []))
+        self.assertEqual(CompiledValidator({"type": "object", "properties": {}})({"x": 1})[1][0]["error"], "unknown")
+        self.assertEqual(CompiledValidator(None)("not a dict")[1][0]["error"], "type")
+
+    def test_error_report_is_json_the_llm_can_act_on(self):
+        _, errors = self.validator({"count": "many"})
+        message = format_validation_errors("sample", errors, self.validator)
+        self.assertTrue(message.startswith("Error: invalid parameters for tool 'sample'"))
+        report = json.loads(message[message.index("{"):])
+        self.assertEqual(report["expected"], {"count": {"type": "integer"}, "path": {"type": "string"}})
+        self.assertEqual(report["required"], ["path"])
+
+if __name__ == '__main__':
+    unittest.main()
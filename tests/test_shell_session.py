@@ -0,0 +1,79 @@
+import unittest
+import os
+import sys
+import tempfile
+import threading
+import time
+
+# Add the project root to the Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.rexode_cli.core.process_runner import cancel_running, run_command_sync, use_shell_session
+from src.rexode_cli.core.shell_session import ShellSession
+
+@unittest.skipUnless(ShellSession.supported(), "persistent shell needs a POSIX shell")
+class TestShellSession(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.session = ShellSession(cwd=self.temp_dir.name)
+
+    def tearDown(self):
+        self.session.close()
+        self.temp_dir.cleanup()
+
+    def test_state_carries_over_between_commands(self):
+        self.session.run("mkdir sub && cd sub && export GREETING=hello")
+        result = self.session.run('echo "$GREETING from $(basename "$PWD")"')
+        self.assertEqual(result["stdout"], "hello from sub\n")
+        self.assertEqual(self.session.stats, {"commands": 2, "restarts": 0})
+
+    def test_reset_starts_the_next_task_clean(self):
+        self.session.run("mkdir sub && cd sub && export GREETING=hello")
+        self.session.reset()
+        result = self.session.run('echo "${GREETING:-unset} in $PWD"')
+        self.assertEqual(result["stdout"], f"unset in {os.path.realpath(self.temp_dir.name)}\n")
+        self.assertEqual(self.session.stats, {"commands": 2, "restarts": 0})
+
+    def test_exit_codes_and_streams_are_per_command(self):
+        failed = self.session.run("echo out; echo err >&2; false")
+        self.assertEqual((failed["stdout"], failed["stderr"], failed["returncode"]), ("out\n", "err\n", 1))
+        ok = self.session.run("printf 'no newline'")
+        self.assertEqual((ok["stdout"], ok["stderr"], ok["returncode"]), ("no newline", "", 0))
+
+    def test_syntax_errors_do_not_break_the_framing(self):
+        broken = self.session.run("echo 'unterminated")
+        self.assertNotEqual(broken["returncode"], 0)
+        self.assertNotIn("error", broken)
+        self.assertEqual(self.session.run("echo fine")["stdout"], "fine\n")
+
+    def test_shell_restarts_after_exit_in_last_directory(self):
+        self.session.run("mkdir keep && cd keep")
+        result = self.session.run("exit 3")
+        self.assertEqual(result["returncode"], 3)
+        self.assertIn("error", result)
+        self.assertEqual(self.session.run("basename \"$PWD\"")["stdout"], "keep\n")
+        self.assertEqual(self.session.stats["restarts"], 1)
+
+    def test_timeout_and_cancel_kill_the_command(self):
+        result = self.session.run("sleep 30", timeout=0.3)
+        self.assertIn("time limit", result["error"])
+
+        threading.Timer(0.3, cancel_running).start()
+        started = time.monotonic()
+        result = self.session.run("sleep 30")
+        self.assertLess(time.monotonic() - started, 5)
+        self.assertEqual(result["error"], "Cancelled by user")
+        self.assertEqual(self.session.run("echo back")["stdout"], "back\n")
+
+    def test_run_command_sync_uses_the_active_session(self):
+        with use_shell_session(self.session):
+            run_command_sync("cd /", stream=False)
+            self.assertEqual(run_command_sync("pwd", stream=False)["stdout"], "/\n")
+            # An explicit cwd still gets its own process.
+            self.assertEqual(run_command_sync("pwd", cwd=self.temp_dir.name, stream=False)["stdout"],
+                             os.path.realpath(self.temp_dir.name) + "\n")
+        self.assertEqual(self.session.stats["commands"], 2)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,77 @@
+import unittest
+import os
+import sys
+import threading
+import time
+
+# Add the project root to the Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.rexode_cli.core.speech import SpeechWorker
+
+class SlowEngine:
+    """Stands in for pyttsx3: runAndWait takes as long as real speech."""
+
+    def __init__(self, spoken):
+        self.spoken = spoken
+        self.thread = threading.get_ident()
+        self._text = None
+
+    def say(self, text):
+        self._text = text
+
+    def runAndWait(self):
+        assert threading.get_ident() == self.thread
+        time.sleep(0.1)
+        self.spoken.append(self._text)
+
+class TestSpeechWorker(unittest.TestCase):
+
+    def setUp(self):
+        self.spoken = []
+        self.notified = []
+        self.engines = 0
+
+        def engine_factory():
+            self.engines += 1
+            return SlowEngine(self.spoken)
+
+        self.worker = SpeechWorker(max_pending=2, engine_factory=engine_factory,
+                                   notifier=lambda title, message: self.notified.append((title, message)))
+
+    def test_say_does_not_block_and_the_engine_starts_lazily(self):
+        self.assertEqual(self.engines, 0)
+        start = time.perf_counter()
+        self.worker.say("Task identified as code")
+        self.worker.notify("Reminder", "stand up")
+        self.assertLess(time.perf_counter() - start, 0.05)
+        self.assertTrue(self.worker.wait_idle(timeout=2))
+        self.assertEqual(self.spoken, ["Task identified as code"])
+        self.assertEqual(self.notified, [("Reminder", "stand up")])
+        self.assertEqual(self.engines, 1)
+
+    def test_backlog_is_coalesced_and_old_items_dropped(self):
+        self.worker.say("first")
+        time.sleep(0.02)  # "first" is being spoken
+        for i in range(10):
+            self.worker.say(f"step {i}")
+            self.worker.say(f"step {i}")
+        self.assertTrue(self.worker.wait_idle(timeout=2))
+        self.assertEqual(self.spoken, ["first", "step 8", "step 9"])
+        self.assertEqual(self.worker.dropped, 18)
+
+    def test_missing_engine_only_silences_speech(self):
+        def broken():
+            self.engines += 1
+            raise RuntimeError("no espeak")
+
+        self.worker.engine_factory = broken
+        self.worker.say("one")
+        self.worker.say("two")
+        self.worker.notify("Still", "shown")
+        self.assertTrue(self.worker.wait_idle(timeout=2))
+        self.assertEqual(self.engines, 1)
+        self.assertEqual(self.notified, [("Still", "shown")])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,53 @@
+import json
+import unittest
+import os
+import sys
+
+# Add the project root to the Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.rexode_cli.core.stream_parser import ToolCallStreamParser
+
+def feed_in_chunks(parser, text, size):
+    events = []
+    for i in range(0, len(text), size):
+        events.extend(parser.feed(text[i:i + size]))
+    return events
+
+class TestToolCallStreamParser(unittest.TestCase):
+
+    def test_tool_calls_are_emitted_as_each_object_closes(self):
+        """Test that every tool call is emitted once its object is complete, whatever the chunking."""
+        reply = '```json\n' + json.dumps({"tool_calls": [
+            {"name": "read_file", "parameters": {"file_path": "a}.txt"}},
+            {"name": "get_weather", "parameters": {"location": "[Paris]"}},
+        ]}) + '\n```'
+        for size in (1, 3, 7, len(reply)):
+            parser = ToolCallStreamParser()
+            events = feed_in_chunks(parser, reply, size)
+            self.assertEqual(events, [
+                ("tool_call", {"name": "read_file", "parameters": {"file_path": "a}.txt"}}),
+                ("tool_call", {"name": "get_weather", "parameters": {"location": "[Paris]"}}),
+            ])
+            self.assertEqual(parser.text, reply)
+
+    def test_first_call_is_emitted_before_the_reply_ends(self):
+        """Test that the first call is available while the second is still streaming."""
+        parser = ToolCallStreamParser()
+        events = parser.feed('{"tool_calls": [{"name": "list_files", "parameters": {"path": "."}}, {"name": "rea')
+        self.assertEqual(events, [("tool_call", {"name": "list_files", "parameters": {"path": "."}})])
+
+    def test_response_text_is_decoded_incrementally(self):
+        """Test that response deltas decode escapes, including split surrogate pairs."""
+        reply = json.dumps({"response": 'Say "hi"\né \U0001F600 {ok}'})
+        parser = ToolCallStreamParser()
+        events = feed_in_chunks(parser, reply, 2)
+        self.assertTrue(all(kind == "response" for kind, _ in events))
+        self.assertEqual("".join(delta for _, delta in events), 'Say "hi"\né \U0001F600 {ok}')
+
+    def test_malformed_reply_produces_no_events(self):
+        """Test that plain text is ignored."""
+        self.assertEqual(ToolCallStreamParser().feed("Sure, here is the answer."), [])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,5 +1,8 @@
+import asyncio
+import json
+import time
 import unittest
-from unittest.mock import Mock, patch
+from unittest.mock import Mock, PropertyMock, patch
 import os
 import sys
 
@@ -8,6 +11,7 @@ sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')
 
 from src.rexode_cli.core.task_orchestrator import TaskOrchestrator
 from src.rexode_cli.core.tool_manager import ToolManager
+from src.rexode_cli.core.tool_registry import ToolRegistry
 from src.rexode_cli.llm_handler import LLMHandler
 from src.rexode_cli.core.config import Config
 
@@ -17,6 +21,8 @@ class TestTaskOrchestrator(unittest.TestCase):
         """Set up a test environment before each test."""
         self.config = Config()
         self.tool_manager = Mock(spec=ToolManager)
+        # Index whatever tool list each test assigns to the mock.
+        type(self.tool_manager).registry = PropertyMock(side_effect=lambda: ToolRegistry(self.tool_manager.tools))
         self.llm_handler = Mock(spec=LLMHandler)
         self.task_orchestrator = TaskOrchestrator(
             tool_manager=self.tool_manager,
@@ -167,5 +173,165 @@ class TestTaskOrchestrator(unittest.TestCase):
         result = self.task_orchestrator.process_with_rules(user_input)
         self.assertEqual(result, "No tool detected.")
 
+    def test_process_with_rules_falls_back_to_tool_retrieval(self):
+        """Test that a request naming no tool is matched on descriptions and examples."""
+        self.tool_manager.tools = [
+            {
+                "category": "Test Tools",
+                "tools": [
+                    {"name": "get_weather", "description": "Gets the current weather for a location.",
+                     "parameters": {"type": "object", "properties": {"location": {"type": "string"}}},
+                     "examples": [{"input": "What's the weather like in London?"}]},
+                    {"name": "take_note", "description": "Saves a short note.", "parameters": {}},
+                ]
+            }
+        ]
+        self.tool_manager.get_tool.return_value = lambda location: f"sunny in {location}"
+        self.assertEqual(self.task_orchestrator.detect_tool("how hot is it outside?"), (None, None, {}))
+        tool_name, _, _ = self.task_orchestrator.detect_tool("weather location=Paris")
+        self.assertEqual(tool_name, "get_weather")
+        self.assertEqual(self.task_orchestrator.process_with_rules("weather location=Paris"), "sunny in Paris")
+
+    def test_process_with_rules_uses_intent_templates(self):
+        """Test that an intents template from tools.json picks the tool and fills its parameters."""
+        self.tool_manager.tools = [
+            {
+                "category": "Test Tools",
+                "tools": [
+                    {"name": "get_weather", "description": "Gets the current weather for a location.",
+                     "parameters": {"type": "object", "properties": {"location": {"type": "string"}},
+                                    "required": ["location"]},
+                     "intents": [{"template": "weather in {location}"}]},
+                ]
+            }
+        ]
+        self.tool_manager.get_tool.return_value = lambda location: f"sunny in {location}"
+        self.assertEqual(self.task_orchestrator.detect_tool("Weather in New York"),
+                         ("get_weather", 100, {"location": "New York"}))
+        self.assertEqual(self.task_orchestrator.process_with_rules("Weather in New York"), "sunny in New York")
+
+    def _slow_tools(self):
+        self.tool_manager.tools = [
+            {
+                "category": "Test Tools",
+                "tools": [
+                    {"name": "slow_read", "parameters": {}, "sensitive": False, "read_only": True},
+                    {"name": "fast_read", "parameters": {}, "sensitive": False, "read_only": True},
+                    {"name": "write_note", "parameters": {}, "sensitive": True},
+                ]
+            }
+        ]
+        def slow_read():
+            time.sleep(0.2)
+            return "slow"
+        def fast_read():
+            time.sleep(0.1)
+            return "fast"
+        functions = {"slow_read": slow_read, "fast_read": fast_read, "write_note": lambda: "written"}
+        self.tool_manager.get_tool.side_effect = functions.get
+
+    def test_execute_tool_calls_runs_independent_calls_concurrently(self):
+        """Test that read-only calls overlap and their outputs keep the LLM's order."""
+        self._slow_tools()
+        calls = [{"name": "slow_read", "parameters": {}}, {"name": "fast_read", "parameters": {}}]
+        start = time.perf_counter()
+        completed = asyncio.run(self.task_orchestrator.execute_tool_calls(calls))
+        elapsed = time.perf_counter() - start
+
+        self.assertTrue(completed)
+        self.assertLess(elapsed, 0.29)
+        self.assertEqual([entry["content"] for entry in self.task_orchestrator.history], ["slow", "fast"])
+
+    @patch('src.rexode_cli.core.task_orchestrator.request_confirmation', return_value=False)
+    def test_execute_tool_calls_stops_at_declined_sensitive_call(self, mock_confirm):
+        """Test that a declined sensitive call stops the calls queued behind it."""
+        self._slow_tools()
+        calls = [
+            {"name": "fast_read", "parameters": {}},
+            {"name": "write_note", "parameters": {}},
+            {"name": "slow_read", "parameters": {}},
+        ]
+        completed = asyncio.run(self.task_orchestrator.execute_tool_calls(calls))
+
+        self.assertFalse(completed)
+        mock_confirm.assert_called_once()
+        self.assertEqual([entry["content"] for entry in self.task_orchestrator.history], ["fast"])
+
+    def test_streamed_tool_call_starts_before_reply_ends(self):
+        """Test that a streamed tool call runs before the LLM finishes its reply."""
+        self._slow_tools()
+        started = []
+        self.tool_manager.get_tool.side_effect = lambda name: (lambda: started.append(name) or name)
+        reply = json.dumps({"tool_calls": [{"name": "fast_read", "parameters": {}}, {"name": "slow_read", "parameters": {}}]})
+        split = reply.index('{"name": "slow_read"')
+
+        class StreamingLLM:
+            async def astream(self, prompt):
+                yield reply[:split]
+                await asyncio.sleep(0.05)
+                self.started_before_end = list(started)
+                yield reply[split:]
+
+        llm = StreamingLLM()
+        self.task_orchestrator.llm = llm
+        completed = asyncio.run(self.task_orchestrator.stream_llm_turn("prompt"))
+
+        self.assertEqual(completed, (reply, True))
+        self.assertEqual(llm.started_before_end, ["fast_read"])
+        self.assertEqual(self.task_orchestrator.history, [
+            {"role": "assistant", "content": reply},
+            {"role": "tool", "content": "fast_read"},
+            {"role": "tool", "content": "slow_read"},
+        ])
+
+    def test_cached_tool_result_is_reused(self):
+        """Test that a tool with a cache policy runs once for repeated identical calls."""
+        self.tool_manager.tools = [
+            {"category": "Web", "tools": [{"name": "get_weather", "parameters": {}, "cache": {"ttl": 600}}]}
+        ]
+        calls_made = []
+        self.tool_manager.get_tool.return_value = lambda location: calls_made.append(location) or "sunny"
+        calls = [{"name": "get_weather", "parameters": {"location": "Paris"}}]
+
+        asyncio.run(self.task_orchestrator.execute_tool_calls(calls))
+        asyncio.run(self.task_orchestrator.execute_tool_calls(calls))
+
+        self.assertEqual(calls_made, ["Paris"])
+        self.assertEqual([entry["content"] for entry in self.task_orchestrator.history], ["sunny", "sunny"])
+        self.assertEqual((self.task_orchestrator.tool_cache.hits, self.task_orchestrator.tool_cache.misses), (1, 1))
+
+    def test_invalid_llm_parameters_are_reported_not_executed(self):
+        """Test that LLM parameters are coerced to the schema, and that invalid ones come back as one error."""
+        self.tool_manager.tools = [{"category": "Files", "tools": [{"name": "head", "parameters": {
+            "type": "object", "properties": {"path": {"type": "string"}, "lines": {"type": "integer"}},
+            "required": ["path"]}}]}]
+        calls_made = []
+        self.tool_manager.get_tool.return_value = lambda path, lines=10: calls_made.append((path, lines)) or "ok"
+
+        asyncio.run(self.task_orchestrator.execute_tool_calls([
+            {"name": "head", "parameters": {"path": "a.txt", "lines": "5"}},
+            {"name": "head", "parameters": {"lines": "five", "colour": "red"}},
+        ]))
+
+        self.assertEqual(calls_made, [("a.txt", 5)])
+        error = self.task_orchestrator.history[1]["content"]
+        self.assertTrue(error.startswith("Error: invalid parameters for tool 'head'"))
+        report = json.loads(error[error.index("{"):])
+        self.assertEqual({e["parameter"] for e in report["errors"]}, {"lines", "colour", "path"})
+
+    def test_process_with_rules_prompts_until_the_value_is_valid(self):
+        """Test that a missing parameter is asked for again until it validates."""
+        self.tool_manager.tools = [{"category": "Files", "tools": [{"name": "head", "parameters": {
+            "type": "object", "properties": {"path": {"type": "string"}, "lines": {"type": "integer", "minimum": 1}},
+            "required": ["path", "lines"]}}]}]
+        self.tool_manager.get_tool.return_value = lambda path, lines: f"{lines} lines of {path}"
+        self.task_orchestrator.console = Mock()
+        self.task_orchestrator.console.input.side_effect = ["many", "0", "3"]
+
+        result = self.task_orchestrator.process_with_rules("head path=a.txt")
+
+        self.assertEqual(result, "3 lines of a.txt")
+        self.assertEqual(self.task_orchestrator.console.input.call_count, 3)
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
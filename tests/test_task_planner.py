@@ -0,0 +1,172 @@
+import unittest
+import asyncio
+import json
+import os
+import sys
+import time
+from unittest.mock import Mock, PropertyMock, patch
+
+# Add the project root to the Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.rexode_cli.core.process_runner import _shell_session
+from src.rexode_cli.core.task_planner import DagScheduler, PlanError, fill_parameters, parse_plan
+from src.rexode_cli.core.task_orchestrator import TaskOrchestrator
+from src.rexode_cli.core.tool_manager import ToolManager
+from src.rexode_cli.core.tool_registry import ToolRegistry
+
+TOOLS = [{"category": "Test", "tools": [
+    {"name": "fetch", "description": "Fetches a page.", "parameters": {"properties": {"url": {"type": "string"}}}},
+    {"name": "summarize", "description": "Summarizes text.", "parameters": {"properties": {"text": {"type": "string"}}}},
+    {"name": "write_file", "description": "Writes a file.", "sensitive": True,
+     "parameters": {"properties": {"file_path": {"type": "string"}, "content": {"type": "string"}}}},
+]}]
+
+def plan(*subtasks):
+    return json.dumps({"subtasks": [
+        {"id": i, "tool": tool, "parameters": params, "depends_on": deps} for i, tool, params, deps in subtasks
+    ]})
+
+class TestParsePlan(unittest.TestCase):
+
+    def setUp(self):
+        self.registry = ToolRegistry(TOOLS)
+
+    def test_nodes_come_back_in_dependency_order(self):
+        reply = "Here is the plan:\n```json\n" + plan(
+            ("sum", "summarize", {"text": "{{a}} {{b}}"}, ["a", "b"]),
+            ("a", "fetch", {"url": "a"}, []),
+            ("b", "fetch", {"url": "b"}, []),
+        ) + "\n```"
+        self.assertEqual([node["id"] for node in parse_plan(reply, self.registry)], ["a", "b", "sum"])
+
+    def test_invalid_plans_are_rejected(self):
+        cycle = plan(("a", "fetch", {}, ["b"]), ("b", "fetch", {}, ["a"]))
+        unknown = plan(("a", "fetch", {}, ["missing"]))
+        for reply in (cycle, unknown, "no json here", '{"subtasks": []}'):
+            with self.assertRaises(PlanError):
+                parse_plan(reply, self.registry)
+
+    def test_placeholders_are_filled_from_results(self):
+        filled = fill_parameters({"text": "{{a}} and {{b}}", "raw": "{{a}}", "list": ["{{b}}"]},
+                                 {"a": {"k": 1}, "b": "B"})
+        self.assertEqual(filled, {"text": "{'k': 1} and B", "raw": {"k": 1}, "list": ["B"]})
+
+class TestDagScheduler(unittest.TestCase):
+
+    def test_wall_time_follows_the_critical_path(self):
+        # a, b, c take 0.2 s each and are independent; d needs all three.
+        nodes = parse_plan(plan(("a", "fetch", {}, []), ("b", "fetch", {}, []), ("c", "fetch", {}, []),
+                                ("d", "summarize", {}, ["a", "b", "c"])), ToolRegistry(TOOLS))
+        in_flight, peak = 0, 0
+
+        async def run_subtask(node, parameters):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.2)
+            in_flight -= 1
+            return node["id"]
+
+        ui = Mock()
+        start = time.perf_counter()
+        results, errors, skipped = asyncio.run(DagScheduler(run_subtask, workers=4, ui=ui).run(nodes))
+        elapsed = time.perf_counter() - start
+
+        self.assertEqual(results, {"a": "a", "b": "b", "c": "c", "d": "d"})
+        self.assertEqual(peak, 3)
+        self.assertLess(elapsed, 0.6)  # two levels, not four steps
+        self.assertEqual(ui.complete_step.call_count, 4)
+
+    def test_worker_limit_and_failed_branches(self):
+        nodes = parse_plan(plan(("a", "fetch", {}, []), ("b", "fetch", {}, []), ("c", "fetch", {}, []),
+                                ("after_b", "summarize", {}, ["b"])), ToolRegistry(TOOLS))
+        in_flight, peak = 0, 0
+
+        async def run_subtask(node, parameters):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.05)
+            in_flight -= 1
+            if node["id"] == "b":
+                raise RuntimeError("boom")
+            return "ok"
+
+        results, errors, skipped = asyncio.run(DagScheduler(run_subtask, workers=2).run(nodes))
+        self.assertEqual(peak, 2)
+        self.assertEqual(set(results), {"a", "c"})
+        self.assertEqual(errors, {"b": "boom"})
+        self.assertEqual(skipped, {"after_b"})
+
+class TestProcessWithPlan(unittest.TestCase):
+
+    def setUp(self):
+        self.calls = []
+        self.sessions = []
+        self.fail_urls = {"bad"}
+
+        async def fetch(url):
+            self.calls.append(("fetch", url))
+            await asyncio.sleep(0.1)
+            return f"Error fetching {url}" if url in self.fail_urls else f"page {url}"
+
+        def summarize(text):
+            self.calls.append(("summarize", text))
+            self.sessions.append(_shell_session.get())
+            return f"summary of {text}"
+
+        tool_manager = Mock(spec=ToolManager)
+        tool_manager.tools = TOOLS
+        type(tool_manager).registry = PropertyMock(side_effect=lambda: ToolRegistry(TOOLS))
+        tool_manager.get_tool.side_effect = {"fetch": fetch, "summarize": summarize}.get
+        self.llm = Mock()
+        self.orchestrator = TaskOrchestrator(tool_manager, llm=self.llm)
+        self.orchestrator.tool_cache = None
+
+    def _run(self, *replies):
+        self.llm.ainvoke = Mock(side_effect=[asyncio.sleep(0, reply) for reply in replies])
+        return asyncio.run(self.orchestrator.process_with_plan("summarize pages a and b", ui_factory=None))
+
+    def test_independent_fetches_run_in_parallel(self):
+        start = time.perf_counter()
+        report = self._run(plan(("a", "fetch", {"url": "a"}, []), ("b", "fetch", {"url": "b"}, []),
+                                ("sum", "summarize", {"text": "{{a}} + {{b}}"}, ["a", "b"])))
+        self.assertLess(time.perf_counter() - start, 0.18)
+        self.assertTrue(report.startswith("Plan finished: 3 of 3 subtasks succeeded"))
+        self.assertIn(("summarize", "page a + page b"), self.calls)
+        self.assertEqual(self.llm.ainvoke.call_count, 1)
+
+    def test_only_the_failed_branch_is_replanned(self):
+        report = self._run(
+            plan(("a", "fetch", {"url": "a"}, []), ("b", "fetch", {"url": "bad"}, []),
+                 ("sum", "summarize", {"text": "{{a}} + {{b}}"}, ["a", "b"])),
+            plan(("b2", "fetch", {"url": "mirror"}, []),
+                 ("sum2", "summarize", {"text": "{{a}} + {{b2}}"}, ["a", "b2"])),
+        )
+        self.assertIn("after 1 re-plan", report)
+        self.assertTrue(report.startswith("Plan finished: 3 of 3 subtasks succeeded"))
+        # The successful fetch of "a" was not repeated.
+        self.assertEqual(self.calls.count(("fetch", "a")), 1)
+        replan_prompt = self.llm.ainvoke.call_args_list[1].args[0]
+        self.assertIn("- a (fetch): page a", replan_prompt)
+        self.assertIn("- sum (summarize", replan_prompt)
+
+    def test_plan_runs_on_a_fresh_orchestrator_with_its_shell_session(self):
+        """Test that planning works without process_task and that subtasks see the persistent shell."""
+        self.assertFalse(self.orchestrator.is_cancelled)
+        report = self._run(plan(("sum", "summarize", {"text": "x"}, [])))
+        self.assertTrue(report.startswith("Plan finished: 1 of 1 subtasks succeeded"))
+        self.assertEqual(self.sessions, [self.orchestrator.shell_session])
+        self.assertIsNone(_shell_session.get())
+
+    def test_sensitive_steps_are_confirmed_once(self):
+        with patch("src.rexode_cli.core.task_orchestrator.request_confirmation", return_value=False) as confirm:
+            report = self._run(plan(("w", "write_file", {"file_path": "x", "content": "y"}, []),
+                                    ("w2", "write_file", {"file_path": "z", "content": "y"}, [])))
+        self.assertEqual(report, "Action cancelled by user.")
+        confirm.assert_called_once()
+        self.assertEqual(self.calls, [])
+
+if __name__ == '__main__':
+    unittest.main()
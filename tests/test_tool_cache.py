@@ -0,0 +1,76 @@
+import unittest
+import os
+import sys
+import tempfile
+import time
+
+# Add the project root to the Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.rexode_cli.core.tool_cache import ToolResultCache
+
+TTL = {"ttl": 60}
+
+class TestToolResultCache(unittest.TestCase):
+
+    def test_parameters_are_canonicalized(self):
+        """Test that parameter order does not matter for the cache key."""
+        cache = ToolResultCache()
+        cache.put("fetch_api_data", {"api_url": "u", "page": 1}, {"data": [1]}, TTL)
+        self.assertEqual(cache.get("fetch_api_data", {"page": 1, "api_url": "u"}, TTL), {"data": [1]})
+        self.assertIs(cache.get("fetch_api_data", {"api_url": "u", "page": 2}, TTL), ToolResultCache.MISS)
+        self.assertEqual(cache.stats, {"hits": 1, "misses": 1, "entries": 1})
+
+    def test_expired_entries_and_errors_are_not_returned(self):
+        cache = ToolResultCache()
+        cache.put("get_news", {"topic": "AI"}, "news", {"ttl": 0})
+        cache.put("get_weather", {"location": "Paris"}, "Error getting weather: timeout", TTL)
+        self.assertIs(cache.get("get_news", {"topic": "AI"}, {"ttl": 0}), ToolResultCache.MISS)
+        self.assertIs(cache.get("get_weather", {"location": "Paris"}, TTL), ToolResultCache.MISS)
+        self.assertEqual(len(cache), 0)
+
+    def test_mtime_invalidation(self):
+        """Test that rewriting a file invalidates the cached read_file result."""
+        policy = {"ttl": 60, "invalidate": "mtime", "path_parameter": "file_path"}
+        cache = ToolResultCache()
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "notes.txt")
+            with open(path, "w") as f:
+                f.write("v1")
+            cache.put("read_file", {"file_path": path}, "v1", policy)
+            self.assertEqual(cache.get("read_file", {"file_path": path}, policy), "v1")
+
+            with open(path, "w") as f:
+                f.write("v2!")
+            os.utime(path, ns=(time.time_ns(), time.time_ns() + 1_000_000))
+            self.assertIs(cache.get("read_file", {"file_path": path}, policy), ToolResultCache.MISS)
+
+    def test_least_recently_used_entry_is_evicted(self):
+        cache = ToolResultCache(max_entries=2)
+        cache.put("search_web", {"query": "a"}, "A", TTL)
+        cache.put("search_web", {"query": "b"}, "B", TTL)
+        cache.get("search_web", {"query": "a"}, TTL)
+        cache.put("search_web", {"query": "c"}, "C", TTL)
+        self.assertEqual(cache.get("search_web", {"query": "a"}, TTL), "A")
+        self.assertIs(cache.get("search_web", {"query": "b"}, TTL), ToolResultCache.MISS)
+
+    def test_invalidate_by_tool(self):
+        cache = ToolResultCache()
+        cache.put("search_web", {"query": "a"}, "A", TTL)
+        cache.put("get_news", {"topic": "a"}, "N", TTL)
+        cache.invalidate("search_web")
+        self.assertIs(cache.get("search_web", {"query": "a"}, TTL), ToolResultCache.MISS)
+        self.assertEqual(cache.get("get_news", {"topic": "a"}, TTL), "N")
+
+    def test_entries_persist_across_instances(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "cache", "tool_cache.json")
+            cache = ToolResultCache(persist_path=path)
+            cache.put("system_info", {}, {"system": "Linux"}, TTL)
+            cache.save()
+
+            restored = ToolResultCache(persist_path=path)
+            self.assertEqual(restored.get("system_info", {}, TTL), {"system": "Linux"})
+
+if __name__ == '__main__':
+    unittest.main()
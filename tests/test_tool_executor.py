@@ -0,0 +1,59 @@
+import asyncio
+import threading
+import unittest
+import os
+import sys
+
+# Add the project root to the Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.rexode_cli.core.tool_executor import call_tool, plan_tool_calls
+from src.rexode_cli.core.tool_registry import ToolRegistry
+
+class TestToolExecutor(unittest.TestCase):
+
+    def setUp(self):
+        """Set up a registry with read-only, writing and sensitive tools."""
+        self.registry = ToolRegistry([{"category": "Test Tools", "tools": [
+            {"name": "read_file", "parameters": {}, "sensitive": False, "read_only": True},
+            {"name": "get_weather", "parameters": {}, "sensitive": False, "read_only": True},
+            {"name": "write_file", "parameters": {}, "sensitive": True},
+            {"name": "capture_screenshot", "parameters": {}, "sensitive": False},
+        ]}])
+
+    def test_plan_tool_calls(self):
+        """Test that sensitive and unknown tools act as barriers and depends_on is honoured."""
+        calls = [
+            {"name": "read_file"},
+            {"name": "get_weather"},
+            {"name": "write_file"},
+            {"name": "read_file"},
+            {"name": "get_weather", "depends_on": [3, 7]},
+            {"name": "no_such_tool"},
+        ]
+        self.assertEqual(plan_tool_calls(calls, self.registry), [[], [], [0, 1], [2], [2, 3], [0, 1, 2, 3, 4]])
+
+    def test_writes_order_later_reads(self):
+        """Test that a tool that is not marked read_only runs before the reads that follow it."""
+        calls = [
+            {"name": "read_file"},
+            {"name": "capture_screenshot", "parameters": {"save_path": "shot.png"}},
+            {"name": "read_file", "parameters": {"file_path": "shot.png"}},
+        ]
+        self.assertEqual(plan_tool_calls(calls, self.registry), [[], [0], [1]])
+
+    def test_call_tool_dispatch(self):
+        """Test that sync tools run off the event loop thread and async tools are awaited."""
+        loop_thread = threading.get_ident()
+
+        def sync_tool(value):
+            return value, threading.get_ident() != loop_thread
+
+        async def async_tool(value):
+            return value * 2
+
+        self.assertEqual(asyncio.run(call_tool(sync_tool, {"value": 1})), (1, True))
+        self.assertEqual(asyncio.run(call_tool(async_tool, {"value": 2})), 4)
+
+if __name__ == '__main__':
+    unittest.main()
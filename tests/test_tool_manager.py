@@ -7,6 +7,7 @@ sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')
 
 from src.rexode_cli.core.tool_manager import ToolManager
 from src.rexode_cli.core.config import Config
+from src.rexode_cli.core.tool_manifest import LazyTool, build_manifest
 
 class TestToolManager(unittest.TestCase):
 
@@ -48,5 +49,27 @@ class TestToolManager(unittest.TestCase):
         tool = tool_manager.get_tool('non_existent_tool')
         self.assertIsNone(tool)
 
+    def test_tools_are_loaded_lazily(self):
+        """Test that tool modules are only imported on the first call."""
+        self.config.TOOLS_JSON_PATH = Config.TOOLS_JSON_PATH
+        tool_manager = ToolManager(self.config)
+        read_file = tool_manager.get_tool('read_file')
+        self.assertIsInstance(read_file, LazyTool)
+        self.assertEqual(read_file.module_name, 'os_management')
+        self.assertFalse(read_file.is_loaded)
+        self.assertIn('Rexode', read_file(os.path.join(os.path.dirname(__file__), '..', 'README.md')))
+        self.assertTrue(read_file.is_loaded)
+
+    def test_manifest_prefers_matching_signature(self):
+        """Test that duplicate tool functions resolve to the module whose signature matches tools.json."""
+        tools = [{"category": "Test Tools", "tools": [
+            {"name": "run_tests", "parameters": {"properties": {"project_path": {}, "test_type": {}}}},
+            {"name": "deploy_app", "parameters": {"properties": {"app_path": {}, "target_type": {}}}},
+        ]}]
+        tools_dir = os.path.join(os.path.dirname(__file__), '..', 'src', 'rexode_cli', 'tools')
+        manifest = build_manifest(tools, tools_dir)
+        self.assertEqual(manifest['run_tests']['module'], 'testing_tools')
+        self.assertEqual(manifest['deploy_app']['module'], 'deployment_tools')
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
@@ -0,0 +1,58 @@
+import unittest
+import os
+import sys
+
+# Add the project root to the Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.rexode_cli.core.tool_registry import ToolRegistry
+
+class TestToolRegistry(unittest.TestCase):
+
+    def setUp(self):
+        """Set up a small tool catalog before each test."""
+        self.tools = [
+            {
+                "category": "OS & File Management",
+                "tools": [
+                    {"name": "read_file", "parameters": {"properties": {"file_path": {"type": "string"}}}, "sensitive": False},
+                    {"name": "delete_file", "parameters": {"properties": {"file_path": {"type": "string"}}}, "sensitive": True},
+                ]
+            },
+            {
+                "category": "CI/CD & Automation",
+                "tools": [
+                    {"name": "schedule_task", "parameters": {"properties": {"task": {}, "time": {}}}, "sensitive": False},
+                ]
+            },
+            {
+                "category": "Communication & Productivity",
+                "tools": [
+                    {"name": "schedule_task", "parameters": {"properties": {"task": {}}}, "sensitive": True},
+                ]
+            }
+        ]
+        self.read_file = lambda file_path: file_path
+        self.registry = ToolRegistry(self.tools, {"read_file": self.read_file, "unknown": print})
+
+    def test_indexes(self):
+        """Test the name, category and parameter indexes."""
+        self.assertEqual(self.registry.names, ["read_file", "delete_file", "schedule_task"])
+        self.assertEqual(self.registry.get_schema("delete_file")["name"], "delete_file")
+        self.assertIsNone(self.registry.get_schema("missing"))
+        self.assertEqual(self.registry.tools_in_category("OS & File Management"), ["read_file", "delete_file"])
+        self.assertEqual(self.registry.tools_with_parameter("file_path"), ["read_file", "delete_file"])
+        self.assertTrue(self.registry.is_sensitive("delete_file"))
+
+    def test_duplicate_names_keep_first_definition(self):
+        """Test that a tool listed twice resolves to its first definition."""
+        self.assertEqual(self.registry.category_of("schedule_task"), "CI/CD & Automation")
+        self.assertFalse(self.registry.is_sensitive("schedule_task"))
+
+    def test_callables(self):
+        """Test that only tools present in tools.json are callable."""
+        self.assertIs(self.registry.get_callable("read_file"), self.read_file)
+        self.assertIsNone(self.registry.get_callable("unknown"))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,85 @@
+import unittest
+from unittest.mock import Mock
+import os
+import sys
+
+# Add the project root to the Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.rexode_cli.core.tool_registry import ToolRegistry
+from src.rexode_cli.core.tool_retriever import BM25Index, ToolRetriever, tokenize
+
+TOOLS = [{"category": "Files", "tools": [
+    {"name": "read_file", "description": "Reads the content of a file.",
+     "parameters": {"properties": {"file_path": {"type": "string"}}},
+     "examples": [{"input": "Show me what is in notes.txt"}]},
+    {"name": "list_files", "description": "Lists all files and directories in a given path.",
+     "parameters": {"properties": {"path": {"type": "string"}}},
+     "examples": [{"input": "Show contents of /var/log"}]},
+]}, {"category": "Web", "tools": [
+    {"name": "get_weather", "description": "Gets the current weather for a location.",
+     "parameters": {"properties": {"location": {"type": "string"}}},
+     "examples": [{"input": "What's the weather like in London?"}]},
+]}]
+
+class TestTokenize(unittest.TestCase):
+
+    def test_identifiers_are_kept_whole_and_split(self):
+        self.assertEqual(tokenize("Run list_files on the Directories"), ["run", "list_files", "list", "file", "directory"])
+
+class TestBM25Index(unittest.TestCase):
+
+    def test_rarer_terms_and_shorter_documents_rank_higher(self):
+        index = BM25Index({
+            "a": {"file": 1.0, "read": 1.0},
+            "b": {"file": 1.0, "write": 1.0, "content": 1.0, "disk": 1.0},
+            "c": {"weather": 1.0},
+        })
+        self.assertEqual([doc for doc, _ in index.search(["read", "file"])], ["a", "b"])
+        self.assertEqual(index.search(["weather", "weather"], k=1)[0][0], "c")
+        self.assertEqual(index.search(["unknown"]), [])
+        score = index.search(["read", "file"])[0][1]
+        self.assertLess(score, index.ideal_score(["read", "file"]))
+
+class TestToolRetriever(unittest.TestCase):
+
+    def setUp(self):
+        self.registry = ToolRegistry(TOOLS)
+        self.knowledge_base = Mock()
+        self.retriever = ToolRetriever(self.registry, knowledge_base_factory=lambda: self.knowledge_base)
+
+    def test_lexical_ranking_covers_names_descriptions_parameters_and_examples(self):
+        self.assertEqual(self.retriever.lexical("read_file file_path=a.txt")[0][0], "read_file")
+        self.assertEqual(self.retriever.lexical("what is in the directory")[0][0], "list_files")
+        self.assertEqual(self.retriever.lexical("location=Paris")[0][0], "get_weather")
+        self.assertEqual(self.retriever.lexical("contents of /var/log")[0][0], "list_files")
+        self.assertEqual(self.retriever.lexical("xyzzy"), [])
+        for _, score in self.retriever.lexical("read the file"):
+            self.assertTrue(0.0 < score < 1.0)
+
+    def test_semantic_scores_are_fused_with_lexical_ones(self):
+        # get_weather has no lexical match but is the closest embedding;
+        # read_file matches on both.
+        self.knowledge_base.query_knowledge_base.return_value = (
+            ["d1", "d2", "d3"],
+            [{"tool_name": "get_weather"}, {"tool_name": "read_file"}, {"tool_name": "removed_tool"}],
+            [0.2, 0.8, 0.0],
+        )
+        lexical = dict(self.retriever.lexical("read a file"))
+        ranked = dict(self.retriever.rank("read a file", k=3))
+        self.knowledge_base.query_knowledge_base.assert_called_once_with("read a file", n_results=9)
+        self.assertEqual(set(ranked), {"read_file", "list_files", "get_weather"})
+        self.assertAlmostEqual(ranked["get_weather"], 0.5 * 0.9)
+        self.assertAlmostEqual(ranked["read_file"], 0.5 * lexical["read_file"] + 0.5 * 0.6)
+        self.assertAlmostEqual(ranked["list_files"], 0.5 * lexical["list_files"])
+
+    def test_lexical_ranking_without_knowledge_base(self):
+        def broken_factory():
+            raise ImportError("chromadb missing")
+        retriever = ToolRetriever(self.registry, knowledge_base_factory=broken_factory)
+        self.assertEqual(retriever.rank("read a file", k=1), retriever.lexical("read a file", k=1))
+        self.assertEqual(retriever.rank("read a file", k=1, semantic=False)[0][0], "read_file")
+        self.knowledge_base.query_knowledge_base.assert_not_called()
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,48 @@
+import unittest
+from unittest.mock import Mock
+import os
+import sys
+
+# Add the project root to the Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.rexode_cli.core.tool_registry import ToolRegistry
+from src.rexode_cli.core.tool_shortlist import ToolShortlister
+
+class TestToolShortlister(unittest.TestCase):
+
+    def setUp(self):
+        """Set up a registry and a stub knowledge base before each test."""
+        self.registry = ToolRegistry([{"category": "Test Tools", "tools": [
+            {"name": "read_file", "parameters": {}},
+            {"name": "write_file", "parameters": {}},
+            {"name": "get_weather", "parameters": {}},
+        ]}])
+        self.knowledge_base = Mock()
+        self.shortlister = ToolShortlister(self.registry, knowledge_base_factory=lambda: self.knowledge_base, k=2)
+
+    def test_shortlist_groups_hits_by_tool(self):
+        """Test that hits are grouped per tool, ranked by best score and cut to k."""
+        self.knowledge_base.query_knowledge_base.return_value = (
+            ["d1", "d2", "d3", "d4"],
+            [{"tool_name": "read_file"}, {"tool_name": "write_file"}, {"tool_name": "read_file"}, {"tool_name": "removed_tool"}],
+            [0.4, 0.6, 0.2, 0.1],
+        )
+        self.assertEqual(self.shortlister.shortlist("show me a.txt"), ["read_file", "write_file"])
+        self.knowledge_base.query_knowledge_base.assert_called_once_with("show me a.txt", n_results=6)
+
+    def test_low_confidence_falls_back_to_full_catalog(self):
+        """Test that a weak best match returns None."""
+        self.knowledge_base.query_knowledge_base.return_value = (["d1"], [{"tool_name": "get_weather"}], [1.8])
+        self.assertIsNone(self.shortlister.shortlist("something unrelated"))
+
+    def test_unavailable_knowledge_base_falls_back(self):
+        """Test that a knowledge base that fails to load leaves lexical shortlisting."""
+        factory = Mock(side_effect=ImportError("chromadb missing"))
+        shortlister = ToolShortlister(self.registry, knowledge_base_factory=factory)
+        self.assertEqual(shortlister.shortlist("read a file")[0], "read_file")
+        self.assertIsNone(shortlister.shortlist("something unrelated"))
+        factory.assert_called_once()
+
+if __name__ == '__main__':
+    unittest.main()